@@ -1,35 +1,27 @@
 #!/usr/bin/env python3
-"""Paper trading loop with scan-phase status for the Live desk."""
+"""Paper trading loop with scan-phase status for the Live desk.
+
+Runs :class:`paper_daemon.PaperDaemon`: the workflow is compiled once and every cycle runs
+in this process. ``AIMM_PAPER_ENGINE=subprocess`` starts ``src/main.py`` per cycle instead.
+"""
 
 from __future__ import annotations
 
 import argparse
-import json
+import logging
 import os
-import subprocess
 import sys
-import time
 from pathlib import Path
-from typing import Any
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
-STATUS_PATH = REPO_ROOT / ".runs" / "paper_engine.status.json"
-
+sys.path.insert(0, str(REPO_ROOT / "src"))
 
-def _merge_status(**fields: Any) -> None:
-    """Patch paper_engine.status.json without dropping fields set by the API / main.py."""
-    try:
-        STATUS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        st: dict[str, Any] = {}
-        if STATUS_PATH.is_file():
-            raw = json.loads(STATUS_PATH.read_text(encoding="utf-8"))
-            if isinstance(raw, dict):
-                st = raw
-        st.update(fields)
-        st["updated_at"] = int(time.time())
-        STATUS_PATH.write_text(json.dumps(st, indent=2), encoding="utf-8")
-    except Exception as exc:
-        print(f"[paper-loop] status write failed: {exc}", flush=True)
+from paper_daemon import (  # noqa: E402
+    PaperDaemon,
+    merge_paper_status,
+    paper_engine_kind,
+    subprocess_cycle,
+)
 
 
 def main() -> None:
@@ -41,49 +33,25 @@ def main() -> None:
         default=int(os.getenv("STRATEGY_INTERVAL_SEC", "900") or "900"),
     )
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
     interval = max(300, int(args.interval_sec))
     ticker = str(args.ticker).strip() or "BTC/USDT"
 
-    env = os.environ.copy()
-    env["MODE"] = "paper"
-    env["TICKER"] = ticker
-    env["PYTHONPATH"] = str(REPO_ROOT / "src") + os.pathsep + env.get("PYTHONPATH", "")
+    os.environ["MODE"] = "paper"
+    os.environ["TICKER"] = ticker
+    engine = paper_engine_kind()
+    daemon = PaperDaemon(
+        ticker=ticker,
+        interval_sec=interval,
+        cycle=subprocess_cycle(ticker) if engine == "subprocess" else None,
+    )
+    merge_paper_status(daemon.status_path, ticker=ticker, interval_sec=interval, engine=engine)
+    if engine == "resident":
+        from config.llm_env import require_llm_key
 
-    main_py = REPO_ROOT / "src" / "main.py"
-    iteration = 0
-    while True:
-        iteration += 1
-        now = int(time.time())
-        _merge_status(
-            ticker=ticker,
-            interval_sec=interval,
-            phase="scanning",
-            scan_iteration=iteration,
-            last_scan_started_at=now,
-            next_scan_at=None,
-        )
-        print(f"[paper-loop] invoke ticker={ticker} iteration={iteration}", flush=True)
-        proc = subprocess.run(
-            [sys.executable, str(main_py), "--mode", "paper", "--ticker", ticker],
-            cwd=str(REPO_ROOT),
-            env=env,
-            check=False,
-        )
-        finished = int(time.time())
-        next_at = finished + interval
-        if proc.returncode != 0:
-            print(f"[paper-loop] iteration exit={proc.returncode}", flush=True)
-        _merge_status(
-            ticker=ticker,
-            interval_sec=interval,
-            phase="waiting",
-            scan_iteration=iteration,
-            last_scan_finished_at=finished,
-            last_scan_exit_code=int(proc.returncode),
-            next_scan_at=next_at,
-        )
-        print(f"[paper-loop] sleeping {interval}s (next_scan_at={next_at})", flush=True)
-        time.sleep(interval)
+        require_llm_key()
+        daemon.warm_up()
+    daemon.run_forever()
 
 
 if __name__ == "__main__":
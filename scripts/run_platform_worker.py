@@ -1,26 +1,43 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
 import os
 import sys
 import time
+from functools import partial
 from pathlib import Path
 
 _ROOT = Path(__file__).resolve().parents[1]
 if str(_ROOT / "src") not in sys.path:
     sys.path.insert(0, str(_ROOT / "src"))
 
-from api.copy_routes import execute_inbox_item  # noqa: E402
+from api.backtest_jobs import (  # noqa: E402
+    BacktestJobQueue,
+    backtest_job_workers,
+    claim_spooled_jobs,
+    release_spooled_job,
+    requeue_stale_claims,
+)
+from api.copy_routes import execute_pending_ops  # noqa: E402
+from backtest.completion_journal import CompletionFollower  # noqa: E402
 from storage.leadpage_db import (  # noqa: E402
-    auto_execute_targets,
     database_url,
     fanout_new_signals,
-    insert_local_backtest_result_if_missing,
-    unread_ops_inbox,
+    insert_local_backtest_results_if_missing,
+    pending_auto_execute_ops,
 )
 
 
+def _run_claimed_backtest(spec: dict) -> None:
+    from api.backtest_routes import run_backtest_job
+
+    try:
+        run_backtest_job(str(spec["run_id"]), str(spec["kind"]), dict(spec["request"] or {}))
+    finally:
+        # run_backtest_job persists failures to job.json; a crash keeps the claim for requeue.
+        release_spooled_job(spec)
+
+
 def main() -> None:
     if not database_url():
         raise SystemExit("DATABASE_URL is not set (worker requires Postgres mode).")
@@ -37,33 +54,54 @@ def main() -> None:
     batch = int((os.getenv("PLATFORM_WORKER_BATCH") or "200").strip() or "200")
     batch = max(10, min(2000, batch))
 
+    run_backtests = (os.getenv("PLATFORM_WORKER_BACKTEST_JOBS") or "").strip() in {
+        "1",
+        "true",
+        "TRUE",
+    }
+    auto_execute = (os.getenv("PLATFORM_WORKER_AUTO_EXECUTE") or "").strip() in {
+        "1",
+        "true",
+        "TRUE",
+    }
+    exec_workers = int((os.getenv("PLATFORM_WORKER_EXEC_CONCURRENCY") or "8").strip() or "8")
+    exec_workers = max(1, min(32, exec_workers))
+    backtest_pool = BacktestJobQueue(workers=backtest_job_workers()) if run_backtests else None
+
     print(
         f"[worker] start cursor={cursor} interval={interval}s batch={batch} sync_local_backtests={sync_local}"
+        f" backtest_jobs={run_backtests}"
     )
+    if backtest_pool is not None:
+        requeued = requeue_stale_claims()
+        if requeued:
+            print(f"[worker] re-spooled {requeued} backtest jobs left by a stopped worker")
     last_sync = 0.0
+    local_follower = CompletionFollower()
+    pending_local: list[dict] | None = None
     while True:
         try:
             now = time.time()
+            if backtest_pool is not None:
+                # Only claim what the pool can start now; the rest stays queued for other workers.
+                for spec in claim_spooled_jobs(backtest_pool.idle_slots()):
+                    rid = str(spec["run_id"])
+                    backtest_pool.submit(
+                        rid, partial(_run_claimed_backtest, spec), priority=spec.get("priority")
+                    )
+                    print(f"[worker] started backtest job run_id={rid} kind={spec['kind']}")
+
             if sync_local and (now - last_sync) >= sync_every:
-                inserted = 0
-                runs_dir = _ROOT / ".runs" / "backtests"
-                if runs_dir.is_dir():
-                    for p in sorted(runs_dir.iterdir(), reverse=True)[:200]:
-                        if not p.is_dir():
-                            continue
-                        summary_path = p / "summary.json"
-                        if not summary_path.is_file():
-                            continue
-                        try:
-                            obj = json.loads(summary_path.read_text(encoding="utf-8"))
-                        except Exception:
-                            continue
-                        if isinstance(obj, dict) and insert_local_backtest_result_if_missing(
-                            summary=obj
-                        ):
-                            inserted += 1
-                if inserted:
-                    print(f"[worker] synced local backtests inserted={inserted}")
+                # First pass scans recent run dirs; after that only journaled completions.
+                if pending_local is None:
+                    pending_local = local_follower.backfill(limit=200)
+                summaries = pending_local + local_follower.poll()
+                if summaries:
+                    inserted = insert_local_backtest_results_if_missing(summaries)
+                    if inserted:
+                        print(f"[worker] synced local backtests inserted={inserted}")
+                pending_local = []
+                local_follower.commit()
                 last_sync = now
 
             out = fanout_new_signals(cursor_name=cursor, limit=batch)
@@ -76,25 +114,14 @@ def main() -> None:
                 )
 
             # Auto-execute (safe-by-default): only for (user,provider) with enabled+auto_execute.
-            if (os.getenv("PLATFORM_WORKER_AUTO_EXECUTE") or "").strip() in {"1", "true", "TRUE"}:
-                for uid, prov in auto_execute_targets(limit=500):
-                    ops = unread_ops_inbox(uid, prov, limit=3)
-                    for item in ops:
-                        inbox_id = int(item["id"])
-                        try:
-                            res = execute_inbox_item(user_id=uid, inbox_id=inbox_id)
-                            if res.get("ok") is True:
-                                print(
-                                    f"[worker] auto-executed user={uid} provider={prov} inbox_id={inbox_id}"
-                                )
-                            else:
-                                print(
-                                    f"[worker] auto-exec rejected user={uid} provider={prov} inbox_id={inbox_id}"
-                                )
-                        except Exception as e:
-                            print(
-                                f"[worker] auto-exec error user={uid} provider={prov} inbox_id={inbox_id}: {e}"
-                            )
+            if auto_execute:
+                pending = pending_auto_execute_ops(targets_limit=500, per_target=3)
+                for ex in execute_pending_ops(pending, max_workers=exec_workers):
+                    print(
+                        f"[worker] auto-exec {ex['status']} user={ex['user_id']}"
+                        f" provider={ex['provider']} inbox_id={ex['inbox_id']}"
+                        + (f": {ex['detail']}" if ex["status"] == "failed" else "")
+                    )
         except KeyboardInterrupt:
             print("[worker] stopping")
             return
@@ -12,11 +12,10 @@ from config.app_settings import load_app_settings
 from config.fund_policy import load_fund_policy
 from config.nexus_env import load_nexus_data_base_url
 from paper_account import (
-    append_trade,
     apply_perp_fill,
     apply_spot_fill,
     load_or_init_account,
-    save_account,
+    record_fill,
 )
 
 OrderSide = Literal["buy", "sell"]
@@ -188,8 +187,7 @@ class NexusAdapter:
                     )
             except Exception as e:
                 return {**base, "paper": {"booked": False, "reason": str(e)}}
-            append_trade(runs_dir=runs_dir, account_id=aid, trade={**trade, "order": base})
-            save_account(runs_dir=runs_dir, account=acct)
+            record_fill(runs_dir=runs_dir, account=acct, trade={**trade, "order": base})
             return {
                 **base,
                 "paper": {
@@ -0,0 +1,277 @@
+"""Bounded scheduler for async Research backtests.
+
+Async backtest endpoints used to start one daemon thread per request, so a burst of
+Research runs could oversubscribe the API process. Jobs now go through a priority queue
+drained by a fixed pool of worker threads (``BACKTEST_JOB_WORKERS``).
+
+With ``BACKTEST_JOB_EXECUTOR=worker`` the API does not run backtests at all: requests are
+spooled under ``.runs/backtest_queue/`` and ``scripts/run_platform_worker.py`` claims them
+into its own pool. Spool file names sort by (priority, enqueue time), so a plain directory
+listing is the queue order. A claim file lives until its job ends, so jobs of a worker that
+crashed are re-spooled when it restarts.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from config.runs_paths import runs_dir as _resolved_runs_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_PRIORITY = 5
+MAX_CLAIM_ATTEMPTS = 3
+
+EXECUTOR_API = "api"
+EXECUTOR_WORKER = "worker"
+
+
+def backtest_job_workers() -> int:
+    """Concurrent backtests per process (``BACKTEST_JOB_WORKERS``, clamped to ``[1, 32]``)."""
+    raw = (os.getenv("BACKTEST_JOB_WORKERS") or "").strip()
+    try:
+        n = int(raw) if raw else DEFAULT_JOB_WORKERS
+    except ValueError:
+        n = DEFAULT_JOB_WORKERS
+    return max(1, min(32, n))
+
+
+def backtest_job_executor() -> str:
+    """``api`` (default): run in the API pool; ``worker``: spool for the platform worker."""
+    raw = (os.getenv("BACKTEST_JOB_EXECUTOR") or "").strip().lower()
+    return EXECUTOR_WORKER if raw == EXECUTOR_WORKER else EXECUTOR_API
+
+
+def clamp_priority(priority: int | None) -> int:
+    """Priorities are single digits; lower runs first."""
+    if priority is None:
+        return DEFAULT_JOB_PRIORITY
+    return max(0, min(9, int(priority)))
+
+
+class BacktestJobQueue:
+    """Priority queue (FIFO within a priority) drained by at most ``workers`` threads.
+
+    Threads are started lazily on first submit and live for the process lifetime.
+    """
+
+    def __init__(self, *, workers: int, name: str = "backtest-job") -> None:
+        self._workers = max(1, int(workers))
+        self._name = name
+        self._heap: list[tuple[int, int, str, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._running: set[str] = set()
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def submit(self, run_id: str, fn: Callable[[], None], *, priority: int | None = None) -> int:
+        """Enqueue ``fn`` and return its 1-based queue position."""
+        rid = str(run_id)
+        with self._cv:
+            heapq.heappush(self._heap, (clamp_priority(priority), next(self._seq), rid, fn))
+            self._ensure_threads_locked()
+            self._cv.notify()
+            return self._position_locked(rid) or 1
+
+    def position(self, run_id: str) -> int | None:
+        """1-based position among queued jobs, ``None`` once running or unknown."""
+        with self._cv:
+            return self._position_locked(str(run_id))
+
+    def is_running(self, run_id: str) -> bool:
+        with self._cv:
+            return str(run_id) in self._running
+
+    def idle_slots(self) -> int:
+        """Workers not busy and not already spoken for by queued jobs."""
+        with self._cv:
+            return max(0, self._workers - len(self._running) - len(self._heap))
+
+    def stats(self) -> dict[str, int]:
+        with self._cv:
+            return {
+                "workers": self._workers,
+                "running": len(self._running),
+                "queued": len(self._heap),
+            }
+
+    def _position_locked(self, run_id: str) -> int | None:
+        for i, entry in enumerate(sorted(self._heap)):
+            if entry[2] == run_id:
+                return i + 1
+        return None
+
+    def _ensure_threads_locked(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self._workers:
+            t = threading.Thread(
+                target=self._loop,
+                name=f"{self._name}-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(t)
+            t.start()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cv:
+                while not self._heap:
+                    self._cv.wait()
+                _prio, _seq, rid, fn = heapq.heappop(self._heap)
+                self._running.add(rid)
+            try:
+                fn()
+            except Exception:
+                logger.exception("backtest job crashed run_id=%s", rid)
+            finally:
+                with self._cv:
+                    self._running.discard(rid)
+
+
+def spool_dir() -> Path:
+    return _resolved_runs_dir() / "backtest_queue"
+
+
+def spool_job(
+    run_id: str,
+    kind: str,
+    request: dict[str, Any],
+    *,
+    priority: int | None = None,
+) -> Path:
+    """Persist a job spec for the platform worker (atomic write)."""
+    d = spool_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    prio = clamp_priority(priority)
+    path = d / f"{prio}-{time.time_ns():020d}-{run_id}.json"
+    tmp = path.with_suffix(".tmp")
+    spec = {"run_id": str(run_id), "kind": str(kind), "request": request, "priority": prio}
+    tmp.write_text(json.dumps(spec, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def _spooled_files() -> list[Path]:
+    d = spool_dir()
+    if not d.is_dir():
+        return []
+    try:
+        return sorted(p for p in d.iterdir() if p.suffix == ".json")
+    except OSError:
+        return []
+
+
+def spooled_position(run_id: str) -> int | None:
+    """1-based position of ``run_id`` in the worker spool, ``None`` when claimed or unknown."""
+    suffix = f"-{run_id}.json"
+    for i, p in enumerate(_spooled_files()):
+        if p.name.endswith(suffix):
+            return i + 1
+    return None
+
+
+def _host_id() -> str:
+    # Dot-free, so claim names split cleanly into (stem, worker, "claimed").
+    return socket.gethostname().replace(".", "_")
+
+
+def _worker_id() -> str:
+    return f"{_host_id()}-{os.getpid()}"
+
+
+def claim_spooled_jobs(limit: int) -> list[dict[str, Any]]:
+    """Claim up to ``limit`` spooled jobs in queue order.
+
+    Claiming is an atomic rename to ``<stem>.<host>-<pid>.claimed``, so several workers can
+    share one spool directory. The claim file stays until :func:`release_spooled_job`; if
+    the worker dies first, :func:`requeue_stale_claims` puts the job back on restart.
+    """
+    out: list[dict[str, Any]] = []
+    if limit <= 0:
+        return out
+    worker = _worker_id()
+    for p in _spooled_files():
+        if len(out) >= limit:
+            break
+        claimed = p.with_name(f"{p.stem}.{worker}.claimed")
+        try:
+            p.rename(claimed)
+        except OSError:
+            continue  # another worker won the race
+        try:
+            spec = json.loads(claimed.read_text(encoding="utf-8"))
+        except Exception:
+            spec = None
+        if not (isinstance(spec, dict) and spec.get("run_id") and spec.get("kind")):
+            logger.warning("unreadable spooled backtest job %s, kept as .failed", p.name)
+            claimed.replace(p.with_suffix(".failed"))
+            continue
+        spec["claim_path"] = str(claimed)
+        out.append(spec)
+    return out
+
+
+def release_spooled_job(spec: dict[str, Any]) -> None:
+    """Drop a claim once its job finished or recorded its failure."""
+    claim = spec.get("claim_path")
+    if claim:
+        Path(str(claim)).unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def requeue_stale_claims() -> int:
+    """Re-spool claims left by dead workers on this host; returns how many went back.
+
+    Call on worker start. A job whose claims keep dying (``MAX_CLAIM_ATTEMPTS``) is kept
+    as ``.failed`` instead of crashing every restart.
+    """
+    d = spool_dir()
+    if not d.is_dir():
+        return 0
+    host = _host_id()
+    requeued = 0
+    for claimed in sorted(d.glob("*.claimed")):
+        stem, worker, _ = claimed.name.rsplit(".", 2)
+        owner_host, _, pid = worker.rpartition("-")
+        if owner_host != host or not pid.isdigit() or _pid_alive(int(pid)):
+            continue  # another host's worker, or a live one
+        try:
+            spec = json.loads(claimed.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        spec.pop("claim_path", None)
+        spec["attempts"] = int(spec.get("attempts") or 0) + 1
+        if spec["attempts"] >= MAX_CLAIM_ATTEMPTS:
+            logger.warning("backtest job %s died %d times, kept as .failed", stem, spec["attempts"])
+            claimed.replace(d / f"{stem}.failed")
+            continue
+        tmp = d / f"{stem}.tmp"
+        tmp.write_text(json.dumps(spec, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(d / f"{stem}.json")
+        claimed.unlink(missing_ok=True)
+        requeued += 1
+    return requeued
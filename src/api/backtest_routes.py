@@ -5,7 +5,6 @@ from __future__ import annotations
 import json
 import logging
 import os
-import threading
 import time
 import uuid
 from collections.abc import Callable
@@ -17,6 +16,16 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from api.backtest_jobs import (
+    DEFAULT_JOB_PRIORITY,
+    EXECUTOR_API,
+    EXECUTOR_WORKER,
+    BacktestJobQueue,
+    backtest_job_executor,
+    backtest_job_workers,
+    spool_job,
+    spooled_position,
+)
 from backtest.bars import (
     align_bars_by_min_length,
     fetch_ccxt_ohlcv_bars,
@@ -35,7 +44,12 @@ from backtest.ta_warmup import (
     total_fetch_bars,
     warmup_fetch_since_ms,
 )
-from backtest.trade_book import read_jsonl_dict_records
+from backtest.trade_book import (
+    journal_path,
+    journal_row_count,
+    read_journal_rows,
+    read_jsonl_dict_records,
+)
 from config.runs_paths import runs_dir as _resolved_runs_dir
 from strategies.presets import (
     DEFAULT_QUANT_STRATEGY_ID,
@@ -47,9 +61,10 @@ from strategies.presets import (
 RUNS_DIR = _resolved_runs_dir()
 BACKTESTS_DIR = RUNS_DIR / "backtests"
 
-# Async preset jobs: UI polls GET /backtests/jobs/{run_id} for step progress.
-# Jobs run in daemon threads — API restart orphans "running" job.json files.
+# Async jobs: UI polls GET /backtests/jobs/{run_id} for queue position and step progress.
+# Jobs run on a bounded daemon pool — API restart orphans "running" job.json files.
 BACKTEST_JOBS: dict[str, dict[str, Any]] = {}
+_JOB_QUEUE = BacktestJobQueue(workers=backtest_job_workers())
 
 router = APIRouter(tags=["backtests"])
 logger = logging.getLogger(__name__)
@@ -143,10 +158,20 @@ def _job_progress_update(
     _write_job(run_id, dict(BACKTEST_JOBS[run_id]))
 
 
+def _queue_position(run_id: str) -> int | None:
+    pos = _JOB_QUEUE.position(run_id)
+    return pos if pos is not None else spooled_position(run_id)
+
+
 def _maybe_fail_stale_job(run_id: str, job: dict[str, Any]) -> dict[str, Any]:
     status = str(job.get("status") or "")
     if status not in ("running", "queued"):
         return job
+    if status == "queued":
+        # Waiting behind other jobs is not a stall.
+        pos = _queue_position(run_id)
+        if pos is not None:
+            return {**job, "queue_position": pos}
     updated = _job_updated_at(job, run_id=run_id)
     if updated is None:
         return job
@@ -194,6 +219,8 @@ def recover_stale_backtest_jobs(*, reason: str = "api_startup") -> int:
             continue
         if str(job.get("status") or "") not in ("running", "queued"):
             continue
+        if spooled_position(d.name) is not None:
+            continue  # still waiting for the platform worker
         _fail_job(
             d.name,
             job,
@@ -208,14 +235,12 @@ def recover_stale_backtest_jobs(*, reason: str = "api_startup") -> int:
     return n
 
 
-def _jsonl_preview(path: Path, *, limit: int = 20) -> list[dict[str, Any]]:
+def _jsonl_preview(path: Path, *, limit: int = 20, from_end: bool = False) -> list[dict[str, Any]]:
+    if from_end:
+        return read_jsonl_dict_records(path, tail=limit)
     return read_jsonl_dict_records(path, limit=limit)
 
 
-def _read_jsonl_all(path: Path) -> list[dict[str, Any]]:
-    return read_jsonl_dict_records(path)
-
-
 def _downsample_rows(rows: list[dict[str, Any]], max_points: int) -> list[dict[str, Any]]:
     """Evenly sample rows (inclusive ends) so charts stay responsive for long runs."""
     n = len(rows)
@@ -677,14 +702,8 @@ def post_quick_backtest(req: QuickBacktestRequest) -> dict[str, Any]:
     return _execute_quick_backtest(req)
 
 
-@router.post("/backtests/quick/async")
-def post_quick_backtest_async(req: QuickBacktestRequest) -> dict[str, Any]:
-    """Run quick backtest in a background thread and expose per-bar progress.
-
-    Poll :func:`get_backtest_job` for progress updates.
-    """
-    rid = f"bt-{uuid.uuid4().hex[:12]}"
-    BACKTEST_JOBS[rid] = {
+def _queued_job_state(*, executor: str = EXECUTOR_API) -> dict[str, Any]:
+    return {
         "status": "queued",
         "step": 0,
         "total_steps": 0,
@@ -693,71 +712,91 @@ def post_quick_backtest_async(req: QuickBacktestRequest) -> dict[str, Any]:
         "capital": None,
         "positions": 0,
         "ts": None,
+        "vetoed": None,
+        "executor": executor,
     }
-    _write_job(rid, dict(BACKTEST_JOBS[rid]))
 
-    def work() -> None:
-        def on_bar(i: int, total: int, snap: dict[str, Any]) -> None:
-            _job_progress_update(rid, i, total, snap)
 
-        try:
-            out = _execute_quick_backtest(req, run_id=rid, on_bar_complete=on_bar)
-            BACKTEST_JOBS[rid] = {"status": "completed", "result": out}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except HTTPException as e:
-            detail = e.detail
-            BACKTEST_JOBS[rid] = {
-                "status": "failed",
-                "error": detail if isinstance(detail, str) else str(detail),
-            }
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except Exception as e:
-            logger.exception("async quick backtest failed")
-            BACKTEST_JOBS[rid] = {"status": "failed", "error": str(e)}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
+def _enqueue_backtest_job(kind: str, request: BaseModel, *, priority: int | None) -> dict[str, Any]:
+    """Queue an async backtest on the API pool or the platform-worker spool."""
+    rid = f"bt-{uuid.uuid4().hex[:12]}"
+    payload = request.model_dump()
+    executor = backtest_job_executor()
+    BACKTEST_JOBS[rid] = _queued_job_state(executor=executor)
+    if executor == EXECUTOR_WORKER:
+        # The worker owns the job from here; drop the local copy so polls read job.json.
+        _write_job(rid, dict(BACKTEST_JOBS.pop(rid)))
+        spool_job(rid, kind, payload, priority=priority)
+        position = spooled_position(rid)
+    else:
+        _write_job(rid, dict(BACKTEST_JOBS[rid]))
+        position = _JOB_QUEUE.submit(
+            rid, lambda: run_backtest_job(rid, kind, payload), priority=priority
+        )
+    return {"run_id": rid, "poll": f"/backtests/jobs/{rid}", "queue_position": position}
 
-    threading.Thread(target=work, daemon=True).start()
-    return {"run_id": rid, "poll": f"/backtests/jobs/{rid}"}
 
+def run_backtest_job(run_id: str, kind: str, request: dict[str, Any]) -> None:
+    """Execute one queued async backtest and persist its terminal state.
 
-@router.post("/backtests/demo/async")
-def post_demo_backtest_async(req: DemoBacktestRequest) -> dict[str, Any]:
-    """Run README-style multi-symbol demo backtest (async) with job polling."""
-    rid = f"bt-{uuid.uuid4().hex[:12]}"
-    BACKTEST_JOBS[rid] = {
-        "status": "queued",
-        "step": 0,
-        "total_steps": 0,
-        "trade_count": 0,
-        "equity": None,
-        "capital": None,
-        "positions": 0,
-        "ts": None,
-    }
+    Runs on an API pool thread, or inside ``scripts/run_platform_worker.py`` for spooled jobs.
+    """
+    rid = str(run_id)
+    state = BACKTEST_JOBS.get(rid) or _queued_job_state(executor=EXECUTOR_WORKER)
+    # Refresh updated_at on dequeue so time spent queued never reads as a stall.
+    BACKTEST_JOBS[rid] = {**state, "status": "running"}
     _write_job(rid, dict(BACKTEST_JOBS[rid]))
 
-    def work() -> None:
-        def on_bar(i: int, total: int, snap: dict[str, Any]) -> None:
-            _job_progress_update(rid, i, total, snap)
+    def on_bar(i: int, total: int, snap: dict[str, Any]) -> None:
+        _job_progress_update(rid, i, total, snap)
+
+    try:
+        if kind == "quick":
+            out = _execute_quick_backtest(
+                QuickBacktestRequest(**request), run_id=rid, on_bar_complete=on_bar
+            )
+        elif kind == "demo":
+            out = _execute_demo_backtest(
+                DemoBacktestRequest(**request), run_id=rid, on_bar_complete=on_bar
+            )
+        elif kind == "preset":
+            out = _execute_preset_backtest(
+                PresetBacktestRequest(**request), run_id=rid, on_bar_complete=on_bar
+            )
+        else:
+            raise ValueError(f"unknown backtest job kind: {kind!r}")
+        BACKTEST_JOBS[rid] = {"status": "completed", "result": out}
+        _write_job(rid, dict(BACKTEST_JOBS[rid]))
+    except HTTPException as e:
+        detail = e.detail
+        BACKTEST_JOBS[rid] = {
+            "status": "failed",
+            "error": detail if isinstance(detail, str) else str(detail),
+        }
+        _write_job(rid, dict(BACKTEST_JOBS[rid]))
+    except Exception as e:
+        logger.exception("async %s backtest failed", kind)
+        BACKTEST_JOBS[rid] = {"status": "failed", "error": str(e)}
+        _write_job(rid, dict(BACKTEST_JOBS[rid]))
 
-        try:
-            out = _execute_demo_backtest(req, run_id=rid, on_bar_complete=on_bar)
-            BACKTEST_JOBS[rid] = {"status": "completed", "result": out}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except HTTPException as e:
-            detail = e.detail
-            BACKTEST_JOBS[rid] = {
-                "status": "failed",
-                "error": detail if isinstance(detail, str) else str(detail),
-            }
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except Exception as e:
-            logger.exception("async demo backtest failed")
-            BACKTEST_JOBS[rid] = {"status": "failed", "error": str(e)}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
 
-    threading.Thread(target=work, daemon=True).start()
-    return {"run_id": rid, "poll": f"/backtests/jobs/{rid}"}
+@router.post("/backtests/quick/async")
+def post_quick_backtest_async(
+    req: QuickBacktestRequest, priority: int = DEFAULT_JOB_PRIORITY
+) -> dict[str, Any]:
+    """Queue a quick backtest and expose per-bar progress.
+
+    Poll :func:`get_backtest_job` for queue position and progress updates.
+    """
+    return _enqueue_backtest_job("quick", req, priority=priority)
+
+
+@router.post("/backtests/demo/async")
+def post_demo_backtest_async(
+    req: DemoBacktestRequest, priority: int = DEFAULT_JOB_PRIORITY
+) -> dict[str, Any]:
+    """Queue a README-style multi-symbol demo backtest with job polling."""
+    return _enqueue_backtest_job("demo", req, priority=priority)
 
 
 class PresetBacktestRequest(BaseModel):
@@ -783,9 +822,12 @@ def get_strategy_presets() -> dict[str, Any]:
     return {"strategies": list_presets()}
 
 
-@router.post("/backtests/preset")
-def post_preset_backtest(req: PresetBacktestRequest) -> dict[str, Any]:
-    """Run a quick backtest using a **named preset** (defaults for bars, interval, caps)."""
+def _execute_preset_backtest(
+    req: PresetBacktestRequest,
+    *,
+    run_id: str | None = None,
+    on_bar_complete: Callable[[int, int, dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
     try:
         merged = merge_preset_quick_request(
             req.preset_id,
@@ -828,7 +870,13 @@ def post_preset_backtest(req: PresetBacktestRequest) -> dict[str, Any]:
             initial_cash=float(merged.get("initial_cash") or 10_000),
             fee_bps=float(merged.get("fee_bps") or 10),
         )
-        return _execute_demo_backtest(demo, deploy_path=deploy_path, strategy=strategy_meta)
+        return _execute_demo_backtest(
+            demo,
+            run_id=run_id,
+            on_bar_complete=on_bar_complete,
+            deploy_path=deploy_path,
+            strategy=strategy_meta,
+        )
 
     q = QuickBacktestRequest(
         **{k: v for k, v in merged.items() if k in QuickBacktestRequest.model_fields}
@@ -836,108 +884,31 @@ def post_preset_backtest(req: PresetBacktestRequest) -> dict[str, Any]:
     return _execute_quick_backtest(
         q,
         strategy=strategy_meta,
+        run_id=run_id,
+        on_bar_complete=on_bar_complete,
         deploy_path=deploy_path,
     )
 
 
+@router.post("/backtests/preset")
+def post_preset_backtest(req: PresetBacktestRequest) -> dict[str, Any]:
+    """Run a quick backtest using a **named preset** (defaults for bars, interval, caps)."""
+    return _execute_preset_backtest(req)
+
+
 @router.post("/backtests/preset/async")
-def post_preset_backtest_async(req: PresetBacktestRequest) -> dict[str, Any]:
-    """Run preset backtest in a background thread.
+def post_preset_backtest_async(
+    req: PresetBacktestRequest, priority: int = DEFAULT_JOB_PRIORITY
+) -> dict[str, Any]:
+    """Queue a preset backtest.
 
-    Poll :func:`get_backtest_job` for per-bar progress.
+    Unknown presets are rejected up front; poll :func:`get_backtest_job` for per-bar progress.
     """
     try:
-        merged = merge_preset_quick_request(
-            req.preset_id,
-            ticker=req.ticker,
-            exchange_id=req.exchange_id,
-            n_bars=req.n_bars,
-            interval_sec=req.interval_sec,
-            max_steps=req.max_steps,
-            seed=req.seed,
-            fee_bps=req.fee_bps,
-            initial_cash=req.initial_cash,
-            since_iso=req.since_iso,
-            until_iso=req.until_iso,
-        )
-        preset = get_preset(req.preset_id)
+        get_preset(req.preset_id)
     except KeyError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
-
-    deploy_path = str(merged.pop("deploy_path", "") or "") or None
-    symbols = str(merged.pop("symbols", "") or "").strip()
-    merged.pop("preset_id", None)
-    merged.pop("seed", None)
-
-    strategy_meta = {
-        "preset_id": preset.id,
-        "title": preset.title,
-        "description": preset.description,
-        "deploy_path": deploy_path,
-        "arbitrator_mode": "agent_llm",
-    }
-    sym_list = [s.strip() for s in symbols.split(",") if s.strip()]
-    use_demo = len(sym_list) >= 2 and not (req.since_iso and req.until_iso)
-
-    rid = f"bt-{uuid.uuid4().hex[:12]}"
-    BACKTEST_JOBS[rid] = {
-        "status": "queued",
-        "step": 0,
-        "total_steps": 0,
-        "trade_count": 0,
-        "equity": None,
-        "vetoed": None,
-    }
-    _write_job(rid, dict(BACKTEST_JOBS[rid]))
-
-    def work() -> None:
-        def on_bar(i: int, total: int, snap: dict[str, Any]) -> None:
-            _job_progress_update(rid, i, total, snap)
-
-        try:
-            if use_demo:
-                demo = DemoBacktestRequest(
-                    symbols=symbols,
-                    steps=int(merged.get("max_steps") or merged.get("n_bars") or 200),
-                    interval_sec=int(merged.get("interval_sec") or 86_400),
-                    exchange_id=str(merged.get("exchange_id") or "binance"),
-                    initial_cash=float(merged.get("initial_cash") or 10_000),
-                    fee_bps=float(merged.get("fee_bps") or 10),
-                )
-                out = _execute_demo_backtest(
-                    demo,
-                    run_id=rid,
-                    on_bar_complete=on_bar,
-                    deploy_path=deploy_path,
-                    strategy=strategy_meta,
-                )
-            else:
-                q = QuickBacktestRequest(
-                    **{k: v for k, v in merged.items() if k in QuickBacktestRequest.model_fields}
-                )
-                out = _execute_quick_backtest(
-                    q,
-                    strategy=strategy_meta,
-                    run_id=rid,
-                    on_bar_complete=on_bar,
-                    deploy_path=deploy_path,
-                )
-            BACKTEST_JOBS[rid] = {"status": "completed", "result": out}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except HTTPException as e:
-            detail = e.detail
-            BACKTEST_JOBS[rid] = {
-                "status": "failed",
-                "error": detail if isinstance(detail, str) else str(detail),
-            }
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-        except Exception as e:
-            logger.exception("async preset backtest failed")
-            BACKTEST_JOBS[rid] = {"status": "failed", "error": str(e)}
-            _write_job(rid, dict(BACKTEST_JOBS[rid]))
-
-    threading.Thread(target=work, daemon=True).start()
-    return {"run_id": rid, "poll": f"/backtests/jobs/{rid}"}
+    return _enqueue_backtest_job("preset", req, priority=priority)
 
 
 @router.get("/backtests/jobs/{run_id}")
@@ -1137,12 +1108,12 @@ def get_backtest_equity(
     max_points: int = Query(2000, ge=10, le=50_000),
 ) -> dict[str, Any]:
     """Return equity curve points for charting (downsampled for large runs)."""
-    equity_path = BACKTESTS_DIR / run_id / "equity.jsonl"
-    if not equity_path.is_file():
+    run_dir = BACKTESTS_DIR / run_id
+    if journal_path(run_dir, "equity") is None:
         raise HTTPException(
             status_code=404, detail="Unknown backtest run_id or missing equity.jsonl"
         )
-    rows = _read_jsonl_all(equity_path)
+    rows = read_journal_rows(run_dir, "equity")
     # Older runs wrote warmup bars into equity.jsonl; drop them so charts match
     # the scored From→To window (same as buy&hold / bars.json).
     summary_path = BACKTESTS_DIR / run_id / "summary.json"
@@ -1183,16 +1154,14 @@ def get_backtest_trades(
     run_id: str,
     limit: int = Query(2000, ge=1, le=50_000),
 ) -> dict[str, Any]:
-    """Return booked trades from ``trades.jsonl`` (newest last; capped by ``limit``)."""
-    trades_path = BACKTESTS_DIR / run_id / "trades.jsonl"
-    if not trades_path.is_file():
+    """Return booked trades from the trades journal (newest last; capped by ``limit``)."""
+    run_dir = BACKTESTS_DIR / run_id
+    if journal_path(run_dir, "trades") is None:
         raise HTTPException(
             status_code=404, detail="Unknown backtest run_id or missing trades.jsonl"
         )
-    rows = _read_jsonl_all(trades_path)
-    total = len(rows)
-    if total > limit:
-        rows = rows[-limit:]
+    total = journal_row_count(run_dir, "trades")
+    rows = read_journal_rows(run_dir, "trades", tail=limit)
     normalized = [normalize_trade_row_for_api(r) for r in rows]
     return {
         "run_id": run_id,
@@ -1207,6 +1176,7 @@ def get_backtest_trades(
 def get_backtest_iterations(
     run_id: str,
     limit: int = Query(300, ge=1, le=5000),
+    from_end: bool = Query(False, description="Return the last ``limit`` receipts instead."),
 ) -> dict[str, Any]:
     """Return per-bar iteration receipts from ``iterations.jsonl`` (capped)."""
 
@@ -1215,7 +1185,7 @@ def get_backtest_iterations(
         raise HTTPException(
             status_code=404, detail="Unknown backtest run_id or missing iterations.jsonl"
         )
-    rows = _jsonl_preview(iterations_path, limit=limit)
+    rows = _jsonl_preview(iterations_path, limit=limit, from_end=from_end)
     return {
         "run_id": run_id,
         "total_returned": len(rows),
@@ -1306,6 +1276,48 @@ def get_backtest_bars(
     }
 
 
+def _finished_run_dir(run_id: str) -> Path:
+    """``BACKTESTS_DIR/<run_id>`` for a finished run; 404 for anything that is not a single
+    plain path segment (``..``, separators) or has no ``summary.json``."""
+    if not run_id or run_id in {".", ".."} or Path(run_id).name != run_id or "\\" in run_id:
+        raise HTTPException(status_code=404, detail="Unknown backtest run_id")
+    run_dir = BACKTESTS_DIR / run_id
+    if not (run_dir / "summary.json").is_file():
+        raise HTTPException(status_code=404, detail="Unknown backtest run_id")
+    return run_dir
+
+
+@router.get("/backtests/{run_id}/chart")
+def get_backtest_chart(
+    run_id: str,
+    series: str = Query("equity", description="equity | ohlcv | benchmark"),
+    start_ts: int | None = Query(None, description="Range start (bar ts, inclusive)."),
+    end_ts: int | None = Query(None, description="Range end (bar ts, inclusive)."),
+    width: int = Query(1000, ge=10, le=20_000, description="Target points (chart px)."),
+) -> dict[str, Any]:
+    """Columnar chart series from the run's precomputed min/max-preserving levels.
+
+    Cost depends on ``width``, not run length. Runs finalized before levels existed are
+    served from levels built in memory from their journals and ``bars.json``; the request
+    never writes into the run directory.
+    """
+    from backtest.chart_levels import (
+        CHART_SERIES,
+        query_chart,
+        query_chart_from_artifacts,
+        read_chart_meta,
+    )
+
+    if series not in CHART_SERIES:
+        raise HTTPException(status_code=400, detail=f"series must be one of {CHART_SERIES}")
+    run_dir = _finished_run_dir(run_id)
+    query = query_chart if read_chart_meta(run_dir) is not None else query_chart_from_artifacts
+    out = query(run_dir, series, start_ts=start_ts, end_ts=end_ts, width=width)
+    if out is None:
+        raise HTTPException(status_code=404, detail=f"No {series} chart data for this run")
+    return {"run_id": run_id, **out}
+
+
 def _backtest_list_item(run_dir: Path) -> dict[str, Any] | None:
     """Compact metadata for the Saved-run picker (skips dirs without summary.json)."""
     summary_path = run_dir / "summary.json"
@@ -1336,15 +1348,10 @@ def _backtest_list_item(run_dir: Path) -> dict[str, Any] | None:
             bars_n = int(summary.get("eval_bars") or summary.get("total_bars") or 0)
     else:
         bars_n = int(summary.get("eval_bars") or summary.get("total_bars") or 0)
-    equity_n = 0
-    eq_path = run_dir / "equity.jsonl"
-    if eq_path.is_file():
-        try:
-            equity_n = sum(
-                1 for line in eq_path.read_text(encoding="utf-8").splitlines() if line.strip()
-            )
-        except Exception:
-            equity_n = 0
+    try:
+        equity_n = journal_row_count(run_dir, "equity")
+    except Exception:
+        equity_n = 0
     end_ts = summary.get("end_ts")
     try:
         if end_ts is not None:
@@ -80,7 +80,7 @@ def get_capabilities() -> dict[str, Any]:
                 {
                     "label": "Positions",
                     "api": "GET /pm/portfolio-health",
-                    "source": ".runs/paper/<account>.account.json (or live adapter)",
+                    "source": ".runs/paper/paper.sqlite3 (or live adapter)",
                 },
             ],
             "live": [
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Literal
 
@@ -10,19 +11,19 @@ from pydantic import BaseModel, Field
 from api.auth_routes import require_user_id
 from config.app_settings import load_app_settings
 from paper_account import (
-    append_trade,
+    PaperAccount,
+    PerpPosition,
+    SpotPosition,
     apply_perp_fill,
     apply_spot_fill,
     load_or_init_account,
-    save_account,
+    record_fill,
 )
 from storage.leadpage_db import (
     append_paper_trade as _db_append_paper_trade,
 )
 from storage.leadpage_db import (
-    database_url as _db_url,
-)
-from storage.leadpage_db import (
+    commit_copy_executions,
     get_copy_setting,
     get_signal,
     inbox_items,
@@ -31,6 +32,9 @@ from storage.leadpage_db import (
     record_execution,
     upsert_copy_setting,
 )
+from storage.leadpage_db import (
+    database_url as _db_url,
+)
 from storage.leadpage_db import (
     get_or_init_paper_account as _db_get_or_init_paper_account,
 )
@@ -87,56 +91,22 @@ def _intent_from_signal_meta(meta: dict[str, Any]) -> dict[str, Any] | None:
     return it if isinstance(it, dict) else None
 
 
-def execute_inbox_item(*, user_id: int, inbox_id: int) -> dict[str, Any]:
-    """Pure helper for worker/UI to execute without a FastAPI Request."""
-    if not _db_url():
-        raise RuntimeError("DATABASE_URL is not set")
-    uid = int(user_id)
-
-    rows = inbox_items(uid, limit=5000)
-    it = next((r for r in rows if int(r.get("id") or 0) == int(inbox_id)), None)
-    if not it:
-        raise HTTPException(status_code=404, detail="inbox item not found")
+_DEFAULT_SETTING: dict[str, Any] = {
+    "enabled": True,
+    "auto_execute": False,
+    "instrument": "spot",
+    "max_notional_usdt": None,
+}
 
-    signal_id = int(it.get("signal_id") or 0)
-    provider = str(it.get("provider") or "")
-    sig = get_signal(signal_id)
-    if not sig:
-        raise HTTPException(status_code=404, detail="signal not found")
-    if str(sig.get("kind") or "") != "ops":
-        raise HTTPException(status_code=400, detail="only ops signals are executable")
 
+def _execution_plan(sig: dict[str, Any], setting: dict[str, Any]) -> dict[str, Any] | str:
+    """Validated fill parameters for an ops signal, or the rejection detail."""
     meta = sig.get("meta") if isinstance(sig.get("meta"), dict) else {}
     intent = _intent_from_signal_meta(meta)
     if not intent:
-        ex = record_execution(
-            user_id=uid,
-            provider=provider,
-            signal_id=signal_id,
-            inbox_id=int(inbox_id),
-            status="rejected",
-            detail="missing meta.intent",
-            trade=None,
-        )
-        return {"ok": False, "execution": ex}
-
-    setting = get_copy_setting(uid, provider) or {
-        "enabled": True,
-        "auto_execute": False,
-        "instrument": "spot",
-        "max_notional_usdt": None,
-    }
+        return "missing meta.intent"
     if not bool(setting.get("enabled", True)):
-        ex = record_execution(
-            user_id=uid,
-            provider=provider,
-            signal_id=signal_id,
-            inbox_id=int(inbox_id),
-            status="rejected",
-            detail="copy disabled for provider",
-            trade=None,
-        )
-        return {"ok": False, "execution": ex}
+        return "copy disabled for provider"
 
     instrument = str(intent.get("instrument") or setting.get("instrument") or "spot").lower()
     if instrument not in {"spot", "perp"}:
@@ -144,106 +114,136 @@ def execute_inbox_item(*, user_id: int, inbox_id: int) -> dict[str, Any]:
     symbol = str(intent.get("symbol") or intent.get("ticker") or sig.get("ticker") or "").strip()
     side = str(intent.get("side") or "").strip().lower()
     if side not in {"buy", "sell"} or not symbol:
-        ex = record_execution(
-            user_id=uid,
-            provider=provider,
-            signal_id=signal_id,
-            inbox_id=int(inbox_id),
-            status="rejected",
-            detail="invalid intent (missing symbol/side)",
-            trade=None,
-        )
-        return {"ok": False, "execution": ex}
+        return "invalid intent (missing symbol/side)"
 
     notional = float(intent.get("notional_usdt") or 0.0)
     price = float(intent.get("price") or 0.0)
     if notional <= 0 or price <= 0 or not math.isfinite(notional) or not math.isfinite(price):
-        ex = record_execution(
-            user_id=uid,
-            provider=provider,
-            signal_id=signal_id,
-            inbox_id=int(inbox_id),
-            status="rejected",
-            detail="invalid intent (notional/price)",
-            trade=None,
-        )
-        return {"ok": False, "execution": ex}
+        return "invalid intent (notional/price)"
 
     max_notional = setting.get("max_notional_usdt")
     if isinstance(max_notional, (int, float)) and math.isfinite(float(max_notional)):
         notional = min(notional, float(max_notional))
 
-    qty = notional / price
-    fee_bps = float(intent.get("fee_bps") or 10.0)
-    leverage = float(intent.get("leverage") or 3.0)
+    return {
+        "instrument": instrument,
+        "symbol": symbol,
+        "side": side,
+        "notional": notional,
+        "price": price,
+        "qty": notional / price,
+        "fee_bps": float(intent.get("fee_bps") or 10.0),
+        "leverage": float(intent.get("leverage") or 3.0),
+    }
+
 
+def _load_paper_account(uid: int) -> PaperAccount:
     acct_id = f"user-{uid}"
     s = load_app_settings()
-    use_db_paper = bool(_db_url())
-    if use_db_paper:
-        # DB-backed paper account snapshot (single source of truth in production)
-        snap = _db_get_or_init_paper_account(uid, start_usdt=float(s.paper.start_usdt))
-        acct = load_or_init_account(
-            runs_dir=RUNS_DIR, account_id=acct_id, start_usdt=float(s.paper.start_usdt)
+    acct = load_or_init_account(
+        runs_dir=RUNS_DIR, account_id=acct_id, start_usdt=float(s.paper.start_usdt)
+    )
+    if not _db_url():
+        return acct
+    # DB-backed paper account snapshot (single source of truth in production)
+    snap = _db_get_or_init_paper_account(uid, start_usdt=float(s.paper.start_usdt))
+    # Hydrate file-based object with DB state for deterministic execution logic reuse.
+    acct.cash_usdt = float(snap.get("cash_usdt") or acct.cash_usdt)
+    acct.realized_pnl_usdt = float(snap.get("realized_pnl_usdt") or acct.realized_pnl_usdt)
+    # Positions are stored as arrays in snapshot; keep compatibility with PaperAccount loader
+    # by writing a temp-ish json dict shape into object maps.
+    acct.spot_positions = {}
+    for p in snap.get("spot_positions") or []:
+        if isinstance(p, dict) and p.get("symbol"):
+            acct.spot_positions[str(p["symbol"])] = SpotPosition(
+                symbol=str(p["symbol"]),
+                qty=float(p.get("qty") or 0.0),
+                avg_entry=float(p.get("avg_entry") or 0.0),
+            )
+    acct.perp_positions = {}
+    for p in snap.get("perp_positions") or []:
+        if isinstance(p, dict) and p.get("symbol"):
+            acct.perp_positions[str(p["symbol"])] = PerpPosition(
+                symbol=str(p["symbol"]),
+                qty_signed=float(p.get("qty_signed") or 0.0),
+                avg_entry=float(p.get("avg_entry") or 0.0),
+                leverage=float(p.get("leverage") or 1.0),
+                margin_locked_usdt=float(p.get("margin_locked_usdt") or 0.0),
+            )
+    return acct
+
+
+def _apply_plan(acct: PaperAccount, plan: dict[str, Any]) -> dict[str, Any]:
+    """Fill ``plan`` into ``acct`` and persist it to the local paper store."""
+    if plan["instrument"] == "perp":
+        trade = apply_perp_fill(
+            account=acct,
+            symbol=plan["symbol"],
+            side=plan["side"],
+            qty=plan["qty"],
+            price=plan["price"],
+            fee_bps=plan["fee_bps"],
+            leverage=plan["leverage"],
         )
-        # Hydrate file-based object with DB state for deterministic execution logic reuse.
-        acct.cash_usdt = float(snap.get("cash_usdt") or acct.cash_usdt)
-        acct.realized_pnl_usdt = float(snap.get("realized_pnl_usdt") or acct.realized_pnl_usdt)
-        # Positions are stored as arrays in snapshot; keep compatibility with PaperAccount loader
-        # by writing a temp-ish json dict shape into object maps.
-        acct.spot_positions = {}
-        for p in snap.get("spot_positions") or []:
-            if isinstance(p, dict) and p.get("symbol"):
-                from paper_account import SpotPosition
-
-                acct.spot_positions[str(p["symbol"])] = SpotPosition(
-                    symbol=str(p["symbol"]),
-                    qty=float(p.get("qty") or 0.0),
-                    avg_entry=float(p.get("avg_entry") or 0.0),
-                )
-        acct.perp_positions = {}
-        for p in snap.get("perp_positions") or []:
-            if isinstance(p, dict) and p.get("symbol"):
-                from paper_account import PerpPosition
-
-                acct.perp_positions[str(p["symbol"])] = PerpPosition(
-                    symbol=str(p["symbol"]),
-                    qty_signed=float(p.get("qty_signed") or 0.0),
-                    avg_entry=float(p.get("avg_entry") or 0.0),
-                    leverage=float(p.get("leverage") or 1.0),
-                    margin_locked_usdt=float(p.get("margin_locked_usdt") or 0.0),
-                )
     else:
-        acct = load_or_init_account(
-            runs_dir=RUNS_DIR, account_id=acct_id, start_usdt=float(s.paper.start_usdt)
+        trade = apply_spot_fill(
+            account=acct,
+            symbol=plan["symbol"],
+            side=plan["side"],
+            qty=plan["qty"],
+            price=plan["price"],
+            fee_bps=plan["fee_bps"],
+        )
+    record_fill(runs_dir=RUNS_DIR, account=acct, trade=trade)
+    return trade
+
+
+def _executed_detail(plan: dict[str, Any]) -> str:
+    return (
+        f"executed {plan['instrument']} {plan['side']} {plan['symbol']} "
+        f"notional={plan['notional']:.2f} price={plan['price']:.8f}"
+    )
+
+
+def execute_inbox_item(*, user_id: int, inbox_id: int) -> dict[str, Any]:
+    """Pure helper for worker/UI to execute without a FastAPI Request."""
+    if not _db_url():
+        raise RuntimeError("DATABASE_URL is not set")
+    uid = int(user_id)
+
+    rows = inbox_items(uid, limit=5000)
+    it = next((r for r in rows if int(r.get("id") or 0) == int(inbox_id)), None)
+    if not it:
+        raise HTTPException(status_code=404, detail="inbox item not found")
+
+    signal_id = int(it.get("signal_id") or 0)
+    provider = str(it.get("provider") or "")
+    sig = get_signal(signal_id)
+    if not sig:
+        raise HTTPException(status_code=404, detail="signal not found")
+    if str(sig.get("kind") or "") != "ops":
+        raise HTTPException(status_code=400, detail="only ops signals are executable")
+
+    setting = get_copy_setting(uid, provider) or dict(_DEFAULT_SETTING)
+    plan = _execution_plan(sig, setting)
+    if isinstance(plan, str):
+        ex = record_execution(
+            user_id=uid,
+            provider=provider,
+            signal_id=signal_id,
+            inbox_id=int(inbox_id),
+            status="rejected",
+            detail=plan,
+            trade=None,
         )
+        return {"ok": False, "execution": ex}
 
+    acct = _load_paper_account(uid)
     try:
-        if instrument == "perp":
-            trade = apply_perp_fill(
-                account=acct,
-                symbol=symbol,
-                side=side,
-                qty=qty,
-                price=price,
-                fee_bps=fee_bps,
-                leverage=leverage,
-            )
-        else:
-            trade = apply_spot_fill(
-                account=acct,
-                symbol=symbol,
-                side=side,
-                qty=qty,
-                price=price,
-                fee_bps=fee_bps,
-            )
-        save_account(runs_dir=RUNS_DIR, account=acct)
-        append_trade(runs_dir=RUNS_DIR, account_id=acct_id, trade=trade)
-        if use_db_paper:
-            # Persist back to DB canonical snapshot.
-            _db_save_paper_account(uid, acct.snapshot(instrument=instrument))
-            _db_append_paper_trade(uid, trade)
+        trade = _apply_plan(acct, plan)
+        # Persist back to DB canonical snapshot.
+        _db_save_paper_account(uid, acct.snapshot(instrument=plan["instrument"]))
+        _db_append_paper_trade(uid, trade)
         mark_inbox_read(uid, int(inbox_id))
         ex = record_execution(
             user_id=uid,
@@ -251,10 +251,14 @@ def execute_inbox_item(*, user_id: int, inbox_id: int) -> dict[str, Any]:
             signal_id=signal_id,
             inbox_id=int(inbox_id),
             status="executed",
-            detail=f"executed {instrument} {side} {symbol} notional={notional:.2f} price={price:.8f}",
+            detail=_executed_detail(plan),
             trade=trade,
         )
-        return {"ok": True, "execution": ex, "account": acct.snapshot(instrument=instrument)}
+        return {
+            "ok": True,
+            "execution": ex,
+            "account": acct.snapshot(instrument=plan["instrument"]),
+        }
     except Exception as e:
         ex = record_execution(
             user_id=uid,
@@ -268,6 +272,78 @@ def execute_inbox_item(*, user_id: int, inbox_id: int) -> dict[str, Any]:
         return {"ok": False, "execution": ex}
 
 
+def _execute_user_items(uid: int, items: list[dict[str, Any]]) -> dict[str, Any]:
+    """Execute one user's pending items in inbox order against a single account load."""
+    out: dict[str, Any] = {"executions": [], "read": [], "trades": [], "snapshot": None}
+    acct: PaperAccount | None = None
+    for it in items:
+        sig = it.get("signal")
+        if not sig or str(sig.get("kind") or "") != "ops":
+            # Same as the per-item path (404/400): nothing recorded, item stays unread.
+            continue
+        base = {
+            "user_id": uid,
+            "provider": str(it.get("provider") or ""),
+            "signal_id": int(it.get("signal_id") or 0),
+            "inbox_id": int(it["id"]),
+        }
+        plan = _execution_plan(sig, it.get("setting") or dict(_DEFAULT_SETTING))
+        if isinstance(plan, str):
+            out["executions"].append({**base, "status": "rejected", "detail": plan, "trade": None})
+            continue
+        try:
+            if acct is None:
+                acct = _load_paper_account(uid)
+            trade = _apply_plan(acct, plan)
+        except Exception as e:
+            out["executions"].append({**base, "status": "failed", "detail": str(e), "trade": None})
+            continue
+        out["executions"].append(
+            {**base, "status": "executed", "detail": _executed_detail(plan), "trade": trade}
+        )
+        out["read"].append(int(it["id"]))
+        out["trades"].append((uid, trade))
+        out["snapshot"] = acct.snapshot(instrument=plan["instrument"])
+    return out
+
+
+def execute_pending_ops(
+    items: list[dict[str, Any]], *, max_workers: int = 8
+) -> list[dict[str, Any]]:
+    """Auto-execute a batch from :func:`storage.leadpage_db.pending_auto_execute_ops`.
+
+    Items are grouped per follower so each paper account is loaded and saved once; followers
+    run in a bounded thread pool and every execution, read mark, trade and account snapshot
+    is written in one transaction. Returns the recorded executions.
+    """
+    if not _db_url():
+        raise RuntimeError("DATABASE_URL is not set")
+    by_user: dict[int, list[dict[str, Any]]] = {}
+    for it in items:
+        by_user.setdefault(int(it["user_id"]), []).append(it)
+    if not by_user:
+        return []
+    workers = max(1, min(int(max_workers), len(by_user)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="copy-exec") as pool:
+        results = list(pool.map(lambda kv: _execute_user_items(*kv), by_user.items()))
+
+    executions: list[dict[str, Any]] = []
+    read_ids: list[int] = []
+    trades: list[tuple[int, dict[str, Any]]] = []
+    accounts: dict[int, dict[str, Any]] = {}
+    for uid, res in zip(by_user, results, strict=True):
+        executions.extend(res["executions"])
+        read_ids.extend(res["read"])
+        trades.extend(res["trades"])
+        if res["snapshot"] is not None:
+            accounts[uid] = res["snapshot"]
+    if not executions:
+        return []
+    return commit_copy_executions(
+        executions=executions, read_inbox_ids=read_ids, trades=trades, accounts=accounts
+    )
+
+
 @router.post("/copy/execute")
 def post_execute(request: Request, req: ExecuteInboxRequest) -> dict[str, Any]:
     """Execute an ops signal into the user's local paper account.
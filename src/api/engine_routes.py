@@ -239,18 +239,12 @@ def paper_book() -> dict[str, Any]:
 def paper_book_reset(req: PaperBookResetRequest | None = None) -> dict[str, Any]:
     """Reset local default paper book to start_usdt (clears positions)."""
     from config.app_settings import load_app_settings
-    from paper_account import PaperAccount, save_account
+    from paper_account import PaperAccount, reset_account
 
     s = load_app_settings()
     start = float(req.start_usdt) if req and req.start_usdt else float(s.paper.start_usdt)
     acct = PaperAccount(account_id="default", cash_usdt=start, updated_ts=int(time.time()))
-    save_account(runs_dir=RUNS_DIR, account=acct)
-    trades = RUNS_DIR / "paper" / "default.trades.jsonl"
-    try:
-        if trades.exists():
-            trades.unlink()
-    except Exception:
-        pass
+    reset_account(runs_dir=RUNS_DIR, account=acct)
     return {
         "ok": True,
         "account_id": "default",
@@ -36,7 +36,7 @@ from .profile_routes import router as profile_router
 from .provider_admin_routes import router as provider_admin_router
 from .public_provider_routes import router as public_provider_router
 from .runtime_settings_routes import router as runtime_settings_router
-from .schema_validation import validate_nexus_payload
+from .schema_validation import schema_validation_stats, validate_nexus_payload
 from .signal_routes import router as signal_router
 from .studio_routes import router as studio_router
 from .tools_routes import router as tools_router
@@ -180,6 +180,7 @@ def health() -> dict[str, Any]:
         "ok": True,
         "llm_configured": llm_key_available(),
         "futu_required": False,
+        "schema_validation": schema_validation_stats(),
     }
 
 
@@ -319,7 +320,7 @@ async def ws_run_payload(websocket: WebSocket, run_id: str) -> None:
                 tail_traces=DEFAULT_TAIL_TRACES,
                 tail_message_log=DEFAULT_TAIL_MESSAGE_LOG,
             )
-            # Validate payload shape but keep it cheap by validating only the trimmed payload.
+            # Cached by payload shape, so repeated ticks skip the full Draft-7 pass.
             validate_nexus_payload(payload)
             await websocket.send_json({"type": "payload", "payload": payload})
             await asyncio.sleep(1.0)
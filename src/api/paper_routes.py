@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import sqlite3
 from pathlib import Path
 from typing import Any
 
@@ -8,7 +8,7 @@ from fastapi import APIRouter, HTTPException, Query, Request
 
 from api.auth_routes import require_user_id
 from config.app_settings import load_app_settings
-from paper_account import load_or_init_account
+from paper_account import list_trades, load_or_init_account
 from storage.leadpage_db import database_url as _db_url
 from storage.leadpage_db import get_or_init_paper_account as _db_get_or_init_paper_account
 from storage.leadpage_db import list_paper_trades as _db_list_paper_trades
@@ -36,23 +36,28 @@ def get_snapshot(request: Request) -> dict[str, Any]:
 
 
 @router.get("/paper/trades")
-def get_trades(request: Request, limit: int = Query(200, ge=1, le=5000)) -> dict[str, Any]:
+def get_trades(
+    request: Request,
+    limit: int = Query(200, ge=1, le=5000),
+    before_id: int | None = Query(None, ge=1, description="Cursor from ``next_before_id``."),
+    symbol: str | None = Query(None),
+    since_ts: int | None = Query(None, ge=0),
+    until_ts: int | None = Query(None, ge=0),
+) -> dict[str, Any]:
+    """Newest ``limit`` trades (oldest-first). Page back with ``before_id=next_before_id``."""
     uid = require_user_id(request)
     if _db_url():
         return {"trades": _db_list_paper_trades(uid, limit=int(limit))}
-    acct_id = _account_id(uid)
-    trades_path = RUNS_DIR / "paper" / f"{acct_id}.trades.jsonl"
-    if not trades_path.exists():
-        return {"trades": []}
-    rows: list[dict[str, Any]] = []
     try:
-        for line in trades_path.read_text(encoding="utf-8").splitlines()[-int(limit) :]:
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            if isinstance(obj, dict):
-                rows.append(obj)
-    except Exception as e:
+        rows, next_before_id = list_trades(
+            runs_dir=RUNS_DIR,
+            account_id=_account_id(uid),
+            limit=int(limit),
+            before_id=before_id,
+            symbol=symbol,
+            since_ts=since_ts,
+            until_ts=until_ts,
+        )
+    except sqlite3.Error as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
-    return {"trades": rows}
+    return {"trades": rows, "next_before_id": next_before_id}
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import json
-from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from config.agent_prompts import AgentPromptSettings, load_agent_prompt_settings
 from config.app_settings import load_app_settings
+from storage.jsonl_tail import tail_lines
 
 # IMPORTANT: this registry must match the *actual* node names emitted by FlowEvents
 # in `main._instrument_node(...)` (the `node_name` argument).
@@ -128,14 +128,10 @@ def _read_events(log_path: Path, *, tail: int | None = None) -> List[Dict[str, A
     if not log_path.exists():
         return []
     if tail is not None and tail > 0:
-        buf: deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=int(tail))
-        with log_path.open() as f:
-            for idx, line in enumerate(f):
-                line = line.strip()
-                if not line:
-                    continue
-                buf.append((idx, json.loads(line)))
-        rows: List[Tuple[int, Dict[str, Any]]] = list(buf)
+        # Seek from EOF; only the relative order of the kept lines matters for sorting.
+        rows: List[Tuple[int, Dict[str, Any]]] = [
+            (idx, json.loads(line)) for idx, line in enumerate(tail_lines(log_path, int(tail)))
+        ]
     else:
         rows = []
         with log_path.open() as f:
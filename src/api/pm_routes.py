@@ -24,7 +24,7 @@ from backtest.exchange_trade_format import (
     trade_row_side,
     trade_row_symbol_for_analytics,
 )
-from backtest.trade_book import read_jsonl_dict_records
+from backtest.trade_book import read_journal_rows, read_jsonl_dict_records
 from config.llm_env import llm_key_available
 from llm.openai_client import run_tool_calling_chat, stream_chat_completion
 
@@ -150,9 +150,7 @@ def _is_stable_pair(sym: str) -> bool:
 
 def _build_snapshot(run_dir: Path, *, trades_limit: int = 5000) -> dict[str, Any]:
     summary_path = run_dir / "summary.json"
-    trades_path = run_dir / "trades.jsonl"
     iterations_path = run_dir / "iterations.jsonl"
-    equity_path = run_dir / "equity.jsonl"
     if not summary_path.exists():
         raise HTTPException(status_code=404, detail=f"missing summary.json under {run_dir}")
 
@@ -161,11 +159,9 @@ def _build_snapshot(run_dir: Path, *, trades_limit: int = 5000) -> dict[str, Any
     metrics = summary.get("metrics") if isinstance(summary.get("metrics"), dict) else {}
     evaluation = summary.get("evaluation") if isinstance(summary.get("evaluation"), dict) else {}
 
-    trades = (
-        read_jsonl_dict_records(trades_path, limit=trades_limit) if trades_path.exists() else []
-    )
+    trades = read_journal_rows(run_dir, "trades", stop=trades_limit)
     iters = read_jsonl_dict_records(iterations_path, limit=2000) if iterations_path.exists() else []
-    equity = read_jsonl_dict_records(equity_path, limit=25000) if equity_path.exists() else []
+    equity = read_journal_rows(run_dir, "equity", stop=25000)
 
     eq0 = equity[0] if equity else {}
     eqn = equity[-1] if equity else {}
@@ -1,13 +1,42 @@
-"""JSON Schema validation for Nexus payload contract."""
+"""JSON Schema validation for Nexus payload contract.
+
+``/runs/{id}/payload`` and every ``/ws/runs`` tick validate the payload they send. Payloads
+from the same run mostly repeat one structure, so results are cached by a structural
+signature: key sets, value types (floats split by whether they are integral) and distinct
+array-item shapes, plus the values of enum-constrained fields. A payload whose signature was already validated costs one walk
+instead of a full Draft-7 pass.
+
+``AIMM_SCHEMA_VALIDATION`` picks the mode:
+
+- ``cached`` (default): validate each distinct signature once.
+- ``full``: validate every call (tests, debugging).
+- ``sample``: check a fraction (``AIMM_SCHEMA_VALIDATION_SAMPLE_RATE``, default 0.05) of
+  calls through the cache; the rest pass unchecked.
+- ``off``: never validate.
+
+Counters (checks, cache hits, sampled-out calls, failures) are exposed via
+:func:`schema_validation_stats`.
+"""
 
 from __future__ import annotations
 
 import json
+import logging
+import os
+import random
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from functools import lru_cache
 from typing import Any
 
 from jsonschema import Draft7Validator
 
+logger = logging.getLogger(__name__)
+
+_CACHE_MAX = 512
+_MODES = {"cached", "full", "sample", "off"}
+
 
 def _load_schema_text() -> str:
     """Load the checked-in Nexus payload schema.
@@ -19,18 +48,181 @@ def _load_schema_text() -> str:
     return (files("api.schema") / "nexus_payload.json").read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=1)
+def _schema() -> dict[str, Any]:
+    return json.loads(_load_schema_text())
+
+
 @lru_cache(maxsize=1)
 def _validator() -> Draft7Validator:
-    schema = json.loads(_load_schema_text())
-    return Draft7Validator(schema)
+    return Draft7Validator(_schema())
 
 
-def validate_nexus_payload(payload: dict[str, Any]) -> None:
-    """Raise ValueError with a compact message if payload violates schema."""
-    validator = _validator()
-    errors = sorted(validator.iter_errors(payload), key=lambda e: list(e.path))
+@lru_cache(maxsize=1)
+def _fast_check() -> Callable[[dict[str, Any]], bool]:
+    """Boolean validity check: ``fastjsonschema`` when installed, else ``Draft7Validator.is_valid``
+    (stops at the first error instead of collecting and sorting all of them)."""
+    try:
+        import fastjsonschema
+    except ImportError:
+        return _validator().is_valid
+    # Draft7Validator ignores ``format`` without a format checker; match that.
+    compiled = fastjsonschema.compile(_schema(), use_formats=False)
+
+    def check(payload: dict[str, Any]) -> bool:
+        try:
+            compiled(payload)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+    return check
+
+
+@lru_cache(maxsize=1)
+def _value_keys() -> frozenset[str]:
+    """Property names whose schema constrains the value itself (``enum`` / ``const``)."""
+    keys: set[str] = set()
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for name, sub in (node.get("properties") or {}).items():
+                if isinstance(sub, dict) and ("enum" in sub or "const" in sub):
+                    keys.add(name)
+            for v in node.values():
+                walk(v)
+        elif isinstance(node, list):
+            for v in node:
+                walk(v)
+
+    walk(_schema())
+    return frozenset(keys)
+
+
+def payload_signature(payload: Any) -> int:
+    """Hash of the payload's structure (see module docstring); equal signatures validate alike."""
+    value_keys = _value_keys()
+
+    def shape(v: Any, key: str | None = None) -> Any:
+        if isinstance(v, dict):
+            return ("o", frozenset((k, shape(x, k)) for k, x in v.items()))
+        if isinstance(v, list):
+            return ("a", frozenset(shape(x, key) for x in v))
+        if key in value_keys and isinstance(v, (str, int, float, bool)) or v is None:
+            return (type(v).__name__, v)
+        if isinstance(v, float):
+            # Draft-7 ``integer`` accepts 1.0 but not 1.5: integral floats are their own shape.
+            return ("float", v.is_integer())
+        return type(v).__name__
+
+    return hash(shape(payload))
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.checks = 0
+        self.cache_hits = 0
+        self.validations = 0
+        self.sampled_out = 0
+        self.failures = 0
+        self.last_failure: str | None = None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "mode": _mode(),
+                "checks": self.checks,
+                "cache_hits": self.cache_hits,
+                "validations": self.validations,
+                "sampled_out": self.sampled_out,
+                "failures": self.failures,
+                "last_failure": self.last_failure,
+                "cached_shapes": len(_RESULTS),
+            }
+
+
+_STATS = _Stats()
+# signature -> None (valid) or the ValueError message
+_RESULTS: OrderedDict[int, str | None] = OrderedDict()
+
+
+def _mode() -> str:
+    raw = (os.getenv("AIMM_SCHEMA_VALIDATION") or "").strip().lower()
+    return raw if raw in _MODES else "cached"
+
+
+def _sample_rate() -> float:
+    raw = (os.getenv("AIMM_SCHEMA_VALIDATION_SAMPLE_RATE") or "").strip()
+    try:
+        v = float(raw) if raw else 0.05
+    except ValueError:
+        v = 0.05
+    return max(0.0, min(1.0, v))
+
+
+def _full_validate(payload: dict[str, Any]) -> str | None:
+    if _fast_check()(payload):
+        return None
+    errors = sorted(_validator().iter_errors(payload), key=lambda e: list(e.path))
     if not errors:
-        return
+        return None
     first = errors[0]
     path = ".".join(str(x) for x in first.path) or "<root>"
-    raise ValueError(f"Nexus payload schema validation failed at {path}: {first.message}")
+    return f"Nexus payload schema validation failed at {path}: {first.message}"
+
+
+def validate_nexus_payload(payload: dict[str, Any]) -> None:
+    """Raise ValueError with a compact message if payload violates schema."""
+    mode = _mode()
+    if mode == "off":
+        return
+    if mode == "sample" and random.random() >= _sample_rate():
+        with _STATS.lock:
+            _STATS.sampled_out += 1
+        return
+
+    sig = None if mode == "full" else payload_signature(payload)
+    with _STATS.lock:
+        _STATS.checks += 1
+        hit = sig is not None and sig in _RESULTS
+        if hit:
+            _STATS.cache_hits += 1
+            _RESULTS.move_to_end(sig)
+            message = _RESULTS[sig]
+    if not hit:
+        message = _full_validate(payload)
+        with _STATS.lock:
+            _STATS.validations += 1
+            if sig is not None:
+                _RESULTS[sig] = message
+                while len(_RESULTS) > _CACHE_MAX:
+                    _RESULTS.popitem(last=False)
+    if message is None:
+        return
+    with _STATS.lock:
+        _STATS.failures += 1
+        _STATS.last_failure = message
+    if not hit:
+        logger.warning("%s", message)
+    raise ValueError(message)
+
+
+def schema_validation_stats() -> dict[str, Any]:
+    """Counters since process start (or the last :func:`reset_schema_validation_cache`)."""
+    return _STATS.snapshot()
+
+
+def reset_schema_validation_cache() -> None:
+    global _STATS
+    with _STATS.lock:
+        _RESULTS.clear()
+    _STATS = _Stats()
+
+
+__all__ = [
+    "payload_signature",
+    "reset_schema_validation_cache",
+    "schema_validation_stats",
+    "validate_nexus_payload",
+]
@@ -0,0 +1,223 @@
+"""Process-wide fan-out of new ``LeadpageSignal`` rows to ``/signals/stream`` clients.
+
+Each SSE client used to re-query the latest 200 signals every ``poll_sec``. Now one
+background thread learns about new rows and pushes them to every subscriber queue:
+
+- **Postgres**: ``LISTEN leadpage_signals`` on a dedicated psycopg connection;
+  :func:`storage.leadpage_db.insert_signal` sends ``pg_notify`` with the new id. A
+  periodic catch-up query covers notifications missed while reconnecting.
+- **SQLite / other backends**: one shared poller (``SIGNALS_STREAM_POLL_SEC``, default 1s)
+  reading ``id > last_id``.
+
+Either way the database sees O(new signals) work, independent of the number of clients.
+Slow clients whose queue fills up are dropped and resume with ``Last-Event-ID``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from storage.leadpage_db import (
+    SIGNAL_NOTIFY_CHANNEL,
+    database_url,
+    engine,
+    latest_signal_id,
+    signals_after,
+)
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_MAX = 1000
+_LISTEN_CATCHUP_SEC = 30.0
+
+
+def _poll_sec() -> float:
+    raw = (os.getenv("SIGNALS_STREAM_POLL_SEC") or "").strip()
+    try:
+        v = float(raw) if raw else 1.0
+    except ValueError:
+        v = 1.0
+    return max(0.1, min(30.0, v))
+
+
+@dataclass(eq=False)
+class SignalSubscription:
+    """One SSE client. ``inbox`` yields signal dicts; ``None`` means the client overflowed."""
+
+    provider: str | None
+    inbox: queue.Queue[dict[str, Any] | None] = field(
+        default_factory=lambda: queue.Queue(maxsize=_QUEUE_MAX)
+    )
+    overflowed: bool = False
+
+    def wants(self, row: dict[str, Any]) -> bool:
+        return not self.provider or row.get("provider") == self.provider
+
+
+class SignalBroadcaster:
+    """Single reader thread → per-client queues. Started lazily by the first subscriber."""
+
+    def __init__(self, *, poll_sec: float | None = None) -> None:
+        self._poll_sec = poll_sec if poll_sec is not None else _poll_sec()
+        self._lock = threading.Lock()
+        self._subs: set[SignalSubscription] = set()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._last_id = 0
+        self.mode = "idle"
+
+    def subscribe(self, provider: str | None = None) -> SignalSubscription:
+        sub = SignalSubscription(provider=provider or None)
+        with self._lock:
+            self._subs.add(sub)
+            if self._thread is None:
+                self._last_id = latest_signal_id()
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="signal-broadcaster", daemon=True
+                )
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub: SignalSubscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    def notify(self) -> None:
+        """Wake the poller now (same-process publishers on non-Postgres backends)."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self._thread = None
+
+    def publish(self, rows: list[dict[str, Any]]) -> None:
+        """Fan ``rows`` (id order) out to matching subscribers."""
+        if not rows:
+            return
+        with self._lock:
+            self._last_id = max(self._last_id, max(int(r.get("id") or 0) for r in rows))
+            subs = list(self._subs)
+        for sub in subs:
+            if sub.overflowed:
+                continue
+            for row in rows:
+                if not sub.wants(row):
+                    continue
+                try:
+                    sub.inbox.put_nowait(row)
+                except queue.Full:
+                    sub.overflowed = True
+                    self.unsubscribe(sub)
+                    # Drain one slot so the sentinel always fits; the client reconnects.
+                    try:
+                        sub.inbox.get_nowait()
+                    except queue.Empty:
+                        pass
+                    sub.inbox.put_nowait(None)
+                    break
+
+    def fetch_new(self) -> None:
+        while True:
+            rows = signals_after(self._last_id, limit=500)
+            self.publish(rows)
+            if len(rows) < 500:
+                return
+
+    def _run(self) -> None:
+        listen_conn = self._listen_connection()
+        self.mode = "listen" if listen_conn is not None else "poll"
+        logger.info("signal broadcaster started (mode=%s)", self.mode)
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    if not self._subs:
+                        # Cleared under the lock subscribe() checks, so a subscriber that
+                        # arrives while this thread winds down starts a fresh one.
+                        if self._thread is threading.current_thread():
+                            self._thread = None
+                        break
+                try:
+                    if listen_conn is not None:
+                        self._wait_notify(listen_conn)
+                    else:
+                        self._wake.wait(self._poll_sec)
+                        self._wake.clear()
+                    self.fetch_new()
+                except Exception as e:
+                    logger.warning("signal broadcaster error (%s): %s", self.mode, e)
+                    if listen_conn is not None:
+                        _close_quietly(listen_conn)
+                        listen_conn = self._listen_connection()
+                        self.mode = "listen" if listen_conn is not None else "poll"
+                    self._stop.wait(self._poll_sec)
+        finally:
+            if listen_conn is not None:
+                _close_quietly(listen_conn)
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                if self._thread is None:
+                    self.mode = "idle"
+
+    def _listen_connection(self) -> Any | None:
+        eng = engine()
+        if eng is None or eng.dialect.name != "postgresql":
+            return None
+        try:
+            import psycopg
+        except ImportError:
+            return None
+        try:
+            conninfo = eng.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            conn = psycopg.connect(conninfo, autocommit=True)
+            conn.execute(f"LISTEN {SIGNAL_NOTIFY_CHANNEL}")
+            return conn
+        except Exception as e:
+            logger.warning("signal broadcaster LISTEN unavailable, polling instead: %s", e)
+            return None
+
+    def _wait_notify(self, conn: Any) -> None:
+        # Returns on the first notification or after the catch-up interval; the caller
+        # then reads every row past the cursor, so one query serves a burst of NOTIFYs.
+        for _ in conn.notifies(timeout=_LISTEN_CATCHUP_SEC, stop_after=1):
+            pass
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_BROADCASTER: SignalBroadcaster | None = None
+_BROADCASTER_LOCK = threading.Lock()
+
+
+def get_signal_broadcaster() -> SignalBroadcaster | None:
+    """Shared broadcaster, or None when ``DATABASE_URL`` is unset."""
+    global _BROADCASTER
+    if not database_url():
+        return None
+    with _BROADCASTER_LOCK:
+        if _BROADCASTER is None:
+            _BROADCASTER = SignalBroadcaster()
+        return _BROADCASTER
+
+
+__all__ = ["SignalBroadcaster", "SignalSubscription", "get_signal_broadcaster"]
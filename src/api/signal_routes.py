@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import queue
 import time
 from typing import Any, Literal
 
@@ -9,10 +10,12 @@ from pydantic import BaseModel, Field
 
 from api.auth_routes import require_user_id
 from api.leadpage_routes import _auth_provider_db_or_env_or_401  # reuse provider auth
+from api.signal_broadcaster import get_signal_broadcaster
 from storage.leadpage_db import database_url as _db_url
 from storage.leadpage_db import feed_signals as _db_feed_signals
 from storage.leadpage_db import insert_signal as _db_insert_signal
 from storage.leadpage_db import list_following as _db_list_following
+from storage.leadpage_db import signals_after as _db_signals_after
 
 router = APIRouter(tags=["signals"])
 
@@ -43,6 +46,9 @@ def post_publish_signal(request: Request, req: PublishSignalRequest) -> dict[str
         result_run_id=req.result_run_id,
         meta=req.meta or {},
     )
+    broadcaster = get_signal_broadcaster()
+    if broadcaster is not None:
+        broadcaster.notify()
     return {"ok": True, "signal": row}
 
 
@@ -73,12 +79,23 @@ def get_following_feed(
     return {"count": len(rows), "signals": rows}
 
 
-def _sse(data: dict[str, Any]) -> bytes:
-    # SSE event with json payload.
+def _sse(data: dict[str, Any], *, event_id: int | None = None) -> bytes:
+    # SSE event with json payload; ``id:`` lets EventSource resume via Last-Event-ID.
     import json as _json
 
     payload = _json.dumps(data, separators=(",", ":"), default=str)
-    return f"data: {payload}\n\n".encode("utf-8")
+    prefix = f"id: {int(event_id)}\n" if event_id is not None else ""
+    return f"{prefix}data: {payload}\n\n".encode("utf-8")
+
+
+def _last_event_id(request: Request, query_value: int | None) -> int | None:
+    raw = request.headers.get("last-event-id")
+    if raw is None and query_value is not None:
+        return int(query_value)
+    try:
+        return max(0, int(str(raw).strip())) if raw is not None else None
+    except ValueError:
+        return None
 
 
 @router.get("/signals/stream")
@@ -87,48 +104,54 @@ def stream_signals(
     provider: str | None = Query(None),
     poll_sec: float = Query(1.0, ge=0.25, le=10.0),
     limit: int = Query(50, ge=1, le=200),
+    last_event_id: int | None = Query(None, ge=0),
 ) -> StreamingResponse:
     """Server-Sent Events stream of latest signals (public).
 
-    This is a simple polling-based SSE stream over Postgres; suitable for lightweight realtime UI.
+    New signals are pushed by the shared :mod:`api.signal_broadcaster` (Postgres
+    LISTEN/NOTIFY, or one poller on other backends) instead of a query per client.
+    ``poll_sec`` is the keep-alive ping interval. Reconnects with ``Last-Event-ID``
+    (header, or ``last_event_id`` query) replay everything after that id instead of
+    the latest ``limit`` snapshot.
     """
-    if not _db_url():
+    broadcaster = get_signal_broadcaster()
+    if broadcaster is None:
         return StreamingResponse(
             iter([_sse({"type": "error", "error": "db_not_enabled"})]),
             media_type="text/event-stream",
         )
+    resume_from = _last_event_id(request, last_event_id)
+    # Subscribe before the snapshot query so nothing published in between is lost.
+    sub = broadcaster.subscribe(provider)
 
     def gen():
-        last_id = 0
-        # initial snapshot
-        rows = _db_feed_signals(limit=int(limit), provider=provider)
-        for r in reversed(rows):
-            rid = int(r.get("id") or 0)
-            last_id = max(last_id, rid)
-            yield _sse({"type": "signal", "signal": r})
-        yield _sse({"type": "ready", "last_id": last_id})
-
-        while True:
-            # Client disconnected?
-            if getattr(request, "is_disconnected", None):
+        try:
+            if resume_from is None:
+                rows = list(reversed(_db_feed_signals(limit=int(limit), provider=provider)))
+            else:
+                rows = _db_signals_after(resume_from, limit=1000, provider=provider)
+            last_id = resume_from or 0
+            for r in rows:
+                rid = int(r.get("id") or 0)
+                last_id = max(last_id, rid)
+                yield _sse({"type": "signal", "signal": r}, event_id=rid)
+            yield _sse({"type": "ready", "last_id": last_id})
+
+            while True:
                 try:
-                    if request.is_disconnected():
-                        return
-                except Exception:
-                    pass
-
-            rows2 = _db_feed_signals(limit=200, provider=provider)
-            new_rows = []
-            for r in rows2:
+                    r = sub.inbox.get(timeout=float(poll_sec))
+                except queue.Empty:
+                    yield _sse({"type": "ping", "ts": int(time.time())})
+                    continue
+                if r is None:
+                    yield _sse({"type": "error", "error": "slow_consumer", "last_id": last_id})
+                    return
                 rid = int(r.get("id") or 0)
-                if rid > last_id:
-                    new_rows.append(r)
-            if new_rows:
-                for r in reversed(new_rows):
-                    last_id = max(last_id, int(r.get("id") or 0))
-                    yield _sse({"type": "signal", "signal": r})
-            else:
-                yield _sse({"type": "ping", "ts": int(time.time())})
-            time.sleep(float(poll_sec))
+                if rid <= last_id:
+                    continue
+                last_id = rid
+                yield _sse({"type": "signal", "signal": r}, event_id=rid)
+        finally:
+            broadcaster.unsubscribe(sub)
 
     return StreamingResponse(gen(), media_type="text/event-stream")
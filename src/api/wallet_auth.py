@@ -23,9 +23,6 @@ import hashlib
 import secrets
 import time
 
-from eth_account import Account  # pip: eth-account
-from eth_account.messages import encode_defunct
-
 # ── Challenge generation ──
 
 _CHALLENGE_PREFIX = "leaderboard.olaxbt.xyz wants you to sign in with your wallet.\n\n"
@@ -67,6 +64,9 @@ def verify_wallet_signature(*, wallet: str, challenge: str, signature: str) -> b
 
     Uses EIP-191 (personal_sign) standard via eth_account.
     """
+    from eth_account import Account  # pip: eth-account (~1s import; only wallet logins)
+    from eth_account.messages import encode_defunct
+
     try:
         message = encode_defunct(text=challenge)
         recovered = Account.recover_message(message, signature=signature)
@@ -7,8 +7,6 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import ccxt
-
 
 def _resolve_ccxt_symbol(exchange: Any, symbol: str) -> str:
     """Resolve common Binance linear-swap aliases (``BASE/USDT:USDT``) when spot ``BASE/USDT`` is absent."""
@@ -99,6 +97,8 @@ def fetch_ccxt_ohlcv_bars(
 
     Returns CCXT rows ``[ts_ms, open, high, low, close, volume]`` (same as synthetic helpers).
     """
+    import ccxt
+
     if limit < 2:
         raise ValueError("limit must be >= 2")
     ex_class = getattr(ccxt, exchange_id)
@@ -127,6 +127,8 @@ def fetch_ccxt_ohlcv_range(
     Paginates exchange pages (typically 500–1000 rows) so windows are **reproducible**
     unlike ``fetch_ohlcv(..., limit=N)`` alone (which drifts as "last N candles").
     """
+    import ccxt
+
     if since_ms >= until_ms:
         raise ValueError("since_ms must be < until_ms")
     ex_class = getattr(ccxt, exchange_id)
@@ -0,0 +1,309 @@
+"""Precomputed multi-resolution chart levels for backtest equity / OHLCV / benchmark.
+
+``PerpEngine._finalize`` writes ``chart/`` next to the other artifacts. Each series is
+stored as a pyramid of ``.npy`` matrices:
+
+- level 0 is the scored series itself (one row per bar);
+- level ``k`` merges pairs of level ``k-1`` buckets, so one row covers ``2**k`` bars.
+
+Every row is ``[ts, open, high, low, close, volume, bars]``. ``ts`` is the first bar of the
+bucket, open/close are its first/last value, high/low are its extremes, and volume is the
+sum. Line series (equity, buy&hold) use the same layout with their value as OHLC, so a
+downsampled curve keeps every peak and trough (min/max-preserving) instead of the
+arbitrary points that index striding picks.
+
+:func:`query_chart` picks the coarsest level that still gives at least ``width`` buckets
+for the requested time range, so the reply has between ``width`` and ``2 * width`` points.
+It then slices that level from a memory-mapped file with ``searchsorted``. Reading a chart
+costs O(log n + width), whatever the run length. Runs finalized before levels existed are
+served by :func:`query_chart_from_artifacts`, which builds the levels in memory from the
+journals and ``bars.json`` without writing into the run directory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHART_DIR = "chart"
+CHART_SERIES = ("equity", "ohlcv", "benchmark")
+COLUMNS = ("ts", "open", "high", "low", "close", "volume", "bars")
+_TS, _O, _H, _L, _C, _V, _N = range(len(COLUMNS))
+# Stop halving once a level is this short; a chart never needs fewer buckets.
+_MIN_LEVEL_ROWS = 64
+
+
+def _base_matrix(ts: Sequence[float], ohlcv: np.ndarray) -> np.ndarray:
+    """Level-0 rows from ``ts`` and an ``(n, 5)`` OHLCV (or ``(n,)`` value) array."""
+    vals = np.asarray(ohlcv, dtype=np.float64)
+    n = len(vals)
+    out = np.empty((n, len(COLUMNS)), dtype=np.float64)
+    out[:, _TS] = np.asarray(ts, dtype=np.float64)
+    if vals.ndim == 1:
+        out[:, _O] = out[:, _H] = out[:, _L] = out[:, _C] = vals
+        out[:, _V] = 0.0
+    else:
+        out[:, _O : _V + 1] = vals[:, :5]
+    out[:, _N] = 1.0
+    return out
+
+
+def _halve(level: np.ndarray) -> np.ndarray:
+    """Merge rows pairwise (a trailing odd row becomes its own bucket)."""
+    n = len(level)
+    starts = np.arange(0, n, 2)
+    ends = np.minimum(starts + 1, n - 1)
+    out = np.empty((len(starts), len(COLUMNS)), dtype=np.float64)
+    out[:, _TS] = level[starts, _TS]
+    out[:, _O] = level[starts, _O]
+    out[:, _H] = np.maximum(level[starts, _H], level[ends, _H])
+    out[:, _L] = np.minimum(level[starts, _L], level[ends, _L])
+    out[:, _C] = level[ends, _C]
+    pair = ends != starts
+    out[:, _V] = level[starts, _V] + np.where(pair, level[ends, _V], 0.0)
+    out[:, _N] = level[starts, _N] + np.where(pair, level[ends, _N], 0.0)
+    return out
+
+
+def build_levels(base: np.ndarray) -> list[np.ndarray]:
+    levels = [base]
+    while len(levels[-1]) > _MIN_LEVEL_ROWS:
+        levels.append(_halve(levels[-1]))
+    return levels
+
+
+def _series_bases(
+    equity: tuple[Sequence[float], Sequence[float]] | None,
+    ohlcv: Sequence[Sequence[Any]] | None,
+    benchmark: tuple[Sequence[float], Sequence[float]] | None,
+) -> dict[str, np.ndarray]:
+    bases: dict[str, np.ndarray] = {}
+    if equity is not None and len(equity[0]):
+        bases["equity"] = _base_matrix(equity[0], np.asarray(equity[1], dtype=np.float64))
+    if ohlcv is not None and len(ohlcv):
+        arr = np.asarray([r[:6] for r in ohlcv], dtype=np.float64)
+        bases["ohlcv"] = _base_matrix(arr[:, 0], arr[:, 1:6])
+    if benchmark is not None and len(benchmark[0]):
+        bases["benchmark"] = _base_matrix(benchmark[0], np.asarray(benchmark[1], dtype=np.float64))
+    return bases
+
+
+def write_chart_levels(
+    run_dir: Path,
+    *,
+    equity: tuple[Sequence[float], Sequence[float]] | None = None,
+    ohlcv: Sequence[Sequence[Any]] | None = None,
+    benchmark: tuple[Sequence[float], Sequence[float]] | None = None,
+) -> dict[str, Any]:
+    """Write ``chart/<series>_L<k>.npy`` plus ``chart/meta.json``; returns the meta.
+
+    ``equity`` / ``benchmark`` are ``(ts, values)``; ``ohlcv`` rows are
+    ``[ts, o, h, l, c, v]``. The set is built in a temp directory and renamed into place,
+    so readers never see a mix of old and new levels.
+    """
+    run_dir = Path(run_dir)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{CHART_DIR}.", dir=str(run_dir)))
+    meta: dict[str, Any] = {"columns": list(COLUMNS), "series": {}}
+    try:
+        for name, base in _series_bases(equity, ohlcv, benchmark).items():
+            levels = build_levels(base)
+            for k, level in enumerate(levels):
+                np.save(tmp_dir / f"{name}_L{k}.npy", level)
+            meta["series"][name] = {"bars": len(base), "levels": [len(lv) for lv in levels]}
+        (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=1), encoding="utf-8")
+        _swap_dir(tmp_dir, run_dir / CHART_DIR)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta
+
+
+def _swap_dir(src: Path, dst: Path) -> None:
+    """Rename ``src`` to ``dst``, moving an existing ``dst`` aside first (rename cannot
+    replace a non-empty directory)."""
+    old = None
+    if dst.exists():
+        old = Path(tempfile.mkdtemp(prefix=f".{dst.name}.old.", dir=str(dst.parent)))
+        os.replace(dst, old / dst.name)
+    os.replace(src, dst)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def read_chart_meta(run_dir: Path) -> dict[str, Any] | None:
+    path = Path(run_dir) / CHART_DIR / "meta.json"
+    if not path.is_file():
+        return None
+    try:
+        meta = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def pick_level(levels: Sequence[int], bars_in_range: int, width: int) -> int:
+    """Coarsest level whose bucket (``2**k`` bars) still gives ``>= width`` points."""
+    width = max(1, int(width))
+    k = 0
+    while k + 1 < len(levels) and bars_in_range // (2 ** (k + 1)) >= width:
+        k += 1
+    return k
+
+
+def query_chart(
+    run_dir: Path,
+    series: str,
+    *,
+    start_ts: float | None = None,
+    end_ts: float | None = None,
+    width: int = 1000,
+) -> dict[str, Any] | None:
+    """Columnar rows of ``series`` for ``[start_ts, end_ts]`` at ``width``–``2*width`` points.
+
+    Buckets are aligned to the run start, so the first and last bucket may reach a few bars
+    past the range edges. Returns None when the run has no levels for ``series``.
+    """
+    meta = read_chart_meta(run_dir)
+    info = (meta or {}).get("series", {}).get(series)
+    if not isinstance(info, dict):
+        return None
+    levels = [int(x) for x in info.get("levels") or []]
+    if not levels:
+        return None
+    base_dir = Path(run_dir) / CHART_DIR
+
+    def load(k: int) -> np.ndarray:
+        return np.load(base_dir / f"{series}_L{k}.npy", mmap_mode="r")
+
+    return _slice_levels(series, levels, load, start_ts=start_ts, end_ts=end_ts, width=width)
+
+
+def _slice_levels(
+    series: str,
+    levels: Sequence[int],
+    load: Callable[[int], np.ndarray],
+    *,
+    start_ts: float | None,
+    end_ts: float | None,
+    width: int,
+) -> dict[str, Any]:
+    base = load(0)
+    ts0 = base[:, _TS]
+    lo = 0 if start_ts is None else int(np.searchsorted(ts0, float(start_ts), side="left"))
+    hi = len(ts0) if end_ts is None else int(np.searchsorted(ts0, float(end_ts), side="right"))
+    hi = max(lo, hi)
+    k = pick_level(levels, hi - lo, width)
+    if k == 0:
+        rows = base[lo:hi]
+    else:
+        # Bucket i of level k covers bars [i * 2**k, (i + 1) * 2**k).
+        level = load(k)
+        step = 2**k
+        rows = level[lo // step : (hi + step - 1) // step] if hi > lo else level[:0]
+    rows = np.array(rows)
+    columns: dict[str, list[Any]] = {
+        "ts": rows[:, _TS].astype(np.int64).tolist(),
+        "open": rows[:, _O].tolist(),
+        "high": rows[:, _H].tolist(),
+        "low": rows[:, _L].tolist(),
+        "close": rows[:, _C].tolist(),
+        "bars": rows[:, _N].astype(np.int64).tolist(),
+    }
+    if series == "ohlcv":
+        columns["volume"] = rows[:, _V].tolist()
+    return {
+        "series": series,
+        "level": k,
+        "bucket_bars": 2**k,
+        "count": hi - lo,
+        "points": len(rows),
+        "downsampled": k > 0,
+        "columns": columns,
+    }
+
+
+def query_chart_from_artifacts(
+    run_dir: Path,
+    series: str,
+    *,
+    start_ts: float | None = None,
+    end_ts: float | None = None,
+    width: int = 1000,
+) -> dict[str, Any] | None:
+    """:func:`query_chart` for runs without ``chart/``: levels built in memory, nothing written."""
+    base = _artifact_bases(Path(run_dir), series).get(series)
+    if base is None:
+        return None
+    levels = build_levels(base)
+    return _slice_levels(
+        series,
+        [len(lv) for lv in levels],
+        levels.__getitem__,
+        start_ts=start_ts,
+        end_ts=end_ts,
+        width=width,
+    )
+
+
+def _artifact_bases(run_dir: Path, series: str) -> dict[str, np.ndarray]:
+    """Level-0 matrix of ``series`` rebuilt from the equity journal or ``bars.json``."""
+    from backtest.trade_book import iter_journal_rows, journal_path
+
+    equity = None
+    eq_path = journal_path(run_dir, "equity") if series == "equity" else None
+    if eq_path is not None:
+        ts, vals = [], []
+        for row in iter_journal_rows(eq_path, columns=("ts", "equity")):
+            try:
+                t, v = int(row["ts"]), float(row["equity"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            ts.append(t)
+            vals.append(v)
+        equity = (ts, vals)
+    ohlcv = benchmark = None
+    bars_path = run_dir / "bars.json"
+    if series != "equity" and bars_path.is_file():
+        try:
+            raw = json.loads(bars_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            raw = {}
+        bars = raw.get("bars") if isinstance(raw, dict) else None
+        if isinstance(bars, list):
+            ohlcv = [
+                [b.get("ts"), b.get("o"), b.get("h"), b.get("l"), b.get("c"), b.get("v") or 0.0]
+                for b in bars
+                if isinstance(b, dict) and b.get("ts") is not None
+            ]
+        points = raw.get("benchmark_equity_points") if isinstance(raw, dict) else None
+        if isinstance(points, list):
+            pts = [p for p in points if isinstance(p, dict) and "ts" in p and "equity" in p]
+            benchmark = ([p["ts"] for p in pts], [p["equity"] for p in pts])
+    try:
+        return _series_bases(equity, ohlcv, benchmark)
+    except (TypeError, ValueError) as e:
+        logger.warning("chart levels from artifacts failed for %s: %s", run_dir, e)
+        return {}
+
+
+__all__ = [
+    "CHART_SERIES",
+    "COLUMNS",
+    "build_levels",
+    "pick_level",
+    "query_chart",
+    "query_chart_from_artifacts",
+    "read_chart_meta",
+    "write_chart_levels",
+]
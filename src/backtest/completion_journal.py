@@ -0,0 +1,206 @@
+"""Append-only journal of finished backtests (``.runs/backtest_completions.jsonl``).
+
+``PerpEngine._finalize`` (or ``run_multi_step_backtest``, after its final ``summary.json``
+rewrite) appends one ``{"run_id", "summary", "ts"}`` row. Consumers such as the platform
+worker keep a cursor and read only the rows appended since, instead of re-listing
+``.runs/backtests`` and re-reading every summary.
+
+The journal is compacted once it grows past ``_MAX_BYTES``. Appends and compaction share an
+``fcntl`` lock on a sidecar file, so a CLI backtest and an API job never lose rows to each
+other's rewrite. The cursor is ``(inode, offset)``: compaction replaces the file, so a reader
+whose inode no longer matches (or whose offset lies past EOF) starts over from the top.
+Consumers must therefore be idempotent per ``run_id``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from config.runs_paths import runs_dir as _default_runs_dir
+from storage.jsonl_tail import compact_if_oversized
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = "backtest_completions.jsonl"
+
+_MAX_BYTES = 1024 * 1024
+_KEEP_LAST = 5000
+# Journaled runs whose summary stays unreadable this long are given up on.
+_PENDING_TTL_SEC = 3600
+_LOCK = threading.Lock()
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in other processes are not serialized.
+    fcntl = None  # type: ignore[assignment]
+
+
+class JournalCursor(NamedTuple):
+    """Position in one generation of the journal (``inode`` 0: no journal yet)."""
+
+    inode: int
+    offset: int
+
+
+def journal_path(runs_dir: Path | None = None) -> Path:
+    return (runs_dir or _default_runs_dir()) / JOURNAL_NAME
+
+
+@contextmanager
+def _journal_lock(path: Path) -> Iterator[None]:
+    """Exclusive across threads and, where ``fcntl`` exists, across processes."""
+    with _LOCK:
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(path.with_name(path.name + ".lock"), os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the flock
+
+
+def record_backtest_completion(
+    run_id: str, summary_path: Path, *, runs_dir: Path | None = None
+) -> None:
+    """Append one completion row (best effort: a failed append never fails the backtest)."""
+    path = journal_path(runs_dir)
+    row = {"run_id": str(run_id), "summary": str(summary_path), "ts": int(time.time())}
+    line = (json.dumps(row, separators=(",", ":")) + "\n").encode("utf-8")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _journal_lock(path):
+            # One O_APPEND write per row; the lock keeps it out of a compaction's copy window.
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            compact_if_oversized(path, max_bytes=_MAX_BYTES, keep_last=_KEEP_LAST)
+    except OSError as exc:
+        logger.warning("backtest completion journal append failed for %s: %s", run_id, exc)
+
+
+def journal_end(runs_dir: Path | None = None) -> JournalCursor:
+    """Cursor at the current end of the journal (``(0, 0)`` when there is no journal yet)."""
+    try:
+        st = journal_path(runs_dir).stat()
+    except OSError:
+        return JournalCursor(0, 0)
+    return JournalCursor(st.st_ino, st.st_size)
+
+
+def read_completions(
+    cursor: JournalCursor | None, *, runs_dir: Path | None = None
+) -> tuple[list[dict[str, Any]], JournalCursor]:
+    """Rows appended since ``cursor`` and the cursor to resume from.
+
+    ``None``, a cursor from an older generation of the file (compacted) or one past EOF
+    (truncated) reads from the top. A trailing partial line (append in flight) is left for
+    the next read. Malformed rows are skipped.
+    """
+    path = journal_path(runs_dir)
+    try:
+        with open(path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            size = f.seek(0, os.SEEK_END)
+            offset = cursor.offset if cursor is not None and cursor.inode == inode else 0
+            if offset > size:
+                offset = 0
+            f.seek(offset)
+            data = f.read(size - offset)
+    except OSError:
+        return [], JournalCursor(0, 0)
+    end = data.rfind(b"\n") + 1
+    rows: list[dict[str, Any]] = []
+    for raw in data[:end].splitlines():
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(row, dict) and row.get("run_id"):
+            rows.append(row)
+    return rows, JournalCursor(inode, offset + end)
+
+
+def _load_summary(path: Path) -> dict[str, Any] | None:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+class CompletionFollower:
+    """Cursor over the journal that yields the ``summary.json`` payloads of new backtests.
+
+    The cursor starts at the current end of the journal; :meth:`backfill` covers runs that
+    finished earlier. :meth:`poll` does not move the cursor; call :meth:`commit` once the
+    batch is stored, so a failed insert is retried on the next poll. Rows whose summary
+    cannot be read yet stay pending and are retried (for up to ``_PENDING_TTL_SEC``).
+    """
+
+    def __init__(self, runs_dir: Path | None = None) -> None:
+        self.runs_dir = runs_dir or _default_runs_dir()
+        self.cursor = journal_end(self.runs_dir)
+        self._next = self.cursor
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._next_pending: dict[str, dict[str, Any]] = {}
+
+    def backfill(self, *, limit: int = 200) -> list[dict[str, Any]]:
+        """Summaries of the newest ``limit`` run directories (one directory scan)."""
+        bt = self.runs_dir / "backtests"
+        if not bt.is_dir():
+            return []
+        out: list[dict[str, Any]] = []
+        for p in sorted(bt.iterdir(), reverse=True)[:limit]:
+            if p.is_dir() and (obj := _load_summary(p / "summary.json")) is not None:
+                out.append(obj)
+        return out
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Summaries of runs journaled since the cursor, plus pending ones that now load."""
+        rows, self._next = read_completions(self.cursor, runs_dir=self.runs_dir)
+        candidates = dict(self._pending)
+        for row in rows:
+            candidates[str(row["run_id"])] = row
+        out: list[dict[str, Any]] = []
+        pending: dict[str, dict[str, Any]] = {}
+        now = time.time()
+        for run_id, row in candidates.items():
+            path = Path(str(row.get("summary") or ""))
+            if not path.is_file():
+                path = self.runs_dir / "backtests" / run_id / "summary.json"
+            obj = _load_summary(path)
+            if obj is not None:
+                out.append(obj)
+            elif now - float(row.get("ts") or 0) < _PENDING_TTL_SEC:
+                pending[run_id] = row
+            else:
+                logger.warning("backtest completion %s: summary unreadable, giving up", run_id)
+        self._next_pending = pending
+        return out
+
+    def commit(self) -> None:
+        self.cursor = self._next
+        self._pending = self._next_pending
+
+
+__all__ = [
+    "JOURNAL_NAME",
+    "CompletionFollower",
+    "JournalCursor",
+    "journal_end",
+    "journal_path",
+    "read_completions",
+    "record_backtest_completion",
+]
@@ -6,11 +6,18 @@ Checks that the bars fed to agents are sane before inference:
 - Minimum bar count
 - Ticker consistency
 
+Backtest windows are prefixes of one history that grows a bar at a time, so
+:class:`OhlcvPrefixValidator` validates the full history once (vectorized) at load, extends
+in O(1) per appended bar, and answers ``validate_ohlcv_window(history[:n])`` in O(1).
 """
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
 
 
 @dataclass
@@ -122,3 +129,111 @@ def validate_ohlcv_window(
 
     passed = all(v for v in checks.values())
     return OhlcvQualityResult(passed=passed, warnings=warnings, checks=checks)
+
+
+def _parse_ts(row: Any) -> float:
+    try:
+        return float(row[0])
+    except (IndexError, TypeError, ValueError):
+        return 0.0
+
+
+def _ts_scale(first_ts: float) -> float:
+    # Normalise to milliseconds (support ms or sec), keyed off the first bar like the window check.
+    return 1000.0 if 1e8 < first_ts < 1e10 else 1.0
+
+
+class OhlcvPrefixValidator:
+    """Per-symbol data-quality state for every prefix ``bars[:n]`` of one OHLCV history.
+
+    Tracks only the first non-monotonic bar and the first oversized gap; :meth:`result` for
+    a prefix matches :func:`validate_ohlcv_window` on that prefix.
+    """
+
+    def __init__(self, bars: Sequence[Any] = (), *, interval_sec: int) -> None:
+        self.interval_ms = int(interval_sec) * 1000
+        self.max_gap_ms = int(self.interval_ms * 1.5)
+        self._n = 0
+        self._scale = 1.0
+        self._last_ts = 0.0
+        self._first_unordered: int | None = None
+        self._first_gap: tuple[int, int] | None = None
+        if len(bars):
+            self._load(bars)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _load(self, bars: Sequence[Any]) -> None:
+        ts = np.fromiter((_parse_ts(r) for r in bars), dtype=np.float64, count=len(bars))
+        self._scale = _ts_scale(float(ts[0]))
+        ts = ts * self._scale
+        self._n = int(ts.size)
+        self._last_ts = float(ts[-1])
+        if ts.size < 2:
+            return
+        diff = np.diff(ts)
+        bad = np.flatnonzero(ts[1:] < ts[:-1])
+        if bad.size:
+            self._first_unordered = int(bad[0]) + 1
+        gaps = np.flatnonzero(np.trunc(diff) > self.max_gap_ms)
+        if gaps.size:
+            i = int(gaps[0]) + 1
+            self._first_gap = (i, int(diff[i - 1]))
+
+    def append(self, row: Any) -> None:
+        """Extend the history by one bar (O(1))."""
+        ts = _parse_ts(row)
+        if self._n == 0:
+            self._scale = _ts_scale(ts)
+            self._last_ts = ts * self._scale
+            self._n = 1
+            return
+        ts *= self._scale
+        i = self._n
+        if self._first_unordered is None and ts < self._last_ts:
+            self._first_unordered = i
+        if self._first_gap is None and int(ts - self._last_ts) > self.max_gap_ms:
+            self._first_gap = (i, int(ts - self._last_ts))
+        self._last_ts = ts
+        self._n += 1
+
+    def result(
+        self, n: int, *, symbol: str, expected_ticker: str, min_bars: int = 2
+    ) -> OhlcvQualityResult:
+        """Validation of the first ``n`` bars (``n`` ≤ bars seen so far)."""
+        n = int(n)
+        if n > self._n:
+            raise ValueError(f"prefix of {n} bars exceeds the {self._n} validated")
+        if n <= 0:
+            return validate_ohlcv_window(
+                [], symbol=symbol, expected_ticker=expected_ticker, interval_sec=1
+            )
+        checks: dict[str, bool] = {}
+        warnings: list[str] = []
+        checks["min_bars"] = n >= min_bars
+        if not checks["min_bars"]:
+            warnings.append(f"{symbol}: only {n} bars, need ≥{min_bars}")
+
+        monotonic = self._first_unordered is None or self._first_unordered >= n
+        checks["monotonic_ts"] = monotonic
+        if not monotonic:
+            warnings.append(f"{symbol}: non-monotonic timestamps detected")
+
+        gap_ok = True
+        if monotonic and self._first_gap is not None and self._first_gap[0] < n:
+            gap_ok = False
+            i, gap = self._first_gap
+            warnings.append(
+                f"{symbol}: gap of {gap}ms at bar {i} "
+                f"(> {self.max_gap_ms}ms, expected ~{self.interval_ms}ms)"
+            )
+        checks["gap_ok"] = gap_ok
+
+        ticker_match = symbol == expected_ticker
+        checks["ticker_match"] = ticker_match
+        if not ticker_match:
+            warnings.append(f"{symbol}: ticker mismatch (expected {expected_ticker})")
+        checks["has_data"] = True
+
+        return OhlcvQualityResult(passed=all(checks.values()), warnings=warnings, checks=checks)
@@ -10,13 +10,16 @@ from __future__ import annotations
 
 import logging
 import os
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List
 from typing import Any as _Any
 
-from backtest.data_quality import validate_ohlcv_window
+from backtest.data_quality import OhlcvPrefixValidator, validate_ohlcv_window
+from backtest.market_view import UniverseWindows
 from config.app_settings import load_app_settings
 from config.run_mode import RunMode
 from flow_log import FlowEventRepo, set_flow_repo
@@ -28,6 +31,23 @@ from .langgraph_adapter import run_perp_backtest
 logger = logging.getLogger(__name__)
 
 
+def _cached_intrabar_bars(
+    symbols: List[str], *, timeframe: str, cache_dir: Path
+) -> Dict[str, List[List[float]]]:
+    """Lower-timeframe bars from the OHLCV CSV cache (offline); missing files are skipped."""
+    if not timeframe:
+        return {}
+    from backtest.ohlcv_csv_cache import load_ohlcv_csv, ohlcv_cache_path
+
+    out: Dict[str, List[List[float]]] = {}
+    for sym in symbols:
+        try:
+            out[sym] = load_ohlcv_csv(ohlcv_cache_path(cache_dir, sym, timeframe))
+        except (FileNotFoundError, OSError, ValueError) as e:
+            logger.warning("intrabar %s bars unavailable for %s: %s", timeframe, sym, e)
+    return out
+
+
 @dataclass
 class BacktestConfig:
     """Backward-compatible config dataclass (perp only).
@@ -52,6 +72,18 @@ class BacktestConfig:
     max_hold_bars: int = 0
     timeframe: str = ""
     run_id: str = ""
+    #: ``"high_low"``: TP/SL/liquidation on the bar's high/low path (PerpEngine ``intrabar``).
+    intrabar: str = "close"
+    #: Lower timeframe read from the OHLCV cache for the ``high_low`` path (e.g. ``"1m"``).
+    intrabar_timeframe: str = ""
+    #: Precompute the deterministic desk's intents with NumPy instead of invoking the graph.
+    fast_deterministic: bool = False
+    #: Replay ``workflow.invoke`` outputs from the on-disk invoke cache across runs
+    #: (None: ``AIMM_BACKTEST_INVOKE_CACHE``).
+    invoke_cache: bool | None = None
+    #: ``"parquet"``: equity/trades journals as Parquet (None/"": ``AIMM_BACKTEST_ARTIFACT_FORMAT``,
+    #: default JSONL).
+    artifact_format: str = ""
 
 
 class BacktestEngine:
@@ -85,10 +117,16 @@ class BacktestEngine:
                 "deploy_arbitrator_mode": getattr(config, "deploy_arbitrator_mode", None),
                 "timeframe": config.timeframe,
                 "run_id": config.run_id,
+                "intrabar": config.intrabar,
+                "intrabar_timeframe": config.intrabar_timeframe,
+                "fast_deterministic": config.fast_deterministic,
+                "invoke_cache": config.invoke_cache,
+                "artifact_format": config.artifact_format,
             }
         else:
             self._cfg = dict(config or {})
-        self.workflow = build_workflow().compile()
+        # The fast deterministic path only compiles the graph if it has to fall back to it.
+        self.workflow = None if self._cfg.get("fast_deterministic") else build_workflow().compile()
 
     def run(
         self,
@@ -174,7 +212,22 @@ class BacktestEngine:
             "trade_cooldown_bars": int(c.get("trade_cooldown_bars", fp.trade_cooldown_bars)),
             "timeframe": str(c.get("timeframe", "")),
             "eval_start_bar": ta_warmup,
+            "concurrent_signals": bool(c.get("concurrent_symbols"))
+            or os.environ.get("AIMM_BACKTEST_CONCURRENT_SYMBOLS", "").strip() == "1",
+            "intrabar": str(c.get("intrabar") or "close"),
+            "artifact_format": str(
+                c.get("artifact_format")
+                or (os.environ.get("AIMM_BACKTEST_ARTIFACT_FORMAT") or "").strip()
+                or "jsonl"
+            ),
+            "record_completion": bool(c.get("record_completion", True)),
         }
+        if perp_cfg["intrabar"] == "high_low":
+            perp_cfg["intrabar_bars"] = c.get("intrabar_bars") or _cached_intrabar_bars(
+                list(bars_by_symbol),
+                timeframe=str(c.get("intrabar_timeframe") or ""),
+                cache_dir=Path(c.get("ohlcv_cache_dir") or settings.market.ohlcv_cache_dir),
+            )
 
         print_run_header(
             run_id=run_id,
@@ -216,8 +269,41 @@ class BacktestEngine:
         if multi_asset:
             os.environ["AIMM_BACKTEST_PER_SYMBOL_INVOKE"] = "1"
         btc_ref_sym = ticker if ticker in bars_by_symbol else next(iter(bars_by_symbol), "")
+        universe_windows = UniverseWindows(bars_by_symbol)
+        # Validate each full history once; per-bar gating then reads prefix state in O(1).
+        dq_interval_sec = int(c.get("interval_sec", 300))
+        dq_validators: dict[str, OhlcvPrefixValidator] = {}
+        for sym, sym_bars in bars_by_symbol.items():
+            dq_validators[sym] = validator = OhlcvPrefixValidator(
+                sym_bars, interval_sec=dq_interval_sec
+            )
+            full = validator.result(len(validator), symbol=sym, expected_ticker=sym, min_bars=1)
+            if not full.passed:
+                logger.warning("data_quality history issues: %s", " | ".join(full.warnings))
 
         _invoke_cache: dict[Any, dict[str, Any]] = {}
+        # ``_signal_fn`` runs on several threads with ``concurrent_symbols``; this guards the
+        # closure state below (run_mem, the receipt writer and the flow repo lock themselves).
+        _shared_lock = threading.Lock()
+        invoke_store = None
+        bar_chains: dict[str, Any] = {}
+        invoke_version = ""
+        from backtest.invoke_cache import (
+            BarChain,
+            code_version,
+            get_invoke_cache,
+            invoke_cache_enabled,
+            state_key,
+        )
+
+        if invoke_cache_enabled(c.get("invoke_cache")):
+            try:
+                invoke_store = get_invoke_cache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("invoke cache unavailable, invoking every bar: %s", e)
+            bar_chains = {sym: BarChain(rows) for sym, rows in bars_by_symbol.items()}
+            # After the per-symbol env defaults above, so the version sees this run's env.
+            invoke_version = code_version()
         _equity_peak: dict[str, float] = {"v": 0.0}
 
         def _compact_agent_contract(c: dict[str, Any]) -> dict[str, Any]:
@@ -337,7 +423,7 @@ class BacktestEngine:
 
                 btc_window = None
                 if btc_ref_sym and btc_ref_sym in bars_by_symbol and btc_ref_sym != symbol:
-                    btc_window = list(bars_by_symbol[btc_ref_sym])[:bar_index]
+                    btc_window = universe_windows.window(btc_ref_sym, bar_index)
                 tw, vcp_meta = vcp_target_weight_from_window(
                     symbol,
                     window if isinstance(window, list) else [],
@@ -404,25 +490,17 @@ class BacktestEngine:
                 if isinstance(dt, dict) and dt:
                     state["decision_threshold"] = dt
             state["universe"] = list(bars_by_symbol.keys())
-            state["market_data"] = {
-                s: {
-                    "status": "success",
-                    "backtest": True,
-                    # Slice OHLCV to completed bars only (no look-ahead).
-                    "ohlcv": list(bars_by_symbol[s])[: len(window)]
-                    if window
-                    else list(bars_by_symbol.get(s, []))[:0],
-                }
-                for s in bars_by_symbol
-            }
+            # Shared per-bar slices: one copy per symbol per bar, not per invocation.
+            state["market_data"] = universe_windows.market_data(len(window) if window else 0)
 
             sm = state.setdefault("shared_memory", {})
             iv_sec = int(c.get("interval_sec", 300))
-            peak = float(_equity_peak.get("v") or 0.0)
             eq_f = float(equity)
-            if eq_f > peak:
-                peak = eq_f
-                _equity_peak["v"] = peak
+            with _shared_lock:
+                peak = float(_equity_peak.get("v") or 0.0)
+                if eq_f > peak:
+                    peak = eq_f
+                    _equity_peak["v"] = peak
             dd_frac = (1.0 - (eq_f / peak)) if peak > 1e-12 else 0.0
             primary_pos = positions.get(symbol)
             primary_qty = 0.0
@@ -493,13 +571,26 @@ class BacktestEngine:
             primary_md = state.get("market_data", {}).get(symbol, {})
             ohlcv_for_dq = primary_md.get("ohlcv", window) if isinstance(window, list) else window
             if isinstance(ohlcv_for_dq, list):
-                dq_result = validate_ohlcv_window(
-                    ohlcv_for_dq,
-                    symbol=symbol,
-                    expected_ticker=symbol,
-                    interval_sec=int(c.get("interval_sec", 300)),
-                    min_bars=2 if isinstance(window, list) and len(window) >= 2 else 1,
-                )
+                dq_min_bars = 2 if isinstance(window, list) and len(window) >= 2 else 1
+                dq_validator = dq_validators.get(symbol)
+                dq_n = len(ohlcv_for_dq)
+                if (
+                    dq_validator is not None
+                    and dq_n <= len(dq_validator)
+                    and (dq_n == 0 or ohlcv_for_dq[-1] is bars_by_symbol[symbol][dq_n - 1])
+                ):
+                    # The window is a prefix of the loaded history (shared slice).
+                    dq_result = dq_validator.result(
+                        dq_n, symbol=symbol, expected_ticker=symbol, min_bars=dq_min_bars
+                    )
+                else:
+                    dq_result = validate_ohlcv_window(
+                        ohlcv_for_dq,
+                        symbol=symbol,
+                        expected_ticker=symbol,
+                        interval_sec=dq_interval_sec,
+                        min_bars=dq_min_bars,
+                    )
                 dq_passed = dq_result.passed
                 dq_warnings = dq_result.warnings
                 sm["backtest"]["data_quality"] = {
@@ -533,6 +624,7 @@ class BacktestEngine:
                 return 0.0
 
             invoke_cache_hit = False
+            invoke_cache_persisted = False
             per_sym_invoke = (
                 multi_asset or os.environ.get("AIMM_BACKTEST_PER_SYMBOL_INVOKE", "").strip() == "1"
             )
@@ -542,10 +634,28 @@ class BacktestEngine:
                     bar_key = (len(window), symbol)
                 else:
                     bar_key = len(window)
-                cached = _invoke_cache.get(bar_key)
+                with _shared_lock:
+                    cached = _invoke_cache.get(bar_key)
+                store_key = ""
+                if cached is None and invoke_store is not None:
+                    store_key = state_key(state, chains=bar_chains, version=invoke_version)
+                    try:
+                        cached = invoke_store.get(store_key)
+                    except sqlite3.Error as e:
+                        logger.warning("invoke cache read error: %s", e)
+                    if cached is not None:
+                        with _shared_lock:
+                            _invoke_cache[bar_key] = cached
+                        invoke_cache_persisted = True
                 if cached is None:
                     output = self.workflow.invoke(state)
-                    _invoke_cache[bar_key] = output
+                    with _shared_lock:
+                        _invoke_cache[bar_key] = output
+                    if store_key and isinstance(output, dict):
+                        try:
+                            invoke_store.put(store_key, output, symbol=str(symbol))
+                        except (sqlite3.Error, TypeError, ValueError) as e:
+                            logger.warning("invoke cache write error: %s", e)
                 else:
                     output = cached
                     invoke_cache_hit = True
@@ -617,6 +727,8 @@ class BacktestEngine:
                         rec["data_quality"] = dq_store
                     if invoke_cache_hit:
                         rec["invoke_cache_shared"] = True
+                    if invoke_cache_persisted:
+                        rec["invoke_cache_persisted"] = True
                     if os.environ.get("AIMM_BACKTEST_VERBOSE_RECEIPTS") == "1":
                         if isinstance(output, dict):
                             _build_tier0_summary(rec, output)
@@ -670,10 +782,75 @@ class BacktestEngine:
                 print(f"[Backtest Warning] Workflow failed at step: {exc}\n{tb_str}")
                 return 0.0
 
+        fast_desks: dict[str, Any] = {}
+        fast_report: dict[str, Any] | None = None
+        if c.get("fast_deterministic"):
+            from backtest.fast_deterministic import check_parity, compile_desk_decisions
+
+            deploy_cfg = c.get("deploy_config") if isinstance(c.get("deploy_config"), dict) else {}
+            desk_kwargs: dict[str, Any] = {
+                "profile_weights": c.get("deploy_profile_weights") or None,
+                "decision_threshold": deploy_cfg.get("decision_threshold") or None,
+            }
+            try:
+                for sym in sorted(agent_led_set & set(bars_by_symbol)):
+                    fast_desks[sym] = compile_desk_decisions(
+                        sym,
+                        bars_by_symbol[sym],
+                        allows_short=bool(c.get("allows_short", True)),
+                        **desk_kwargs,
+                    )
+            except ValueError as exc:
+                logger.warning("fast deterministic path unavailable, using the graph: %s", exc)
+                fast_desks = {}
+            sample = int(c.get("fast_parity_sample", 8) or 0)
+            mismatches: list[dict[str, Any]] = []
+            graph_symbols: list[str] = []
+            for sym in sorted(fast_desks):
+                found = check_parity(
+                    fast_desks[sym], bars_by_symbol[sym], sample=sample, **desk_kwargs
+                )
+                if found:
+                    # A desk that disagrees with the graph is not trusted for any bar.
+                    logger.warning(
+                        "fast deterministic parity: %d sampled bars of %s differ from the "
+                        "graph path, running it through the graph; first: %s",
+                        len(found),
+                        sym,
+                        found[0],
+                    )
+                    mismatches.extend(found)
+                    graph_symbols.append(sym)
+                    del fast_desks[sym]
+            fast_report = {
+                "symbols": sorted(fast_desks),
+                "graph_fallback_symbols": graph_symbols,
+                "parity_sample": sample,
+                "parity_mismatches": mismatches,
+            }
+            perp_cfg["summary_extra"] = {"fast_deterministic": fast_report}
+            if (graph_symbols or not fast_desks) and self.workflow is None:
+                self.workflow = build_workflow().compile()
+
+        def _fast_signal_fn(symbol: str, window: list, positions, account) -> float:
+            from backtest.fast_deterministic import book_is_flat
+
+            desk = fast_desks.get(symbol)
+            n = len(window) if isinstance(window, list) else 0
+            if desk is None or n < int(c.get("min_warmup_bars") or 0):
+                # Warmup bars and VCP-routed symbols go through the regular path.
+                return _signal_fn(symbol, window, positions, account)
+            dq = dq_validators[symbol].result(
+                n, symbol=symbol, expected_ticker=symbol, min_bars=2 if n >= 2 else 1
+            )
+            if not dq.passed:
+                return 0.0
+            return desk.target_weight(n, book_flat=book_is_flat(positions))
+
         result = run_perp_backtest(
             ticker=ticker,
             bars_by_symbol=bars_by_symbol,
-            signal_fn=_signal_fn,
+            signal_fn=_fast_signal_fn if fast_desks else _signal_fn,
             config=perp_cfg,
             run_id=run_id,
             runs_dir=runs_dir,
@@ -684,10 +861,13 @@ class BacktestEngine:
         events_path = runs_dir / f"{run_id}.events.jsonl"
         bench_raw = result.get("benchmark")
         bench_out: dict[str, Any] = dict(bench_raw) if isinstance(bench_raw, dict) else {}
+        from backtest.trade_book import journal_path
+
+        bt_out = runs_dir / "backtests" / run_id
         paths = {
-            "summary": str(runs_dir / "backtests" / run_id / "summary.json"),
-            "trades": str(runs_dir / "backtests" / run_id / "trades.jsonl"),
-            "equity": str(runs_dir / "backtests" / run_id / "equity.jsonl"),
+            "summary": str(bt_out / "summary.json"),
+            "trades": str(journal_path(bt_out, "trades") or bt_out / "trades.jsonl"),
+            "equity": str(journal_path(bt_out, "equity") or bt_out / "equity.jsonl"),
             "iterations": str(iterations_path),
             "events": str(events_path) if events_path.exists() else str(events_path),
         }
@@ -711,6 +891,7 @@ class BacktestEngine:
             "final_equity": result.get("final_equity", perp_cfg["initial_cash"]),
             "benchmark": bench_out,
             "paths": paths,
+            **({"fast_deterministic": fast_report} if fast_report is not None else {}),
         }
 
     @staticmethod
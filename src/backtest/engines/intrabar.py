@@ -0,0 +1,145 @@
+"""Intrabar exits for :class:`~backtest.engines.perp.PerpEngine` (``intrabar="high_low"``).
+
+The default engine checks take-profit, stop-loss and liquidation against the bar close, so
+a 1h/4h bar that wicks through a stop and closes back inside never triggers it. In
+``high_low`` mode each open position is checked against the bar's high/low path instead, and
+exits fill at the level that was crossed (or at the open when the bar gaps through it).
+
+Path model, per bar (or per lower-timeframe sub-bar when ``intrabar_bars`` are supplied):
+
+- The open comes first: a gap through a level exits at the open.
+- Otherwise the adverse extreme is assumed to print before the favorable one (conservative:
+  a bar whose range covers both the stop and the target stops out). Lower-timeframe bars
+  narrow that ambiguity to one sub-bar.
+- Between the stop and the liquidation price, whichever is nearer to the entry is hit first.
+
+Sub-bars are scanned with NumPy masks (first crossing of each level), not a Python loop.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+INTRABAR_MODES = ("close", "high_low")
+
+
+def liquidation_price(
+    *,
+    direction: int,
+    entry: float,
+    size: float,
+    margin: float,
+    tier_caps: Sequence[float],
+    tier_rates: Sequence[float],
+) -> float:
+    """Mark price at which ``margin + unrealized <= maintenance`` (tiered maintenance rate).
+
+    The rate depends on the notional at the liquidation price, so the price is re-solved
+    until the tier is consistent (at most one step per tier).
+    """
+    if size <= 0:
+        return float("nan")
+
+    def rate(notional: float) -> float:
+        i = bisect_left(tier_caps, notional)
+        return tier_rates[min(i, len(tier_rates) - 1)]
+
+    r = rate(size * entry)
+    price = float("nan")
+    for _ in range(len(tier_rates)):
+        if direction > 0:
+            price = (size * entry - margin) / (size * (1.0 - r))
+        else:
+            price = (size * entry + margin) / (size * (1.0 + r))
+        r_next = rate(size * max(price, 0.0))
+        if r_next == r:
+            break
+        r = r_next
+    return max(price, 0.0)
+
+
+class IntrabarPath:
+    """Lower-timeframe bars per symbol, sliced per parent bar ``[ts, ts + interval)``."""
+
+    def __init__(self, bars_by_symbol: Mapping[str, Sequence[Sequence[Any]]], interval_sec: int):
+        self.interval_ms = int(interval_sec) * 1000
+        self._arrays: dict[str, np.ndarray] = {}
+        for sym, rows in bars_by_symbol.items():
+            if not rows:
+                continue
+            arr = np.asarray([r[:5] for r in rows], dtype=np.float64)
+            self._arrays[sym] = arr[np.argsort(arr[:, 0], kind="stable")]
+
+    def window(self, symbol: str, ts_ms: int) -> np.ndarray | None:
+        """Sub-bars ``[ts, open, high, low, close]`` inside the parent bar, or None."""
+        arr = self._arrays.get(symbol)
+        if arr is None:
+            return None
+        ts = arr[:, 0]
+        lo = int(np.searchsorted(ts, ts_ms, side="left"))
+        hi = int(np.searchsorted(ts, ts_ms + self.interval_ms, side="left"))
+        return arr[lo:hi] if hi > lo else None
+
+
+def _first(mask: np.ndarray) -> int:
+    return int(mask.argmax()) if mask.any() else -1
+
+
+def first_exit(
+    path: np.ndarray,
+    *,
+    direction: int,
+    take_profit: float | None,
+    stop_loss: float | None,
+    liquidation: float | None,
+) -> tuple[str, float, int] | None:
+    """First level crossed along ``path`` rows ``[ts, open, high, low, close]``.
+
+    Returns ``(reason, raw fill price, row index)`` with reason ``take_profit``,
+    ``stop_loss`` or ``liquidation``; None when no level is reached.
+    """
+    opens, highs, lows = path[:, 1], path[:, 2], path[:, 3]
+    d = 1 if direction > 0 else -1
+
+    def reaches(px: Any, level: float, adverse: bool) -> Any:
+        # Adverse moves go down for longs and up for shorts; favorable the other way.
+        upward = (d < 0) if adverse else (d > 0)
+        return px >= level if upward else px <= level
+
+    levels = (
+        ("liquidation", liquidation, True),
+        ("stop_loss", stop_loss, True),
+        ("take_profit", take_profit, False),
+    )
+    hits: list[tuple[int, str, float, bool]] = []
+    for reason, level, adverse in levels:
+        if level is None or not np.isfinite(level) or level <= 0:
+            continue
+        ext = (lows if d > 0 else highs) if adverse else (highs if d > 0 else lows)
+        idx = _first(reaches(ext, level, adverse))
+        if idx >= 0:
+            hits.append((idx, reason, float(level), adverse))
+    if not hits:
+        return None
+    i = min(h[0] for h in hits)
+    at_bar = [(reason, level, adverse) for idx, reason, level, adverse in hits if idx == i]
+    o = float(opens[i])
+
+    # The open gaps through a level: exit at the open (liquidation labels ahead of the stop).
+    for reason, level, adverse in at_bar:
+        if reaches(o, level, adverse):
+            return reason, o, i
+    # Adverse before favorable; of the stop and liquidation, the one nearer entry trades first.
+    adverse_hits = [(reason, level) for reason, level, adverse in at_bar if adverse]
+    if adverse_hits:
+        reason, level = max(adverse_hits, key=lambda x: d * x[1])
+        return reason, level, i
+    reason, level, _ = at_bar[0]
+    return reason, level, i
+
+
+__all__ = ["INTRABAR_MODES", "IntrabarPath", "first_exit", "liquidation_price"]
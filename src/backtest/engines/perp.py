@@ -3,8 +3,9 @@
 Model: USDT-margined linear perpetual contracts.
 - 24/7, long/short, no lot-size restrictions
 - Initial margin = notional / leverage
-- Funding fee settlement every 8h (dedup per slot)
-- Tiered maintenance margin liquidation check
+- Funding fee settlement every 8h (dedup per slot), scheduled once per run from the
+  aligned bar timestamps
+- Tiered maintenance margin liquidation check (bisect over tier caps)
 
 Config keys (all plain dict, no env vars):
   leverage=1.0  default leverage
@@ -13,6 +14,15 @@ Config keys (all plain dict, no env vars):
   slippage=0.0005
   funding_rate=0.0001
   initial_cash=10000
+  concurrent_signals=False  evaluate all symbols' signals in parallel each bar
+                            (``signal_fn`` must then be thread-safe)
+  intrabar="close"   "high_low": TP/SL/liquidation trigger on the bar's high/low path and
+                     fill at the crossed level (see ``backtest.engines.intrabar``)
+  intrabar_bars=None  optional lower-timeframe bars per symbol for the ``high_low`` path
+  artifact_format="jsonl"  "parquet": equity/trades journals as Parquet (needs pyarrow)
+
+``equity`` / ``trades`` rows are streamed to their journals as the run progresses
+(``backtest.trade_book``), not materialized at the end.
 """
 
 from __future__ import annotations
@@ -20,11 +30,20 @@ from __future__ import annotations
 import json
 import logging
 import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from backtest.completion_journal import record_backtest_completion
+from backtest.engines.intrabar import INTRABAR_MODES, IntrabarPath, first_exit, liquidation_price
+from backtest.trade_book import JsonlJournal, ParquetJournal, journal_path, open_journal
 from config.runs_paths import runs_dir as _default_runs_dir
+from runs_retention import note_runs_artifact
 
 logger = logging.getLogger(__name__)
 
@@ -64,8 +83,37 @@ _TIER_TABLE = [
     (float("inf"), 0.10),
 ]
 
+_TIER_CAPS = [cap for cap, _ in _TIER_TABLE]
+_TIER_RATES = [rate for _, rate in _TIER_TABLE]
+
 FUNDING_HOURS = {0, 8, 16}
 
+_HOUR_MS = 3_600_000
+_DAY_MS = 86_400_000
+
+
+def _funding_key(ts_ms: int) -> tuple[bool, int]:
+    """Dedup key of a bar: its UTC hour slot at funding hours, otherwise its UTC day."""
+    hour_slot = int(ts_ms) // _HOUR_MS
+    if hour_slot % 24 in FUNDING_HOURS:
+        return True, hour_slot
+    return False, int(ts_ms) // _DAY_MS
+
+
+def funding_schedule(timestamps_ms: Sequence[int]) -> list[bool]:
+    """Per-bar flags: ``True`` where a symbol first enters a funding slot (see ``_funding_key``).
+
+    Each key is charged once, so the schedule only depends on the timestamps and is shared by
+    every symbol of an aligned run.
+    """
+    seen: set[tuple[bool, int]] = set()
+    out: list[bool] = []
+    for ts in timestamps_ms:
+        key = _funding_key(ts)
+        out.append(key not in seen)
+        seen.add(key)
+    return out
+
 
 @dataclass
 class Position:
@@ -111,6 +159,85 @@ class EquitySnapshot:
     position_count: int
 
 
+def _equity_record(s: EquitySnapshot) -> dict[str, Any]:
+    return {
+        "ts": s.timestamp,
+        "capital": round(s.capital, 8),
+        "unrealized_pnl": round(s.unrealized_pnl, 8),
+        "equity": round(s.equity, 8),
+        "positions": s.position_count,
+    }
+
+
+def _trade_record(t: Trade, run_id: str) -> dict[str, Any]:
+    rec: dict[str, Any] = {
+        "run_id": run_id,
+        "symbol": t.symbol,
+        "direction": t.direction,
+        "entry_price": t.entry_price,
+        "exit_price": t.exit_price,
+        "size": t.size,
+        "leverage": t.leverage,
+        "pnl": round(t.pnl, 8),
+        "pnl_pct": round(t.pnl_pct, 4),
+        "exit_reason": t.exit_reason,
+        "holding_bars": t.holding_bars,
+        "commission": round(t.commission, 8),
+        "exit_bar_index": int(t.exit_bar_index),
+        "entry_bar_index": int(t.entry_bar_index),
+    }
+    if int(t.entry_ts_ms) > 0:
+        rec["entry_ts_ms"] = int(t.entry_ts_ms)
+    if int(t.exit_ts_ms) > 0:
+        # Binance ``myTrades``-style epoch ms — ``normalize_trade_row_for_api`` maps to ``ts_ms`` for web UI.
+        rec["time"] = int(t.exit_ts_ms)
+        rec["exit_ts_ms"] = int(t.exit_ts_ms)
+    return rec
+
+
+def _bar_json(row: Sequence[Any]) -> str:
+    return json.dumps(
+        {
+            "ts": int(row[0]),
+            "o": float(row[1]),
+            "h": float(row[2]),
+            "l": float(row[3]),
+            "c": float(row[4]),
+            "v": float(row[5]),
+        }
+    )
+
+
+def _write_bars_json(
+    path: Path,
+    header: dict[str, Any],
+    bars: Sequence[Sequence[Any]],
+    ohlcv_by_symbol: dict[str, Sequence[Sequence[Any]]] | None,
+) -> None:
+    """``bars.json`` (header fields, ``bars``, optional ``ohlcv_by_symbol``), one bar per line."""
+
+    def write_rows(f, rows: Sequence[Sequence[Any]]) -> None:
+        f.write("[")
+        for i, row in enumerate(rows):
+            f.write(",\n " if i else "\n ")
+            f.write(_bar_json(row))
+        f.write("\n]")
+
+    with path.open("w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, val in header.items():
+            f.write(f"{json.dumps(key)}: {json.dumps(val)},\n")
+        f.write('"bars": ')
+        write_rows(f, bars)
+        if ohlcv_by_symbol is not None:
+            f.write(',\n"ohlcv_by_symbol": {')
+            for i, (sym, sym_rows) in enumerate(ohlcv_by_symbol.items()):
+                f.write(f"{',' if i else ''}\n{json.dumps(sym)}: ")
+                write_rows(f, sym_rows)
+            f.write("\n}")
+        f.write("\n}\n")
+
+
 class PerpEngine:
     """Perpetual-contract backtest engine.
 
@@ -133,7 +260,10 @@ class PerpEngine:
         self.positions: dict[str, Position] = {}
         self.trades: list[Trade] = []
         self.snapshots: list[EquitySnapshot] = []
-        self._funding_applied: set[tuple[str, int, int]] = set()
+        # Per-bar funding flags for the aligned run (``run``); ``None`` outside ``run``.
+        self._funding_bars: list[bool] | None = None
+        # Fallback for direct ``on_bar`` calls: last charged key per symbol and key kind.
+        self._funding_last: dict[tuple[str, bool], int] = {}
         self._bar_index: int = 0
         self._last_bar_ts: int = 0
         self._eval_start_bar: int = 0
@@ -148,6 +278,27 @@ class PerpEngine:
         self.trade_cooldown_bars: int = max(0, int(cfg.get("trade_cooldown_bars", 0)))
         self._last_entry_bar: dict[str, int] = {}
         self._eval_start_bar = max(0, int(cfg.get("eval_start_bar", 0) or 0))
+        # Opt-in: call signal_fn for every symbol of a bar concurrently (all see the
+        # bar-start book), then rebalance in symbol order. Lets per-symbol LLM calls
+        # overlap instead of running back to back; signal_fn must be thread-safe.
+        self.concurrent_signals: bool = bool(cfg.get("concurrent_signals", False))
+        mode = str(cfg.get("intrabar") or "close").strip().lower()
+        self.intrabar: str = mode if mode in INTRABAR_MODES else "close"
+        sub_bars = cfg.get("intrabar_bars")
+        self._intrabar_path: IntrabarPath | None = (
+            IntrabarPath(sub_bars, self.interval_sec)
+            if self.intrabar == "high_low" and sub_bars
+            else None
+        )
+        self.artifact_format: str = str(cfg.get("artifact_format") or "jsonl").strip().lower()
+        # Callers that rewrite summary.json after the run journal the completion themselves.
+        self.record_completion: bool = bool(cfg.get("record_completion", True))
+        # Caller-provided run metadata (e.g. the fast-path parity report) for summary.json.
+        self.summary_extra: dict[str, Any] = dict(cfg.get("summary_extra") or {})
+        # Open only inside ``run``; direct ``on_bar`` use keeps trades in memory only.
+        self._run_id: str = ""
+        self._equity_journal: JsonlJournal | ParquetJournal | None = None
+        self._trade_journal: JsonlJournal | ParquetJournal | None = None
 
     def can_execute(self, direction: int, bar) -> bool:
         return True
@@ -164,34 +315,35 @@ class PerpEngine:
 
     @staticmethod
     def maintenance_rate(notional_usd: float) -> float:
-        for cap, rate in _TIER_TABLE:
-            if notional_usd <= cap:
-                return rate
-        return _TIER_TABLE[-1][1]
+        i = bisect_left(_TIER_CAPS, notional_usd)
+        if i >= len(_TIER_RATES) or notional_usd != notional_usd:  # NaN: top tier
+            return _TIER_RATES[-1]
+        return _TIER_RATES[i]
 
-    def on_bar(self, symbol: str, close: float, timestamp_ms: int) -> None:
+    def on_bar(
+        self, symbol: str, close: float, timestamp_ms: int, *, bar: Sequence[float] | None = None
+    ) -> None:
+        """End-of-bar bookkeeping; ``bar`` (``[ts, o, h, l, c, v]``) enables intrabar exits."""
         self._apply_funding(symbol, close, timestamp_ms)
-        self._check_liquidation(symbol, close, timestamp_ms)
-        self._check_tp_sl(symbol, close, timestamp_ms)
+        if self.intrabar == "high_low" and bar is not None:
+            self._check_intrabar(symbol, bar, timestamp_ms)
+        else:
+            self._check_liquidation(symbol, close, timestamp_ms)
+            self._check_tp_sl(symbol, close, timestamp_ms)
         self._check_timeout(symbol, close, timestamp_ms)
 
     def _apply_funding(self, symbol: str, close: float, ts_ms: int) -> None:
-        from datetime import datetime, timezone
-
-        dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
-        slot = (dt.year, dt.month, dt.day, dt.hour)
-        hour = dt.hour
-
-        if hour in FUNDING_HOURS:
-            dedup_key = (symbol, slot)
-            if dedup_key in self._funding_applied:
+        schedule = self._funding_bars
+        if schedule is not None and 0 <= self._bar_index < len(schedule):
+            if not schedule[self._bar_index]:
                 return
-            self._funding_applied.add(dedup_key)
         else:
-            day_key = (symbol, dt.year, dt.month, dt.day)
-            if day_key in self._funding_applied:
+            # Bars outside ``run`` arrive in time order per symbol: a key repeats only while
+            # it is the latest one of its kind.
+            kind, value = _funding_key(ts_ms)
+            if self._funding_last.get((symbol, kind)) == value:
                 return
-            self._funding_applied.add(day_key)
+            self._funding_last[(symbol, kind)] = value
 
         pos = self.positions.get(symbol)
         if pos is None:
@@ -219,6 +371,50 @@ class PerpEngine:
                 exit_ts_ms=int(timestamp_ms),
             )
 
+    def _check_intrabar(self, symbol: str, bar: Sequence[float], timestamp_ms: int) -> None:
+        """TP/SL/liquidation against the bar's high/low path (``intrabar="high_low"``)."""
+        pos = self.positions.get(symbol)
+        if pos is None:
+            return
+        d = pos.direction
+        tp = (
+            pos.entry_price * (1 + d * self.take_profit_pct / 100.0)
+            if self.take_profit_pct > 0
+            else None
+        )
+        sl = (
+            pos.entry_price * (1 - d * self.stop_loss_pct / 100.0)
+            if self.stop_loss_pct > 0
+            else None
+        )
+        liq = (
+            liquidation_price(
+                direction=d,
+                entry=pos.entry_price,
+                size=pos.size,
+                margin=pos.initial_margin,
+                tier_caps=_TIER_CAPS,
+                tier_rates=_TIER_RATES,
+            )
+            if pos.leverage > 1.0
+            else None
+        )
+        if tp is None and sl is None and liq is None:
+            return
+        path = self._intrabar_path.window(symbol, timestamp_ms) if self._intrabar_path else None
+        if path is None:
+            path = np.asarray([bar[:5]], dtype=np.float64)
+        hit = first_exit(path, direction=d, take_profit=tp, stop_loss=sl, liquidation=liq)
+        if hit is None:
+            return
+        reason, price, i = hit
+        self._close(
+            symbol,
+            self.apply_slippage(price, -d),
+            reason,
+            exit_ts_ms=int(path[i, 0]),
+        )
+
     def _check_timeout(self, symbol: str, close: float, timestamp_ms: int) -> None:
         """Close positions that have been held longer than max_hold_bars."""
         pos = self.positions.get(symbol)
@@ -286,78 +482,145 @@ class PerpEngine:
         symbols = sorted(bars_by_symbol.keys())
         aligned = self._align_bars(bars_by_symbol)
         total_bars = len(aligned.get(symbols[0], []))
+        self._funding_bars = funding_schedule([int(row[0]) for row in aligned.get(symbols[0], [])])
 
         run_id = run_id or f"perp_{int(time.time())}"
         runs_dir = runs_dir or _default_runs_dir()
+        out_dir = runs_dir / "backtests" / run_id
+        self._run_id = run_id
+        self._equity_journal = open_journal(out_dir, "equity", fmt=self.artifact_format)
+        self._trade_journal = open_journal(out_dir, "trades", fmt=self.artifact_format)
+        try:
+            return self._run_bars(
+                symbols,
+                aligned,
+                total_bars,
+                signal_fn,
+                run_id=run_id,
+                runs_dir=runs_dir,
+                progress_callback=progress_callback,
+                benchmark_symbol=benchmark_symbol,
+            )
+        finally:
+            self._close_journals()
+            # The schedule belongs to this run's aligned bars; later ``on_bar`` calls use keys.
+            self._funding_bars = None
+
+    def _close_journals(self) -> None:
+        for journal in (self._equity_journal, self._trade_journal):
+            if journal is not None:
+                journal.close()
+        self._equity_journal = self._trade_journal = None
+
+    def _run_bars(
+        self,
+        symbols: list[str],
+        aligned: dict[str, list[list[float]]],
+        total_bars: int,
+        signal_fn,
+        *,
+        run_id: str,
+        runs_dir: Path,
+        progress_callback,
+        benchmark_symbol: str | None,
+    ) -> dict[str, Any]:
 
-        for bar_idx in range(total_bars):
-            self._bar_index = bar_idx
-            # Completed bars only (no look-ahead). Signal at end of bar i-1 → fill at open of bar i.
-            completed = {s: aligned[s][:bar_idx] for s in symbols}
-            bar_open = {s: float(aligned[s][bar_idx][1]) for s in symbols}
-            last_close = {s: float(aligned[s][bar_idx][4]) for s in symbols}
-            last_ts = int(aligned[symbols[0]][bar_idx][0])
-            self._last_bar_ts = last_ts
-
-            if bar_idx > 0:
-                mark_closes = {s: float(aligned[s][bar_idx - 1][4]) for s in symbols}
-                account = AccountSnapshot(
-                    cash=float(self.capital),
-                    equity=float(self._equity(mark_closes)),
-                )
-                for sym in symbols:
-                    target = float(
-                        signal_fn(
+        signal_pool: ThreadPoolExecutor | None = None
+        if self.concurrent_signals and len(symbols) > 1:
+            signal_pool = ThreadPoolExecutor(
+                max_workers=min(len(symbols), 16), thread_name_prefix="perp-signal"
+            )
+
+        try:
+            # Scored bars only (warmup is TA context, not plotted) unless warmup spans the run.
+            journal_from = self._eval_start_bar if self._eval_start_bar < total_bars else 0
+            for bar_idx in range(total_bars):
+                self._bar_index = bar_idx
+                # Completed bars only (no look-ahead). Signal at end of bar i-1 → fill at open of bar i.
+                completed = {s: aligned[s][:bar_idx] for s in symbols}
+                bar_open = {s: float(aligned[s][bar_idx][1]) for s in symbols}
+                last_close = {s: float(aligned[s][bar_idx][4]) for s in symbols}
+                last_ts = int(aligned[symbols[0]][bar_idx][0])
+                self._last_bar_ts = last_ts
+
+                if bar_idx > 0:
+                    mark_closes = {s: float(aligned[s][bar_idx - 1][4]) for s in symbols}
+                    account = AccountSnapshot(
+                        cash=float(self.capital),
+                        equity=float(self._equity(mark_closes)),
+                    )
+                    targets: dict[str, float] = {}
+                    if signal_pool is not None:
+                        book = dict(self.positions)
+                        futures = {
+                            sym: signal_pool.submit(
+                                signal_fn, sym, completed[sym], dict(book), account
+                            )
+                            for sym in symbols
+                        }
+                        targets = {sym: float(f.result()) for sym, f in futures.items()}
+                    for sym in symbols:
+                        if signal_pool is not None:
+                            target = targets[sym]
+                        else:
+                            target = float(
+                                signal_fn(
+                                    sym,
+                                    completed[sym],
+                                    {k: v for k, v in self.positions.items()},
+                                    account,
+                                )
+                            )
+                        self._rebalance(
                             sym,
-                            completed[sym],
-                            {k: v for k, v in self.positions.items()},
-                            account,
+                            float(target),
+                            bar_open[sym],
+                            last_close[sym],
+                            last_ts,
+                            last_close,
                         )
-                    )
-                    self._rebalance(
-                        sym,
-                        float(target),
-                        bar_open[sym],
-                        last_close[sym],
-                        last_ts,
-                        last_close,
-                    )
-
-            for sym in symbols:
-                self.on_bar(sym, last_close[sym], last_ts)
 
-            eq = self._equity(last_close)
-            snap = EquitySnapshot(
-                timestamp=last_ts,
-                capital=self.capital,
-                unrealized_pnl=eq - self.capital,
-                equity=eq,
-                position_count=len(self.positions),
-            )
-            self.snapshots.append(snap)
-            if progress_callback is not None:
-                try:
-                    # Report scored-window progress only (0…eval_total), not TA warmup bars.
-                    eval_start = max(0, int(self._eval_start_bar))
-                    eval_total = max(1, int(total_bars) - eval_start)
-                    if bar_idx < eval_start:
-                        eval_i = -1  # still preparing indicators
-                    else:
-                        eval_i = int(bar_idx) - eval_start
-                    progress_callback(
-                        eval_i,
-                        eval_total,
-                        {
-                            "ts": int(last_ts),
-                            "equity": float(eq),
-                            "capital": float(self.capital),
-                            "positions": int(len(self.positions)),
-                            "trade_count": int(len(self.trades)),
-                            "warmup": bool(bar_idx < eval_start),
-                        },
-                    )
-                except Exception:
-                    pass
+                for sym in symbols:
+                    self.on_bar(sym, last_close[sym], last_ts, bar=aligned[sym][bar_idx])
+
+                eq = self._equity(last_close)
+                snap = EquitySnapshot(
+                    timestamp=last_ts,
+                    capital=self.capital,
+                    unrealized_pnl=eq - self.capital,
+                    equity=eq,
+                    position_count=len(self.positions),
+                )
+                self.snapshots.append(snap)
+                if self._equity_journal is not None and bar_idx >= journal_from:
+                    self._equity_journal.append(_equity_record(snap))
+                if progress_callback is not None:
+                    try:
+                        # Report scored-window progress only (0…eval_total), not TA warmup bars.
+                        eval_start = max(0, int(self._eval_start_bar))
+                        eval_total = max(1, int(total_bars) - eval_start)
+                        if bar_idx < eval_start:
+                            eval_i = -1  # still preparing indicators
+                        else:
+                            eval_i = int(bar_idx) - eval_start
+                        progress_callback(
+                            eval_i,
+                            eval_total,
+                            {
+                                "ts": int(last_ts),
+                                "equity": float(eq),
+                                "capital": float(self.capital),
+                                "positions": int(len(self.positions)),
+                                "trade_count": int(len(self.trades)),
+                                "warmup": bool(bar_idx < eval_start),
+                            },
+                        )
+                    except Exception:
+                        pass
+        finally:
+            # Also on a failing bar, so an exception never leaks the worker threads.
+            if signal_pool is not None:
+                signal_pool.shutdown(wait=True, cancel_futures=True)
 
         if total_bars > 0:
             final_close = {s: float(aligned[s][-1][4]) for s in symbols}
@@ -474,25 +737,26 @@ class PerpEngine:
         holding = max(self._bar_index - pos.entry_bar_index, 0)
         ts_exit = int(exit_ts_ms) if exit_ts_ms is not None else int(self._last_bar_ts)
 
-        self.trades.append(
-            Trade(
-                symbol=pos.symbol,
-                direction=pos.direction,
-                entry_price=pos.entry_price,
-                exit_price=exit_price,
-                size=pos.size,
-                leverage=pos.leverage,
-                pnl=pnl,
-                pnl_pct=pnl_pct,
-                exit_reason=reason,
-                holding_bars=holding,
-                commission=pos.entry_commission + exit_comm,
-                entry_bar_index=int(pos.entry_bar_index),
-                entry_ts_ms=int(pos.entry_ts_ms),
-                exit_ts_ms=ts_exit,
-                exit_bar_index=int(self._bar_index),
-            )
+        trade = Trade(
+            symbol=pos.symbol,
+            direction=pos.direction,
+            entry_price=pos.entry_price,
+            exit_price=exit_price,
+            size=pos.size,
+            leverage=pos.leverage,
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            exit_reason=reason,
+            holding_bars=holding,
+            commission=pos.entry_commission + exit_comm,
+            entry_bar_index=int(pos.entry_bar_index),
+            entry_ts_ms=int(pos.entry_ts_ms),
+            exit_ts_ms=ts_exit,
+            exit_bar_index=int(self._bar_index),
         )
+        self.trades.append(trade)
+        if self._trade_journal is not None:
+            self._trade_journal.append(_trade_record(trade, self._run_id))
 
     def _equity(self, last_closes: dict[str, float]) -> float:
         eq = self.capital
@@ -569,9 +833,8 @@ class PerpEngine:
             exit_reason_distribution,
             periods_per_year_from_interval_sec,
             profit_factor,
-            returns_from_equity,
-            sharpe_ratio,
         )
+        from backtest.metrics_kernel import metrics_bundle
 
         equity_vals = [s.equity for s in self.snapshots] if self.snapshots else [self.initial_cash]
         if not equity_vals:
@@ -580,25 +843,14 @@ class PerpEngine:
         eval_start = max(0, int(self._eval_start_bar))
         if eval_start > 0 and eval_start < len(equity_vals):
             equity_vals = equity_vals[eval_start:]
-        start_equity = float(equity_vals[0]) if equity_vals else float(self.initial_cash)
-
-        total_return = (
-            (equity_vals[-1] - start_equity) / start_equity * 100 if start_equity > 0 else 0.0
-        )
-
-        peak = equity_vals[0]
-        max_dd = 0.0
-        for v in equity_vals:
-            peak = max(peak, v)
-            dd = (peak - v) / peak * 100 if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-
         # Annualize from per-bar simple returns. Prefer bar spacing inferred from snapshot
         # timestamps so Sharpe stays correct even if `interval_sec` was not threaded into PerpEngine.
-        rets = returns_from_equity(equity_vals)
         bar_sec = self._infer_bar_interval_sec_from_snapshots()
         ppy = periods_per_year_from_interval_sec(bar_sec)
-        sharpe = sharpe_ratio(rets, periods_per_year=ppy)
+        bundle = metrics_bundle(equity_vals, periods_per_year=ppy)
+        total_return = bundle["total_return_pct"]
+        max_dd = bundle["max_drawdown_pct"]
+        sharpe = bundle["sharpe"]
 
         eval_trades = [
             t for t in self.trades if int(getattr(t, "entry_bar_index", 0)) >= eval_start
@@ -637,10 +889,10 @@ class PerpEngine:
         benchmark_symbol: str = "",
         aligned_bars: dict[str, list[list[float]]] | None = None,
     ) -> dict[str, Any]:
-        import pandas as pd
-
         out_dir = runs_dir / "backtests" / run_id
         out_dir.mkdir(parents=True, exist_ok=True)
+        # Journals are complete once the final positions are closed.
+        self._close_journals()
 
         benchmark: dict[str, Any] = {}
         # Chart / report window = scored bars only (warmup is TA context, not plotted).
@@ -682,91 +934,46 @@ class PerpEngine:
             if self.snapshots and eval_start < len(self.snapshots)
             else self.snapshots
         )
-        eq_records = []
-        for s in eval_snaps:
-            eq_records.append(
-                {
-                    "ts": s.timestamp,
-                    "capital": round(s.capital, 8),
-                    "unrealized_pnl": round(s.unrealized_pnl, 8),
-                    "equity": round(s.equity, 8),
-                    "positions": s.position_count,
-                }
-            )
-        pd.DataFrame(eq_records).to_json(out_dir / "equity.jsonl", orient="records", lines=True)
-
-        # Persist OHLCV + buy&hold for the charts API (same scored window as equity).
-        bar_rows = [
-            {
-                "ts": int(row[0]),
-                "o": float(row[1]),
-                "h": float(row[2]),
-                "l": float(row[3]),
-                "c": float(row[4]),
-                "v": float(row[5]),
-            }
-            for row in (rows or [])
-        ]
-        # Plain floats for /bars clients; keep ts-aligned objects under benchmark_equity_points.
-        bh_values = [float(p["equity"]) for p in bh_curve if "equity" in p]
-        if bar_rows:
-            bars_payload: dict[str, Any] = {
-                "ticker": benchmark_symbol or (symbols[0] if symbols else ""),
-                "benchmark_symbol": benchmark_symbol or (symbols[0] if symbols else ""),
+        # Persist OHLCV + buy&hold for the charts API (same scored window as equity),
+        # streamed row by row rather than built as one payload.
+        if rows:
+            ticker = benchmark_symbol or (symbols[0] if symbols else "")
+            header: dict[str, Any] = {
+                "ticker": ticker,
+                "benchmark_symbol": ticker,
                 "interval_sec": self.interval_sec,
-                "bars": bar_rows,
-                "benchmark_equity": bh_values,
+                # Plain floats for /bars clients; ts-aligned objects under *_points.
+                "benchmark_equity": [float(p["equity"]) for p in bh_curve if "equity" in p],
                 "benchmark_equity_points": bh_curve,
                 "fill_model": "signal_on_completed_bars_fill_at_next_open",
             }
+            scored_by_symbol = None
             if aligned_bars:
-                ohlcv_by_symbol: dict[str, list[dict[str, float]]] = {}
-                for sym, sym_rows in aligned_bars.items():
-                    scored = (
+                scored_by_symbol = {
+                    sym: (
                         sym_rows[eval_start:]
                         if eval_start > 0 and eval_start < len(sym_rows)
                         else sym_rows
                     )
-                    ohlcv_by_symbol[sym] = [
-                        {
-                            "ts": int(row[0]),
-                            "o": float(row[1]),
-                            "h": float(row[2]),
-                            "l": float(row[3]),
-                            "c": float(row[4]),
-                            "v": float(row[5]),
-                        }
-                        for row in scored
-                    ]
-                bars_payload["ohlcv_by_symbol"] = ohlcv_by_symbol
-            (out_dir / "bars.json").write_text(json.dumps(bars_payload, indent=1))
-
-        trade_records = []
-        for t in self.trades:
-            rec: dict[str, Any] = {
-                "run_id": run_id,
-                "symbol": t.symbol,
-                "direction": t.direction,
-                "entry_price": t.entry_price,
-                "exit_price": t.exit_price,
-                "size": t.size,
-                "leverage": t.leverage,
-                "pnl": round(t.pnl, 8),
-                "pnl_pct": round(t.pnl_pct, 4),
-                "exit_reason": t.exit_reason,
-                "holding_bars": t.holding_bars,
-                "commission": round(t.commission, 8),
-                "exit_bar_index": int(t.exit_bar_index),
-            }
-            rec["entry_bar_index"] = int(t.entry_bar_index)
-            if int(t.entry_ts_ms) > 0:
-                rec["entry_ts_ms"] = int(t.entry_ts_ms)
-            if int(t.exit_ts_ms) > 0:
-                # Binance ``myTrades``-style epoch ms — ``normalize_trade_row_for_api`` maps to ``ts_ms`` for web UI.
-                rec["time"] = int(t.exit_ts_ms)
-                rec["exit_ts_ms"] = int(t.exit_ts_ms)
-            trade_records.append(rec)
-        pd.DataFrame(trade_records).to_json(out_dir / "trades.jsonl", orient="records", lines=True)
+                    for sym, sym_rows in aligned_bars.items()
+                }
+            _write_bars_json(out_dir / "bars.json", header, rows, scored_by_symbol)
+
+        try:
+            from backtest.chart_levels import write_chart_levels
+
+            write_chart_levels(
+                out_dir,
+                equity=([s.timestamp for s in eval_snaps], [s.equity for s in eval_snaps]),
+                ohlcv=rows,
+                benchmark=(
+                    ([p["ts"] for p in bh_curve], [p["equity"] for p in bh_curve])
+                    if bh_curve
+                    else None
+                ),
+            )
+        except Exception as exc:
+            logger.warning("chart levels failed for %s: %s", run_id, exc)
 
         # Dates follow the scored From→To window (same series as equity.jsonl / B&H).
         start_ts = int(eval_snaps[0].timestamp) if eval_snaps else None
@@ -808,6 +1015,7 @@ class PerpEngine:
             "end_ts": end_ts,
             "start_iso": start_iso,
             "end_iso": end_iso,
+            **self.summary_extra,
         }
 
         try:
@@ -822,8 +1030,8 @@ class PerpEngine:
                 out_dir,
                 run_id=run_id,
                 summary=summary,
-                trades=trade_records,
-                snapshots=eq_records,
+                trades_path=journal_path(out_dir, "trades"),
+                equity_path=journal_path(out_dir, "equity"),
                 events_path=events_path,
                 symbols=symbols,
                 total_bars=len(self.snapshots),
@@ -833,5 +1041,8 @@ class PerpEngine:
             logger.warning("export_bundle failed for %s: %s", run_id, exc)
 
         (out_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+        note_runs_artifact(out_dir, runs_dir=runs_dir)
+        if self.record_completion:
+            record_backtest_completion(run_id, out_dir / "summary.json", runs_dir=runs_dir)
 
         return summary
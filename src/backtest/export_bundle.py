@@ -5,6 +5,10 @@ Generates the files analysts expect after every backtest run:
 - equity_curve.csv — bar-by-bar equity with drawdown
 - audit_trail_ledger.jsonl — merged chronological audit stream
 - export_manifest.json — schema version, file list, run config hash
+
+Trades / equity come either as row lists or as the run's streamed journals
+(``trades_path`` / ``equity_path``, JSONL or Parquet), which are read batch by batch
+so the CSVs never need the whole series in memory.
 """
 
 from __future__ import annotations
@@ -13,10 +17,14 @@ import csv
 import json
 import logging
 import os
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
+from backtest.trade_book import iter_journal_rows
+
 logger = logging.getLogger(__name__)
 
 CSV_DIALECT = "unix"
@@ -39,7 +47,7 @@ def _fmt_ts_ms(ts_ms: int | float | None) -> str:
         return _safe(ts_ms)
 
 
-def write_trades_csv(trades: list[dict[str, Any]], path: Path) -> None:
+def write_trades_csv(trades: Iterable[dict[str, Any]], path: Path) -> None:
     """Write ``trades_record.csv`` — one row per closed round-trip."""
     fields = [
         "run_id",
@@ -89,7 +97,7 @@ def write_trades_csv(trades: list[dict[str, Any]], path: Path) -> None:
             )
 
 
-def write_equity_csv(snapshots: list[dict[str, Any]], path: Path) -> None:
+def write_equity_csv(snapshots: Iterable[dict[str, Any]], path: Path) -> None:
     """Write ``equity_curve.csv`` with bar index, timestamps, and drawdown."""
     fields = [
         "bar_index",
@@ -102,29 +110,27 @@ def write_equity_csv(snapshots: list[dict[str, Any]], path: Path) -> None:
         "drawdown_pct",
     ]
     peak = float("-inf")
-    records: list[dict[str, Any]] = []
-    for idx, s in enumerate(snapshots):
-        ts_ms = int(s.get("ts", s.get("timestamp", 0)))
-        eq = float(s.get("equity", 0.0))
-        if eq > peak:
-            peak = eq
-        dd = ((eq - peak) / peak * 100) if peak > 0 else 0.0
-        records.append(
-            {
-                "bar_index": idx,
-                "ts_ms": ts_ms,
-                "ts_utc": _fmt_ts_ms(ts_ms),
-                "capital": round(float(s.get("capital", 0.0)), 8),
-                "unrealized_pnl": round(float(s.get("unrealized_pnl", 0.0)), 8),
-                "equity": round(eq, 8),
-                "positions": int(s.get("position_count", s.get("positions", 0))),
-                "drawdown_pct": round(dd, 4),
-            }
-        )
     with path.open("w", newline="") as f:
         w = csv.DictWriter(f, fieldnames=fields, dialect=CSV_DIALECT)
         w.writeheader()
-        w.writerows(records)
+        for idx, s in enumerate(snapshots):
+            ts_ms = int(s.get("ts", s.get("timestamp", 0)))
+            eq = float(s.get("equity", 0.0))
+            if eq > peak:
+                peak = eq
+            dd = ((eq - peak) / peak * 100) if peak > 0 else 0.0
+            w.writerow(
+                {
+                    "bar_index": idx,
+                    "ts_ms": ts_ms,
+                    "ts_utc": _fmt_ts_ms(ts_ms),
+                    "capital": round(float(s.get("capital", 0.0)), 8),
+                    "unrealized_pnl": round(float(s.get("unrealized_pnl", 0.0)), 8),
+                    "equity": round(eq, 8),
+                    "positions": int(s.get("position_count", s.get("positions", 0))),
+                    "drawdown_pct": round(dd, 4),
+                }
+            )
 
 
 def write_audit_ledger(
@@ -280,6 +286,15 @@ def write_export_manifest(
     path.write_text(json.dumps(manifest, indent=2, default=str))
 
 
+def _nonempty(rows: Iterable[dict[str, Any]] | None) -> Iterator[dict[str, Any]] | None:
+    """``rows`` as an iterator, or None when there are none (peeks one row)."""
+    if rows is None:
+        return None
+    it = iter(rows)
+    first = next(it, None)
+    return None if first is None else chain((first,), it)
+
+
 def write_analysis_bundle(
     run_dir: Path,
     *,
@@ -290,9 +305,14 @@ def write_analysis_bundle(
     events_path: Path | None = None,
     symbols: list[str] | None = None,
     total_bars: int | None = None,
+    trades_path: Path | None = None,
+    equity_path: Path | None = None,
 ) -> dict[str, str]:
     """Write all analysis bundle files and return a ``{name: relpath}`` map.
 
+    ``trades_path`` / ``equity_path`` (run journals) are streamed when the matching row
+    list is not given.
+
     Returns
     -------
     dict mapping logical file names to relative paths (e.g.
@@ -303,14 +323,22 @@ def write_analysis_bundle(
 
     files_written: dict[str, str] = {}
 
-    if trades:
+    if trades is None and trades_path is not None and trades_path.is_file():
+        trade_rows = _nonempty(iter_journal_rows(trades_path))
+    else:
+        trade_rows = _nonempty(trades)
+    if trade_rows is not None:
         csv_path = run_dir / "trades_record.csv"
-        write_trades_csv(trades, csv_path)
+        write_trades_csv(trade_rows, csv_path)
         files_written["trades_record_csv"] = csv_path.name
 
-    if snapshots:
+    if snapshots is None and equity_path is not None and equity_path.is_file():
+        equity_rows = _nonempty(iter_journal_rows(equity_path))
+    else:
+        equity_rows = _nonempty(snapshots)
+    if equity_rows is not None:
         csv_path = run_dir / "equity_curve.csv"
-        write_equity_csv(snapshots, csv_path)
+        write_equity_csv(equity_rows, csv_path)
         files_written["equity_curve_csv"] = csv_path.name
 
     ledger_path = run_dir / "audit_trail_ledger.jsonl"
@@ -0,0 +1,513 @@
+"""Fast deterministic backtests: the OHLCV-only desk compiled to array operations.
+
+The graph path runs ``workflow.invoke`` once per bar (and per symbol), which recomputes the
+TA-Lib bundle over the whole prefix, rebuilds the OHLCV-derived Nexus context, merges state
+and emits flow events and receipts. For the deterministic desk — Tier-0 agents 1.1 (macro),
+2.1 (pattern) and 2.3 (TA) read from OHLCV, the weighted arbitrator and the execution-intent
+gate — every per-bar decision is a function of the completed-bar prefix only, so this module
+computes all of them in one pass over each symbol's history:
+
+- TA-Lib indicators are causal, so one call over the full series yields the value each
+  prefix would produce at its last bar.
+- 1.1 and 2.1 contracts only take a handful of discrete values; their agent composites come
+  from :func:`~workflow.weight_assigner.compute_agent_weighted_signals` once per distinct
+  contract.
+- The 2.3 factors, the global composite, the decision gates and the TA-led override are
+  NumPy expressions that mirror :mod:`workflow.weight_assigner` operation for operation.
+
+The LLM layers of the product graph (agent LLM inference, portfolio proposal, risk guard)
+are not part of this path. :func:`check_parity` replays sampled bars through the real
+Tier-0 nodes and :func:`~workflow.weighted_arbitrator.arbitrate_tier0` and reports any bar
+where the two disagree. ``tests/test_fast_deterministic.py`` replays every bar of several
+presets the same way, so a formula change on either side fails the suite.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tier-0 agents that run from OHLCV alone (everything else needs live Nexus feeds).
+OHLCV_DESK_AGENTS = ("1.1", "2.1", "2.3")
+
+_NEAR_ZERO = 1e-12
+
+
+@dataclass(frozen=True)
+class DeskDecisions:
+    """Per-bar trade intents for one symbol, indexed by completed-window length ``n``.
+
+    ``action[n]`` is ``1`` (BUY), ``-1`` (SELL) or ``0`` (HOLD) on a flat book and
+    ``confidence[n]`` the intent confidence; index 0 (no completed bars) is HOLD.
+    """
+
+    symbol: str
+    action: np.ndarray
+    confidence: np.ndarray
+    allows_short: bool = True
+
+    def intent(self, n: int, *, book_flat: bool = True) -> tuple[str, float]:
+        """``(action, confidence)`` as :func:`~workflow.execution_intent.derive_trade_intent`."""
+        a = int(self.action[n])
+        if a < 0 and book_flat and not self.allows_short:
+            return "HOLD", float(self.confidence[n])
+        return {1: "BUY", -1: "SELL"}.get(a, "HOLD"), float(self.confidence[n])
+
+    def target_weight(self, n: int, *, book_flat: bool) -> float:
+        """PerpEngine target weight, sized as the graph path's ``_signal_fn``."""
+        action, conf = self.intent(n, book_flat=book_flat)
+        sign = {"BUY": 1.0, "SELL": -1.0}.get(action, 0.0)
+        return sign * min(max(0.0, min(1.0, conf)), 0.45)
+
+
+def _ohlcv_matrix(bars: Sequence[Sequence[Any]]) -> np.ndarray:
+    """``(N, 6)`` float matrix; the fast path needs clean, complete rows."""
+    try:
+        arr = np.asarray([list(r[:6]) for r in bars], dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"fast deterministic path needs numeric OHLCV rows: {exc}") from exc
+    if arr.ndim != 2 or arr.shape[1] < 6:
+        raise ValueError("fast deterministic path needs [ts, o, h, l, c, v] rows")
+    if not np.isfinite(arr).all() or (arr[:, 4] <= 0).any():
+        raise ValueError("fast deterministic path needs finite OHLCV with positive closes")
+    return arr
+
+
+def _py_round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    # Python's round() (correctly rounded), not np.round: gates compare the rounded values.
+    return np.fromiter((round(x, ndigits) for x in values.tolist()), np.float64, len(values))
+
+
+def _finite_or(values: np.ndarray, default: float) -> np.ndarray:
+    return np.where(np.isfinite(values), values, default)
+
+
+def _env_int(name: str, default: str) -> int:
+    return int(os.getenv(name) or default)
+
+
+def _ta_factors(ohlcv: np.ndarray) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Agent 2.3 (``technical_ta_engine``) factor signals for every prefix.
+
+    Returns ``(enabled, factors)``; ``enabled[i]`` is False where the agent reports
+    ``skipped`` (too few bars or ``AIMM_TA_TIER0_DISABLE``).
+    """
+    import talib
+
+    from tools.technical_indicators import _MIN_BARS_CLOSE_EXTENDED, _MIN_BARS_HLC_FACTOR
+
+    high, low, close, vol = ohlcv[:, 2], ohlcv[:, 3], ohlcv[:, 4], ohlcv[:, 5]
+    size = len(close)
+    n = np.arange(1, size + 1)
+    period = _env_int("AIMM_TA_PERIOD", "14")
+    disabled = (os.getenv("AIMM_TA_TIER0_DISABLE") or "").strip().lower() in ("1", "true", "yes")
+    enabled = (n >= period + 1) & (not disabled)
+
+    rsi = _finite_or(talib.RSI(close, timeperiod=period), 50.0)
+    macd, _, hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+    has_macd = n >= _MIN_BARS_CLOSE_EXTENDED
+    hist = np.where(has_macd, _finite_or(hist, 0.0), 0.0)
+    macd = np.where(has_macd, _finite_or(macd, 0.0), 0.0)
+    # ``ti.get("macd_hist") or ti.get("macd")``: a zero histogram falls through to the line.
+    macd_in = np.where(hist != 0.0, hist, macd)
+    roc = _finite_or(talib.ROC(close, timeperiod=period), 0.0)
+
+    has_hlc = n >= max(period * _MIN_BARS_HLC_FACTOR, period + 2)
+    atr = np.where(has_hlc, _finite_or(talib.ATR(high, low, close, timeperiod=period), 0.0), 0.0)
+    adx = np.where(has_hlc, _finite_or(talib.ADX(high, low, close, timeperiod=period), 25.0), 25.0)
+    obv = np.where(has_hlc, _finite_or(talib.OBV(close, vol), 0.0), 0.0)
+
+    fast_p = _env_int("AIMM_TA_EMA_FAST", "9")
+    slow_p = _env_int("AIMM_TA_EMA_SLOW", "21")
+    ema_fast = talib.EMA(close, timeperiod=fast_p)
+    ema_slow = talib.EMA(close, timeperiod=slow_p)
+    has_ema = (n >= slow_p + 1) & np.isfinite(ema_fast) & np.isfinite(ema_slow)
+    ema_slow = np.where(has_ema, ema_slow, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ema_bull = np.where(
+            ema_slow > 0,
+            np.clip(0.5 + ((np.where(has_ema, ema_fast, 0.0) / ema_slow - 1.0) * 5.0), 0.0, 1.0),
+            0.5,
+        )
+
+    lookback = np.maximum(2, np.minimum(_env_int("AIMM_TA_MOMENTUM_LOOKBACK", "6"), n - 1))
+    c0 = close[np.maximum(np.arange(size) - lookback, 0)]
+    momentum = np.where(n >= 2, (close - c0) / c0, 0.0)
+
+    factors = {
+        "rsi": np.clip(1.0 - np.abs(rsi - 55.0) / 45.0 * 0.7, 0.0, 1.0),
+        "macd": np.clip(0.5 + macd_in / (np.abs(macd_in) + 1.0) * 0.4, 0.0, 1.0),
+        "obv": np.clip(0.5 + obv / (np.abs(obv) + 1.0) * 0.3, 0.0, 1.0),
+        "atr": np.where(atr > 0, 1.0 - np.clip(atr / 10.0, 0.0, 1.0), 0.5),
+        "adx": np.clip(adx / 50.0, 0.0, 1.0),
+        "ema_cross": ema_bull,
+        "price_momentum": np.clip(0.5 + momentum / 0.12 * 0.5, 0.0, 1.0),
+        "roc": np.clip(0.5 + roc / 15.0, 0.0, 1.0),
+        # The TA bundle carries no ``volume`` field, so the factor reads 0.
+        "volume": np.zeros(size),
+    }
+    return enabled, factors
+
+
+def _macro_contracts(close: np.ndarray, *, nexus: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Agent 1.1 contract fields ``(macro_regime_state, Liquidity_Score)`` per prefix."""
+    from backtest.ohlcv_derived_context import _return_vol
+
+    size = len(close)
+    n = np.arange(1, size + 1)
+    base = np.where(n >= 30, 60.0, 50.0)
+    if not nexus:
+        return np.ones(size, dtype=np.int64), np.rint(base).astype(np.int64)
+
+    ret = np.zeros(size)
+    vol = np.zeros(size)
+    head = min(size, 29)
+    for i in range(head):
+        ret[i], vol[i] = _return_vol(close[: i + 1].tolist())
+    if size > 29:
+        # 30-close windows: 29 one-bar returns, summed left to right like ``sum()``.
+        r = (close[1:] / close[:-1] - 1.0) * 100.0
+        windows = np.lib.stride_tricks.sliding_window_view(r * r, 29)
+        acc = windows[:, 0].copy()
+        for k in range(1, 29):
+            acc += windows[:, k]
+        ret[29:] = (close[29:] / close[:-29] - 1.0) * 100.0
+        vol[29:] = np.power(acc / 29, 0.5) * (365**0.5)
+
+    score = np.clip(50.0 + ret * 0.8 - np.minimum(vol, 80.0) * 0.15, 10.0, 95.0)
+    risk_on = (ret > 2.0) & (vol < 60.0)
+    risk_off = (ret < -5.0) | (vol > 90.0)
+    score = np.where(
+        risk_off,
+        np.maximum(10.0, score - 12.0),
+        np.where(risk_on, np.minimum(95.0, score + 8.0), score),
+    )
+    # ``systemic_liquidity_score`` is published rounded to cents, then floors the base score.
+    score = np.minimum(95.0, np.maximum(base, _py_round(score, 2)))
+    regime = np.where(risk_on, 2, np.where(risk_off, 0, np.where(score >= 65, 2, 1)))
+    return regime.astype(np.int64), np.rint(np.clip(score, 0.0, 100.0)).astype(np.int64)
+
+
+def _pattern_contracts(close: np.ndarray, *, nexus: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Agent 2.1 contract fields ``(Setup_Score, kalman_support > 0)`` per prefix.
+
+    The pattern label follows from the Setup_Score (``trend`` with OHLCV-derived context,
+    else ``range`` / ``unknown``), so it is not returned separately.
+    """
+    size = len(close)
+    n = np.arange(1, size + 1)
+    derived = (n >= 5) & nexus
+    setup = np.where(n >= 15, 50, 0) + np.where(derived, 20, 0)
+    support_pos = np.zeros(size, dtype=bool)
+    if nexus and size >= 5:
+        lows = np.empty(size)
+        head = min(size, 19)
+        lows[:head] = np.minimum.accumulate(close[:head])
+        if size > 19:
+            lows[19:] = np.lib.stride_tricks.sliding_window_view(close, 20).min(axis=1)
+        support_pos = derived & (_py_round(lows, 2) > 0)
+    return setup.astype(np.int64), support_pos
+
+
+def _agent_scores(contract: dict[str, Any]) -> tuple[float, float, int]:
+    """``(composite, confidence, factor_count)`` of one agent's contract."""
+    from workflow.weight_assigner import compute_agent_weighted_signals
+
+    aid = str(contract["agent"])
+    sig = next(
+        s
+        for s in compute_agent_weighted_signals({"tier0_contracts": [contract]})
+        if s.agent_id == aid
+    )
+    return sig.composite, sig.confidence, len(sig.factor_signals)
+
+
+def _discrete_agent(
+    keys: list[tuple[Any, ...]], make_contract: Callable[..., dict[str, Any]]
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Composite / confidence arrays for an agent whose contract takes few distinct values."""
+    cache: dict[tuple[Any, ...], tuple[float, float, int]] = {}
+    comp = np.empty(len(keys))
+    conf = np.empty(len(keys))
+    count = 0
+    for i, key in enumerate(keys):
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = _agent_scores(make_contract(*key))
+        comp[i], conf[i], count = hit
+    return comp, conf, count
+
+
+def _thresholds(decision_threshold: Mapping[str, Any]) -> dict[str, Any]:
+    from workflow.weight_assigner import _f
+
+    thr_buy = decision_threshold.get("buy", {}) if decision_threshold else {}
+    thr_sell = decision_threshold.get("sell", {}) if decision_threshold else {}
+    out: dict[str, Any] = {
+        "buy_composite": _f(thr_buy.get("min_composite", 60), 60.0) / 100.0,
+        "buy_confidence": _f(thr_buy.get("min_confidence", 50), 50.0) / 100.0,
+        "sell_composite": _f(thr_sell.get("max_composite", 40), 40.0) / 100.0,
+        "sell_confidence": _f(thr_sell.get("min_confidence", 50), 50.0) / 100.0,
+        "min_factors": 3,
+        "ta_led": None,
+    }
+    ag = decision_threshold.get("alignment_gating") if decision_threshold else None
+    if isinstance(ag, dict):
+        out["min_factors"] = int(ag.get("min_factors_for_directional", 3))
+    ta_led = decision_threshold.get("ta_led") if decision_threshold else None
+    if isinstance(ta_led, dict) and ta_led.get("enabled", True):
+        out["ta_led"] = {
+            "agent_id": str(ta_led.get("agent_id") or "2.3"),
+            "buy": _f(ta_led.get("buy_min_composite", 57), 57.0) / 100.0,
+            "sell": _f(ta_led.get("sell_max_composite", 43), 43.0) / 100.0,
+            "confidence": _f(ta_led.get("min_confidence", 14), 14.0) / 100.0,
+        }
+    return out
+
+
+def _desk_state(
+    profile_weights: Mapping[str, float] | None, decision_threshold: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    state: dict[str, Any] = {}
+    if profile_weights:
+        state["profile_weights"] = dict(profile_weights)
+    if decision_threshold:
+        state["decision_threshold"] = dict(decision_threshold)
+    return state
+
+
+def compile_desk_decisions(
+    symbol: str,
+    bars: Sequence[Sequence[Any]],
+    *,
+    profile_weights: Mapping[str, float] | None = None,
+    decision_threshold: Mapping[str, Any] | None = None,
+    allows_short: bool = True,
+) -> DeskDecisions:
+    """Trade intents of the deterministic desk for every completed-bar prefix of ``bars``.
+
+    Raises ``ValueError`` when the history or the desk configuration is outside what the
+    fast path models (dirty OHLCV rows, an enabled agent that needs live Nexus feeds).
+    """
+    from backtest.ohlcv_derived_context import backtest_ohlcv_nexus_enabled
+    from schemas.arbitration import AGENT_FACTOR_MAP
+    from workflow.weighted_arbitrator import (
+        _V4_DISABLED_AGENTS,
+        _resolve_agent_weights,
+        _resolve_decision_threshold,
+    )
+
+    enabled_ids = sorted(set(AGENT_FACTOR_MAP) - _V4_DISABLED_AGENTS)
+    if not set(enabled_ids) <= set(OHLCV_DESK_AGENTS):
+        raise ValueError(f"fast deterministic path cannot model agents {enabled_ids}")
+
+    ohlcv = _ohlcv_matrix(bars)
+    close = ohlcv[:, 4]
+    size = len(close)
+    nexus = backtest_ohlcv_nexus_enabled()
+    state = _desk_state(profile_weights, decision_threshold)
+    weights = _resolve_agent_weights(state)  # type: ignore[arg-type]
+    thr = _thresholds(_resolve_decision_threshold(state))  # type: ignore[arg-type]
+
+    # Per-agent composite / confidence / enabled / factor count, in agent-id order.
+    agents: dict[str, dict[str, Any]] = {}
+    regime, liquidity = _macro_contracts(close, nexus=nexus)
+    comp, conf, count = _discrete_agent(
+        list(zip(regime.tolist(), liquidity.tolist(), strict=True)),
+        lambda mrs, ls: {
+            "agent": "1.1",
+            "status": "success",
+            "macro_regime_state": mrs,
+            "Liquidity_Score": ls,
+        },
+    )
+    agents["1.1"] = {"composite": comp, "confidence": conf, "factors": count}
+
+    setup, support_pos = _pattern_contracts(close, nexus=nexus)
+    comp, conf, count = _discrete_agent(
+        list(zip(setup.tolist(), support_pos.tolist(), strict=True)),
+        lambda ss, sup: {
+            "agent": "2.1",
+            "status": "success",
+            "Setup_Score": ss,
+            "kalman_support": 1.0 if sup else None,
+            "pattern": "trend" if ss in (20, 70) else ("range" if ss else "unknown"),
+        },
+    )
+    agents["2.1"] = {"composite": comp, "confidence": conf, "factors": count}
+
+    ta_enabled, factors = _ta_factors(ohlcv)
+    composite = np.zeros(size)
+    total = 0.0
+    for fid, fw in sorted(AGENT_FACTOR_MAP["2.3"].items(), key=lambda x: x[0]):
+        composite += fw * np.clip(factors[fid], 0.0, 1.0)
+        total += fw
+    composite = np.clip(composite / total, 0.0, 1.0)
+    agents["2.3"] = {
+        "composite": composite,
+        "confidence": np.clip(0.5 + np.abs(composite - 0.5) * 2.0, 0.0, 1.0),
+        "factors": len(AGENT_FACTOR_MAP["2.3"]),
+        "enabled": ta_enabled,
+    }
+
+    always = np.ones(size, dtype=bool)
+    total_weight = np.zeros(size)
+    weighted_sum = np.zeros(size)
+    enabled_count = np.zeros(size, dtype=np.int64)
+    bullish = np.zeros(size, dtype=np.int64)
+    bearish = np.zeros(size, dtype=np.int64)
+    factor_count = np.zeros(size, dtype=np.int64)
+    for aid in enabled_ids:
+        a = agents[aid]
+        on = a.get("enabled", always)
+        w = weights.get(aid, 0.0)
+        total_weight = np.where(on, total_weight + w, total_weight)
+        weighted_sum = np.where(on, weighted_sum + w * a["composite"], weighted_sum)
+        enabled_count += on
+        bullish += on & (a["composite"] >= 0.55)
+        bearish += on & (a["composite"] <= 0.45)
+        factor_count += np.where(on, a["factors"], 0)
+
+    has_weight = total_weight > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g_comp = np.where(has_weight, np.clip(weighted_sum / total_weight, 0.0, 1.0), 0.5)
+    consensus = np.maximum(bullish, bearish) / np.maximum(1, enabled_count)
+    g_conf = np.clip(np.abs(g_comp - 0.5) * 2.0 * np.minimum(1.0, 0.5 + consensus * 0.5), 0.0, 1.0)
+    g_conf = np.where(has_weight, g_conf, 0.0)
+    stance_bull = has_weight & (g_comp >= 0.53)
+    stance_bear = has_weight & (g_comp <= 0.47) & ~stance_bull
+    g_comp = _py_round(g_comp, 4)
+    confidence = _py_round(g_conf, 4)
+
+    buy = stance_bull & (g_comp >= thr["buy_composite"]) & (confidence >= thr["buy_confidence"])
+    sell = stance_bear & (g_comp <= thr["sell_composite"]) & (confidence >= thr["sell_confidence"])
+    gated = (buy | sell) & (factor_count < thr["min_factors"])
+    buy &= ~gated
+    sell &= ~gated
+
+    ta_led = thr["ta_led"]
+    if ta_led is not None and ta_led["agent_id"] in enabled_ids:
+        a = agents[ta_led["agent_id"]]
+        on = a.get("enabled", always)
+        ta_conf = np.maximum(confidence, a["confidence"])
+        # 1.2 news shocks block aggressive longs; 1.2 is never part of this desk.
+        led_buy = on & ~buy & (a["composite"] >= ta_led["buy"]) & (ta_conf >= ta_led["confidence"])
+        led_sell = (
+            on
+            & ~led_buy
+            & ~sell
+            & (a["composite"] <= ta_led["sell"])
+            & (ta_conf >= ta_led["confidence"])
+        )
+        confidence = np.where(led_buy | led_sell, ta_conf, confidence)
+        buy = (buy | led_buy) & ~led_sell
+        sell = (sell | led_sell) & ~led_buy
+
+    # Arbitration rounds the confidence; the execution intent clamps to 0.95 and rounds again.
+    confidence = _py_round(np.clip(_py_round(confidence, 4), 0.0, 0.95), 2)
+    action = np.zeros(size + 1, dtype=np.int8)
+    action[1:] = np.where(buy, 1, np.where(sell, -1, 0))
+    conf_out = np.zeros(size + 1)
+    conf_out[1:] = confidence
+    return DeskDecisions(
+        symbol=symbol, action=action, confidence=conf_out, allows_short=bool(allows_short)
+    )
+
+
+def reference_intent(
+    symbol: str,
+    bars: Sequence[Sequence[Any]],
+    n: int,
+    *,
+    profile_weights: Mapping[str, float] | None = None,
+    decision_threshold: Mapping[str, Any] | None = None,
+    allows_short: bool = True,
+) -> tuple[str, float]:
+    """Graph-path intent for window ``bars[:n]`` on a flat book (one bar, no LLM layers).
+
+    Runs the real Tier-0 node functions and :func:`~workflow.weighted_arbitrator.
+    arbitrate_tier0` on the state ``BacktestEngine`` builds for that bar.
+    """
+    import main
+    from backtest.ohlcv_derived_context import (
+        backtest_ohlcv_nexus_enabled,
+        build_ohlcv_derived_nexus_context,
+    )
+    from config.run_mode import RunMode
+    from schemas.state import initial_hedge_fund_state
+    from workflow.weighted_arbitrator import arbitrate_tier0
+
+    state = initial_hedge_fund_state(ticker=symbol, run_mode=RunMode.BACKTEST.value)
+    state.update(_desk_state(profile_weights, decision_threshold))  # type: ignore[typeddict-item]
+    state["market_data"] = {
+        symbol: {"status": "success", "backtest": True, "ohlcv": [list(r) for r in bars[:n]]}
+    }
+    sm = state["shared_memory"]
+    sm["backtest"] = {"qty": 0.0, "positions": {}, "allows_short": bool(allows_short)}
+    if backtest_ohlcv_nexus_enabled():
+        sm["nexus"] = build_ohlcv_derived_nexus_context(
+            ticker=symbol, universe=[symbol], market_data=state["market_data"]
+        )
+    contracts: list[dict[str, Any]] = []
+    for node in (main.monetary_sentinel, main.pattern_recognition_bot, main.technical_ta_engine):
+        contracts.extend(node(state)["tier0_contracts"])
+    state["tier0_contracts"] = contracts
+    _, _, intent = arbitrate_tier0(state)
+    return str(intent["action"]), float(intent["confidence"])
+
+
+def check_parity(
+    decisions: DeskDecisions,
+    bars: Sequence[Sequence[Any]],
+    *,
+    sample: int = 8,
+    profile_weights: Mapping[str, float] | None = None,
+    decision_threshold: Mapping[str, Any] | None = None,
+    tol: float = 1e-9,
+) -> list[dict[str, Any]]:
+    """Bars (evenly spaced, ``sample`` of them) where fast and graph intents differ."""
+    if sample <= 0 or not bars:
+        return []
+    bar_ns = sorted({int(x) for x in np.linspace(1, len(bars), num=min(sample, len(bars)))})
+    mismatches: list[dict[str, Any]] = []
+    for n in bar_ns:
+        fast = decisions.intent(n)
+        graph = reference_intent(
+            decisions.symbol,
+            bars,
+            n,
+            profile_weights=profile_weights,
+            decision_threshold=decision_threshold,
+            allows_short=decisions.allows_short,
+        )
+        if fast[0] != graph[0] or abs(fast[1] - graph[1]) > tol:
+            mismatches.append(
+                {"symbol": decisions.symbol, "bars": n, "fast": list(fast), "graph": list(graph)}
+            )
+    return mismatches
+
+
+def book_is_flat(positions: Mapping[str, Any]) -> bool:
+    """Net signed base quantity across ``positions`` is zero (the short-gate test)."""
+    total = 0.0
+    for pos in positions.values():
+        direction = int(getattr(pos, "direction", 1) or 1)
+        total += float(pos.size) * (1.0 if direction >= 0 else -1.0)
+    return abs(total) <= _NEAR_ZERO
+
+
+__all__ = [
+    "OHLCV_DESK_AGENTS",
+    "DeskDecisions",
+    "book_is_flat",
+    "check_parity",
+    "compile_desk_decisions",
+    "reference_intent",
+]
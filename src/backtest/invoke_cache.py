@@ -0,0 +1,238 @@
+"""Persistent, content-addressed cache for per-bar ``workflow.invoke`` outputs.
+
+``BacktestEngine.run`` already shares one invoke per bar inside a run; this store carries
+those outputs across runs, so re-running a preset over the same bars replays the graph
+from disk instead of re-invoking every node.
+
+The key hashes everything the graph reads from its input state:
+
+- bars: one chained digest per symbol prefix (``d[n] = H(d[n-1] | row n)``), so the whole
+  history that seeds EMAs/ATR is covered at O(1) cost per bar;
+- the book (cash, equity, positions), profile weights, decision thresholds, arbitrator
+  mode, working memory and the rest of ``shared_memory`` (minus run ids and wall-clock stamps);
+- a code version: the ``src`` sources, ``config/*.json`` and the ``AIMM_*`` / LLM model env.
+
+Only the output keys the engine and terminal log read are stored, as zlib-compressed JSON in
+a :class:`~storage.sqlite_lru.SqliteLruStore` (the same store as :mod:`llm.decision_cache`).
+Opt in with ``BacktestConfig.invoke_cache`` or ``AIMM_BACKTEST_INVOKE_CACHE=1``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from storage.sqlite_lru import SharedStore, SqliteLruStore, env_cache_dir, env_max_entries
+
+logger = logging.getLogger(__name__)
+
+_ENABLE_ENV = "AIMM_BACKTEST_INVOKE_CACHE"
+_CACHE_ENV = "AIMM_INVOKE_CACHE_DIR"
+_MAX_ENTRIES_ENV = "AIMM_INVOKE_CACHE_MAX_ENTRIES"
+_DEFAULT_CACHE_DIR = ".cache/invoke"
+_DB_NAME = "invoke.sqlite3"
+_DEFAULT_MAX_ENTRIES = 500_000
+
+# Output keys replayed on a hit (everything ``_signal_fn`` / ``print_bar_decision`` read).
+CACHED_OUTPUT_KEYS = (
+    "trade_intent",
+    "is_vetoed",
+    "veto_reason",
+    "proposed_signal",
+    "arbitration_result",
+    "tier0_contracts",
+    "reasoning_logs",
+    "profile_weights",
+)
+# Env that only changes logging or the caches themselves, not decisions.
+_ENV_IGNORED_PREFIXES = (
+    "AIMM_BACKTEST_INVOKE_CACHE",
+    "AIMM_INVOKE_CACHE_",
+    "AIMM_DECISION_CACHE_",
+    "AIMM_BACKTEST_TERMINAL_LOG",
+    "AIMM_BACKTEST_VERBOSE_RECEIPTS",
+)
+# Per-run / wall-clock fields of ``shared_memory`` sections that no node decides on.
+_VOLATILE_KEYS = {"backtest": ("run_id",), "nexus": ("fetched_at_epoch",)}
+# Provider model / endpoint selection (OPENAI_MODEL, ATLASCLOUD_BASE_URL, ...).
+_ENV_MODEL_SUFFIXES = ("_MODEL", "_BASE_URL")
+
+
+def _cache_dir() -> Path:
+    return env_cache_dir(_CACHE_ENV, _DEFAULT_CACHE_DIR)
+
+
+def invoke_cache_enabled(config_flag: Any = None) -> bool:
+    """``BacktestConfig.invoke_cache`` wins when set; otherwise ``AIMM_BACKTEST_INVOKE_CACHE=1``."""
+    if config_flag is not None:
+        return bool(config_flag)
+    return (os.getenv(_ENABLE_ENV) or "").strip() == "1"
+
+
+@functools.lru_cache(maxsize=1)
+def _source_fingerprint() -> str:
+    """Hash of every ``src`` module and ``config/*.json`` (computed once per process)."""
+    h = hashlib.blake2b(digest_size=16)
+    src_root = Path(__file__).resolve().parents[1]
+    files = sorted(src_root.rglob("*.py"))
+    cfg_dir = Path("config")
+    if cfg_dir.is_dir():
+        files += sorted(cfg_dir.glob("*.json"))
+    for path in files:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        h.update(str(path.name).encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(data)
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def code_version() -> str:
+    """Sources + decision-relevant env; any change starts a fresh key space."""
+    env = sorted(
+        (k, v)
+        for k, v in os.environ.items()
+        if (k.startswith("AIMM_") and not k.startswith(_ENV_IGNORED_PREFIXES))
+        or k.endswith(_ENV_MODEL_SUFFIXES)
+    )
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_source_fingerprint().encode("ascii"))
+    h.update(json.dumps(env, separators=(",", ":")).encode("utf-8"))
+    return h.hexdigest()
+
+
+class BarChain:
+    """Chained prefix digests of one symbol's bars, extended lazily as windows grow."""
+
+    def __init__(self, bars: Sequence[Sequence[Any]]) -> None:
+        self._bars = bars
+        self._digests: list[bytes] = [b""]
+        # Concurrent per-symbol signals key on every symbol's chain.
+        self._lock = threading.Lock()
+
+    def digest(self, n: int) -> str:
+        n = max(0, min(int(n), len(self._bars)))
+        with self._lock:
+            return self._extend(n).hex()
+
+    def _extend(self, n: int) -> bytes:
+        while len(self._digests) <= n:
+            i = len(self._digests) - 1
+            row = self._bars[i]
+            try:
+                packed = struct.pack("<6d", *(float(x) for x in row[:6]))
+            except (TypeError, ValueError, struct.error):
+                packed = json.dumps(list(row), default=str).encode("utf-8")
+            self._digests.append(
+                hashlib.blake2b(self._digests[-1] + packed, digest_size=16).digest()
+            )
+        return self._digests[n]
+
+
+def state_key(
+    state: Mapping[str, Any],
+    *,
+    chains: Mapping[str, BarChain],
+    version: str,
+) -> str:
+    """Content address of one invoke input.
+
+    ``market_data`` windows are replaced by their chained digests; ``run_id`` and wall-clock
+    stamps are dropped so the same bars and book hit across runs.
+    """
+    market: dict[str, Any] = {}
+    for sym, md in sorted((state.get("market_data") or {}).items()):
+        rows = md.get("ohlcv") if isinstance(md, Mapping) else None
+        n = len(rows) if isinstance(rows, Sequence) else 0
+        chain = chains.get(sym)
+        market[sym] = [n, chain.digest(n) if chain is not None else None]
+    body: dict[str, Any] = {
+        k: v for k, v in state.items() if k not in ("market_data", "shared_memory")
+    }
+    sm = dict(state.get("shared_memory") or {})
+    for section, volatile in _VOLATILE_KEYS.items():
+        part = sm.get(section)
+        if isinstance(part, Mapping):
+            sm[section] = {k: v for k, v in part.items() if k not in volatile}
+    body["shared_memory"] = sm
+    body["market_data"] = market
+    payload = json.dumps(body, sort_keys=True, default=str, separators=(",", ":"))
+    h = hashlib.sha256()
+    for part in (version, payload):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def compact_output(output: Mapping[str, Any]) -> dict[str, Any]:
+    """The part of a workflow output that is worth persisting."""
+    return {k: output[k] for k in CACHED_OUTPUT_KEYS if k in output}
+
+
+class InvokeCache(SqliteLruStore):
+    """Compressed invoke outputs over :class:`~storage.sqlite_lru.SqliteLruStore`."""
+
+    def __init__(self, db_path: Path | str, *, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        super().__init__(
+            db_path,
+            table="invokes",
+            stats_table="invoke_stats",
+            tags=("symbol",),
+            payload_type="BLOB",
+            max_entries=max_entries,
+        )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.get_payload(key)
+        if raw is None:
+            return None
+        try:
+            data = json.loads(zlib.decompress(raw))
+        except (zlib.error, json.JSONDecodeError) as e:
+            logger.warning("Invoke cache read error for %s: %s", key[:12], e)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def put(self, key: str, output: Mapping[str, Any], *, symbol: str = "") -> None:
+        raw = json.dumps(compact_output(output), default=str, separators=(",", ":"))
+        self.put_payload(key, zlib.compress(raw.encode("utf-8"), 6), symbol=symbol)
+
+    def invalidate(self, *, symbol: str | None = None) -> int:
+        return super().invalidate(symbol=symbol)
+
+
+_CACHE: SharedStore[InvokeCache] = SharedStore(
+    lambda: _cache_dir() / _DB_NAME,
+    lambda path: InvokeCache(
+        path, max_entries=env_max_entries(_MAX_ENTRIES_ENV, _DEFAULT_MAX_ENTRIES)
+    ),
+)
+
+
+def get_invoke_cache() -> InvokeCache:
+    """Process-wide cache for the current ``AIMM_INVOKE_CACHE_DIR`` (reopened if it changes)."""
+    return _CACHE.get()
+
+
+__all__ = [
+    "CACHED_OUTPUT_KEYS",
+    "BarChain",
+    "InvokeCache",
+    "code_version",
+    "compact_output",
+    "get_invoke_cache",
+    "invoke_cache_enabled",
+    "state_key",
+]
@@ -9,8 +9,6 @@ from typing import Any, Sequence
 
 from config.app_settings import load_app_settings
 
-from .engine import BacktestEngine
-
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +50,8 @@ class MultiStepResult:
     iterations_path: Path | None = None
     quality_report: dict[str, Any] | None = None
     resolved_config: dict[str, Any] | None = None
+    #: Fast deterministic path: desk symbols, graph fallbacks and sampled parity mismatches.
+    fast_report: dict[str, Any] | None = None
 
 
 def run_multi_step_backtest(
@@ -80,6 +80,11 @@ def run_multi_step_backtest(
     timeframe: str = "",
     eval_steps: int | None = None,
     ta_warmup_bars: int | None = None,
+    intrabar: str = "close",
+    intrabar_timeframe: str = "",
+    fast_deterministic: bool = False,
+    invoke_cache: bool | None = None,
+    artifact_format: str = "",
 ) -> MultiStepResult:
     """Run a deterministic multi-step backtest and persist artifacts under ``.runs/``."""
     app = load_app_settings()
@@ -101,6 +106,13 @@ def run_multi_step_backtest(
         "take_profit_pct": float(take_profit_pct),
         "stop_loss_pct": float(stop_loss_pct),
         "max_hold_bars": int(max_hold_bars),
+        "intrabar": str(intrabar or "close"),
+        "intrabar_timeframe": str(intrabar_timeframe or ""),
+        "fast_deterministic": bool(fast_deterministic),
+        "invoke_cache": invoke_cache,
+        "artifact_format": str(artifact_format or ""),
+        # Journaled below, once summary.json carries quality_report / resolved_config.
+        "record_completion": False,
         "timeframe": str(timeframe or ""),
         "run_id": str(run_id or ""),
         "deploy_profile_weights": deploy_profile_weights,
@@ -115,6 +127,9 @@ def run_multi_step_backtest(
         engine_cfg["allows_short"] = bool(deploy_config["allows_short"])
     if deploy_config and deploy_config.get("agent_led_symbols"):
         engine_cfg["agent_led_symbols"] = deploy_config["agent_led_symbols"]
+    # Deferred: the engine imports the full LangGraph / agent stack.
+    from .engine import BacktestEngine
+
     engine = BacktestEngine(engine_cfg)
     if bars_by_symbol is not None:
         raw = {str(sym): [list(x) for x in series] for sym, series in bars_by_symbol.items()}
@@ -150,8 +165,9 @@ def run_multi_step_backtest(
         trades_path = Path(str(paths.get("trades"))) if paths.get("trades") else None
         trades: list[dict[str, Any]] = []
         if trades_path and trades_path.is_file():
-            with trades_path.open(encoding="utf-8") as f:
-                trades = [json.loads(line) for line in f if line.strip()]
+            from backtest.trade_book import read_jsonl_dict_records
+
+            trades = read_jsonl_dict_records(trades_path)
 
         closes: list[float] = []
         if bars is not None:
@@ -197,6 +213,14 @@ def run_multi_step_backtest(
     except Exception as exc:
         logger.warning("quality-report post-process failed: %s", exc)
         qual_report = None
+    if summary_path and summary_path.is_file():
+        from backtest.completion_journal import record_backtest_completion
+
+        record_backtest_completion(
+            str(res.get("run_id") or summary_path.parent.name),
+            summary_path,
+            runs_dir=runs_dir,
+        )
 
     stamped_config: dict[str, Any] | None = None
     if deploy_config:
@@ -219,4 +243,5 @@ def run_multi_step_backtest(
         iterations_path=iterations_path,
         quality_report=qual_report,
         resolved_config=stamped_config,
+        fast_report=res.get("fast_deterministic"),
     )
@@ -0,0 +1,64 @@
+"""Per-bar OHLCV windows shared across every symbol invocation of a backtest bar.
+
+``BacktestEngine._signal_fn`` runs once per symbol per bar and each run used to copy the
+full history of every universe symbol (``list(bars)[:n]``), i.e. universe² × history work
+per bar. :class:`UniverseWindows` slices each symbol at most once per window length and
+hands the same list to every invocation of that bar.
+
+The slices are shared: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping, Sequence
+from itertools import islice
+from typing import Any
+
+
+class UniverseWindows:
+    """Completed-bar windows ``bars[:n]`` for the universe, memoized for the current ``n``."""
+
+    def __init__(self, bars_by_symbol: Mapping[str, Sequence[Any]]) -> None:
+        self._bars = bars_by_symbol
+        self._lock = threading.Lock()
+        self._n = -1
+        self._slices: dict[str, list[Any]] = {}
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._bars.keys())
+
+    def window(self, symbol: str, n: int) -> list[Any]:
+        """First ``n`` bars of ``symbol`` (no look-ahead); ``[]`` for unknown symbols."""
+        n = max(0, int(n))
+        with self._lock:
+            if n != self._n:
+                # Bars advance monotonically; older windows are no longer requested.
+                self._n = n
+                self._slices = {}
+            rows = self._slices.get(symbol)
+            if rows is None:
+                src = self._bars.get(symbol) or []
+                rows = src[:n] if isinstance(src, list) else list(islice(src, n))
+                self._slices[symbol] = rows
+            return rows
+
+    def market_data(self, n: int) -> dict[str, dict[str, Any]]:
+        """``state["market_data"]`` for a window of ``n`` bars.
+
+        The outer and per-symbol dicts are fresh per call (graph nodes may annotate them);
+        only the OHLCV lists are shared.
+        """
+        return {
+            s: {
+                "status": "success",
+                "backtest": True,
+                # Slice OHLCV to completed bars only (no look-ahead).
+                "ohlcv": self.window(s, n),
+            }
+            for s in self._bars
+        }
+
+
+__all__ = ["UniverseWindows"]
@@ -1,9 +1,16 @@
+"""Backtest performance metrics.
+
+Scalar helpers keep their list-based signatures; the arithmetic lives in the vectorized
+:mod:`backtest.metrics_kernel`, which also scores batches of curves for sweeps.
+"""
+
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from typing import Any, Iterable, Sequence
 
+from backtest import metrics_kernel as kernel
+
 
 def _to_floats(xs: Iterable[float]) -> list[float]:
     return [float(x) for x in xs]
@@ -14,26 +21,15 @@ def max_drawdown(equity_curve: Sequence[float]) -> float:
     eq = _to_floats(equity_curve)
     if len(eq) < 2:
         return 0.0
-    peak = eq[0]
-    mdd = 0.0
-    for x in eq:
-        peak = max(peak, x)
-        if peak > 0:
-            dd = (peak - x) / peak
-            mdd = max(mdd, dd)
-    return float(mdd)
+    return float(kernel.max_drawdown(eq))
 
 
 def returns_from_equity(equity_curve: Sequence[float]) -> list[float]:
     """Compute simple returns between consecutive equity points."""
     eq = _to_floats(equity_curve)
-    rets: list[float] = []
-    for a, b in zip(eq, eq[1:], strict=False):
-        if a == 0:
-            rets.append(0.0)
-        else:
-            rets.append((b - a) / a)
-    return rets
+    if len(eq) < 2:
+        return []
+    return kernel.returns(eq).tolist()
 
 
 def periods_per_year_from_interval_sec(interval_sec: int) -> int:
@@ -48,8 +44,7 @@ def downside_deviation(returns: Sequence[float], *, mar: float = 0.0) -> float:
     r = _to_floats(returns)
     if not r:
         return 0.0
-    sq = [min(0.0, float(x) - mar) ** 2 for x in r]
-    return float(math.sqrt(sum(sq) / len(r)))
+    return float(kernel.downside_deviation(r, mar=mar))
 
 
 def sharpe_ratio(returns: Sequence[float], *, periods_per_year: int = 365) -> float:
@@ -63,18 +58,7 @@ def sharpe_ratio(returns: Sequence[float], *, periods_per_year: int = 365) -> fl
     r = _to_floats(returns)
     if len(r) < 2:
         return 0.0
-    mean = sum(r) / len(r)
-    var = sum((x - mean) ** 2 for x in r) / (len(r) - 1)
-    std = math.sqrt(var)
-    if std <= 0:
-        return 0.0
-    absrets = sorted(abs(x) for x in r)
-    med_abs = absrets[len(absrets) // 2]
-    noise_floor = max(1e-12, float(med_abs) * 0.2)
-    std_eff = max(std, noise_floor)
-    raw = (mean / std_eff) * math.sqrt(max(1, int(periods_per_year)))
-    cap = 15.0
-    return float(max(-cap, min(cap, raw)))
+    return float(kernel.sharpe(r, periods_per_year=periods_per_year))
 
 
 def sortino_ratio(
@@ -87,11 +71,7 @@ def sortino_ratio(
     r = _to_floats(returns)
     if len(r) < 2:
         return 0.0
-    mean = sum(r) / len(r)
-    dd = downside_deviation(r, mar=mar)
-    if dd <= 1e-18:
-        return 0.0
-    return float(((mean - mar) / dd) * math.sqrt(periods_per_year))
+    return float(kernel.sortino(r, periods_per_year=periods_per_year, mar=mar))
 
 
 def profit_factor(pnls: Sequence[float]) -> float | None:
@@ -0,0 +1,177 @@
+"""Vectorized equity-curve metrics over NumPy arrays.
+
+Every function accepts one curve ``(n,)`` or a batch of equal-length curves ``(k, n)`` and
+reduces along the last axis, so a sweep can score thousands of curves in one call.
+:func:`metrics_bundle_many` handles ragged lists by grouping curves of equal length.
+
+Definitions match the scalar helpers in :mod:`backtest.metrics` (which delegate here):
+simple returns with a zero previous equity mapped to 0, peak-to-trough drawdown as a
+fraction, Sharpe with the median-|r| noise floor and ±15 cap, Sortino against a MAR.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SHARPE_CAP = 15.0
+
+
+def _as_2d(values: Any) -> tuple[np.ndarray, bool]:
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 1:
+        return arr[None, :], True
+    if arr.ndim != 2:
+        raise ValueError(f"expected a 1-D curve or 2-D batch, got shape {arr.shape}")
+    return arr, False
+
+
+def _out(arr: np.ndarray, squeeze: bool) -> Any:
+    return float(arr[0]) if squeeze else arr
+
+
+def returns(equity: Any) -> np.ndarray:
+    """Per-bar simple returns ``(k, n-1)``; a zero previous equity yields 0."""
+    eq, squeeze = _as_2d(equity)
+    prev = eq[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(prev == 0, 0.0, (eq[:, 1:] - prev) / np.where(prev == 0, 1.0, prev))
+    return r[0] if squeeze else r
+
+
+def max_drawdown(equity: Any) -> Any:
+    """Max peak-to-trough drawdown as a fraction; 0 for curves shorter than 2 points."""
+    eq, squeeze = _as_2d(equity)
+    if eq.shape[1] < 2:
+        return _out(np.zeros(eq.shape[0]), squeeze)
+    peak = np.maximum.accumulate(eq, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, (peak - eq) / np.where(peak > 0, peak, 1.0), 0.0)
+    return _out(np.maximum(dd.max(axis=1), 0.0), squeeze)
+
+
+def sharpe(rets: Any, *, periods_per_year: int = 365) -> Any:
+    """Annualized Sharpe (zero risk-free) with the noise floor and cap of ``sharpe_ratio``."""
+    r, squeeze = _as_2d(rets)
+    n = r.shape[1]
+    if n < 2:
+        return _out(np.zeros(r.shape[0]), squeeze)
+    mean = r.mean(axis=1)
+    std = r.std(axis=1, ddof=1)
+    med_abs = np.partition(np.abs(r), n // 2, axis=1)[:, n // 2]
+    std_eff = np.maximum(std, np.maximum(1e-12, med_abs * 0.2))
+    raw = mean / std_eff * math.sqrt(max(1, int(periods_per_year)))
+    out = np.where(std > 0, np.clip(raw, -SHARPE_CAP, SHARPE_CAP), 0.0)
+    return _out(out, squeeze)
+
+
+def downside_deviation(rets: Any, *, mar: float = 0.0) -> Any:
+    r, squeeze = _as_2d(rets)
+    if r.shape[1] == 0:
+        return _out(np.zeros(r.shape[0]), squeeze)
+    below = np.minimum(0.0, r - mar)
+    return _out(np.sqrt((below * below).mean(axis=1)), squeeze)
+
+
+def sortino(rets: Any, *, periods_per_year: int = 365, mar: float = 0.0) -> Any:
+    r, squeeze = _as_2d(rets)
+    if r.shape[1] < 2:
+        return _out(np.zeros(r.shape[0]), squeeze)
+    mean = r.mean(axis=1)
+    dd = downside_deviation(r, mar=mar)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = (mean - mar) / np.where(dd > 1e-18, dd, 1.0) * math.sqrt(periods_per_year)
+    return _out(np.where(dd > 1e-18, raw, 0.0), squeeze)
+
+
+def metrics_bundle(equity: Any, *, periods_per_year: int = 365) -> dict[str, Any]:
+    """Total return, drawdown, Sharpe, Sortino and volatility from one returns pass.
+
+    Scalars for a 1-D curve, ``(k,)`` arrays for a batch. Percent fields are ×100.
+    """
+    eq, squeeze = _as_2d(equity)
+    k, n = eq.shape
+    r = returns(eq)
+    if n >= 1:
+        start = eq[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total = np.where(start > 0, (eq[:, -1] - start) / np.where(start > 0, start, 1.0), 0.0)
+    else:
+        total = np.zeros(k)
+    vol = r.std(axis=1, ddof=1) if r.shape[1] >= 2 else np.zeros(k)
+    bundle = {
+        "total_return_pct": total * 100.0,
+        "max_drawdown_pct": max_drawdown(eq) * 100.0,
+        "sharpe": sharpe(r, periods_per_year=periods_per_year),
+        "sortino": sortino(r, periods_per_year=periods_per_year),
+        "vol_ann_pct": vol * math.sqrt(max(1, int(periods_per_year))) * 100.0,
+    }
+    if squeeze:
+        return {key: float(np.asarray(v).reshape(-1)[0]) for key, v in bundle.items()}
+    return bundle
+
+
+def metrics_bundle_many(
+    curves: Sequence[Sequence[float]], *, periods_per_year: int = 365
+) -> list[dict[str, float]]:
+    """:func:`metrics_bundle` for ragged curves, vectorized within each length group."""
+    out: list[dict[str, float]] = [{} for _ in curves]
+    by_len: dict[int, list[int]] = {}
+    for i, c in enumerate(curves):
+        by_len.setdefault(len(c), []).append(i)
+    for idxs in by_len.values():
+        batch = metrics_bundle(
+            np.asarray([curves[i] for i in idxs], dtype=np.float64).reshape(len(idxs), -1),
+            periods_per_year=periods_per_year,
+        )
+        for j, i in enumerate(idxs):
+            out[i] = {key: float(v[j]) for key, v in batch.items()}
+    return out
+
+
+def rolling_metrics(
+    equity: Any, *, window: int, periods_per_year: int = 365
+) -> dict[str, np.ndarray]:
+    """Trailing-window Sharpe, drawdown and volatility for every bar.
+
+    ``window`` counts equity points; entries before the first full window are NaN.
+    Shapes follow the input: ``(n,)`` or ``(k, n)``.
+    """
+    eq, squeeze = _as_2d(equity)
+    k, n = eq.shape
+    w = int(window)
+    result = {
+        "sharpe": np.full((k, n), np.nan),
+        "max_drawdown_pct": np.full((k, n), np.nan),
+        "vol_ann_pct": np.full((k, n), np.nan),
+    }
+    if w >= 2 and n >= w:
+        eq_win = sliding_window_view(eq, w, axis=1)  # (k, n-w+1, w)
+        flat_eq = eq_win.reshape(-1, w)
+        r = returns(flat_eq)
+        result["sharpe"][:, w - 1 :] = sharpe(r, periods_per_year=periods_per_year).reshape(k, -1)
+        result["max_drawdown_pct"][:, w - 1 :] = (max_drawdown(flat_eq) * 100.0).reshape(k, -1)
+        vol = r.std(axis=1, ddof=1) if w >= 3 else np.zeros(r.shape[0])
+        result["vol_ann_pct"][:, w - 1 :] = (
+            vol * math.sqrt(max(1, int(periods_per_year))) * 100.0
+        ).reshape(k, -1)
+    if squeeze:
+        return {key: v[0] for key, v in result.items()}
+    return result
+
+
+__all__ = [
+    "SHARPE_CAP",
+    "downside_deviation",
+    "max_drawdown",
+    "metrics_bundle",
+    "metrics_bundle_many",
+    "returns",
+    "rolling_metrics",
+    "sharpe",
+    "sortino",
+]
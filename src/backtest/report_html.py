@@ -14,7 +14,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from backtest.iteration_decision import decision_from_iteration
+from backtest.trade_book import journal_row_count, read_journal_rows
 
 DEFAULT_REPORT_NAME = "backtest_report.html"
 _PREFERRED_BENCHMARK = "BTC/USDT"
@@ -113,8 +116,8 @@ def _normalize_trade_row(t: dict[str, Any], *, idx: int = 0) -> dict[str, Any]:
 
 
 def _load_trades(run_dir: Path) -> list[dict[str, Any]]:
-    """Load trades from JSONL, or CSV if JSONL is absent."""
-    rows = _read_jsonl(run_dir / "trades.jsonl")
+    """Load trades from the run journal (JSONL / Parquet), or CSV if it is absent."""
+    rows = read_journal_rows(run_dir, "trades")
     if not rows:
         rows = list(_read_trades_csv(run_dir / "trades_record.csv"))
     return [_normalize_trade_row(t, idx=i) for i, t in enumerate(rows)]
@@ -242,16 +245,23 @@ def _load_equity_curve(run_dir: Path, summary: dict[str, Any] | None = None) ->
         if out:
             return out
 
-    raw_rows = [r for r in _read_jsonl(run_dir / "equity.jsonl") if isinstance(r, dict)]
-    # Legacy equity.jsonl may include TA warmup; drop it when total_bars matches.
+    # Legacy equity.jsonl may include TA warmup; skip it when total_bars matches.
+    start = 0
     if summary:
         try:
             warmup = int(summary.get("ta_warmup_bars") or 0)
             total_bars = int(summary.get("total_bars") or 0)
-            if warmup > 0 and total_bars > warmup and len(raw_rows) >= total_bars:
-                raw_rows = raw_rows[warmup:]
+            if (
+                warmup > 0
+                and total_bars > warmup
+                and journal_row_count(run_dir, "equity") >= total_bars
+            ):
+                start = warmup
         except (TypeError, ValueError):
             pass
+    raw_rows = read_journal_rows(
+        run_dir, "equity", columns=("ts", "equity", "capital"), start=start
+    )
     out = []
     for i, row in enumerate(raw_rows):
         try:
@@ -378,12 +388,13 @@ def _align_benchmark(benchmark: list[float], n: int) -> list[float]:
     return benchmark + [benchmark[-1]] * (n - len(benchmark))
 
 
-def _daily_returns(equity: list[float]) -> list[float]:
-    rets: list[float] = []
-    for i in range(1, len(equity)):
-        if equity[i - 1] > 0:
-            rets.append((equity[i] / equity[i - 1]) - 1.0)
-    return rets
+def _daily_returns(equity: list[float]) -> np.ndarray:
+    eq = np.asarray(equity, dtype=np.float64)
+    if eq.size < 2:
+        return eq[:0]
+    prev = eq[:-1]
+    ok = prev > 0
+    return eq[1:][ok] / prev[ok] - 1.0
 
 
 def _risk_metrics(
@@ -400,9 +411,8 @@ def _risk_metrics(
 
     var_95: float | None = None
     if len(rets) >= 5:
-        sorted_rets = sorted(rets)
-        idx = max(0, int(math.floor(0.05 * len(sorted_rets))) - 1)
-        var_95 = sorted_rets[idx] * 100.0
+        idx = max(0, int(math.floor(0.05 * len(rets))) - 1)
+        var_95 = float(np.partition(rets, idx)[idx]) * 100.0
 
     calmar: float | None = None
     if ret_pct is not None and mdd and float(mdd) > 0:
@@ -414,7 +424,7 @@ def _risk_metrics(
 
     vol_ann: float | None = None
     if len(rets) >= 2:
-        vol_ann = statistics.stdev(rets) * ann_factor * 100.0
+        vol_ann = float(rets.std(ddof=1)) * ann_factor * 100.0
 
     return {
         "var_95_pct": var_95,
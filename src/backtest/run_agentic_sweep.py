@@ -1,6 +1,9 @@
 """Agentic parameter sweep across regimes, symbol sets, and arbitrator/TA presets.
 
-Deterministic weighted arbitrator only (no LLM). Writes::
+Presets vary the weighted arbitrator (profile weights, decision thresholds). By default each
+run goes through the desk graph; ``--fast`` runs the deterministic OHLCV desk (Tier-0 1.1 /
+2.1 / 2.3 + weighted arbitrator, no LLM) as NumPy arrays over each window, parity-checked
+against the graph nodes on sampled bars (``backtest.fast_deterministic``). Writes::
 
     .runs/evaluations/sweep_<id>/sweep_report.json
     .runs/evaluations/sweep_<id>/sweep_report.md
@@ -10,6 +13,8 @@ Example::
     NEXUS_DISABLE=1 uv run python -m backtest.run_agentic_sweep
 
     uv run python -m backtest.run_agentic_sweep --quick
+
+    uv run python -m backtest.run_agentic_sweep --quick --fast
 """
 
 from __future__ import annotations
@@ -291,6 +296,7 @@ def _run_one(
     runs_dir: Path,
     sweep_id: str,
     tp_sl_pct: float,
+    fast: bool = False,
 ) -> dict[str, Any]:
     bench_bars = bars_by_symbol.get(sym_set.benchmark, [])
     interval_sec = (
@@ -321,6 +327,7 @@ def _run_one(
                 deploy_arbitrator_mode="agent_llm",
                 deploy_config=deploy_cfg or None,
                 timeframe="1d",
+                fast_deterministic=fast,
             )
         else:
             res = run_multi_step_backtest(
@@ -337,6 +344,7 @@ def _run_one(
                 deploy_arbitrator_mode="agent_llm",
                 deploy_config=deploy_cfg or None,
                 timeframe="1d",
+                fast_deterministic=fast,
             )
     finally:
         _restore_env(prior)
@@ -364,6 +372,7 @@ def _run_one(
         "win_rate_pct": m.get("win_rate_pct"),
         "regimes_in_window": regime.get("regimes_covered"),
         "quality_passed": (res.quality_report or {}).get("overall_passed"),
+        **({"fast_deterministic": res.fast_report} if res.fast_report is not None else {}),
     }
 
 
@@ -551,6 +560,7 @@ def run_sweep(
     exchange: str,
     tp_sl_pct: float,
     tail_steps: int | None,
+    fast: bool = False,
 ) -> dict[str, Any]:
     sweep_id = f"sweep_{int(time.time())}"
     out_dir = runs_dir / "evaluations" / sweep_id
@@ -587,6 +597,7 @@ def run_sweep(
                     runs_dir=runs_dir,
                     sweep_id=sweep_id,
                     tp_sl_pct=tp_sl_pct,
+                    fast=fast,
                 )
                 rows.append(row)
                 print(
@@ -618,6 +629,7 @@ def run_sweep(
                     runs_dir=runs_dir,
                     sweep_id=sweep_id,
                     tp_sl_pct=tp_sl_pct,
+                    fast=fast,
                 )
                 rows.append(row)
 
@@ -628,6 +640,7 @@ def run_sweep(
             "TA momentum via agent 2.3 ta_bundle/v2; presets vary profile_weights "
             "and decision_threshold via deploy_config only (no new env flags)."
         ),
+        "fast_deterministic": bool(fast),
         "rows": rows,
         "aggregate": _aggregate(rows),
         "github_default_recommendation": _github_default_pick(rows),
@@ -659,6 +672,11 @@ def main() -> None:
         default=180,
         help="Also run recent N daily bars (0 to disable). Default 180.",
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Deterministic desk as NumPy arrays (no LLM, no per-bar graph invoke).",
+    )
     args = parser.parse_args()
 
     fp = load_fund_policy()
@@ -687,6 +705,7 @@ def main() -> None:
         exchange=args.exchange,
         tp_sl_pct=tp_sl,
         tail_steps=tail,
+        fast=args.fast,
     )
     out = args.runs_dir / "evaluations" / report["sweep_id"]
     print(json.dumps({"sweep_id": report["sweep_id"], "report_dir": str(out)}, indent=2))
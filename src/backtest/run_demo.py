@@ -235,6 +235,21 @@ def build_run_demo_parser() -> argparse.ArgumentParser:
         metavar="PCT",
         help="Set symmetric take-profit / stop-loss at ±PCT%% from entry. E.g. 5.0 = ±5%% TP/SL. 0 = disabled.",
     )
+    parser.add_argument(
+        "--intrabar",
+        choices=("close", "high_low"),
+        default="close",
+        help=(
+            "TP/SL/liquidation trigger: bar close (default) or the bar's high/low path, "
+            "filled at the crossed level."
+        ),
+    )
+    parser.add_argument(
+        "--intrabar-timeframe",
+        default="",
+        metavar="TF",
+        help="With --intrabar high_low: lower-timeframe bars from the OHLCV cache (e.g. 1m).",
+    )
     parser.add_argument(
         "--forward-validate",
         action="store_true",
@@ -557,6 +572,8 @@ def execute_run_demo(
             leverage=run_leverage,
             take_profit_pct=take_profit_pct,
             stop_loss_pct=stop_loss_pct,
+            intrabar=args.intrabar,
+            intrabar_timeframe=args.intrabar_timeframe,
             deploy_config=deploy_config,
             deploy_profile_weights=_dep_w,
             deploy_profile_id=_dep_id,
@@ -662,6 +679,8 @@ def execute_run_demo(
             leverage=run_leverage,
             take_profit_pct=take_profit_pct,
             stop_loss_pct=stop_loss_pct,
+            intrabar=args.intrabar,
+            intrabar_timeframe=args.intrabar_timeframe,
             deploy_config=deploy_config,
             deploy_profile_weights=_dep_w,
             deploy_profile_id=_dep_id,
@@ -748,6 +767,8 @@ def execute_run_demo(
                 leverage=run_leverage,
                 take_profit_pct=take_profit_pct,
                 stop_loss_pct=stop_loss_pct,
+                intrabar=args.intrabar,
+                intrabar_timeframe=args.intrabar_timeframe,
                 deploy_config=deploy_config,
                 deploy_profile_weights=_dep_w,
                 deploy_profile_id=_dep_id,
@@ -764,6 +785,8 @@ def execute_run_demo(
                 runs_dir=runs_dir_path,
                 take_profit_pct=take_profit_pct,
                 stop_loss_pct=stop_loss_pct,
+                intrabar=args.intrabar,
+                intrabar_timeframe=args.intrabar_timeframe,
                 instrument=args.instrument,
                 leverage=run_leverage,
                 deploy_config=deploy_config,
@@ -1,12 +1,24 @@
-"""Append-only trade / equity journal for backtests (JSONL)."""
+"""Append-only trade / equity journal for backtests (JSONL, optionally Parquet).
+
+``PerpEngine`` streams ``equity`` / ``trades`` rows into a journal as the run progresses;
+readers (API, HTML report, export bundle) take row slices or column subsets through
+:func:`read_journal_rows` / :func:`iter_journal_rows` without knowing the file format.
+"""
 
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping, Sequence
+import logging
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+from storage.jsonl_tail import tail_jsonl
+
+logger = logging.getLogger(__name__)
+
 
 def append_jsonl(path: Path, row: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -30,14 +42,24 @@ def _expand_jsonl_value(val: Any) -> list[dict[str, Any]]:
     return []
 
 
-def read_jsonl_dict_records(path: Path, *, limit: int | None = None) -> list[dict[str, Any]]:
+def read_jsonl_dict_records(
+    path: Path, *, limit: int | None = None, tail: int | None = None
+) -> list[dict[str, Any]]:
     """Read ``.jsonl`` rows as dicts.
 
+    ``limit`` stops after the first N rows; ``tail`` returns the last N rows by seeking
+    backwards from EOF, without reading the rest of the file.
     Supports **legacy** files where a single line held a JSON array of records (older engine bug).
+    A ``.parquet`` journal path is read the same way.
     """
     out: list[dict[str, Any]] = []
     if not path.is_file():
         return out
+    if path.suffix == ".parquet":
+        rows = iter_journal_rows(path)
+        return list(deque(rows, maxlen=tail)) if tail is not None else list(islice(rows, limit))
+    if tail is not None:
+        return tail_jsonl(path, int(tail), expand_arrays=True, strict=True)
     with path.open(encoding="utf-8") as f:
         for line in f:
             line = line.strip()
@@ -49,3 +71,212 @@ def read_jsonl_dict_records(path: Path, *, limit: int | None = None) -> list[dic
                 if limit is not None and len(out) >= limit:
                     return out
     return out
+
+
+# --- Streaming run journals (``equity`` / ``trades``) -------------------------------------
+
+ARTIFACT_FORMATS = ("jsonl", "parquet")
+
+# Parquet column types; JSONL rows carry the same keys (optional ones may be absent).
+_JOURNAL_SCHEMAS: dict[str, tuple[tuple[str, str], ...]] = {
+    "equity": (
+        ("ts", "int64"),
+        ("capital", "double"),
+        ("unrealized_pnl", "double"),
+        ("equity", "double"),
+        ("positions", "int64"),
+    ),
+    "trades": (
+        ("run_id", "string"),
+        ("symbol", "string"),
+        ("direction", "int64"),
+        ("entry_price", "double"),
+        ("exit_price", "double"),
+        ("size", "double"),
+        ("leverage", "double"),
+        ("pnl", "double"),
+        ("pnl_pct", "double"),
+        ("exit_reason", "string"),
+        ("holding_bars", "int64"),
+        ("commission", "double"),
+        ("exit_bar_index", "int64"),
+        ("entry_bar_index", "int64"),
+        ("entry_ts_ms", "int64"),
+        ("time", "int64"),
+        ("exit_ts_ms", "int64"),
+    ),
+}
+
+
+class JsonlJournal:
+    """Appends one JSON object per line as rows arrive (nothing is held in memory)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = path.open("w", encoding="utf-8")
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self._f.write(json.dumps(dict(row), default=str) + "\n")
+        self.rows += 1
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+
+class ParquetJournal:
+    """Buffers ``batch_rows`` rows, then writes them as one Parquet row group."""
+
+    def __init__(self, path: Path, name: str, *, batch_rows: int = 4096) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.rows = 0
+        self._pa = pa
+        self._schema = pa.schema(
+            [(col, pa.type_for_alias(typ)) for col, typ in _JOURNAL_SCHEMAS[name]]
+        )
+        self._batch_rows = max(1, int(batch_rows))
+        self._buf: list[dict[str, Any]] = []
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._closed = False
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self._buf.append(dict(row))
+        self.rows += 1
+        if len(self._buf) >= self._batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buf:
+            self._writer.write_table(self._pa.Table.from_pylist(self._buf, schema=self._schema))
+            self._buf = []
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._flush()
+        self._writer.close()
+        self._closed = True
+
+
+def open_journal(run_dir: Path, name: str, *, fmt: str = "jsonl") -> JsonlJournal | ParquetJournal:
+    """Streaming writer for ``<run_dir>/<name>.jsonl`` (or ``.parquet``).
+
+    Parquet needs ``pyarrow`` (the ``export`` extra); without it the journal falls back to
+    JSONL with a warning rather than failing the run.
+    """
+    if name not in _JOURNAL_SCHEMAS:
+        raise ValueError(f"unknown journal {name!r}")
+    fmt = (fmt or "jsonl").strip().lower()
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"artifact format must be one of {ARTIFACT_FORMATS}, got {fmt!r}")
+    # A rerun under the same run_id must not leave the other format behind for readers.
+    for suffix in (".parquet", ".jsonl"):
+        (run_dir / f"{name}{suffix}").unlink(missing_ok=True)
+    if fmt == "parquet":
+        try:
+            return ParquetJournal(run_dir / f"{name}.parquet", name)
+        except ImportError:
+            logger.warning("pyarrow not installed; writing %s.jsonl instead of Parquet", name)
+    return JsonlJournal(run_dir / f"{name}.jsonl")
+
+
+def journal_path(run_dir: Path, name: str) -> Path | None:
+    """The run's ``name`` journal, Parquet first; None when neither file exists."""
+    for suffix in (".parquet", ".jsonl"):
+        path = run_dir / f"{name}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def _project(row: dict[str, Any], columns: Sequence[str] | None) -> dict[str, Any]:
+    if columns is None:
+        return row
+    return {c: row[c] for c in columns if c in row}
+
+
+def iter_journal_rows(
+    path: Path, *, columns: Sequence[str] | None = None, batch_rows: int = 8192
+) -> Iterator[dict[str, Any]]:
+    """Stream rows (optionally only ``columns``) without loading the whole journal."""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(str(path))
+        cols = [c for c in columns if c in pf.schema_arrow.names] if columns else None
+        for batch in pf.iter_batches(batch_size=batch_rows, columns=cols):
+            for row in batch.to_pylist():
+                yield _project({k: v for k, v in row.items() if v is not None}, columns)
+        return
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            for row in _expand_jsonl_value(json.loads(line)):
+                yield _project(row, columns)
+
+
+def read_journal_rows(
+    run_dir: Path,
+    name: str,
+    *,
+    columns: Sequence[str] | None = None,
+    start: int = 0,
+    stop: int | None = None,
+    tail: int | None = None,
+) -> list[dict[str, Any]]:
+    """Rows ``[start:stop]`` (or the last ``tail``) of a run journal, JSONL or Parquet.
+
+    Parquet decodes only the requested columns of the row groups overlapping the slice;
+    JSONL is streamed line by line (``tail`` seeks back from EOF).
+    """
+    path = journal_path(run_dir, name)
+    if path is None:
+        return []
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(str(path))
+        cols = [c for c in columns if c in pf.schema_arrow.names] if columns else None
+        meta = pf.metadata
+        n = meta.num_rows
+        lo, hi = (
+            (max(0, n - int(tail)), n) if tail is not None else slice(start, stop).indices(n)[:2]
+        )
+        if hi <= lo:
+            return []
+        groups: list[int] = []
+        first = offset = 0
+        for i in range(meta.num_row_groups):
+            size = meta.row_group(i).num_rows
+            if offset < hi and offset + size > lo:
+                if not groups:
+                    first = offset
+                groups.append(i)
+            offset += size
+        table = pf.read_row_groups(groups, columns=cols)
+        rows = table.slice(lo - first, hi - lo).to_pylist()
+        return [_project({k: v for k, v in r.items() if v is not None}, columns) for r in rows]
+    if tail is not None:
+        return [_project(r, columns) for r in read_jsonl_dict_records(path, tail=tail)]
+    return list(islice(iter_journal_rows(path, columns=columns), max(0, start), stop))
+
+
+def journal_row_count(run_dir: Path, name: str) -> int:
+    """Row count from Parquet metadata, or a streamed line count for JSONL."""
+    path = journal_path(run_dir, name)
+    if path is None:
+        return 0
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        return int(pq.ParquetFile(str(path)).metadata.num_rows)
+    with path.open(encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
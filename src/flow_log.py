@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -25,6 +26,8 @@ class FlowEventRepo:
         self.run_id = run_id
         self.log_path = log_path
         self._events: List[FlowEvent] = []
+        # Guards ``_events`` and the log file; concurrent per-symbol signals share one repo.
+        self._lock = threading.Lock()
 
     def emit(self, event: FlowEvent) -> None:
         if self.run_id and event.run_id is None:
@@ -34,7 +37,8 @@ class FlowEventRepo:
                 run_id=self.run_id,
                 payload=event.payload,
             )
-        self._events.append(event)
+        with self._lock:
+            self._events.append(event)
         if self.log_path:
             self._append_to_file(event)
 
@@ -51,25 +55,28 @@ class FlowEventRepo:
                         return
                 except OSError:
                     pass
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(event.to_dict(), default=str) + "\n")
+            line = json.dumps(event.to_dict(), default=str) + "\n"
+            with self._lock, open(self.log_path, "a") as f:
+                f.write(line)
         except OSError:
             pass
 
     def events(self) -> List[FlowEvent]:
-        return list(self._events)
+        with self._lock:
+            return list(self._events)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "run_id": self.run_id,
-            "events": [e.to_dict() for e in self._events],
+            "events": [e.to_dict() for e in self.events()],
         }
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), default=str, indent=2)
 
     def clear(self) -> None:
-        self._events.clear()
+        with self._lock:
+            self._events.clear()
 
 
 # Global repo for the current run; workflow can set this before invoke.
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
 from collections import deque
 from dataclasses import dataclass
@@ -46,31 +47,37 @@ class RunWorkingMemory:
         self._tool_events: deque[dict[str, Any]] = deque(
             maxlen=max(0, int(cfg.recent_tool_events_max))
         )
+        # Concurrent per-symbol signals record and snapshot from several threads.
+        self._lock = threading.Lock()
 
     def record_view(self, view: dict[str, Any]) -> None:
         if self._views.maxlen == 0:
             return
         if isinstance(view, dict):
-            self._views.append(dict(view))
+            with self._lock:
+                self._views.append(dict(view))
 
     def record_decision(self, decision: dict[str, Any]) -> None:
         if self._decisions.maxlen == 0:
             return
         if isinstance(decision, dict):
-            self._decisions.append(dict(decision))
+            with self._lock:
+                self._decisions.append(dict(decision))
 
     def record_tool_event_summary(self, event: dict[str, Any]) -> None:
         if self._tool_events.maxlen == 0:
             return
         if isinstance(event, dict):
-            self._tool_events.append(dict(event))
+            with self._lock:
+                self._tool_events.append(dict(event))
 
     def to_shared_memory_fragment(self) -> dict[str, Any]:
-        return {
-            "recent_views": list(self._views),
-            "recent_decisions": list(self._decisions),
-            "recent_tool_events": list(self._tool_events),
-        }
+        with self._lock:
+            return {
+                "recent_views": list(self._views),
+                "recent_decisions": list(self._decisions),
+                "recent_tool_events": list(self._tool_events),
+            }
 
 
 class IterationReceiptWriter:
@@ -81,13 +88,16 @@ class IterationReceiptWriter:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if self.path.exists():
             self.path.unlink()
+        # Concurrent per-symbol signals share one writer.
+        self._lock = threading.Lock()
 
     def append(self, rec: dict[str, Any]) -> None:
         if not isinstance(rec, dict):
             return
         try:
-            with self.path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(rec, default=str) + "\n")
+            line = json.dumps(rec, default=str) + "\n"
+            with self._lock, self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
         except Exception:
             return
 
@@ -6,58 +6,28 @@ Deterministic Tier-0 output is prompt context only. On failure, emit
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
-
-from openai import OpenAI
+from typing import TYPE_CHECKING, Any
 
 from config.llm_env import resolve_llm_config
-
-# Lazy-loaded decision cache
-_DECISION_CACHE: Any = None
-
-
-def _get_decision_cache() -> Any:
-    global _DECISION_CACHE
-    if _DECISION_CACHE is not None:
-        return _DECISION_CACHE
-    try:
-        from llm.decision_cache import (
-            decision_cache_enabled,
-            read_cached_decision,
-            write_cached_decision,
-        )
-
-        _DECISION_CACHE = {
-            "read": read_cached_decision,
-            "write": write_cached_decision,
-            "enabled": decision_cache_enabled,
-        }
-    except ImportError:
-        _DECISION_CACHE = {}
-    return _DECISION_CACHE
-
-
-def _cache_key_for_agent(
-    agent_id: str,
-    ticker: str | None,
-    prompt_text: str,
-) -> str | None:
-    """Generate a deterministic cache key for this agent call.
-
-    Returns None if caching is disabled.
-    """
-    cache = _get_decision_cache()
-    enabled_fn = cache.get("enabled")
-    if enabled_fn and not enabled_fn():
-        return None
-    raw = f"{agent_id}|{ticker or ''}|{prompt_text}"
-    return hashlib.sha256(raw.encode()).hexdigest()
-
+from llm.client_pool import create_chat_completion, get_openai_client
+from llm.decision_cache import (
+    decision_cache_enabled,
+    prompt_key,
+    read_cached_decision,
+    write_cached_decision,
+)
+from llm.inference_scheduler import estimate_tokens, get_llm_scheduler
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -151,7 +121,10 @@ def _init_llm() -> None:
             "agent_llm mode requires an LLM API key. "
             "Set DEEPSEEK_API_KEY, OPENAI_API_KEY, or ATLASCLOUD_API_KEY."
         )
-    _LLM_CLIENT = OpenAI(api_key=llm_config.api_key, base_url=llm_config.base_url)
+    # Shares the pooled connection pool; retries are handled by the inference scheduler.
+    _LLM_CLIENT = get_openai_client(
+        api_key=llm_config.api_key, base_url=llm_config.base_url
+    ).with_options(max_retries=0)
     _LLM_MODEL = llm_config.model
     logger.info(
         "agent_llm client initialised (model=%s, base=%s)",
@@ -171,24 +144,43 @@ def get_default_model() -> str:
     return _LLM_MODEL
 
 
+# path -> ((mtime_ns, size), text); persona/SKILL.md are re-read only after an edit.
+_MD_CACHE: dict[Path, tuple[tuple[int, int], str]] = {}
+_MD_CACHE_LOCK = threading.Lock()
+
+
+def _read_markdown(path: Path) -> str | None:
+    """Read ``path`` memoized by mtime/size; None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _MD_CACHE_LOCK:
+        hit = _MD_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    text = path.read_text(encoding="utf-8")
+    with _MD_CACHE_LOCK:
+        _MD_CACHE[path] = (stamp, text)
+    return text
+
+
 def _load_persona(agent_id: str) -> str:
     info = _AGENT_INFO.get(agent_id)
     if not info:
         return f"You are a generic trading analyst (agent {agent_id})."
-    persona_path = _AGENTS_BASE / info["dir"] / "persona.md"
-    if not persona_path.is_file():
+    text = _read_markdown(_AGENTS_BASE / info["dir"] / "persona.md")
+    if text is None:
         return f"You are {info['name']} (agent {agent_id})."
-    return persona_path.read_text(encoding="utf-8")
+    return text
 
 
 def _load_skill(agent_id: str) -> str:
     info = _AGENT_INFO.get(agent_id)
     if not info:
         return ""
-    skill_path = _AGENTS_BASE / info["dir"] / "SKILL.md"
-    if not skill_path.is_file():
-        return ""
-    return skill_path.read_text(encoding="utf-8")
+    return _read_markdown(_AGENTS_BASE / info["dir"] / "SKILL.md") or ""
 
 
 def _ohlcv_for_ticker(state: dict[str, Any], ticker: str) -> list[Any]:
@@ -330,47 +322,102 @@ def _build_deterministic_context(contract: dict[str, Any] | None, agent_id: str)
     return "\n".join(parts)
 
 
-def _build_market_context(
-    state: dict[str, Any],
-    ticker: str | None = None,
-    deterministic_contract: dict[str, Any] | None = None,
-    agent_id: str | None = None,
-) -> str:
-    """Build rich market context for an LLM agent prompt.
+# (universe, Nexus digest) -> formatted global fragments; every symbol of a bar shares one entry.
+_GLOBAL_CONTEXT: OrderedDict[tuple[Any, ...], tuple[str, ...]] = OrderedDict()
+_GLOBAL_CONTEXT_LOCK = threading.Lock()
+_GLOBAL_CONTEXT_MAX = 256
 
-    Includes:
-    - Ticker and universe
-    - OHLCV bars (last 30, price stats)
-    - Order book depth
-    - Nexus news / funding / OI / on-chain
-    - Deterministic Tier-0 findings (context only, not fallback)
+
+def _global_context_key(state: dict[str, Any]) -> tuple[Any, ...]:
+    """Digest of the state the universe and Nexus fragments are built from."""
+    universe = state.get("universe")
+    uni_key = tuple(str(s) for s in universe[:10]) if isinstance(universe, (list, tuple)) else ()
+    nexus = (state.get("shared_memory") or {}).get("nexus")
+    if not isinstance(nexus, dict):
+        return uni_key, ""
+    news = nexus.get("news")
+    read = {
+        "news": news[:5] if isinstance(news, list) else None,
+        "funding": nexus.get("funding"),
+        "oi": nexus.get("open_interest") or nexus.get("oi"),
+        "onchain": nexus.get("onchain"),
+    }
+    blob = json.dumps(read, sort_keys=True, default=str).encode("utf-8")
+    return uni_key, hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _global_context_lines(state: dict[str, Any]) -> tuple[str, ...]:
+    """Universe and Nexus sections, memoized across the symbols of a bar."""
+    key = _global_context_key(state)
+    with _GLOBAL_CONTEXT_LOCK:
+        hit = _GLOBAL_CONTEXT.get(key)
+        if hit is not None:
+            _GLOBAL_CONTEXT.move_to_end(key)
+            return hit
+    lines: list[str] = []
+    uni = _build_universe_context(state)
+    if uni:
+        lines.append(f"## Universe\n{uni}")
+    nexus = _build_nexus_context(state)
+    if nexus:
+        lines.append(f"## Nexus Data\n{nexus}")
+    out = tuple(lines)
+    with _GLOBAL_CONTEXT_LOCK:
+        _GLOBAL_CONTEXT[key] = out
+        while len(_GLOBAL_CONTEXT) > _GLOBAL_CONTEXT_MAX:
+            _GLOBAL_CONTEXT.popitem(last=False)
+    return out
+
+
+def build_shared_market_context(state: dict[str, Any], ticker: str | None = None) -> str:
+    """Agent-independent part of the prompt context for one ticker and bar.
+
+    Global fragments (universe, Nexus bundle) come first so the prompt prefix is
+    byte-identical across symbols in a bar; ticker-specific OHLCV and depth follow.
+    Callers running several agents on the same state build this once and pass it to
+    :func:`infer_agent` as ``shared_context``. The global fragments are memoized by
+    universe and Nexus digest, so only the per-ticker sections are rebuilt per symbol.
     """
     if not ticker:
         ticker = state.get("ticker", "BTC/USDT")
-    lines = [f"Ticker: {ticker}"]
+    lines = list(_global_context_lines(state))
 
-    uni = _build_universe_context(state)
-    if uni:
-        lines.append(f"\n## Universe\n{uni}")
+    lines.append(f"## Ticker\n{ticker}")
 
     ohlcv = _ohlcv_for_ticker(state, ticker)
     ohlcv_str = _ohlcv_summary(ohlcv, max_bars=30)
-    lines.append(f"\n## OHLCV Data ({ticker})\n{ohlcv_str}")
+    lines.append(f"## OHLCV Data ({ticker})\n{ohlcv_str}")
 
     depth = _build_depth_context(state, ticker)
     if depth:
-        lines.append(f"\n## Order Book\n{depth}")
+        lines.append(f"## Order Book\n{depth}")
 
-    nexus = _build_nexus_context(state)
-    if nexus:
-        lines.append(f"\n## Nexus Data\n{nexus}")
+    return "\n\n".join(lines)
+
+
+def _build_market_context(
+    state: dict[str, Any],
+    ticker: str | None = None,
+    deterministic_contract: dict[str, Any] | None = None,
+    agent_id: str | None = None,
+    *,
+    shared_context: str | None = None,
+) -> str:
+    """Build rich market context for an LLM agent prompt.
 
+    Includes:
+    - Universe and Nexus news / funding / OI / on-chain (shared across symbols)
+    - Ticker, OHLCV bars (last 30, price stats) and order book depth
+    - Deterministic Tier-0 findings (context only, not fallback), last because
+      they are the only per-agent part
+    """
+    if shared_context is None:
+        shared_context = build_shared_market_context(state, ticker)
     if deterministic_contract is not None and agent_id is not None:
         det = _build_deterministic_context(deterministic_contract, agent_id)
         if det:
-            lines.append(f"\n## Deterministic Baseline\n{det}")
-
-    return "\n".join(lines)
+            return f"{shared_context}\n\n## Deterministic Baseline\n{det}"
+    return shared_context
 
 
 def _output_schema_json(agent_id: str) -> str:
@@ -379,21 +426,13 @@ def _output_schema_json(agent_id: str) -> str:
     return json.dumps(neutral, indent=2)
 
 
-def _build_agent_prompt(
-    agent_id: str,
-    persona: str,
-    skill: str,
-    market_context: str,
-) -> tuple[str, str]:
-    """Build system + user prompt for a single agent LLM inference.
-
-    The LLM is instructed to produce the SAME PascalCase fields the
-    weight assigner reads, with no fallback to deterministic math.
-    """
+@functools.lru_cache(maxsize=64)
+def _system_prompt(agent_id: str, persona: str, skill: str) -> str:
+    """Per-agent system prompt; identical bytes on every call so provider prefix caches hit."""
     agent_name = _AGENT_INFO.get(agent_id, {}).get("name", f"Agent {agent_id}")
     schema_json = _output_schema_json(agent_id)
 
-    system = (
+    return (
         f"You are {agent_name} (agent ID: {agent_id}), a specialised agent "
         f"in a multi-agent trading system.\n\n"
         f"## Your Persona\n{persona}\n\n"
@@ -413,8 +452,20 @@ def _build_agent_prompt(
         "Output ONLY the JSON on a single line or pretty-printed. No preamble, no markdown fences.\n"
     )
 
-    user = f"## Current Market Data\n{market_context}\n\nProduce your structured signal now."
 
+def _build_agent_prompt(
+    agent_id: str,
+    persona: str,
+    skill: str,
+    market_context: str,
+) -> tuple[str, str]:
+    """Build system + user prompt for a single agent LLM inference.
+
+    The LLM is instructed to produce the SAME PascalCase fields the
+    weight assigner reads, with no fallback to deterministic math.
+    """
+    system = _system_prompt(agent_id, persona, skill)
+    user = f"## Current Market Data\n{market_context}\n\nProduce your structured signal now."
     return system, user
 
 
@@ -509,6 +560,7 @@ def infer_agent(
     model: str | None = None,
     temperature: float = 0.1,
     max_tokens: int = 1024,
+    shared_context: str | None = None,
 ) -> dict[str, Any]:
     """Run a single agent's LLM inference.
 
@@ -524,6 +576,8 @@ def infer_agent(
         model: Model override (default from ``AIMM_LLM_MODEL`` env).
         temperature: LLM temperature.
         max_tokens: Max output tokens.
+        shared_context: Precomputed :func:`build_shared_market_context` for
+            ``state``/``ticker``; built here when omitted.
 
     Returns:
         Dict with the agent's PascalCase fields + metadata.
@@ -544,37 +598,44 @@ def infer_agent(
         ticker=ticker,
         deterministic_contract=deterministic_contract,
         agent_id=agent_id,
+        shared_context=shared_context,
     )
 
     system, user = _build_agent_prompt(agent_id, persona, skill, market_context)
 
-    # Decision cache: check before LLM call
-    cache = _get_decision_cache()
-    full_prompt = system + "\n" + user
-    ck = _cache_key_for_agent(agent_id, ticker or state.get("ticker", ""), full_prompt)
+    # Decision cache: content-addressed by model + prompts, checked before the LLM call.
+    model_name = model or get_default_model()
+    cache_ticker = str(ticker or state.get("ticker") or "")
+    ck: str | None = None
+    if decision_cache_enabled():
+        # Sampling settings change the response, so they are part of the address.
+        extra = json.dumps({"temperature": temperature, "max_tokens": max_tokens}, sort_keys=True)
+        ck = prompt_key(model_name, system, user, extra=extra)
     if ck:
-        cached = cache.get("read")
-        if cached:
-            hit = cached(agent_id, ck)
-            if hit is not None:
-                logger.info("agent_llm: cache HIT for %s (key=%s...)", agent_id, ck[:12])
-                hit["agent"] = agent_id
-                hit["agent_id"] = agent_id
-                hit["source"] = "agent_llm"
-                hit["llm_enabled"] = True
-                hit["cached"] = True
-                return _fill_missing_fields(hit, agent_id)
+        hit = read_cached_decision(ck)
+        if hit is not None:
+            logger.info("agent_llm: cache HIT for %s (key=%s...)", agent_id, ck[:12])
+            hit["agent"] = agent_id
+            hit["agent_id"] = agent_id
+            hit["source"] = "agent_llm"
+            hit["llm_enabled"] = True
+            hit["cached"] = True
+            return _fill_missing_fields(hit, agent_id)
 
     try:
-        resp = client.chat.completions.create(
-            model=model or get_default_model(),
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-            timeout=45,
+        resp = get_llm_scheduler().call(
+            lambda: create_chat_completion(
+                client,
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=45,
+            ),
+            est_tokens=estimate_tokens(system, user, max_tokens=max_tokens),
         )
     except Exception as e:
         logger.warning("agent_llm: LLM call failed for %s: %s", agent_id, e)
@@ -594,12 +655,8 @@ def infer_agent(
     result["llm_enabled"] = True
 
     # Write to cache for reproducibility
-    write_fn = cache.get("write")
-    if ck and write_fn:
-        try:
-            write_fn(agent_id, ck, result)
-        except Exception as e:
-            logger.debug("agent_llm: cache write failed: %s", e)
+    if ck:
+        write_cached_decision(ck, result, agent_id=agent_id, ticker=cache_ticker, model=model_name)
 
     return result
 
@@ -617,6 +674,7 @@ def check_api_key() -> str | None:
 
 
 __all__ = [
+    "build_shared_market_context",
     "infer_agent",
     "check_api_key",
     "get_default_model",
@@ -340,6 +340,8 @@ def signal_arbitrator_llm(state: HedgeFundState) -> Dict[str, Any]:
                 model=model_name,
                 temperature=(ps.temperature if ps is not None else None),
                 max_tokens=(ps.max_tokens if ps is not None else None),
+                cache_agent_id="signal_arbitrator",
+                cache_ticker=ticker,
             )
             last_text = text or ""
         except Exception as exc:
@@ -0,0 +1,237 @@
+"""Shared OpenAI-compatible client registry.
+
+``OpenAI(...)`` owns an ``httpx`` connection pool; building one per call (as
+``run_tool_calling_chat`` used to) throws away keep-alive connections and TLS sessions on
+every arbitrator / portfolio / debate round. Clients are cached here by
+``(base_url, api_key, timeout)`` and shared across callers and threads.
+
+:func:`create_chat_completion` wraps ``chat.completions.create`` with per-provider
+latency and token counters (:func:`provider_stats`). :func:`get_async_openai_client`
+and :func:`acreate_chat_completion` are the ``AsyncOpenAI`` equivalents for callers
+that fan out with ``asyncio.gather``. Async clients are pooled per event loop, because
+an ``httpx.AsyncClient`` cannot be shared across loops. The pool holds each loop weakly,
+so a collected loop drops its clients, and a new loop that reuses a dead loop's ``id``
+never inherits them. :func:`aclose_async_clients` closes the running loop's clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+ClientKey = tuple[str, str, float]
+
+_CLIENTS: dict[ClientKey, OpenAI] = {}
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[ClientKey, AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+_LOCK = threading.Lock()
+
+
+def _client_key(api_key: str, base_url: str | None, timeout: float | None) -> ClientKey:
+    return (base_url or _DEFAULT_BASE_URL, api_key, float(timeout or 0.0))
+
+
+def _build(cls: Any, api_key: str, base_url: str | None, timeout: float | None) -> Any:
+    # OpenAI SDK options vary across versions; keep a safe fallback if kwargs are unsupported.
+    try:
+        if timeout:
+            return cls(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=2)
+        return cls(api_key=api_key, base_url=base_url, max_retries=2)
+    except TypeError:
+        try:
+            return cls(api_key=api_key, base_url=base_url, timeout=timeout)
+        except TypeError:
+            return cls(api_key=api_key, base_url=base_url)
+
+
+def get_openai_client(
+    *, api_key: str, base_url: str | None = None, timeout: float | None = None
+) -> OpenAI:
+    """Pooled sync client for one provider endpoint (created on first use)."""
+    from openai import OpenAI
+
+    key = _client_key(api_key, base_url, timeout)
+    with _LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _build(OpenAI, api_key, base_url, timeout)
+            _CLIENTS[key] = client
+            logger.debug("openai client pool: new client for %s (timeout=%s)", key[0], key[2])
+        return client
+
+
+def get_async_openai_client(
+    *, api_key: str, base_url: str | None = None, timeout: float | None = None
+) -> AsyncOpenAI:
+    """Pooled ``AsyncOpenAI`` client for the running event loop.
+
+    Outside a loop there is nothing to bind to, so the caller gets an unpooled client it owns.
+    """
+    from openai import AsyncOpenAI
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _build(AsyncOpenAI, api_key, base_url, timeout)
+    key = _client_key(api_key, base_url, timeout)
+    with _LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = _build(AsyncOpenAI, api_key, base_url, timeout)
+            clients[key] = client
+        return client
+
+
+async def aclose_async_clients() -> None:
+    """Evict and close the running loop's pooled clients (await before the loop ends)."""
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        clients = list((_ASYNC_CLIENTS.pop(loop, None) or {}).values())
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug("async openai client close failed: %s", e)
+
+
+def close_clients() -> None:
+    """Drop every pooled client and close its sync connection pool (tests / shutdown).
+
+    Async clients are only dropped; use :func:`aclose_async_clients` inside their loop.
+    """
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug("openai client close failed: %s", e)
+
+
+class ProviderStats:
+    """Thread-safe per-provider counters: calls, errors, latency, prompt/completion tokens."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: dict[str, dict[str, float]] = {}
+
+    def record(
+        self,
+        provider: str,
+        *,
+        latency_s: float,
+        usage: Any = None,
+        error: bool = False,
+    ) -> None:
+        prompt = int(getattr(usage, "prompt_tokens", 0) or 0)
+        completion = int(getattr(usage, "completion_tokens", 0) or 0)
+        with self._lock:
+            row = self._rows.setdefault(
+                provider,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "latency_s_total": 0.0,
+                    "latency_s_max": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                },
+            )
+            row["calls"] += 1
+            row["errors"] += int(error)
+            row["latency_s_total"] += latency_s
+            row["latency_s_max"] = max(row["latency_s_max"], latency_s)
+            row["prompt_tokens"] += prompt
+            row["completion_tokens"] += completion
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            out: dict[str, dict[str, Any]] = {}
+            for provider, row in self._rows.items():
+                calls = int(row["calls"])
+                out[provider] = {
+                    **row,
+                    "calls": calls,
+                    "errors": int(row["errors"]),
+                    "prompt_tokens": int(row["prompt_tokens"]),
+                    "completion_tokens": int(row["completion_tokens"]),
+                    "latency_s_avg": row["latency_s_total"] / calls if calls else 0.0,
+                }
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+_STATS = ProviderStats()
+
+
+def provider_stats() -> dict[str, dict[str, Any]]:
+    """Counters per provider base URL since process start (or the last reset)."""
+    return _STATS.snapshot()
+
+
+def reset_provider_stats() -> None:
+    _STATS.reset()
+
+
+def _provider_label(client: Any) -> str:
+    return str(getattr(client, "base_url", "") or _DEFAULT_BASE_URL).rstrip("/")
+
+
+def create_chat_completion(client: OpenAI, **kwargs: Any) -> Any:
+    """``client.chat.completions.create(**kwargs)`` with latency/token accounting.
+
+    For ``stream=True`` the latency is time to the first response, and no tokens are counted.
+    """
+    provider = _provider_label(client)
+    t0 = time.perf_counter()
+    try:
+        resp = client.chat.completions.create(**kwargs)
+    except Exception:
+        _STATS.record(provider, latency_s=time.perf_counter() - t0, error=True)
+        raise
+    _STATS.record(provider, latency_s=time.perf_counter() - t0, usage=getattr(resp, "usage", None))
+    return resp
+
+
+async def acreate_chat_completion(client: AsyncOpenAI, **kwargs: Any) -> Any:
+    """Async counterpart of :func:`create_chat_completion`."""
+    provider = _provider_label(client)
+    t0 = time.perf_counter()
+    try:
+        resp = await client.chat.completions.create(**kwargs)
+    except Exception:
+        _STATS.record(provider, latency_s=time.perf_counter() - t0, error=True)
+        raise
+    _STATS.record(provider, latency_s=time.perf_counter() - t0, usage=getattr(resp, "usage", None))
+    return resp
+
+
+__all__ = [
+    "ProviderStats",
+    "acreate_chat_completion",
+    "aclose_async_clients",
+    "close_clients",
+    "create_chat_completion",
+    "get_async_openai_client",
+    "get_openai_client",
+    "provider_stats",
+    "reset_provider_stats",
+]
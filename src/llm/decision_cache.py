@@ -1,4 +1,13 @@
-"""File-backed decision cache for reproducible agent_llm backtests."""
+"""Content-addressed LLM decision cache for reproducible agent_llm backtests.
+
+One SQLite file keyed by a hash of model + system + user prompt, stored in a
+:class:`~storage.sqlite_lru.SqliteLruStore` (WAL journal, LRU eviction, trigger-kept
+counters). ``agent_id`` / ``ticker`` are indexed columns for targeted invalidation.
+
+Shared by ``agent_llm_client.infer_agent`` and ``openai_client.run_tool_calling_chat``
+(arbitrator, portfolio and desk-debate calls), so a repeated backtest over the same
+window replays every LLM decision from disk.
+"""
 
 from __future__ import annotations
 
@@ -6,38 +15,23 @@ import hashlib
 import json
 import logging
 import os
-import time
+import sqlite3
 from pathlib import Path
 from typing import Any
 
+from storage.sqlite_lru import SharedStore, SqliteLruStore, env_cache_dir, env_max_entries
+
 logger = logging.getLogger(__name__)
 
 _CACHE_ENV = "AIMM_DECISION_CACHE_DIR"
+_MAX_ENTRIES_ENV = "AIMM_DECISION_CACHE_MAX_ENTRIES"
 _DEFAULT_CACHE_DIR = ".cache/decisions"
+_DB_NAME = "decisions.sqlite3"
+_DEFAULT_MAX_ENTRIES = 200_000
 
 
 def _cache_dir() -> Path:
-    override = (os.getenv(_CACHE_ENV) or "").strip()
-    return Path(override) if override else Path(_DEFAULT_CACHE_DIR)
-
-
-def _ensure_dir(path: Path) -> None:
-    path.mkdir(parents=True, exist_ok=True)
-
-
-def _cache_key(
-    agent_id: str,
-    ticker: str,
-    date_tag: str,
-    prompt_hash: str,
-) -> str:
-    raw = f"{agent_id}|{ticker}|{date_tag}|{prompt_hash}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:32]
-
-
-def _cache_path(key: str) -> Path:
-    d = _cache_dir() / key[:2] / key[2:4]
-    return d / f"{key}.json"
+    return env_cache_dir(_CACHE_ENV, _DEFAULT_CACHE_DIR)
 
 
 def decision_cache_enabled() -> bool:
@@ -53,38 +47,95 @@ def decision_cache_enabled() -> bool:
     return mode in ("backtest",)
 
 
-def read_cached_decision(
-    agent_id: str,
-    ticker: str,
-    date_tag: str,
-    prompt_hash: str,
-) -> dict[str, Any] | None:
-    """Read a cached decision for the given agent + context.
+def prompt_key(model: str, system: str, user: str, *, extra: str = "") -> str:
+    """Content address for one LLM call.
+
+    ``extra`` folds in anything else that changes the response (tool names, history).
+    """
+    h = hashlib.sha256()
+    for part in (model or "", system or "", user or "", extra or ""):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class DecisionCache(SqliteLruStore):
+    """Decision JSON over :class:`~storage.sqlite_lru.SqliteLruStore`.
+
+    ``agent_id`` / ``ticker`` / ``model`` are tag columns; Tier-0 inference threads share
+    one connection per process.
+    """
+
+    def __init__(self, db_path: Path | str, *, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        super().__init__(
+            db_path,
+            table="decisions",
+            stats_table="decision_stats",
+            tags=("agent_id", "ticker", "model"),
+            max_entries=max_entries,
+        )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.get_payload(key)
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning("Decision cache read error for %s: %s", key[:12], e)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def put(
+        self,
+        key: str,
+        decision: dict[str, Any],
+        *,
+        agent_id: str = "",
+        ticker: str = "",
+        model: str = "",
+    ) -> None:
+        payload = json.dumps(decision, default=str, separators=(",", ":"))
+        self.put_payload(key, payload, agent_id=agent_id, ticker=ticker, model=model)
+
+    def invalidate(self, *, agent_id: str | None = None, ticker: str | None = None) -> int:
+        return super().invalidate(agent_id=agent_id, ticker=ticker)
+
+
+_CACHE: SharedStore[DecisionCache] = SharedStore(
+    lambda: _cache_dir() / _DB_NAME,
+    lambda path: DecisionCache(
+        path, max_entries=env_max_entries(_MAX_ENTRIES_ENV, _DEFAULT_MAX_ENTRIES)
+    ),
+)
+
+
+def _get_cache() -> DecisionCache:
+    """Process-wide cache for the current ``AIMM_DECISION_CACHE_DIR`` (reopened if it changes)."""
+    return _CACHE.get()
+
+
+def read_cached_decision(key: str) -> dict[str, Any] | None:
+    """Read a cached decision by :func:`prompt_key`.
 
     Returns None if cache miss or disabled.
     """
     if not decision_cache_enabled():
         return None
-    key = _cache_key(agent_id, ticker, date_tag, prompt_hash)
-    path = _cache_path(key)
-    if not path.is_file():
-        return None
     try:
-        data = json.loads(path.read_text())
-        return data.get("decision")
-    except (json.JSONDecodeError, OSError) as e:
-        logger.warning("Decision cache read error for %s: %s", key, e)
+        return _get_cache().get(key)
+    except sqlite3.Error as e:
+        logger.warning("Decision cache read error for %s: %s", key[:12], e)
         return None
 
 
 def write_cached_decision(
-    agent_id: str,
-    ticker: str,
-    date_tag: str,
-    prompt_hash: str,
+    key: str,
     decision: dict[str, Any],
     *,
-    metadata: dict[str, Any] | None = None,
+    agent_id: str = "",
+    ticker: str = "",
+    model: str = "",
 ) -> bool:
     """Write a decision to the cache.
 
@@ -92,24 +143,11 @@ def write_cached_decision(
     """
     if not decision_cache_enabled():
         return False
-    key = _cache_key(agent_id, ticker, date_tag, prompt_hash)
-    path = _cache_path(key)
-    _ensure_dir(path.parent)
-    payload = {
-        "key": key,
-        "agent_id": agent_id,
-        "ticker": ticker,
-        "date_tag": date_tag,
-        "prompt_hash": prompt_hash,
-        "decision": decision,
-        "metadata": metadata or {},
-        "cached_at": time.time(),
-    }
     try:
-        path.write_text(json.dumps(payload, indent=2, default=str))
+        _get_cache().put(key, decision, agent_id=agent_id, ticker=ticker or "", model=model)
         return True
-    except OSError as e:
-        logger.warning("Decision cache write error for %s: %s", key, e)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        logger.warning("Decision cache write error for %s: %s", key[:12], e)
         return False
 
 
@@ -118,74 +156,24 @@ def invalidate_cache(agent_id: str | None = None, ticker: str | None = None) ->
 
     Returns number of entries removed.
     """
-    removed = 0
-    cache_root = _cache_dir()
-    if not cache_root.is_dir():
+    if not (_cache_dir() / _DB_NAME).is_file():
         return 0
-    for sub in cache_root.iterdir():
-        if not sub.is_dir():
-            continue
-        for sub2 in sub.iterdir():
-            if not sub2.is_dir():
-                continue
-            for f in sub2.iterdir():
-                if f.suffix != ".json":
-                    continue
-                try:
-                    data = json.loads(f.read_text())
-                    aid = data.get("agent_id", "")
-                    tk = data.get("ticker", "")
-                    if agent_id and aid != agent_id:
-                        continue
-                    if ticker and tk != ticker:
-                        continue
-                    f.unlink()
-                    removed += 1
-                except (json.JSONDecodeError, OSError):
-                    f.unlink()
-                    removed += 1
-    return removed
+    return _get_cache().invalidate(agent_id=agent_id, ticker=ticker)
 
 
 def cache_stats() -> dict[str, Any]:
-    """Return cache statistics."""
-    cache_root = _cache_dir()
-    if not cache_root.is_dir():
+    """Return cache statistics (counter reads only)."""
+    if not (_cache_dir() / _DB_NAME).is_file():
         return {"enabled": decision_cache_enabled(), "total_entries": 0, "size_bytes": 0}
-    total = 0
-    total_bytes = 0
-    agents: set[str] = set()
-    tickers: set[str] = set()
-    for sub in cache_root.iterdir():
-        if not sub.is_dir():
-            continue
-        for sub2 in sub.iterdir():
-            if not sub2.is_dir():
-                continue
-            for f in sub2.iterdir():
-                if f.suffix != ".json":
-                    continue
-                total += 1
-                total_bytes += f.stat().st_size
-                try:
-                    data = json.loads(f.read_text())
-                    agents.add(data.get("agent_id", "unknown"))
-                    tickers.add(data.get("ticker", "unknown"))
-                except Exception:
-                    pass
-    return {
-        "enabled": decision_cache_enabled(),
-        "total_entries": total,
-        "size_bytes": total_bytes,
-        "agents": sorted(agents),
-        "tickers": sorted(tickers),
-    }
+    return {"enabled": decision_cache_enabled(), **_get_cache().stats()}
 
 
 __all__ = [
+    "DecisionCache",
     "cache_stats",
     "decision_cache_enabled",
     "invalidate_cache",
+    "prompt_key",
     "read_cached_decision",
     "write_cached_decision",
 ]
@@ -0,0 +1,249 @@
+"""Process-wide scheduler for concurrent LLM inference.
+
+Tier-0 ``agent_llm`` calls used to run in a fresh ``ThreadPoolExecutor`` per symbol per
+bar, with no limit across symbols or concurrent backtests and no rate-limit handling.
+All agent inference now goes through one scheduler:
+
+- a shared worker pool capped by ``AIMM_LLM_MAX_CONCURRENCY`` (default 8)
+- token buckets for ``AIMM_LLM_RPM`` / ``AIMM_LLM_TPM`` (0 or unset = unlimited)
+- retry with jittered exponential backoff on 429 / 5xx / timeouts
+  (``AIMM_LLM_MAX_RETRIES``, default 2 — the OpenAI SDK's own default), honouring
+  ``Retry-After`` when present
+
+Per-bar wall time for N agents × M symbols is then bounded by the slowest call rather
+than the sum of latencies, as long as the provider limits allow it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_NAMES = frozenset(
+    {"APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError"}
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def is_retryable_llm_error(exc: BaseException) -> bool:
+    """Rate limits, provider 5xx and transport timeouts are worth another attempt."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if type(exc).__name__ in _RETRYABLE_NAMES:
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and status in _RETRYABLE_STATUS
+
+
+def _retry_after_sec(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        raw = headers.get("retry-after")
+        return max(0.0, float(raw)) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMRateLimiter:
+    """Two continuously refilling token buckets: requests/min and tokens/min.
+
+    A limit of 0 disables that bucket. Requests larger than the TPM bucket are
+    admitted once the bucket is full so they cannot block forever.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: int = 0,
+        tpm: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._rpm = max(0, int(rpm))
+        self._tpm = max(0, int(tpm))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._req_tokens = float(self._rpm)
+        self._tok_tokens = float(self._tpm)
+        self._last = clock()
+
+    def _refill_locked(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._last)
+        self._last = now
+        if self._rpm:
+            self._req_tokens = min(self._rpm, self._req_tokens + elapsed * self._rpm / 60.0)
+        if self._tpm:
+            self._tok_tokens = min(self._tpm, self._tok_tokens + elapsed * self._tpm / 60.0)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request of ``tokens`` fits; return seconds spent waiting."""
+        if not self._rpm and not self._tpm:
+            return 0.0
+        need_tok = float(min(max(0, int(tokens)), self._tpm)) if self._tpm else 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill_locked()
+                wait = 0.0
+                if self._rpm and self._req_tokens < 1.0:
+                    wait = max(wait, (1.0 - self._req_tokens) * 60.0 / self._rpm)
+                if self._tpm and self._tok_tokens < need_tok:
+                    wait = max(wait, (need_tok - self._tok_tokens) * 60.0 / self._tpm)
+                if wait <= 0.0:
+                    if self._rpm:
+                        self._req_tokens -= 1.0
+                    if self._tpm:
+                        self._tok_tokens -= need_tok
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+
+class LLMRequestScheduler:
+    """Shared pool + limiter + retry policy for LLM calls.
+
+    :meth:`call` runs one provider request inline (rate-limited, retried).
+    :meth:`submit` / :meth:`map` fan work out onto the shared pool so callers on
+    different symbols or backtests share one global concurrency cap.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_retries: int = 2,
+        backoff_base_sec: float = 0.5,
+        backoff_cap_sec: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self._backoff_base = max(0.0, float(backoff_base_sec))
+        self._backoff_cap = max(self._backoff_base, float(backoff_cap_sec))
+        self._sleep = sleep
+        self._limiter = LLMRateLimiter(rpm=rpm, tpm=tpm, sleep=sleep)
+        self._inflight = threading.BoundedSemaphore(self.max_concurrency)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "throttle_wait_sec": 0.0}
+
+    @classmethod
+    def from_env(cls) -> LLMRequestScheduler:
+        return cls(
+            max_concurrency=max(1, min(64, _env_int("AIMM_LLM_MAX_CONCURRENCY", 8))),
+            rpm=_env_int("AIMM_LLM_RPM", 0),
+            tpm=_env_int("AIMM_LLM_TPM", 0),
+            max_retries=max(0, min(10, _env_int("AIMM_LLM_MAX_RETRIES", 2))),
+        )
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="llm-infer"
+                )
+            return self._pool
+
+    def _bump(self, key: str, value: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {"max_concurrency": self.max_concurrency, **self._stats}
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        hinted = _retry_after_sec(exc)
+        if hinted is not None:
+            return min(self._backoff_cap, hinted)
+        delay = min(self._backoff_cap, self._backoff_base * (2**attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def call(self, fn: Callable[[], T], *, est_tokens: int = 0) -> T:
+        """Run one provider request under the rate limiter, retrying transient errors."""
+        attempt = 0
+        while True:
+            waited = self._limiter.acquire(est_tokens)
+            if waited:
+                self._bump("throttle_wait_sec", waited)
+            self._bump("calls")
+            try:
+                with self._inflight:
+                    return fn()
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable_llm_error(exc):
+                    self._bump("failures")
+                    raise
+                delay = self._backoff(attempt, exc)
+                logger.info(
+                    "llm request retry %d/%d in %.1fs: %s",
+                    attempt + 1,
+                    self.max_retries,
+                    delay,
+                    exc,
+                )
+                self._bump("retries")
+                attempt += 1
+                self._sleep(delay)
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        return self._executor().submit(fn, *args, **kwargs)
+
+    def map(self, fn: Callable[[Any], T], items: Iterable[Any]) -> list[Future[T]]:
+        """Submit ``fn(item)`` for every item; futures come back in input order."""
+        return [self.submit(fn, item) for item in items]
+
+
+_SCHEDULER: LLMRequestScheduler | None = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMRequestScheduler:
+    """Process-wide scheduler configured from env on first use."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = LLMRequestScheduler.from_env()
+        return _SCHEDULER
+
+
+def estimate_tokens(*texts: str, max_tokens: int = 0) -> int:
+    """Cheap prompt+completion estimate for TPM budgeting (~4 chars per token)."""
+    return sum(len(t or "") for t in texts) // 4 + max(0, int(max_tokens))
+
+
+__all__ = [
+    "LLMRateLimiter",
+    "LLMRequestScheduler",
+    "estimate_tokens",
+    "get_llm_scheduler",
+    "is_retryable_llm_error",
+]
@@ -7,9 +7,14 @@ import signal
 import threading
 from typing import Any, Dict, List, Optional, Tuple
 
-from openai import OpenAI
-
 from config.llm_env import resolve_llm_config
+from llm.client_pool import create_chat_completion, get_openai_client
+from llm.decision_cache import (
+    decision_cache_enabled,
+    prompt_key,
+    read_cached_decision,
+    write_cached_decision,
+)
 from llm.tool_registry import call_tool, openai_tools_payload
 
 logger = logging.getLogger(__name__)
@@ -22,6 +27,15 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return v in ("1", "true", "yes", "y", "on")
 
 
+def _timeout_s() -> float:
+    raw = (os.getenv("AIMM_LLM_TIMEOUT_S") or "").strip()
+    try:
+        timeout_s = float(raw) if raw else 60.0
+    except ValueError:
+        timeout_s = 60.0
+    return max(5.0, min(300.0, timeout_s))
+
+
 def run_tool_calling_chat(
     *,
     system: str,
@@ -32,12 +46,18 @@ def run_tool_calling_chat(
     max_tool_rounds: int = 3,
     max_tokens: Optional[int] = None,
     conversation_history: Optional[List[Dict[str, str]]] = None,
+    cache_agent_id: Optional[str] = None,
+    cache_ticker: Optional[str] = None,
 ) -> Tuple[str, List[Dict[str, Any]]]:
     """Run an OpenAI chat with optional tool calls (bounded).
 
     Returns (final_text, tool_events) where tool_events is a list of {name, args, result}.
 
     conversation_history: prior user/assistant turns (excluding the latest user message in ``user``).
+
+    When the decision cache is enabled (backtests), identical calls replay the stored
+    ``(final_text, tool_events)``; ``cache_agent_id`` / ``cache_ticker`` label the entry
+    for :func:`llm.decision_cache.invalidate_cache`.
     """
     llm_config = resolve_llm_config()
     if not llm_config.api_key:
@@ -45,23 +65,9 @@ def run_tool_calling_chat(
             "OPENAI_API_KEY or ATLASCLOUD_API_KEY is required when AI_MARKET_MAKER_USE_LLM=1"
         )
 
-    api_key = llm_config.api_key
     base_url = llm_config.base_url
-    timeout_s_raw = (os.getenv("AIMM_LLM_TIMEOUT_S") or "").strip()
-    try:
-        timeout_s = float(timeout_s_raw) if timeout_s_raw else 60.0
-    except ValueError:
-        timeout_s = 60.0
-    timeout_s = max(5.0, min(300.0, timeout_s))
-
-    # OpenAI SDK options vary across versions; keep a safe fallback if kwargs are unsupported.
-    try:
-        client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout_s, max_retries=2)
-    except TypeError:
-        try:
-            client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout_s)
-        except TypeError:
-            client = OpenAI(api_key=api_key, base_url=base_url)
+    timeout_s = _timeout_s()
+    client = get_openai_client(api_key=llm_config.api_key, base_url=base_url, timeout=timeout_s)
     env_model = (os.getenv("OPENAI_MODEL") or "").strip() or None
     model_name = model or llm_config.model
     if base_url and "deepseek" in base_url and env_model and model and model != env_model:
@@ -91,6 +97,25 @@ def run_tool_calling_chat(
     tool_events: List[Dict[str, Any]] = []
     tool_payload = openai_tools_payload(tool_specs)
 
+    cache_key: Optional[str] = None
+    if decision_cache_enabled():
+        extra = json.dumps(
+            {
+                "history": messages[1:-1],
+                "tools": sorted(str(t.get("function", {}).get("name")) for t in tool_payload),
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "max_tool_rounds": max_tool_rounds,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        cache_key = prompt_key(model_name, system, user, extra=extra)
+        hit = read_cached_decision(cache_key)
+        if hit is not None and isinstance(hit.get("text"), str):
+            events = hit.get("tool_events")
+            return hit["text"], events if isinstance(events, list) else []
+
     for _ in range(max_tool_rounds + 1):
         create_kwargs: Dict[str, Any] = {"model": model_name, "messages": messages}
         if temperature is not None:
@@ -129,7 +154,7 @@ def run_tool_calling_chat(
             signal.signal(signal.SIGALRM, _raise_timeout)
             signal.alarm(alarm_s)
         try:
-            resp = client.chat.completions.create(**create_kwargs)
+            resp = create_chat_completion(client, **create_kwargs)
         except Exception as exc:
             # Provider errors are often opaque; include the resolved model/base_url in logs.
             logger.error(
@@ -191,6 +216,14 @@ def run_tool_calling_chat(
 
         # No tool calls -> final
         final_text = msg.content or ""
+        if cache_key and final_text:
+            write_cached_decision(
+                cache_key,
+                {"text": final_text, "tool_events": tool_events},
+                agent_id=cache_agent_id or "",
+                ticker=cache_ticker or "",
+                model=model_name,
+            )
         return final_text, tool_events
 
     return "", tool_events
@@ -213,22 +246,9 @@ def stream_chat_completion(
             "OPENAI_API_KEY or ATLASCLOUD_API_KEY is required when AI_MARKET_MAKER_USE_LLM=1"
         )
 
-    api_key = llm_config.api_key
-    base_url = llm_config.base_url
-    timeout_s_raw = (os.getenv("AIMM_LLM_TIMEOUT_S") or "").strip()
-    try:
-        timeout_s = float(timeout_s_raw) if timeout_s_raw else 60.0
-    except ValueError:
-        timeout_s = 60.0
-    timeout_s = max(5.0, min(300.0, timeout_s))
-
-    try:
-        client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout_s, max_retries=2)
-    except TypeError:
-        try:
-            client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout_s)
-        except TypeError:
-            client = OpenAI(api_key=api_key, base_url=base_url)
+    client = get_openai_client(
+        api_key=llm_config.api_key, base_url=llm_config.base_url, timeout=_timeout_s()
+    )
 
     model_name = model or llm_config.model
     messages: List[Dict[str, Any]] = [
@@ -243,7 +263,7 @@ def stream_chat_completion(
             mt = None
         if mt is not None and mt > 0:
             create_kwargs["max_tokens"] = mt
-    return client.chat.completions.create(**create_kwargs)
+    return create_chat_completion(client, **create_kwargs)
 
 
 __all__ = ["run_tool_calling_chat", "stream_chat_completion"]
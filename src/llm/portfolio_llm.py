@@ -186,6 +186,8 @@ def llm_portfolio_proposal(state: HedgeFundState) -> dict[str, Any]:
                 model=(ps.model if ps is not None else None),
                 temperature=(ps.temperature if ps is not None else None),
                 max_tokens=(ps.max_tokens if ps is not None else None),
+                cache_agent_id="portfolio_proposal",
+                cache_ticker=tk,
             )
             last_text = text or ""
         except Exception as exc:
@@ -273,6 +275,8 @@ def llm_portfolio_execute(
                 model=(ps.model if ps is not None else None),
                 temperature=(ps.temperature if ps is not None else None),
                 max_tokens=(ps.max_tokens if ps is not None else None),
+                cache_agent_id="portfolio_execute",
+                cache_ticker=tk,
             )
         except Exception as exc:
             retry_reasons.append(f"llm_error:{type(exc).__name__}")
@@ -5,35 +5,20 @@ import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pprint import pformat
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
-import ccxt
 from dotenv import load_dotenv
-from langgraph.graph import END, StateGraph
 
 from adapters.nexus_adapter import get_nexus_adapter
-from agents.governance.policy_orchestrator import PolicyOrchestratorAgent
-from agents.governance.risk_guard import RiskGuardAgent
-from agents.liquidity_order_flow import LiquidityOrderFlowAgent
-from agents.market_scan import MarketScanAgent
-from agents.monetary_sentinel import MonetarySentinelAgent
-from agents.news_narrative_miner import NewsNarrativeMinerAgent
-from agents.pattern_recognition_bot import PatternRecognitionBotAgent
-from agents.pro_bias_analyst import ProBiasAnalystAgent
-from agents.retail_hype_tracker import RetailHypeTrackerAgent
-from agents.risk_management import RiskManagementAgent
-from agents.statistical_alpha_engine import StatisticalAlphaEngineAgent
-from agents.technical_ta_engine import TechnicalTaEngineAgent
-from agents.whale_behavior_analyst import WhaleBehaviorAnalystAgent
 from config.app_settings import apply_strategy_env_defaults_from_settings, load_app_settings
 from config.fund_policy import load_fund_policy
 from config.llm_env import require_llm_key
 from config.run_mode import RunMode, load_run_mode
 from flow_log import FlowEventRepo, get_flow_repo, set_flow_repo
 from leadpage_local_scan import append_local_scan_result
-from llm.portfolio_llm import llm_portfolio_execute, llm_portfolio_proposal
 from market.universe import augment_universe_with_oi, select_universe_from_tickers
 from nexus_data.client import NexusDataClient
 from nexus_data.feeds import (
@@ -44,22 +29,34 @@ from nexus_data.feeds import (
     oi_ccxt_candidates,
 )
 from run_index import append_run_index
-from runs_retention import enforce_backtests_retention, enforce_runs_retention
+from runs_retention import note_runs_artifact, schedule_runs_retention
 from schemas.flow_events import FlowEvent
 from schemas.state import HedgeFundState, initial_hedge_fund_state
 from schemas.tier0_contract import build_tier0_contract_json
 from telemetry.logger import LogPublisher, get_log_publisher, set_log_publisher
-from tier1 import effective_portfolio_desk_bridge
 from trading.desk_inputs import quant_analysis_for_portfolio
-from workflow.desk_debate import desk_debate
-from workflow.routing import route_after_risk_guard, route_after_risk_guard_mapping
-from workflow.weighted_arbitrator import weighted_arbitrator_node
+
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
+    from agents.market_scan import MarketScanAgent
+
+# ccxt, LangGraph, the OpenAI SDK and the agent modules are imported where they are used
+# (graph build, node bodies), so ``import main`` stays cheap for CLIs and API workers.
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 logger = logging.getLogger(__name__)
 load_dotenv()
 apply_strategy_env_defaults_from_settings(load_app_settings())
 
+# Testnet scan agent shared by the cycles of one process (see ``_market_scan_agent``).
+_SCAN_AGENT: "MarketScanAgent | None" = None
+_SCAN_AGENT_LOADED_AT = 0.0
+_SCAN_AGENT_LOCK = threading.Lock()
+_SCAN_AGENT_TTL_SEC = 6 * 3600
+# Multi-ticker cycles run symbols concurrently; paper fills still go one at a time.
+_EXECUTE_LOCK = threading.Lock()
+
 
 def _emit_flow(repo: FlowEventRepo | None, event: FlowEvent) -> None:
     if repo:
@@ -129,6 +126,15 @@ def _flow_bt_extra(state: HedgeFundState) -> dict[str, Any]:
     return out
 
 
+def _flow_extra(state: HedgeFundState) -> dict[str, Any]:
+    """FlowEvent extras: backtest bar fields, plus ``symbol`` in multi-ticker cycles."""
+    out = _flow_bt_extra(state)
+    sm = state.get("shared_memory")
+    if isinstance(sm, dict) and isinstance(sm.get("shared_scan"), dict):
+        out["symbol"] = state.get("ticker")
+    return out
+
+
 def _instrument_node(node_name: str, node_fn: NodeFn) -> NodeFn:
     """Wrap graph nodes with start/end + reasoning telemetry."""
 
@@ -170,7 +176,7 @@ def _instrument_node(node_name: str, node_fn: NodeFn) -> NodeFn:
     def wrapped(state: HedgeFundState) -> dict[str, Any]:
         repo = get_flow_repo()
         run_id = getattr(repo, "run_id", None) if repo else None
-        bt_x = _flow_bt_extra(state)
+        bt_x = _flow_extra(state)
         _emit_flow(
             repo,
             FlowEvent.node_start(node_name, run_id=run_id, ticker=state.get("ticker"), **bt_x),
@@ -245,6 +251,28 @@ def _final_state_summary(state: HedgeFundState) -> dict[str, Any]:
     }
 
 
+def _market_scan_agent() -> "MarketScanAgent":
+    """Warm testnet scan agent: markets load once per process, not once per cycle.
+
+    Rebuilt after ``_SCAN_AGENT_TTL_SEC`` (listings change) or when the last load fell back
+    to degraded mode (no markets).
+    """
+    from agents.market_scan import MarketScanAgent
+
+    global _SCAN_AGENT, _SCAN_AGENT_LOADED_AT
+    with _SCAN_AGENT_LOCK:
+        now = time.monotonic()
+        agent = _SCAN_AGENT
+        if (
+            agent is None
+            or not agent.exchange.markets
+            or now - _SCAN_AGENT_LOADED_AT > _SCAN_AGENT_TTL_SEC
+        ):
+            agent = MarketScanAgent(testnet=True)
+            _SCAN_AGENT, _SCAN_AGENT_LOADED_AT = agent, now
+        return agent
+
+
 def market_scan(state: HedgeFundState) -> dict[str, Any]:
     logger.debug("Running market_scan node with state: %s", state)
     ticker = state.get("ticker")
@@ -254,6 +282,9 @@ def market_scan(state: HedgeFundState) -> dict[str, Any]:
 
     data = dict(state.get("market_data") or {})
     run_mode = str(state.get("run_mode") or "paper").lower()
+    shared_scan = (state.get("shared_memory") or {}).get("shared_scan")
+    if isinstance(shared_scan, dict):
+        return _reuse_shared_scan(state, ticker, shared_scan)
     s = load_app_settings()
     desired_universe_size = int(s.market.universe_size)
     requested = list(s.market.universe_symbols)
@@ -274,7 +305,7 @@ def market_scan(state: HedgeFundState) -> dict[str, Any]:
         ]
         scan_decision: dict[str, Any] = {"symbols": len(data), "meme_candidates": len(meme_coins)}
     else:
-        agent = MarketScanAgent(testnet=True)
+        agent = _market_scan_agent()
         markets_keys = set(agent.exchange.markets.keys())
         tickers = None
         try:
@@ -407,8 +438,75 @@ def market_scan(state: HedgeFundState) -> dict[str, Any]:
     }
 
 
+def _reuse_shared_scan(
+    state: HedgeFundState, ticker: str, shared_scan: dict[str, Any]
+) -> dict[str, Any]:
+    """``market_scan`` in a multi-ticker cycle: the snapshot is already in state."""
+    universe = list(state.get("universe") or [ticker])
+    return {
+        "ticker": ticker,
+        "market_context": [{"node": "market_scan", "ticker": ticker, "symbols": universe}],
+        "reasoning_logs": [
+            _reasoning_entry(
+                node="market_scan",
+                thought=(
+                    f"Reused the cycle's market scan ({int(shared_scan.get('symbols') or 0)} "
+                    f"symbols) for {ticker}."
+                ),
+                decision=shared_scan,
+            )
+        ],
+    }
+
+
+def scan_market_snapshot(tickers: list[str], *, run_mode: str = "paper") -> dict[str, Any]:
+    """Run ``market_scan`` once for a multi-ticker cycle.
+
+    The universe, meme scan and Nexus global bundle come from the first ticker's scan;
+    OHLCV (and depth) is then fetched for any requested ticker the scan did not cover.
+    """
+    state = initial_hedge_fund_state(run_mode=run_mode, ticker=tickers[0])
+    scan = _instrument_node("market_scan", market_scan)(state)
+    data = scan.setdefault("market_data", {})
+    missing = [t for t in tickers if not isinstance(data.get(t), dict)]
+    if missing and run_mode != RunMode.BACKTEST.value:
+        agent = _market_scan_agent()
+        for sym in missing:
+            try:
+                blob = agent.fetch_data(sym)
+            except Exception as e:
+                logger.error("Failed to fetch data for %s: %s", sym, e)
+                blob = {"status": "error", "error": str(e)}
+            try:
+                blob["nexus_depth"] = get_nexus_adapter().fetch_market_depth(symbol=sym, limit=5)
+            except Exception as e:
+                blob["nexus_depth"] = {"status": "error", "error": str(e)}
+            data[sym] = blob
+    return scan
+
+
+def _symbol_state(
+    scan: dict[str, Any], ticker: str, *, run_mode: str, tickers: list[str]
+) -> HedgeFundState:
+    """Per-symbol graph input over the shared scan (``market_scan`` then short-circuits)."""
+    state = initial_hedge_fund_state(run_mode=run_mode, ticker=ticker)
+    scan_universe = list(scan.get("universe") or [])
+    universe = [ticker] + [s for s in scan_universe if s != ticker]
+    sm = dict(scan.get("shared_memory") or {})
+    sm["shared_scan"] = {"symbols": len(scan.get("market_data") or {}), "tickers": list(tickers)}
+    state["universe"] = universe[: max(1, len(scan_universe))]
+    state["universe_pairs"] = list(scan.get("universe_pairs") or [])
+    # Shallow copy: nodes may annotate the per-symbol dict view, never the shared blobs.
+    state["market_data"] = dict(scan.get("market_data") or {})
+    state["market_scan"] = list(scan.get("market_scan") or [])
+    state["shared_memory"] = sm
+    return state
+
+
 def policy_orchestrator(state: HedgeFundState) -> dict[str, Any]:
     """Supervisor layer: select policy config/preset across runs (persistent memory)."""
+    from agents.governance.policy_orchestrator import PolicyOrchestratorAgent
+
     agent = PolicyOrchestratorAgent()
     out = _run_async(
         agent.process({"run_mode": state.get("run_mode"), "ticker": state.get("ticker")})
@@ -467,6 +565,8 @@ def policy_orchestrator(state: HedgeFundState) -> dict[str, Any]:
 
 
 def monetary_sentinel(state: HedgeFundState) -> dict[str, Any]:
+    from agents.monetary_sentinel import MonetarySentinelAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -491,6 +591,8 @@ def monetary_sentinel(state: HedgeFundState) -> dict[str, Any]:
 
 
 def news_narrative_miner(state: HedgeFundState) -> dict[str, Any]:
+    from agents.news_narrative_miner import NewsNarrativeMinerAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -515,6 +617,8 @@ def news_narrative_miner(state: HedgeFundState) -> dict[str, Any]:
 
 
 def pattern_recognition_bot(state: HedgeFundState) -> dict[str, Any]:
+    from agents.pattern_recognition_bot import PatternRecognitionBotAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -539,6 +643,8 @@ def pattern_recognition_bot(state: HedgeFundState) -> dict[str, Any]:
 
 
 def statistical_alpha_engine(state: HedgeFundState) -> dict[str, Any]:
+    from agents.statistical_alpha_engine import StatisticalAlphaEngineAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -566,6 +672,8 @@ def statistical_alpha_engine(state: HedgeFundState) -> dict[str, Any]:
 
 def technical_ta_engine(state: HedgeFundState) -> dict[str, Any]:
     """Tier-0 Agent 2.3: OHLCV → TA-Lib bundle (``ta_*`` Tier-1 metric_ids)."""
+    from agents.technical_ta_engine import TechnicalTaEngineAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -587,6 +695,8 @@ def technical_ta_engine(state: HedgeFundState) -> dict[str, Any]:
 
 
 def retail_hype_tracker(state: HedgeFundState) -> dict[str, Any]:
+    from agents.retail_hype_tracker import RetailHypeTrackerAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -611,6 +721,8 @@ def retail_hype_tracker(state: HedgeFundState) -> dict[str, Any]:
 
 
 def pro_bias_analyst(state: HedgeFundState) -> dict[str, Any]:
+    from agents.pro_bias_analyst import ProBiasAnalystAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -635,6 +747,8 @@ def pro_bias_analyst(state: HedgeFundState) -> dict[str, Any]:
 
 
 def whale_behavior_analyst(state: HedgeFundState) -> dict[str, Any]:
+    from agents.whale_behavior_analyst import WhaleBehaviorAnalystAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -659,6 +773,8 @@ def whale_behavior_analyst(state: HedgeFundState) -> dict[str, Any]:
 
 
 def liquidity_order_flow(state: HedgeFundState) -> dict[str, Any]:
+    from agents.liquidity_order_flow import LiquidityOrderFlowAgent
+
     ticker = str(state.get("ticker") or "BTC/USDT")
     universe = state.get("universe") or [ticker]
     md = state.get("market_data") or {}
@@ -683,6 +799,8 @@ def liquidity_order_flow(state: HedgeFundState) -> dict[str, Any]:
 
 
 def risk(state: HedgeFundState) -> dict[str, Any]:
+    from agents.risk_management import RiskManagementAgent
+
     logger.debug("Running risk node with state: %s", state)
     market_data = state.get("market_data") or {}
     valuation_data = state.get("valuation") or {}
@@ -800,6 +918,8 @@ def _portfolio_agent_kwargs(state: HedgeFundState) -> dict[str, Any]:
 
 def merged_quant_analysis_for_universe(state: HedgeFundState) -> dict[str, Any]:
     """Per-symbol ``quant_analysis`` rows from Tier-0 ``by_symbol`` (multi-asset) or primary."""
+    from tier1 import effective_portfolio_desk_bridge
+
     tk = str(state.get("ticker") or "BTC/USDT")
     uni = state.get("universe")
     symbols: list[str] = [str(x) for x in uni] if isinstance(uni, list) and uni else [tk]
@@ -815,6 +935,8 @@ def merged_quant_analysis_for_universe(state: HedgeFundState) -> dict[str, Any]:
 
 
 def portfolio_proposal(state: HedgeFundState) -> dict[str, Any]:
+    from llm.portfolio_llm import llm_portfolio_proposal
+
     logger.debug("Running portfolio_proposal node with state: %s", state)
     proposal = llm_portfolio_proposal(state)
     if not isinstance(proposal, dict) or proposal.get("status") == "error":
@@ -849,6 +971,8 @@ def portfolio_proposal(state: HedgeFundState) -> dict[str, Any]:
 
 
 def risk_guard(state: HedgeFundState) -> dict[str, Any]:
+    from agents.governance.risk_guard import RiskGuardAgent
+
     logger.debug("Running risk_guard node with state: %s", state)
     repo = get_flow_repo()
     run_id = getattr(repo, "run_id", None) if repo else None
@@ -950,6 +1074,8 @@ def risk_guard(state: HedgeFundState) -> dict[str, Any]:
 
 
 def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
+    from llm.portfolio_llm import llm_portfolio_execute, llm_portfolio_proposal
+
     logger.debug("Running portfolio_execute node with state: %s", state)
     repo = get_flow_repo()
     run_id = getattr(repo, "run_id", None) if repo else None
@@ -970,18 +1096,6 @@ def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
         logger.error("LLM portfolio_execute failed (no non-LLM fallback).")
         exec_blk = None
 
-    # P3: emit a safe "smart order" record via NexusAdapter (mock by default).
-    # This does not place a real order yet; it provides tool-calling parity for the UI.
-    smart_orders: list[dict[str, Any]] = []
-    adapter = get_nexus_adapter()
-    # Keep an updated paper account snapshot in state for downstream audit and intent context.
-    paper_snapshot: dict[str, Any] | None = None
-    try:
-        health = adapter.get_portfolio_health(account_id="default")
-        paper_snapshot = health.get("paper_account") if isinstance(health, dict) else None
-    except Exception:
-        paper_snapshot = None
-
     def _last_price(sym: str) -> float | None:
         md = state.get("market_data") or {}
         try:
@@ -1014,209 +1128,206 @@ def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
                     }
         return out
 
-    # Mirror the paper snapshot into shared_memory in the shape `execution_intent` expects.
-    sm_out: dict[str, Any] = dict(state.get("shared_memory") or {})
-    if isinstance(paper_snapshot, dict):
-        sm_out["paper"] = {
-            "cash_usdt": float(paper_snapshot.get("cash_usdt") or 0.0),
-            "instrument": str(paper_snapshot.get("instrument") or "spot"),
-            "positions": _paper_positions_map(paper_snapshot),
-            "updated_ts": int(paper_snapshot.get("updated_ts") or 0),
-        }
-
+    # P3: emit a safe "smart order" record via NexusAdapter (mock by default).
+    # This does not place a real order yet; it provides tool-calling parity for the UI.
+    smart_orders: list[dict[str, Any]] = []
     exec_notes: list[str] = []
     clamped_orders: list[dict[str, Any]] = []
+    adapter = get_nexus_adapter()
+    # Keep an updated paper account snapshot in state for downstream audit and intent context.
+    paper_snapshot: dict[str, Any] | None = None
+    sm_out: dict[str, Any] = dict(state.get("shared_memory") or {})
+    # Multi-ticker cycles share one paper account: the snapshot read, the clamps against it
+    # and the fills are one critical section. The LLM calls above stay outside it.
+    with _EXECUTE_LOCK:
+        try:
+            health = adapter.get_portfolio_health(account_id="default")
+            paper_snapshot = health.get("paper_account") if isinstance(health, dict) else None
+        except Exception:
+            paper_snapshot = None
+
+        # Mirror the paper snapshot into shared_memory in the shape `execution_intent` expects.
+        if isinstance(paper_snapshot, dict):
+            sm_out["paper"] = {
+                "cash_usdt": float(paper_snapshot.get("cash_usdt") or 0.0),
+                "instrument": str(paper_snapshot.get("instrument") or "spot"),
+                "positions": _paper_positions_map(paper_snapshot),
+                "updated_ts": int(paper_snapshot.get("updated_ts") or 0),
+            }
 
-    if isinstance(exec_blk, dict):
-        s = load_app_settings()
-        fp = load_fund_policy()
-        inst = str(s.paper.instrument or "spot").lower()
-        lev = min(max(1.0, float(s.paper.leverage)), max(1.0, float(fp.max_leverage)))
-        fee_rate = max(0.0, float(s.paper.fee_bps)) / 10_000.0
-        cash = float((sm_out.get("paper") or {}).get("cash_usdt") or 0.0)
-        pm = (sm_out.get("paper") or {}).get("positions") or {}
-
-        max_notional = max(0.0, cash * float(s.paper.max_notional_fraction))
-        if inst == "perp":
-            max_notional *= lev
-
-        intent = state.get("trade_intent") if isinstance(state.get("trade_intent"), dict) else {}
-        c = intent.get("constraints") if isinstance(intent.get("constraints"), dict) else {}
-        cap = c.get("max_notional_usd")
-        if isinstance(cap, (int, float)):
-            max_notional = min(max_notional, float(cap))
-
-        min_notional = float(s.paper.min_notional_usd)
-
-        for row in exec_blk.get("smart_orders") or []:
-            if not isinstance(row, dict):
-                exec_notes.append("skip:invalid_order_shape")
-                continue
-            sym = str(row.get("symbol") or "")
-            side = str(row.get("side") or "").lower()
-            try:
-                qty = float(row.get("qty") or 0.0)
-            except (TypeError, ValueError):
-                qty = 0.0
-            px = _last_price(sym) if sym else None
-            if not sym or side not in ("buy", "sell") or qty <= 0 or px is None or px <= 0:
-                exec_notes.append("skip:invalid_symbol_side_qty_or_price")
-                continue
-
-            # Enforce notional caps.
-            desired_notional = float(qty) * float(px)
-            allowed_notional = max(0.0, float(max_notional))
-            if desired_notional > allowed_notional + 1e-9:
-                exec_notes.append("clamp:max_notional")
-                qty = allowed_notional / float(px) if allowed_notional > 0 else 0.0
-                desired_notional = qty * float(px)
-
-            # Enforce minimum notional.
-            if desired_notional + 1e-9 < min_notional:
-                exec_notes.append("skip:below_min_notional")
-                continue
-
-            # Spot: cannot sell more than held.
-            if inst != "perp" and side == "sell":
-                p_row = pm.get(sym) if isinstance(pm, dict) else {}
-                pos_spot = float(p_row.get("qty") or 0.0) if isinstance(p_row, dict) else 0.0
-                if pos_spot <= 1e-12:
-                    exec_notes.append("skip:spot_sell_no_position")
-                    continue
-                qty = min(qty, pos_spot)
-                desired_notional = qty * float(px)
-                if desired_notional + 1e-9 < min_notional:
-                    exec_notes.append("skip:below_min_notional_after_spot_cap")
-                    continue
-
-            if inst == "perp" and side in ("buy", "sell"):
-                # Max notional by cash for a fresh leg: cash >= notional/lev + fee(notional).
-                denom = (1.0 / max(1.0, float(lev))) + fee_rate
-                if denom > 0:
-                    max_notional_by_cash = max(0.0, float(cash) / denom)
-                    if desired_notional > max_notional_by_cash + 1e-9:
-                        exec_notes.append("clamp:perp_cash_margin_fee")
-                        qty = max_notional_by_cash / float(px) if max_notional_by_cash > 0 else 0.0
-                        desired_notional = qty * float(px)
-                        if desired_notional + 1e-9 < min_notional:
-                            exec_notes.append("skip:below_min_notional_after_perp_cash_cap")
-                            continue
-
-            if qty <= 0:
-                exec_notes.append("skip:qty_zero_after_clamps")
-                continue
-
-            clamped_orders.append(
-                {
-                    "symbol": sym,
-                    "side": side,
-                    "qty": float(qty),
-                    "price": float(px),
-                    "notional_usdt": float(desired_notional),
-                    "source": "llm_execute",
-                }
-            )
-            smart_orders.append(
-                adapter.place_smart_order(
-                    symbol=sym,
-                    side=side,
-                    qty=float(qty),
-                    order_type="market",
-                    price=float(px),
-                    post_only=True,
-                    max_slippage_bps=25.0,
-                )
-            )
-    elif isinstance(portfolio_result, dict):
-        trades = portfolio_result.get("trades") or {}
-        for sym, trade in trades.items():
-            if not isinstance(trade, dict) or trade.get("status") not in ("proposed", "success"):
-                continue
-            side = trade.get("action")
-            qty = float(trade.get("quantity") or 0.0)
-            if side in ("buy", "sell") and qty > 0:
-                smart_orders.append(
-                    adapter.place_smart_order(
-                        symbol=str(sym),
-                        side=side,
-                        qty=qty,
-                        order_type="market",
-                        price=_last_price(str(sym)),
-                        post_only=True,
-                        max_slippage_bps=25.0,
-                    )
-                )
-
-    if not smart_orders and str(state.get("run_mode") or "").lower() == "paper":
-        intent = state.get("trade_intent") if isinstance(state.get("trade_intent"), dict) else {}
-        action = str(intent.get("action") or "").upper()
-        sym = str(intent.get("ticker") or tk)
-        px = _last_price(sym)
-        if action in ("BUY", "SELL") and px is not None and px > 0:
+        if isinstance(exec_blk, dict):
             s = load_app_settings()
-            cash = float((sm_out.get("paper") or {}).get("cash_usdt") or 0.0)
-            pm = (sm_out.get("paper") or {}).get("positions") or {}
-            p_row = pm.get(sym) if isinstance(pm, dict) else {}
-            pos_spot = float(p_row.get("qty") or 0.0) if isinstance(p_row, dict) else 0.0
-            pos_signed = (
-                float(p_row.get("qty_signed") or pos_spot) if isinstance(p_row, dict) else 0.0
-            )
-            inst = str(s.paper.instrument or "spot").lower()
             fp = load_fund_policy()
+            inst = str(s.paper.instrument or "spot").lower()
             lev = min(max(1.0, float(s.paper.leverage)), max(1.0, float(fp.max_leverage)))
-            max_notional = cash * float(s.paper.max_notional_fraction)
+            fee_rate = max(0.0, float(s.paper.fee_bps)) / 10_000.0
+            cash = float((sm_out.get("paper") or {}).get("cash_usdt") or 0.0)
+            pm = (sm_out.get("paper") or {}).get("positions") or {}
+
+            max_notional = max(0.0, cash * float(s.paper.max_notional_fraction))
             if inst == "perp":
                 max_notional *= lev
+
+            intent = (
+                state.get("trade_intent") if isinstance(state.get("trade_intent"), dict) else {}
+            )
             c = intent.get("constraints") if isinstance(intent.get("constraints"), dict) else {}
             cap = c.get("max_notional_usd")
             if isinstance(cap, (int, float)):
                 max_notional = min(max_notional, float(cap))
-            notional = max(0.0, float(max_notional))
-            if action == "BUY" and cash > 0 and notional >= float(s.paper.min_notional_usd):
-                qty_i = notional / float(px)
+
+            min_notional = float(s.paper.min_notional_usd)
+
+            for row in exec_blk.get("smart_orders") or []:
+                if not isinstance(row, dict):
+                    exec_notes.append("skip:invalid_order_shape")
+                    continue
+                sym = str(row.get("symbol") or "")
+                side = str(row.get("side") or "").lower()
+                try:
+                    qty = float(row.get("qty") or 0.0)
+                except (TypeError, ValueError):
+                    qty = 0.0
+                px = _last_price(sym) if sym else None
+                if not sym or side not in ("buy", "sell") or qty <= 0 or px is None or px <= 0:
+                    exec_notes.append("skip:invalid_symbol_side_qty_or_price")
+                    continue
+
+                # Enforce notional caps.
+                desired_notional = float(qty) * float(px)
+                allowed_notional = max(0.0, float(max_notional))
+                if desired_notional > allowed_notional + 1e-9:
+                    exec_notes.append("clamp:max_notional")
+                    qty = allowed_notional / float(px) if allowed_notional > 0 else 0.0
+                    desired_notional = qty * float(px)
+
+                # Enforce minimum notional.
+                if desired_notional + 1e-9 < min_notional:
+                    exec_notes.append("skip:below_min_notional")
+                    continue
+
+                # Spot: cannot sell more than held.
+                if inst != "perp" and side == "sell":
+                    p_row = pm.get(sym) if isinstance(pm, dict) else {}
+                    pos_spot = float(p_row.get("qty") or 0.0) if isinstance(p_row, dict) else 0.0
+                    if pos_spot <= 1e-12:
+                        exec_notes.append("skip:spot_sell_no_position")
+                        continue
+                    qty = min(qty, pos_spot)
+                    desired_notional = qty * float(px)
+                    if desired_notional + 1e-9 < min_notional:
+                        exec_notes.append("skip:below_min_notional_after_spot_cap")
+                        continue
+
+                if inst == "perp" and side in ("buy", "sell"):
+                    # Max notional by cash for a fresh leg: cash >= notional/lev + fee(notional).
+                    denom = (1.0 / max(1.0, float(lev))) + fee_rate
+                    if denom > 0:
+                        max_notional_by_cash = max(0.0, float(cash) / denom)
+                        if desired_notional > max_notional_by_cash + 1e-9:
+                            exec_notes.append("clamp:perp_cash_margin_fee")
+                            qty = (
+                                max_notional_by_cash / float(px)
+                                if max_notional_by_cash > 0
+                                else 0.0
+                            )
+                            desired_notional = qty * float(px)
+                            if desired_notional + 1e-9 < min_notional:
+                                exec_notes.append("skip:below_min_notional_after_perp_cash_cap")
+                                continue
+
+                if qty <= 0:
+                    exec_notes.append("skip:qty_zero_after_clamps")
+                    continue
+
                 clamped_orders.append(
                     {
                         "symbol": sym,
-                        "side": "buy",
-                        "qty": float(qty_i),
+                        "side": side,
+                        "qty": float(qty),
                         "price": float(px),
-                        "notional_usdt": float(notional),
-                        "source": "intent_synth",
+                        "notional_usdt": float(desired_notional),
+                        "source": "llm_execute",
                     }
                 )
                 smart_orders.append(
                     adapter.place_smart_order(
                         symbol=sym,
-                        side="buy",
-                        qty=float(qty_i),
+                        side=side,
+                        qty=float(qty),
                         order_type="market",
                         price=float(px),
                         post_only=True,
                         max_slippage_bps=25.0,
-                        client_order_id=f"{run_id or 'run'}:paper:intent",
                     )
                 )
-            elif action == "SELL" and notional >= float(s.paper.min_notional_usd):
+        elif isinstance(portfolio_result, dict):
+            trades = portfolio_result.get("trades") or {}
+            for sym, trade in trades.items():
+                if not isinstance(trade, dict) or trade.get("status") not in (
+                    "proposed",
+                    "success",
+                ):
+                    continue
+                side = trade.get("action")
+                qty = float(trade.get("quantity") or 0.0)
+                if side in ("buy", "sell") and qty > 0:
+                    smart_orders.append(
+                        adapter.place_smart_order(
+                            symbol=str(sym),
+                            side=side,
+                            qty=qty,
+                            order_type="market",
+                            price=_last_price(str(sym)),
+                            post_only=True,
+                            max_slippage_bps=25.0,
+                        )
+                    )
+
+        if not smart_orders and str(state.get("run_mode") or "").lower() == "paper":
+            intent = (
+                state.get("trade_intent") if isinstance(state.get("trade_intent"), dict) else {}
+            )
+            action = str(intent.get("action") or "").upper()
+            sym = str(intent.get("ticker") or tk)
+            px = _last_price(sym)
+            if action in ("BUY", "SELL") and px is not None and px > 0:
+                s = load_app_settings()
+                cash = float((sm_out.get("paper") or {}).get("cash_usdt") or 0.0)
+                pm = (sm_out.get("paper") or {}).get("positions") or {}
+                p_row = pm.get(sym) if isinstance(pm, dict) else {}
+                pos_spot = float(p_row.get("qty") or 0.0) if isinstance(p_row, dict) else 0.0
+                pos_signed = (
+                    float(p_row.get("qty_signed") or pos_spot) if isinstance(p_row, dict) else 0.0
+                )
+                inst = str(s.paper.instrument or "spot").lower()
+                fp = load_fund_policy()
+                lev = min(max(1.0, float(s.paper.leverage)), max(1.0, float(fp.max_leverage)))
+                max_notional = cash * float(s.paper.max_notional_fraction)
                 if inst == "perp":
-                    if pos_signed > 1e-12:
-                        q_close = min(pos_signed, notional / float(px))
-                    else:
-                        q_close = notional / float(px)
+                    max_notional *= lev
+                c = intent.get("constraints") if isinstance(intent.get("constraints"), dict) else {}
+                cap = c.get("max_notional_usd")
+                if isinstance(cap, (int, float)):
+                    max_notional = min(max_notional, float(cap))
+                notional = max(0.0, float(max_notional))
+                if action == "BUY" and cash > 0 and notional >= float(s.paper.min_notional_usd):
+                    qty_i = notional / float(px)
                     clamped_orders.append(
                         {
                             "symbol": sym,
-                            "side": "sell",
-                            "qty": float(q_close),
+                            "side": "buy",
+                            "qty": float(qty_i),
                             "price": float(px),
-                            "notional_usdt": float(q_close * float(px)),
+                            "notional_usdt": float(notional),
                             "source": "intent_synth",
                         }
                     )
                     smart_orders.append(
                         adapter.place_smart_order(
                             symbol=sym,
-                            side="sell",
-                            qty=float(q_close),
+                            side="buy",
+                            qty=float(qty_i),
                             order_type="market",
                             price=float(px),
                             post_only=True,
@@ -1224,16 +1335,19 @@ def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
                             client_order_id=f"{run_id or 'run'}:paper:intent",
                         )
                     )
-                elif pos_spot > 1e-12:
-                    n2 = pos_spot * float(px)
-                    if n2 >= float(s.paper.min_notional_usd):
+                elif action == "SELL" and notional >= float(s.paper.min_notional_usd):
+                    if inst == "perp":
+                        if pos_signed > 1e-12:
+                            q_close = min(pos_signed, notional / float(px))
+                        else:
+                            q_close = notional / float(px)
                         clamped_orders.append(
                             {
                                 "symbol": sym,
                                 "side": "sell",
-                                "qty": float(pos_spot),
+                                "qty": float(q_close),
                                 "price": float(px),
-                                "notional_usdt": float(n2),
+                                "notional_usdt": float(q_close * float(px)),
                                 "source": "intent_synth",
                             }
                         )
@@ -1241,7 +1355,7 @@ def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
                             adapter.place_smart_order(
                                 symbol=sym,
                                 side="sell",
-                                qty=float(pos_spot),
+                                qty=float(q_close),
                                 order_type="market",
                                 price=float(px),
                                 post_only=True,
@@ -1249,12 +1363,37 @@ def portfolio_execute(state: HedgeFundState) -> dict[str, Any]:
                                 client_order_id=f"{run_id or 'run'}:paper:intent",
                             )
                         )
+                    elif pos_spot > 1e-12:
+                        n2 = pos_spot * float(px)
+                        if n2 >= float(s.paper.min_notional_usd):
+                            clamped_orders.append(
+                                {
+                                    "symbol": sym,
+                                    "side": "sell",
+                                    "qty": float(pos_spot),
+                                    "price": float(px),
+                                    "notional_usdt": float(n2),
+                                    "source": "intent_synth",
+                                }
+                            )
+                            smart_orders.append(
+                                adapter.place_smart_order(
+                                    symbol=sym,
+                                    side="sell",
+                                    qty=float(pos_spot),
+                                    order_type="market",
+                                    price=float(px),
+                                    post_only=True,
+                                    max_slippage_bps=25.0,
+                                    client_order_id=f"{run_id or 'run'}:paper:intent",
+                                )
+                            )
+                    else:
+                        exec_notes.append("skip:intent_sell_no_position")
                 else:
-                    exec_notes.append("skip:intent_sell_no_position")
-            else:
-                exec_notes.append("skip:intent_below_min_notional_or_no_cash")
-        elif action in ("BUY", "SELL"):
-            exec_notes.append("skip:intent_missing_price")
+                    exec_notes.append("skip:intent_below_min_notional_or_no_cash")
+            elif action in ("BUY", "SELL"):
+                exec_notes.append("skip:intent_missing_price")
 
     smart_order = smart_orders[0] if smart_orders else None
     run_mode = str(state.get("run_mode") or "").strip().lower()
@@ -1367,6 +1506,8 @@ def validate_ticker(ticker: str) -> bool:
     The workflow uses paper execution by default; validation should not hard-fail
     if Binance testnet is temporarily unavailable.
     """
+    import ccxt
+
     if (os.getenv("AIMM_SKIP_TICKER_VALIDATE") or "").strip().lower() in {"1", "true", "yes"}:
         return True
 
@@ -1398,12 +1539,18 @@ def validate_ticker(ticker: str) -> bool:
         return False
 
 
-def build_workflow() -> StateGraph:
+def build_workflow() -> "StateGraph":
     """Compile LangGraph: serial perception → proposal → risk → conditional execution.
 
     Node IDs are prefixed with ``desk_`` where needed so they do not collide with
     :class:`HedgeFundState` keys (LangGraph requirement).
     """
+    from langgraph.graph import END, StateGraph
+
+    from workflow.desk_debate import desk_debate
+    from workflow.routing import route_after_risk_guard, route_after_risk_guard_mapping
+    from workflow.weighted_arbitrator import weighted_arbitrator_node
+
     workflow: StateGraph = StateGraph(HedgeFundState)
     workflow.add_node(
         "policy_orchestrator", _instrument_node("policy_orchestrator", policy_orchestrator)
@@ -1541,17 +1688,30 @@ def main():
             "as profile weights. Overrides --profile-id."
         ),
     )
+    parser.add_argument(
+        "--tickers",
+        type=str,
+        default="",
+        help=(
+            "Comma-separated pairs for one multi-ticker desk cycle: market_scan and the Nexus "
+            "global bundle run once, then each pair runs the graph. Overrides --ticker."
+        ),
+    )
     args = parser.parse_args()
+    tickers = [t.strip() for t in str(args.tickers or "").split(",") if t.strip()]
+    if len(tickers) == 1:
+        args.ticker, tickers = tickers[0], []
 
     run_mode = load_run_mode(override=args.mode)
     logger.info("Run mode: %s", run_mode.value)
 
     if run_mode is not RunMode.BACKTEST:
-        if not args.ticker or not validate_ticker(args.ticker):
-            logger.error("Invalid ticker: %s", args.ticker)
-            raise ValueError(
-                f"Invalid ticker: {args.ticker}. Use a valid Binance Testnet pair (e.g., BTC/USDT)."
-            )
+        for t in tickers or [args.ticker]:
+            if not t or not validate_ticker(t):
+                logger.error("Invalid ticker: %s", t)
+                raise ValueError(
+                    f"Invalid ticker: {t}. Use a valid Binance Testnet pair (e.g., BTC/USDT)."
+                )
 
     # Resolve profile weights (v4.1 personalisation)
     # Priority: --deploy > --profile-id > default
@@ -1595,30 +1755,51 @@ def main():
             state["arbitrator_mode"] = deploy_arb_mode
     logger.debug("Initial state: %s", state)
 
-    run_id = f"run-{args.ticker.replace('/', '-')}-{int(time.time())}"
+    app = build_workflow().compile()
+    if tickers:
+        run_multi_ticker_cycle(
+            app,
+            tickers,
+            run_mode=run_mode.value,
+            state_overrides={
+                k: state[k] for k in ("profile_weights", "profile_id", "arbitrator_mode")
+            },
+        )
+        return
+    run_workflow_once(app, state, ticker=args.ticker, run_mode=run_mode.value)
+
+
+def _desk_symbol_concurrency() -> int:
+    raw = (os.getenv("AIMM_DESK_SYMBOL_CONCURRENCY") or "").strip()
+    try:
+        n = int(raw) if raw else 4
+    except ValueError:
+        n = 4
+    return max(1, min(16, n))
+
+
+def _open_run(run_id: str, *, run_mode: str, runs_dir: Path) -> Path:
+    """Point latest-run markers, the log publisher and the flow repo at ``run_id``."""
     # Print the run id early so operators can deterministically fetch the right payload,
     # even if another background process is also producing runs.
     logger.info("Run id: %s", run_id)
     publisher = LogPublisher(run_id=run_id)
     set_log_publisher(publisher)
-    runs_dir = Path(".runs")
     runs_dir.mkdir(parents=True, exist_ok=True)
     # Paper runs only; backtests use latest_backtest.txt
     (runs_dir / "latest_run.txt").write_text(run_id)
-    if run_mode.value == "paper":
+    if run_mode == "paper":
         (runs_dir / "latest_paper.txt").write_text(run_id)
         status_path = runs_dir / "paper_engine.status.json"
         try:
             st: dict = {}
             if status_path.is_file():
-                import json as _json
-
-                raw = _json.loads(status_path.read_text(encoding="utf-8"))
+                raw = json.loads(status_path.read_text(encoding="utf-8"))
                 if isinstance(raw, dict):
                     st = raw
             st["paper_run_id"] = run_id
             st["updated_at"] = int(time.time())
-            status_path.write_text(_json.dumps(st, indent=2), encoding="utf-8")
+            status_path.write_text(json.dumps(st, indent=2), encoding="utf-8")
         except Exception:
             pass
     flow_log_path = runs_dir / f"{run_id}.events.jsonl"
@@ -1626,22 +1807,25 @@ def main():
         flow_log_path.unlink()
     flow_repo = FlowEventRepo(run_id=run_id, log_path=flow_log_path)
     set_flow_repo(flow_repo)
+    return flow_log_path
 
-    app = build_workflow().compile()
-    try:
-        result = app.invoke(state)
-        logger.info("Run completed: %s", _final_state_summary(result))
-        logger.debug("Final state (full): %s", pformat(result, compact=True))
-    except Exception as e:
-        logger.error("Workflow error: %s", e)
-        raise
-    finally:
-        set_flow_repo(None)
+
+def _close_run(
+    run_id: str,
+    *,
+    runs_dir: Path,
+    flow_log_path: Path,
+    states: list[tuple[HedgeFundState, dict[str, Any] | None]],
+) -> None:
+    """Index each ``(input, final)`` state pair and hand the event log to retention."""
+    set_flow_repo(None)
+    for state, result in states:
         try:
             append_run_index(
                 run_id=run_id,
                 state=result if isinstance(result, dict) else state,
                 events_path=flow_log_path,
+                runs_dir=runs_dir,
             )
         except Exception:
             pass
@@ -1650,12 +1834,101 @@ def main():
                 append_local_scan_result(run_id=run_id, state=result)
         except Exception:
             pass
+    try:
+        note_runs_artifact(flow_log_path, runs_dir=runs_dir)
+        # Sized from the retention manifest on a background thread, off the run path.
+        schedule_runs_retention(runs_dir=runs_dir, keep_run_id=run_id)
+    except Exception:
+        # Never fail a run due to retention housekeeping.
+        pass
+
+
+def run_workflow_once(
+    app: Any,
+    state: HedgeFundState,
+    *,
+    ticker: str,
+    run_mode: str,
+    runs_dir: Path | None = None,
+) -> tuple[str, dict[str, Any] | None]:
+    """Invoke a compiled workflow for one cycle and write its run artifacts.
+
+    Used by ``main()`` and by the resident paper engine (``paper_daemon``), which compiles
+    the graph once and calls this every cycle. Returns ``(run_id, final_state)``.
+    """
+    run_id = f"run-{ticker.replace('/', '-')}-{int(time.time())}"
+    runs_dir = runs_dir or Path(".runs")
+    flow_log_path = _open_run(run_id, run_mode=run_mode, runs_dir=runs_dir)
+
+    result: dict[str, Any] | None = None
+    try:
+        result = app.invoke(state)
+        logger.info("Run completed: %s", _final_state_summary(result))
+        logger.debug("Final state (full): %s", pformat(result, compact=True))
+    except Exception as e:
+        logger.error("Workflow error: %s", e)
+        raise
+    finally:
+        _close_run(run_id, runs_dir=runs_dir, flow_log_path=flow_log_path, states=[(state, result)])
+    return run_id, result
+
+
+def run_multi_ticker_cycle(
+    app: Any,
+    tickers: list[str],
+    *,
+    run_mode: str,
+    runs_dir: Path | None = None,
+    max_workers: int | None = None,
+    state_overrides: dict[str, Any] | None = None,
+) -> tuple[str, dict[str, dict[str, Any] | None]]:
+    """One desk cycle over several tickers under a single run id.
+
+    ``market_scan`` (exchange tickers, universe ranking, Nexus global bundle) runs once; each
+    ticker then runs the graph against that snapshot, up to ``AIMM_DESK_SYMBOL_CONCURRENCY``
+    at a time, with ``symbol`` on its FlowEvents. Paper fills are serialized.
+    ``state_overrides`` (profile weights, arbitrator mode, …) apply to every ticker. Returns
+    ``(run_id, {ticker: final_state or None})``; a failing ticker is logged, not raised.
+    """
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    if not tickers:
+        raise ValueError("run_multi_ticker_cycle needs at least one ticker")
+    run_id = f"run-multi-{len(tickers)}-{int(time.time())}"
+    runs_dir = runs_dir or Path(".runs")
+    flow_log_path = _open_run(run_id, run_mode=run_mode, runs_dir=runs_dir)
+
+    states: dict[str, HedgeFundState] = {}
+    results: dict[str, dict[str, Any] | None] = {t: None for t in tickers}
+
+    def _one(ticker: str) -> dict[str, Any] | None:
         try:
-            enforce_runs_retention(runs_dir=Path(".runs"), keep_run_id=run_id)
-            enforce_backtests_retention(runs_dir=Path(".runs"))
-        except Exception:
-            # Never fail a run due to retention housekeeping.
-            pass
+            return app.invoke(states[ticker])
+        except Exception as e:
+            logger.error("Workflow error for %s: %s", ticker, e)
+            return None
+
+    try:
+        scan = scan_market_snapshot(tickers, run_mode=run_mode)
+        for t in tickers:
+            states[t] = _symbol_state(scan, t, run_mode=run_mode, tickers=tickers)
+            states[t].update(state_overrides or {})
+        workers = min(len(tickers), max_workers or _desk_symbol_concurrency())
+        if workers <= 1:
+            results.update({t: _one(t) for t in tickers})
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="desk-symbol") as pool:
+                results.update(zip(tickers, pool.map(_one, tickers), strict=True))
+        for t, result in results.items():
+            if isinstance(result, dict):
+                logger.info("Run completed (%s): %s", t, _final_state_summary(result))
+    finally:
+        _close_run(
+            run_id,
+            runs_dir=runs_dir,
+            flow_log_path=flow_log_path,
+            states=[(states[t], results[t]) for t in tickers if t in states],
+        )
+    return run_id, results
 
 
 if __name__ == "__main__":
@@ -3,8 +3,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Iterable
 
-import ccxt
-
 DEFAULT_CORE = ("BTC/USDT", "ETH/USDT", "SOL/USDT", "BNB/USDT", "XRP/USDT", "ADA/USDT", "DOGE/USDT")
 
 
@@ -146,6 +144,8 @@ def fetch_volume_ranked_universe_ccxt(
     Use for backtests when you do not want a hand-picked ``--symbols`` list: same idea as a fund
     rotating into the most liquid names the venue actually lists.
     """
+    import ccxt
+
     if size < 1:
         size = 1
     primary = (primary or "BTC/USDT").strip() or "BTC/USDT"
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable
 
+from storage.jsonl_tail import compact_if_oversized, tail_jsonl
+
 
 def _runs_dir() -> Path:
     return Path(os.getenv("AIMM_RUNS_DIR") or ".runs")
@@ -16,6 +18,23 @@ def _memory_path() -> Path:
     return _runs_dir() / "policy_memory.jsonl"
 
 
+def _compaction_limits() -> tuple[int, int]:
+    """(max MB, rows kept) once ``policy_memory.jsonl`` outgrows the cap."""
+
+    def _int(name: str, default: int, lo: int, hi: int) -> int:
+        raw = (os.getenv(name) or "").strip()
+        try:
+            v = int(raw) if raw else default
+        except ValueError:
+            v = default
+        return max(lo, min(hi, v))
+
+    return (
+        _int("AIMM_POLICY_MEMORY_MAX_MB", 16, 1, 10_000),
+        _int("AIMM_POLICY_MEMORY_KEEP_LAST", 5000, 100, 10_000_000),
+    )
+
+
 @dataclass(frozen=True)
 class PolicyDecision:
     """Orchestrator output for this run."""
@@ -42,25 +61,30 @@ class PolicyMemoryStore:
         line = json.dumps(event, sort_keys=True)
         with self.path.open("a", encoding="utf-8") as f:
             f.write(line + "\n")
+        max_mb, keep_last = _compaction_limits()
+        compact_if_oversized(self.path, max_bytes=max_mb * 1024 * 1024, keep_last=keep_last)
 
     def iter_events(self, *, limit: int | None = None) -> Iterable[Dict[str, Any]]:
         if not self.path.exists():
             return []
-        # Read from end if limit requested (simple approach: read all, then slice).
-        try:
-            lines = self.path.read_text(encoding="utf-8").splitlines()
-        except Exception:
-            return []
         if limit is not None:
-            lines = lines[-int(limit) :]
-        out: list[Dict[str, Any]] = []
-        for ln in lines:
+            # Seek backwards from EOF; cost scales with ``limit``, not file size.
             try:
-                obj = json.loads(ln)
-            except Exception:
-                continue
-            if isinstance(obj, dict):
-                out.append(obj)
+                return tail_jsonl(self.path, int(limit))
+            except OSError:
+                return []
+        out: list[Dict[str, Any]] = []
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                for ln in f:
+                    try:
+                        obj = json.loads(ln)
+                    except Exception:
+                        continue
+                    if isinstance(obj, dict):
+                        out.append(obj)
+        except OSError:
+            return []
         return out
 
 
@@ -7,13 +7,18 @@ Perp model (mock, common in agentic demos):
 
 This aligns paper mode with a simplified perpetual contract book; not exchange-identical (no funding,
 liquidation engine, or cross/isolated margin), but comparable across runs for evaluation.
+
+File mode persists every account under ``<runs>/paper/paper.sqlite3`` (:class:`PaperAccountStore`);
+legacy ``<account>.account.json`` / ``.trades.jsonl`` files are imported on first load.
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -101,6 +106,7 @@ class PaperAccount:
 
 
 def _account_paths(*, runs_dir: Path, account_id: str) -> tuple[Path, Path]:
+    """Legacy per-account files, imported into :class:`PaperAccountStore` on first load."""
     base = runs_dir / "paper"
     acct = base / f"{account_id}.account.json"
     trades = base / f"{account_id}.trades.jsonl"
@@ -129,45 +135,321 @@ def _parse_perp_row(row: dict[str, Any]) -> PerpPosition | None:
     )
 
 
+def _account_from_legacy_json(data: dict[str, Any], account_id: str) -> PaperAccount:
+    pa = PaperAccount(
+        account_id=str(data.get("account_id") or account_id),
+        cash_usdt=float(data.get("cash_usdt") or 0.0),
+        realized_pnl_usdt=float(data.get("realized_pnl_usdt") or 0.0),
+        updated_ts=int(data.get("updated_ts") or 0),
+    )
+    if isinstance(data.get("spot_positions"), list):
+        for row in data["spot_positions"]:
+            if isinstance(row, dict):
+                p = _parse_spot_row(row)
+                if p and abs(p.qty) > 1e-12:
+                    pa.spot_positions[p.symbol] = p
+    if isinstance(data.get("perp_positions"), list):
+        for row in data["perp_positions"]:
+            if isinstance(row, dict):
+                p = _parse_perp_row(row)
+                if p and abs(p.qty_signed) > 1e-12:
+                    pa.perp_positions[p.symbol] = p
+    # Legacy: only ``positions`` (spot book).
+    if not pa.spot_positions and not pa.perp_positions and isinstance(data.get("positions"), list):
+        for row in data["positions"]:
+            if isinstance(row, dict):
+                p = _parse_spot_row(row)
+                if p and abs(p.qty) > 1e-12:
+                    pa.spot_positions[p.symbol] = p
+    return pa
+
+
+_STORE_DDL = """
+CREATE TABLE IF NOT EXISTS paper_accounts (
+    account_id         TEXT PRIMARY KEY,
+    cash_usdt          REAL NOT NULL,
+    realized_pnl_usdt  REAL NOT NULL,
+    updated_ts         INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS paper_positions (
+    account_id          TEXT NOT NULL,
+    book                TEXT NOT NULL,
+    symbol              TEXT NOT NULL,
+    qty                 REAL NOT NULL,
+    avg_entry           REAL NOT NULL,
+    leverage            REAL NOT NULL DEFAULT 1.0,
+    margin_locked_usdt  REAL NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (account_id, book, symbol)
+);
+
+CREATE TABLE IF NOT EXISTS paper_trades (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id  TEXT NOT NULL,
+    ts          INTEGER NOT NULL,
+    symbol      TEXT NOT NULL,
+    side        TEXT NOT NULL,
+    instrument  TEXT NOT NULL,
+    trade_json  TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_paper_trades_account_ts
+    ON paper_trades(account_id, ts);
+CREATE INDEX IF NOT EXISTS idx_paper_trades_account_symbol_ts
+    ON paper_trades(account_id, symbol, ts);
+"""
+
+
+class PaperAccountStore:
+    """File-mode paper book: one SQLite file (stdlib ``sqlite3``, WAL) per runs dir.
+
+    Trades are an append-only indexed table; a fill updates the account row and only the
+    traded symbol's position row in the same transaction as the trade insert, instead of
+    rewriting a JSON account file and appending to an unbounded JSONL log.
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        self._path = Path(db_path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_STORE_DDL)
+        self._conn.commit()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def load(self, account_id: str) -> PaperAccount | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM paper_accounts WHERE account_id = ?", (account_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            positions = self._conn.execute(
+                "SELECT * FROM paper_positions WHERE account_id = ? ORDER BY book, symbol",
+                (account_id,),
+            ).fetchall()
+        pa = PaperAccount(
+            account_id=account_id,
+            cash_usdt=float(row["cash_usdt"]),
+            realized_pnl_usdt=float(row["realized_pnl_usdt"]),
+            updated_ts=int(row["updated_ts"]),
+        )
+        for p in positions:
+            sym = str(p["symbol"])
+            if p["book"] == "perp":
+                pa.perp_positions[sym] = PerpPosition(
+                    symbol=sym,
+                    qty_signed=float(p["qty"]),
+                    avg_entry=float(p["avg_entry"]),
+                    leverage=float(p["leverage"]),
+                    margin_locked_usdt=float(p["margin_locked_usdt"]),
+                )
+            else:
+                pa.spot_positions[sym] = SpotPosition(
+                    symbol=sym, qty=float(p["qty"]), avg_entry=float(p["avg_entry"])
+                )
+        return pa
+
+    def _upsert_account_locked(self, account: PaperAccount) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO paper_accounts (account_id, cash_usdt, realized_pnl_usdt, updated_ts)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(account_id) DO UPDATE SET
+                cash_usdt = excluded.cash_usdt,
+                realized_pnl_usdt = excluded.realized_pnl_usdt,
+                updated_ts = excluded.updated_ts
+            """,
+            (
+                account.account_id,
+                float(account.cash_usdt),
+                float(account.realized_pnl_usdt),
+                int(account.updated_ts),
+            ),
+        )
+
+    def _sync_position_locked(self, account: PaperAccount, symbol: str) -> None:
+        aid = account.account_id
+        self._conn.execute(
+            "DELETE FROM paper_positions WHERE account_id = ? AND symbol = ?", (aid, symbol)
+        )
+        spot = account.spot_positions.get(symbol)
+        if spot is not None and abs(float(spot.qty)) > 1e-12:
+            self._conn.execute(
+                "INSERT INTO paper_positions (account_id, book, symbol, qty, avg_entry) "
+                "VALUES (?, 'spot', ?, ?, ?)",
+                (aid, symbol, float(spot.qty), float(spot.avg_entry)),
+            )
+        perp = account.perp_positions.get(symbol)
+        if perp is not None and abs(float(perp.qty_signed)) > 1e-12:
+            self._conn.execute(
+                "INSERT INTO paper_positions "
+                "(account_id, book, symbol, qty, avg_entry, leverage, margin_locked_usdt) "
+                "VALUES (?, 'perp', ?, ?, ?, ?, ?)",
+                (
+                    aid,
+                    symbol,
+                    float(perp.qty_signed),
+                    float(perp.avg_entry),
+                    float(perp.leverage),
+                    float(perp.margin_locked_usdt),
+                ),
+            )
+
+    def _insert_trade_locked(self, account_id: str, trade: dict[str, Any]) -> int:
+        cur = self._conn.execute(
+            "INSERT INTO paper_trades (account_id, ts, symbol, side, instrument, trade_json) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                account_id,
+                int(trade.get("ts") or time.time()),
+                str(trade.get("symbol") or ""),
+                str(trade.get("side") or ""),
+                str(trade.get("instrument") or "spot"),
+                json.dumps(trade, default=str),
+            ),
+        )
+        return int(cur.lastrowid or 0)
+
+    def save(self, account: PaperAccount) -> None:
+        """Full rewrite of one account (init / reset / external edits)."""
+        with self._lock, self._conn:
+            self._upsert_account_locked(account)
+            self._conn.execute(
+                "DELETE FROM paper_positions WHERE account_id = ?", (account.account_id,)
+            )
+            for sym in {*account.spot_positions, *account.perp_positions}:
+                self._sync_position_locked(account, sym)
+
+    def record_fill(self, account: PaperAccount, trade: dict[str, Any]) -> int:
+        """Persist one fill atomically: account row, the traded symbol's position, the trade."""
+        sym = str(trade.get("symbol") or "")
+        with self._lock, self._conn:
+            self._upsert_account_locked(account)
+            if sym:
+                self._sync_position_locked(account, sym)
+            return self._insert_trade_locked(account.account_id, trade)
+
+    def append_trade(self, account_id: str, trade: dict[str, Any]) -> int:
+        with self._lock, self._conn:
+            return self._insert_trade_locked(account_id, trade)
+
+    def clear_trades(self, account_id: str) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM paper_trades WHERE account_id = ?", (account_id,))
+            return int(cur.rowcount or 0)
+
+    def list_trades(
+        self,
+        account_id: str,
+        *,
+        limit: int = 200,
+        before_id: int | None = None,
+        symbol: str | None = None,
+        since_ts: int | None = None,
+        until_ts: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Newest ``limit`` trades matching the filters, returned oldest-first.
+
+        ``before_id`` is the cursor: pass the returned ``next_before_id`` to page further
+        back. It is None once the oldest matching trade has been returned.
+        """
+        clauses = ["account_id = ?"]
+        params: list[Any] = [account_id]
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(int(before_id))
+        if symbol:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if since_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(int(since_ts))
+        if until_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(int(until_ts))
+        n = max(1, int(limit))
+        params.append(n)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, trade_json FROM paper_trades WHERE {' AND '.join(clauses)} "
+                "ORDER BY id DESC LIMIT ?",
+                params,
+            ).fetchall()
+        out: list[dict[str, Any]] = []
+        for r in reversed(rows):
+            try:
+                obj = json.loads(r["trade_json"])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(obj, dict):
+                out.append({**obj, "trade_id": int(r["id"])})
+        next_before = int(rows[-1]["id"]) if len(rows) == n else None
+        return out, next_before
+
+    def import_legacy(self, account: PaperAccount, trades_path: Path) -> int:
+        """One-time import of a JSON account and its ``trades.jsonl`` (files are left in place)."""
+        imported = 0
+        with self._lock, self._conn:
+            self._upsert_account_locked(account)
+            for sym in {*account.spot_positions, *account.perp_positions}:
+                self._sync_position_locked(account, sym)
+            if trades_path.is_file():
+                with trades_path.open(encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            obj = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if isinstance(obj, dict):
+                            self._insert_trade_locked(account.account_id, obj)
+                            imported += 1
+        return imported
+
+
+_STORES: dict[Path, PaperAccountStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def paper_store(runs_dir: Path) -> PaperAccountStore:
+    """Process-wide store for ``runs_dir/paper/paper.sqlite3``."""
+    path = (Path(runs_dir) / "paper" / "paper.sqlite3").resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = PaperAccountStore(path)
+            _STORES[path] = store
+        return store
+
+
 def load_or_init_account(
     *,
     runs_dir: Path,
     account_id: str = "default",
     start_usdt: float,
 ) -> PaperAccount:
-    acct_path, _trades_path = _account_paths(runs_dir=runs_dir, account_id=account_id)
+    store = paper_store(runs_dir)
+    pa = store.load(account_id)
+    if pa is not None:
+        return pa
+
+    acct_path, trades_path = _account_paths(runs_dir=runs_dir, account_id=account_id)
     try:
         if acct_path.exists():
             data = json.loads(acct_path.read_text(encoding="utf-8"))
-            pa = PaperAccount(
-                account_id=str(data.get("account_id") or account_id),
-                cash_usdt=float(data.get("cash_usdt") or 0.0),
-                realized_pnl_usdt=float(data.get("realized_pnl_usdt") or 0.0),
-                updated_ts=int(data.get("updated_ts") or 0),
-            )
-            if isinstance(data.get("spot_positions"), list):
-                for row in data["spot_positions"]:
-                    if isinstance(row, dict):
-                        p = _parse_spot_row(row)
-                        if p and abs(p.qty) > 1e-12:
-                            pa.spot_positions[p.symbol] = p
-            if isinstance(data.get("perp_positions"), list):
-                for row in data["perp_positions"]:
-                    if isinstance(row, dict):
-                        p = _parse_perp_row(row)
-                        if p and abs(p.qty_signed) > 1e-12:
-                            pa.perp_positions[p.symbol] = p
-            # Legacy: only ``positions`` (spot book).
-            if (
-                not pa.spot_positions
-                and not pa.perp_positions
-                and isinstance(data.get("positions"), list)
-            ):
-                for row in data["positions"]:
-                    if isinstance(row, dict):
-                        p = _parse_spot_row(row)
-                        if p and abs(p.qty) > 1e-12:
-                            pa.spot_positions[p.symbol] = p
+            pa = _account_from_legacy_json(data, account_id)
+            pa.account_id = account_id
+            store.import_legacy(pa, trades_path)
             return pa
     except Exception:
         pass
@@ -180,17 +462,7 @@ def load_or_init_account(
 
 
 def save_account(*, runs_dir: Path, account: PaperAccount) -> None:
-    acct_path, _trades_path = _account_paths(runs_dir=runs_dir, account_id=account.account_id)
-    acct_path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
-        "account_id": account.account_id,
-        "cash_usdt": float(account.cash_usdt),
-        "realized_pnl_usdt": float(account.realized_pnl_usdt),
-        "spot_positions": [asdict(p) for p in account.spot_positions.values()],
-        "perp_positions": [asdict(p) for p in account.perp_positions.values()],
-        "updated_ts": int(account.updated_ts),
-    }
-    acct_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    paper_store(runs_dir).save(account)
 
 
 def append_trade(
@@ -199,10 +471,47 @@ def append_trade(
     account_id: str,
     trade: dict[str, Any],
 ) -> None:
-    _acct_path, trades_path = _account_paths(runs_dir=runs_dir, account_id=account_id)
-    trades_path.parent.mkdir(parents=True, exist_ok=True)
-    with trades_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(trade, default=str) + "\n")
+    paper_store(runs_dir).append_trade(account_id, trade)
+
+
+def record_fill(*, runs_dir: Path, account: PaperAccount, trade: dict[str, Any]) -> int:
+    """Persist a fill from :func:`apply_spot_fill` / :func:`apply_perp_fill` atomically."""
+    return paper_store(runs_dir).record_fill(account, trade)
+
+
+def list_trades(
+    *,
+    runs_dir: Path,
+    account_id: str,
+    limit: int = 200,
+    before_id: int | None = None,
+    symbol: str | None = None,
+    since_ts: int | None = None,
+    until_ts: int | None = None,
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Cursor-paginated trade log; see :meth:`PaperAccountStore.list_trades`."""
+    store = paper_store(runs_dir)
+    if store.load(account_id) is None:
+        # Trigger the legacy JSONL import for accounts not yet migrated.
+        acct_path, _ = _account_paths(runs_dir=runs_dir, account_id=account_id)
+        if not acct_path.exists():
+            return [], None
+        load_or_init_account(runs_dir=runs_dir, account_id=account_id, start_usdt=0.0)
+    return store.list_trades(
+        account_id,
+        limit=limit,
+        before_id=before_id,
+        symbol=symbol,
+        since_ts=since_ts,
+        until_ts=until_ts,
+    )
+
+
+def reset_account(*, runs_dir: Path, account: PaperAccount) -> None:
+    """Replace the book with ``account`` and drop its trade history."""
+    store = paper_store(runs_dir)
+    store.save(account)
+    store.clear_trades(account.account_id)
 
 
 def apply_spot_fill(
@@ -470,12 +779,17 @@ Position = SpotPosition
 
 __all__ = [
     "PaperAccount",
+    "PaperAccountStore",
     "PerpPosition",
     "Position",
     "SpotPosition",
     "append_trade",
     "apply_perp_fill",
     "apply_spot_fill",
+    "list_trades",
     "load_or_init_account",
+    "paper_store",
+    "record_fill",
+    "reset_account",
     "save_account",
 ]
@@ -0,0 +1,208 @@
+"""Resident paper-trading engine for the Live desk.
+
+``scripts/run_paper_loop.py`` used to start ``python src/main.py --mode paper`` for every
+cycle, so each one re-imported the stack, recompiled the LangGraph workflow and reloaded
+exchange markets before doing any work. :class:`PaperDaemon` compiles the graph once and
+runs cycles in-process (warm exchange, Nexus and LLM clients), patching
+``paper_engine.status.json`` with the fields ``api.engine_routes`` reads.
+
+A comma-separated ticker (``BTC/USDT,ETH/USDT``) runs one multi-ticker desk cycle per
+interval (``main.run_multi_ticker_cycle``): one market scan shared by every pair.
+
+``AIMM_PAPER_ENGINE=subprocess`` keeps the process-per-cycle loop (full isolation).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from config.runs_paths import repo_root
+from config.runs_paths import runs_dir as _default_runs_dir
+
+logger = logging.getLogger(__name__)
+
+_ENGINES = {"resident", "subprocess"}
+
+
+def paper_engine_kind() -> str:
+    raw = (os.getenv("AIMM_PAPER_ENGINE") or "").strip().lower()
+    return raw if raw in _ENGINES else "resident"
+
+
+def merge_paper_status(path: Path, **fields: Any) -> None:
+    """Patch ``paper_engine.status.json`` without dropping fields set by the API / main.py."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        st: dict[str, Any] = {}
+        if path.is_file():
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(raw, dict):
+                st = raw
+        st.update(fields)
+        st["updated_at"] = int(time.time())
+        path.write_text(json.dumps(st, indent=2), encoding="utf-8")
+    except Exception as exc:
+        logger.warning("paper status write failed: %s", exc)
+
+
+def split_tickers(ticker: str) -> list[str]:
+    return list(dict.fromkeys(t.strip() for t in str(ticker).split(",") if t.strip()))
+
+
+def subprocess_cycle(ticker: str) -> Callable[[], int]:
+    """One ``src/main.py --mode paper`` child per cycle (``AIMM_PAPER_ENGINE=subprocess``)."""
+    root = repo_root()
+    env = os.environ.copy()
+    env["MODE"] = "paper"
+    env["TICKER"] = ticker
+    env["PYTHONPATH"] = str(root / "src") + os.pathsep + env.get("PYTHONPATH", "")
+
+    tickers = split_tickers(ticker)
+    flag = "--tickers" if len(tickers) > 1 else "--ticker"
+
+    def cycle() -> int:
+        proc = subprocess.run(
+            [sys.executable, str(root / "src" / "main.py"), "--mode", "paper", flag, ticker],
+            cwd=str(root),
+            env=env,
+            check=False,
+        )
+        return int(proc.returncode)
+
+    return cycle
+
+
+class PaperDaemon:
+    """Long-lived paper loop: one compiled workflow, one cycle every ``interval_sec``.
+
+    ``cycle`` overrides the in-process graph run (returns an exit code, 0 = ok); a raising
+    cycle is logged and recorded as exit code 1, and the loop keeps going.
+    """
+
+    def __init__(
+        self,
+        *,
+        ticker: str,
+        interval_sec: int,
+        runs_dir: Path | None = None,
+        cycle: Callable[[], int] | None = None,
+    ) -> None:
+        self.ticker = ticker
+        self.tickers = split_tickers(ticker)
+        self.interval_sec = int(interval_sec)
+        self.runs_dir = runs_dir or _default_runs_dir()
+        self.status_path = self.runs_dir / "paper_engine.status.json"
+        self.iteration = 0
+        self._cycle = cycle
+        self._app: Any = None
+        self._stop = threading.Event()
+        self._in_cycle = False
+
+    def warm_up(self) -> None:
+        """Validate the ticker and compile the workflow once (no-op with a custom cycle)."""
+        if self._cycle is not None or self._app is not None:
+            return
+        import main
+
+        for t in self.tickers:
+            if not main.validate_ticker(t):
+                raise ValueError(
+                    f"Invalid ticker: {t}. Use a valid Binance Testnet pair (e.g., BTC/USDT)."
+                )
+        started = time.perf_counter()
+        self._app = main.build_workflow().compile()
+        logger.info("paper engine warm in %.1fs", time.perf_counter() - started)
+
+    def _graph_cycle(self) -> int:
+        import main
+        from schemas.state import initial_hedge_fund_state
+
+        self.warm_up()
+        if len(self.tickers) > 1:
+            _, results = main.run_multi_ticker_cycle(
+                self._app, self.tickers, run_mode="paper", runs_dir=self.runs_dir
+            )
+            return 0 if all(r is not None for r in results.values()) else 1
+        state = initial_hedge_fund_state(run_mode="paper", ticker=self.tickers[0])
+        main.run_workflow_once(
+            self._app, state, ticker=self.tickers[0], run_mode="paper", runs_dir=self.runs_dir
+        )
+        return 0
+
+    def run_once(self) -> int:
+        """Run one scan cycle, bracketed by ``scanning`` / ``waiting`` status patches."""
+        self.iteration += 1
+        merge_paper_status(
+            self.status_path,
+            ticker=self.ticker,
+            interval_sec=self.interval_sec,
+            phase="scanning",
+            scan_iteration=self.iteration,
+            last_scan_started_at=int(time.time()),
+            next_scan_at=None,
+        )
+        logger.info("paper cycle ticker=%s iteration=%d", self.ticker, self.iteration)
+        self._in_cycle = True
+        try:
+            code = int((self._cycle or self._graph_cycle)())
+        except Exception:
+            logger.exception("paper cycle %d failed", self.iteration)
+            code = 1
+        finally:
+            self._in_cycle = False
+        finished = int(time.time())
+        merge_paper_status(
+            self.status_path,
+            ticker=self.ticker,
+            interval_sec=self.interval_sec,
+            phase="waiting",
+            scan_iteration=self.iteration,
+            last_scan_finished_at=finished,
+            last_scan_exit_code=code,
+            next_scan_at=finished + self.interval_sec,
+        )
+        return code
+
+    def run_forever(self, *, max_cycles: int | None = None) -> None:
+        """Cycle until :meth:`stop`, SIGTERM, or ``max_cycles``."""
+        previous = None
+        if threading.current_thread() is threading.main_thread():
+            previous = signal.signal(signal.SIGTERM, self._on_sigterm)
+        try:
+            while not self._stop.is_set():
+                self.run_once()
+                if max_cycles is not None and self.iteration >= max_cycles:
+                    break
+                logger.info("paper engine sleeping %ds", self.interval_sec)
+                self._stop.wait(self.interval_sec)
+        finally:
+            if previous is not None:
+                signal.signal(signal.SIGTERM, previous)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _on_sigterm(self, signum: int, frame: Any) -> None:
+        self.stop()
+        if self._in_cycle:
+            # Same outcome as killing the per-cycle child: abandon the cycle.
+            raise SystemExit(128 + signum)
+
+
+__all__ = [
+    "PaperDaemon",
+    "merge_paper_status",
+    "paper_engine_kind",
+    "split_tickers",
+    "subprocess_cycle",
+]
@@ -13,30 +13,12 @@ from typing import Any
 
 from config.app_settings import load_app_settings
 from schemas.state import HedgeFundState
+from storage.jsonl_tail import compact_if_oversized
 
 
 def _prune_index_file(idx: Path, *, keep_last: int, max_bytes: int) -> None:
-    try:
-        if not idx.exists():
-            return
-        st = idx.stat()
-        if st.st_size <= max_bytes and st.st_size <= max(1, max_bytes):
-            return
-        # Keep only the last N lines. This is fast enough for our intended size caps.
-        lines = idx.read_text(encoding="utf-8").splitlines()
-        if keep_last > 0 and len(lines) > keep_last:
-            lines = lines[-keep_last:]
-        out = "\n".join(lines).rstrip() + "\n" if lines else ""
-        # If still too big (single huge lines), hard trim by bytes.
-        if len(out.encode("utf-8")) > max_bytes:
-            b = out.encode("utf-8")[-max_bytes:]
-            # ensure valid utf-8 by dropping leading partials
-            out = b.decode("utf-8", errors="ignore")
-            if out and not out.endswith("\n"):
-                out += "\n"
-        idx.write_text(out, encoding="utf-8")
-    except OSError:
-        return
+    # Size-triggered: one streaming copy of the retained tail, never a full read.
+    compact_if_oversized(idx, max_bytes=max_bytes, keep_last=keep_last)
 
 
 def append_run_index(
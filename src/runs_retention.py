@@ -7,17 +7,51 @@ This module enforces a simple safety policy:
 - cap total disk usage under `.runs/`
 
 This is config-first (config/app.default.json) with env overrides for emergencies.
+
+Sizes come from a persistent manifest (``.runs/retention_manifest.sqlite3``) instead of a
+recursive scan per call. Reconciling only lists the two retention roots; a directory is
+re-walked only when it is new, was marked with :func:`note_runs_artifact`, changed mtime,
+was still settling when last sized, or its size is older than a day. Enforcement then
+costs O(entries deleted), and :func:`schedule_runs_retention` runs it off the run path.
 """
 
 from __future__ import annotations
 
+import logging
 import os
 import shutil
+import sqlite3
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
 from config.app_settings import load_app_settings
 
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "retention_manifest.sqlite3"
+
+# Always preserve these root entries: indexes and journals, plus live state that is not a
+# run (paper accounts, the resident paper engine, the spooled backtest job queue).
+_PRESERVE_NAMES = {
+    "latest_run.txt",
+    "policy_memory.jsonl",
+    "index.jsonl",
+    "backtest_completions.jsonl",
+    "backtest_completions.jsonl.lock",
+    "paper",
+    "paper_engine.pid",
+    "paper_engine.status.json",
+    "paper_engine.log",
+    "backtest_queue",
+}
+
+# A directory sized within this long of its last mtime may still be growing; re-walk it.
+_SETTLE_SEC = 600.0
+# Upper bound on how stale a clean directory size may get.
+_RESIZE_SEC = 86_400.0
+
 
 @dataclass(frozen=True)
 class RunsRetention:
@@ -68,6 +102,207 @@ def load_runs_retention() -> RunsRetention:
     )
 
 
+_MANIFEST_DDL = """
+CREATE TABLE IF NOT EXISTS entries (
+    scope    TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    kind     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime    REAL NOT NULL,
+    sized_at REAL NOT NULL,
+    dirty    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, name)
+);
+"""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    name: str
+    kind: str  # "file" | "dir"
+    size: int
+    mtime: float
+    path: Path
+
+
+def _tree_size_bytes(root: Path) -> int:
+    """Total file bytes under ``root`` (``os.scandir`` walk, no symlink following)."""
+    total = 0
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(Path(e.path))
+                        elif e.is_file(follow_symlinks=False):
+                            total += e.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+class RetentionManifest:
+    """Per-entry size/mtime/kind for ``.runs/`` (scope ``runs``) and ``.runs/backtests/``
+    (scope ``backtests``), in one SQLite file (stdlib ``sqlite3``, WAL) per runs dir."""
+
+    def __init__(self, runs_dir: Path) -> None:
+        self._base = Path(runs_dir).resolve()
+        self._base.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self._base / MANIFEST_NAME), check_same_thread=False, timeout=10.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_MANIFEST_DDL)
+        self._conn.commit()
+
+    @property
+    def base(self) -> Path:
+        return self._base
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _root(self, scope: str) -> Path:
+        return self._base / "backtests" if scope == "backtests" else self._base
+
+    def _locate(self, path: Path) -> tuple[str, str] | None:
+        try:
+            rel = Path(path).resolve().relative_to(self._base)
+        except ValueError:
+            return None
+        parts = rel.parts
+        if not parts:
+            return None
+        if parts[0] == "backtests":
+            return ("backtests", parts[1]) if len(parts) > 1 else None
+        return "runs", parts[0]
+
+    def mark_dirty(self, path: Path) -> None:
+        """Flag the top-level entry containing ``path`` for re-sizing at the next reconcile."""
+        loc = self._locate(path)
+        if loc is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (scope, name, kind, size, mtime, sized_at, dirty) "
+                "VALUES (?, ?, 'dir', 0, 0, 0, 1) "
+                "ON CONFLICT(scope, name) DO UPDATE SET dirty = 1",
+                loc,
+            )
+            self._conn.commit()
+
+    def forget(self, scope: str, name: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE scope = ? AND name = ?", (scope, name))
+            self._conn.commit()
+
+    def reconcile(self, scope: str) -> list[ManifestEntry]:
+        """List the scope root once and refresh only entries whose size may have changed."""
+        root = self._root(scope)
+        with self._lock:
+            known = {
+                r[0]: r[1:]
+                for r in self._conn.execute(
+                    "SELECT name, kind, size, mtime, sized_at, dirty FROM entries WHERE scope = ?",
+                    (scope,),
+                )
+            }
+        now = time.time()
+        out: list[ManifestEntry] = []
+        updates: list[tuple] = []
+        seen: set[str] = set()
+        try:
+            with os.scandir(root) as it:
+                children = list(it)
+        except OSError:
+            children = []
+        for e in children:
+            name = e.name
+            if name.startswith(MANIFEST_NAME) or (scope == "runs" and name == "backtests"):
+                continue
+            try:
+                st = e.stat(follow_symlinks=False)
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            seen.add(name)
+            prev = known.get(name)
+            if not is_dir:
+                kind, size = "file", int(st.st_size)
+                if prev is None or prev[4] or tuple(prev[:3]) != (kind, size, st.st_mtime):
+                    updates.append((scope, name, kind, size, st.st_mtime, now))
+            elif (
+                prev is None
+                or prev[0] != "dir"
+                or prev[4]
+                or prev[2] != st.st_mtime
+                or prev[3] - st.st_mtime < _SETTLE_SEC
+                or now - prev[3] > _RESIZE_SEC
+            ):
+                kind, size = "dir", _tree_size_bytes(Path(e.path))
+                updates.append((scope, name, kind, size, st.st_mtime, now))
+            else:
+                kind, size = "dir", int(prev[1])
+            out.append(ManifestEntry(name, kind, size, st.st_mtime, Path(e.path)))
+        gone = [(scope, n) for n in known if n not in seen]
+        if updates or gone:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT INTO entries (scope, name, kind, size, mtime, sized_at, dirty) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0) "
+                    "ON CONFLICT(scope, name) DO UPDATE SET kind = excluded.kind, "
+                    "size = excluded.size, mtime = excluded.mtime, "
+                    "sized_at = excluded.sized_at, dirty = 0",
+                    updates,
+                )
+                self._conn.executemany("DELETE FROM entries WHERE scope = ? AND name = ?", gone)
+                self._conn.commit()
+        return out
+
+
+_MANIFESTS: dict[Path, RetentionManifest] = {}
+_MANIFESTS_LOCK = threading.Lock()
+
+
+def retention_manifest(runs_dir: Path | None = None) -> RetentionManifest:
+    """Process-wide manifest for ``runs_dir`` (default ``.runs``)."""
+    path = (runs_dir or Path(".runs")).resolve()
+    with _MANIFESTS_LOCK:
+        m = _MANIFESTS.get(path)
+        if m is None:
+            m = RetentionManifest(path)
+            _MANIFESTS[path] = m
+        return m
+
+
+def note_runs_artifact(path: Path, *, runs_dir: Path | None = None) -> None:
+    """Tell the manifest an artifact under ``runs_dir`` was written (best effort)."""
+    try:
+        retention_manifest(runs_dir).mark_dirty(path)
+    except Exception as e:
+        logger.debug("retention manifest update skipped for %s: %s", path, e)
+
+
+def _remove(entry: ManifestEntry) -> bool:
+    try:
+        if entry.kind == "file":
+            entry.path.unlink(missing_ok=True)
+        else:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    except OSError:
+        return False
+    # rmtree(ignore_errors=True) swallows failures; only a vanished path counts as freed.
+    return not entry.path.exists()
+
+
 def enforce_runs_retention(
     *, runs_dir: Path | None = None, keep_run_id: str | None = None
 ) -> dict[str, int]:
@@ -82,77 +317,38 @@ def enforce_runs_retention(
 
     policy = load_runs_retention()
     max_bytes = int(policy.max_total_mb) * 1024 * 1024
+    manifest = retention_manifest(base)
 
-    # Always preserve these root files.
-    preserve_names = {"latest_run.txt", "policy_memory.jsonl", "index.jsonl"}
-
-    # Collect deletable candidates (files + dirs) with mtime + size.
-    files: list[tuple[float, int, Path]] = []
-    dirs: list[tuple[float, int, Path]] = []
-    for p in base.iterdir():
-        if p.name in preserve_names:
-            continue
-        # Backtests are retained separately.
-        if p.name == "backtests" and p.is_dir():
-            continue
-        if keep_run_id and p.name.startswith(keep_run_id):
-            continue
-        try:
-            st = p.stat()
-        except OSError:
-            continue
-        if p.is_file():
-            files.append((st.st_mtime, st.st_size, p))
-        elif p.is_dir():
-            # Approximate dir size by summing contained files (bounded; okay for retention).
-            sz = 0
-            try:
-                for f in p.rglob("*"):
-                    if f.is_file():
-                        try:
-                            sz += f.stat().st_size
-                        except OSError:
-                            pass
-            except OSError:
-                sz = 0
-            dirs.append((st.st_mtime, sz, p))
-
-    # Current usage (recursive).
-    total = 0
-    for f in base.rglob("*"):
-        if f.is_file():
-            try:
-                total += f.stat().st_size
-            except OSError:
-                pass
+    entries = manifest.reconcile("runs")
+    # Current usage: every tracked root entry plus backtest run dirs.
+    total = sum(e.size for e in entries)
+    total += sum(e.size for e in manifest.reconcile("backtests"))
+    if total <= max_bytes:
+        return {"deleted_files": 0, "deleted_dirs": 0, "bytes_freed": 0}
 
-    # Keep last N by mtime across both files and dirs.
-    candidates: list[tuple[float, int, Path, str]] = [
-        (mt, sz, p, "file") for mt, sz, p in files
-    ] + [(mt, sz, p, "dir") for mt, sz, p in dirs]
-    candidates.sort(key=lambda r: r[0], reverse=True)  # newest first
-    to_consider = candidates[policy.keep_last :]
-    # Oldest first for deletion.
-    to_consider.sort(key=lambda r: r[0])
+    candidates = [
+        e
+        for e in entries
+        if e.name not in _PRESERVE_NAMES and not (keep_run_id and e.name.startswith(keep_run_id))
+    ]
+    # Keep last N by mtime across both files and dirs; delete oldest first.
+    candidates.sort(key=lambda e: e.mtime, reverse=True)
+    to_consider = sorted(candidates[policy.keep_last :], key=lambda e: e.mtime)
 
     deleted_files = deleted_dirs = 0
     bytes_freed = 0
-    for _mt, sz, p, kind in to_consider:
+    for e in to_consider:
         if total <= max_bytes:
             break
-        try:
-            if kind == "file" and p.is_file():
-                p.unlink(missing_ok=True)
-                deleted_files += 1
-                bytes_freed += int(sz)
-                total -= int(sz)
-            elif kind == "dir" and p.is_dir():
-                shutil.rmtree(p, ignore_errors=True)
-                deleted_dirs += 1
-                bytes_freed += int(sz)
-                total -= int(sz)
-        except OSError:
+        if not _remove(e):
             continue
+        manifest.forget("runs", e.name)
+        if e.kind == "file":
+            deleted_files += 1
+        else:
+            deleted_dirs += 1
+        bytes_freed += int(e.size)
+        total -= int(e.size)
 
     return {
         "deleted_files": deleted_files,
@@ -161,17 +357,6 @@ def enforce_runs_retention(
     }
 
 
-def _dir_size_bytes(p: Path) -> int:
-    sz = 0
-    for f in p.rglob("*"):
-        if f.is_file():
-            try:
-                sz += f.stat().st_size
-            except OSError:
-                pass
-    return sz
-
-
 def enforce_backtests_retention(*, runs_dir: Path | None = None) -> dict[str, int]:
     """Enforce retention within `.runs/backtests/` by deleting oldest run directories."""
 
@@ -188,39 +373,81 @@ def enforce_backtests_retention(*, runs_dir: Path | None = None) -> dict[str, in
         # If settings can't be loaded, default to non-destructive behavior.
         return {"deleted_dirs": 0, "bytes_freed": 0}
     max_bytes = int(policy.backtests_max_total_mb) * 1024 * 1024
+    manifest = retention_manifest(base)
 
-    run_dirs = []
-    for d in bt.iterdir():
-        if d.is_dir():
-            try:
-                st = d.stat()
-            except OSError:
-                continue
-            run_dirs.append((st.st_mtime, _dir_size_bytes(d), d))
-    run_dirs.sort(key=lambda r: r[0], reverse=True)  # newest first
-
-    # Total usage
-    total = sum(sz for _mt, sz, _d in run_dirs)
+    run_dirs = [e for e in manifest.reconcile("backtests") if e.kind == "dir"]
+    total = sum(e.size for e in run_dirs)
+    if total <= max_bytes:
+        return {"deleted_dirs": 0, "bytes_freed": 0}
 
     # Never delete newest keep_last
-    to_consider = run_dirs[policy.backtests_keep_last :]
-    to_consider.sort(key=lambda r: r[0])  # oldest first
+    run_dirs.sort(key=lambda e: e.mtime, reverse=True)
+    to_consider = sorted(run_dirs[policy.backtests_keep_last :], key=lambda e: e.mtime)
 
     deleted = 0
     freed = 0
-    for _mt, sz, d in to_consider:
+    for e in to_consider:
         if total <= max_bytes:
             break
-        shutil.rmtree(d, ignore_errors=True)
+        if not _remove(e):
+            continue
+        manifest.forget("backtests", e.name)
         deleted += 1
-        freed += int(sz)
-        total -= int(sz)
+        freed += int(e.size)
+        total -= int(e.size)
     return {"deleted_dirs": deleted, "bytes_freed": freed}
 
 
+_WORKER_LOCK = threading.Lock()
+_WORKER: threading.Thread | None = None
+_PENDING: dict[Path, str | None] = {}
+
+
+def _retention_worker() -> None:
+    global _WORKER
+    while True:
+        with _WORKER_LOCK:
+            if not _PENDING:
+                _WORKER = None
+                return
+            base, keep_run_id = _PENDING.popitem()
+        try:
+            stats = enforce_runs_retention(runs_dir=base, keep_run_id=keep_run_id)
+            stats_bt = enforce_backtests_retention(runs_dir=base)
+            if stats.get("bytes_freed") or stats_bt.get("bytes_freed"):
+                logger.info("runs retention: %s backtests: %s", stats, stats_bt)
+        except Exception as e:
+            # Never fail a run due to retention housekeeping.
+            logger.debug("runs retention failed: %s", e)
+
+
+def schedule_runs_retention(
+    *, runs_dir: Path | None = None, keep_run_id: str | None = None
+) -> threading.Thread:
+    """Run both retention passes on a background thread; calls made while one is in
+    flight coalesce into a single follow-up pass per runs dir.
+
+    The thread is non-daemon so a CLI run still finishes housekeeping before exit.
+    """
+    global _WORKER
+    base = (runs_dir or Path(".runs")).resolve()
+    with _WORKER_LOCK:
+        _PENDING[base] = keep_run_id
+        if _WORKER is None:
+            _WORKER = threading.Thread(target=_retention_worker, name="runs-retention")
+            _WORKER.start()
+        return _WORKER
+
+
 __all__ = [
+    "MANIFEST_NAME",
+    "ManifestEntry",
+    "RetentionManifest",
     "RunsRetention",
     "enforce_backtests_retention",
     "enforce_runs_retention",
     "load_runs_retention",
+    "note_runs_artifact",
+    "retention_manifest",
+    "schedule_runs_retention",
 ]
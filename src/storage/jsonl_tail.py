@@ -0,0 +1,175 @@
+"""Bounded reads and compaction for append-only JSONL files.
+
+Run logs, the run index and policy memory grow with every run, so "last N rows" readers seek
+backwards from EOF in fixed blocks instead of reading the whole file. Compaction keeps the
+newest rows by copying the retained suffix in one streaming pass to a temp file, then
+atomically replacing the original.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reverse(path: Path, *, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield non-blank lines newest-first (raw bytes, no newline), reading blocks from EOF."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + partial
+            lines = chunk.split(b"\n")
+            # The first piece may continue in the previous block.
+            partial = lines.pop(0)
+            for raw in reversed(lines):
+                if raw.strip():
+                    yield raw
+        if partial.strip():
+            yield partial
+
+
+def tail_lines(path: Path, n: int, *, block_size: int = BLOCK_SIZE) -> list[str]:
+    """Last ``n`` non-blank lines, oldest first."""
+    if n <= 0:
+        return []
+    out: list[str] = []
+    for raw in iter_lines_reverse(path, block_size=block_size):
+        out.append(raw.decode("utf-8", errors="replace").strip())
+        if len(out) >= n:
+            break
+    out.reverse()
+    return out
+
+
+def _dict_rows(val: Any) -> list[dict[str, Any]]:
+    if isinstance(val, dict):
+        return [val]
+    if isinstance(val, list):
+        return [x for x in val if isinstance(x, dict)]
+    return []
+
+
+def tail_jsonl(
+    path: Path,
+    n: int,
+    *,
+    where: Callable[[dict[str, Any]], bool] | None = None,
+    expand_arrays: bool = False,
+    strict: bool = False,
+) -> list[dict[str, Any]]:
+    """Last ``n`` JSON object rows (optionally filtered by ``where``), oldest first.
+
+    Malformed lines are skipped unless ``strict``. ``expand_arrays`` also accepts legacy lines
+    holding a JSON array of objects.
+    """
+    if n <= 0:
+        return []
+    out: list[dict[str, Any]] = []
+    for raw in iter_lines_reverse(path):
+        try:
+            val = json.loads(raw)
+        except ValueError:
+            if strict:
+                raise
+            continue
+        rows = _dict_rows(val) if expand_arrays else ([val] if isinstance(val, dict) else [])
+        for row in reversed(rows):
+            if where is not None and not where(row):
+                continue
+            out.append(row)
+            if len(out) >= n:
+                out.reverse()
+                return out
+    out.reverse()
+    return out
+
+
+def _suffix_offset(path: Path, *, keep_last: int, max_bytes: int) -> int:
+    """Byte offset where the newest ``keep_last`` lines, capped at ``max_bytes``, start."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        floor = max(0, size - max_bytes)
+        if keep_last > 0:
+            end = size
+            if end:
+                f.seek(end - 1)
+                if f.read(1) == b"\n":
+                    end -= 1  # the final newline terminates the last line
+            pos, seen = end, 0
+            while pos > floor:
+                step = min(BLOCK_SIZE, pos - floor)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                i = len(chunk)
+                while (i := chunk.rfind(b"\n", 0, i)) >= 0:
+                    seen += 1
+                    if seen == keep_last:
+                        return pos + i + 1
+        if floor == 0:
+            return 0
+        # Byte cap hit first: start at the first line boundary at or after ``floor``.
+        f.seek(floor - 1)
+        while chunk := f.read(BLOCK_SIZE):
+            j = chunk.find(b"\n")
+            if j >= 0:
+                return f.tell() - len(chunk) + j + 1
+        return size
+
+
+def compact_jsonl(path: Path, *, keep_last: int, max_bytes: int) -> bool:
+    """Keep the newest ``keep_last`` lines and at most ``max_bytes``; True if rewritten."""
+    path = Path(path)
+    try:
+        offset = _suffix_offset(path, keep_last=keep_last, max_bytes=max(1, int(max_bytes)))
+    except OSError:
+        return False
+    if offset <= 0:
+        return False
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            src.seek(offset)
+            shutil.copyfileobj(src, dst, BLOCK_SIZE)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def compact_if_oversized(path: Path, *, max_bytes: int, keep_last: int) -> bool:
+    """:func:`compact_jsonl` only once ``path`` has grown past ``max_bytes``."""
+    try:
+        if Path(path).stat().st_size <= max_bytes:
+            return False
+    except OSError:
+        return False
+    return compact_jsonl(path, keep_last=keep_last, max_bytes=max_bytes)
+
+
+__all__ = [
+    "compact_if_oversized",
+    "compact_jsonl",
+    "iter_lines_reverse",
+    "tail_jsonl",
+    "tail_lines",
+]
@@ -7,9 +7,23 @@ import time
 from dataclasses import dataclass
 from typing import Any, Literal
 
-from sqlalchemy import JSON, Float, Integer, String, UniqueConstraint, create_engine, select
+from sqlalchemy import (
+    JSON,
+    Float,
+    Integer,
+    String,
+    UniqueConstraint,
+    create_engine,
+    func,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, aliased, mapped_column
+
+# Postgres NOTIFY channel carrying the id of each newly inserted LeadpageSignal.
+SIGNAL_NOTIFY_CHANNEL = "leadpage_signals"
 
 
 def database_url() -> str | None:
@@ -491,13 +505,8 @@ def result_exists(*, provider: str, run_id: str) -> bool:
         return s.execute(q).first() is not None
 
 
-def insert_local_backtest_result_if_missing(*, summary: dict[str, Any]) -> bool:
-    """Idempotent insert for `.runs/backtests/<run_id>/summary.json` style payloads."""
-    run_id = str(summary.get("run_id") or "").strip()
-    if not run_id:
-        return False
-    if result_exists(provider="local", run_id=run_id):
-        return False
+def _local_result_fields(summary: dict[str, Any]) -> dict[str, Any]:
+    """``LeadpageResult`` columns for a `.runs/backtests/<run_id>/summary.json` payload."""
     evaluation = summary.get("evaluation") if isinstance(summary.get("evaluation"), dict) else {}
     metrics = summary.get("metrics") if isinstance(summary.get("metrics"), dict) else {}
     bench = summary.get("benchmark") if isinstance(summary.get("benchmark"), dict) else {}
@@ -528,23 +537,65 @@ def insert_local_backtest_result_if_missing(*, summary: dict[str, Any]) -> bool:
     ):
         trade_count = metrics.get("total_trades")
     trade_count_i = int(trade_count) if isinstance(trade_count, (int, float)) else None
-    insert_result(
-        provider="local",
-        run_id=run_id,
-        schema_version=1,
-        title=(summary.get("strategy") or {}).get("title")
+    return {
+        "provider": "local",
+        "run_id": str(summary.get("run_id") or "").strip(),
+        "schema_version": 1,
+        "title": (summary.get("strategy") or {}).get("title")
         if isinstance(summary.get("strategy"), dict)
         else None,
-        ticker=str(summary.get("ticker") or "") or None,
-        total_return_pct=total_return_pct,
-        sharpe=sharpe,
-        max_drawdown_pct=mdd_pct,
-        trade_count=trade_count_i,
-        meta={"source": "local_backtest_summary", "summary": summary},
-    )
+        "ticker": str(summary.get("ticker") or "") or None,
+        "total_return_pct": total_return_pct,
+        "sharpe": sharpe,
+        "max_drawdown_pct": mdd_pct,
+        "trade_count": trade_count_i,
+        "meta": {"source": "local_backtest_summary", "summary": summary},
+    }
+
+
+def insert_local_backtest_result_if_missing(*, summary: dict[str, Any]) -> bool:
+    """Idempotent insert for `.runs/backtests/<run_id>/summary.json` style payloads."""
+    run_id = str(summary.get("run_id") or "").strip()
+    if not run_id:
+        return False
+    if result_exists(provider="local", run_id=run_id):
+        return False
+    insert_result(**_local_result_fields(summary))
     return True
 
 
+def insert_local_backtest_results_if_missing(summaries: list[dict[str, Any]]) -> int:
+    """Bulk :func:`insert_local_backtest_result_if_missing`: one existence query and one
+    transaction for the whole batch. Returns the number of rows inserted."""
+    eng = engine()
+    if eng is None:
+        raise RuntimeError("DATABASE_URL is not set")
+    fields: dict[str, dict[str, Any]] = {}
+    for summary in summaries:
+        run_id = str(summary.get("run_id") or "").strip()
+        if run_id and run_id not in fields:
+            fields[run_id] = _local_result_fields(summary)
+    if not fields:
+        return 0
+    with Session(eng) as s:
+        existing = set(
+            s.scalars(
+                select(LeadpageResult.run_id).where(
+                    LeadpageResult.provider == "local",
+                    LeadpageResult.run_id.in_(list(fields)),
+                )
+            ).all()
+        )
+        new = [f for run_id, f in fields.items() if run_id not in existing]
+        if not new:
+            return 0
+        ensure_provider(s, "local")
+        now = _now()
+        s.add_all(LeadpageResult(ts=now, **f) for f in new)
+        s.commit()
+    return len(new)
+
+
 def nonce_seen(provider: str, nonce: str, *, min_ts: int) -> bool:
     eng = engine()
     if eng is None:
@@ -599,19 +650,53 @@ def insert_signal(
             meta=meta,
         )
         s.add(row)
+        s.flush()
+        if eng.dialect.name == "postgresql":
+            # Delivered to LISTENers on commit (api.signal_broadcaster).
+            s.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": SIGNAL_NOTIFY_CHANNEL, "payload": str(int(row.id))},
+            )
         s.commit()
-        return {
-            "id": int(row.id),
-            "ts": int(row.ts),
-            "provider": row.provider,
-            "kind": row.kind,
-            "title": row.title,
-            "body": row.body,
-            "ticker": row.ticker,
-            "result_provider": row.result_provider,
-            "result_run_id": row.result_run_id,
-            "meta": row.meta or {},
-        }
+        return _signal_dict(row)
+
+
+def _signal_dict(r: LeadpageSignal) -> dict[str, Any]:
+    return {
+        "id": int(r.id),
+        "ts": int(r.ts),
+        "provider": r.provider,
+        "kind": r.kind,
+        "title": r.title,
+        "body": r.body,
+        "ticker": r.ticker,
+        "result_provider": r.result_provider,
+        "result_run_id": r.result_run_id,
+        "meta": r.meta or {},
+    }
+
+
+def signals_after(
+    last_id: int, *, limit: int = 200, provider: str | None = None
+) -> list[dict[str, Any]]:
+    """Signals with ``id > last_id`` in id order (stream cursor / ``Last-Event-ID`` resume)."""
+    eng = engine()
+    if eng is None:
+        return []
+    with Session(eng) as s:
+        q = select(LeadpageSignal).where(LeadpageSignal.id > int(last_id))
+        if provider:
+            q = q.where(LeadpageSignal.provider == provider)
+        q = q.order_by(LeadpageSignal.id.asc()).limit(int(limit))
+        return [_signal_dict(r) for r in s.scalars(q).all()]
+
+
+def latest_signal_id() -> int:
+    eng = engine()
+    if eng is None:
+        return 0
+    with Session(eng) as s:
+        return int(s.scalar(select(func.max(LeadpageSignal.id))) or 0)
 
 
 def feed_signals(*, limit: int, provider: str | None = None) -> list[dict[str, Any]]:
@@ -1017,6 +1102,149 @@ def mark_inbox_read(user_id: int, inbox_id: int) -> None:
         s.commit()
 
 
+def pending_auto_execute_ops(
+    *, targets_limit: int = 500, per_target: int = 3
+) -> list[dict[str, Any]]:
+    """Unread ops inbox items for every enabled+auto_execute (user, provider), oldest first.
+
+    One query for all targets (instead of :func:`auto_execute_targets` plus one
+    :func:`unread_ops_inbox` per pair); each item carries its copy ``setting`` and ``signal``.
+    At most ``per_target`` items per pair.
+    """
+    eng = engine()
+    if eng is None:
+        return []
+    targets = (
+        select(
+            LeadpageCopySetting.user_id,
+            LeadpageCopySetting.provider,
+            LeadpageCopySetting.instrument,
+            LeadpageCopySetting.max_notional_usdt,
+        )
+        .where(LeadpageCopySetting.enabled == 1, LeadpageCopySetting.auto_execute == 1)
+        .order_by(LeadpageCopySetting.user_id.asc())
+        .limit(int(targets_limit))
+        .subquery()
+    )
+    # Rank each pair's unread backlog in SQL so only ``per_target`` rows per pair come back.
+    rn = (
+        func.row_number()
+        .over(
+            partition_by=(LeadpageInboxItem.user_id, LeadpageInboxItem.provider),
+            order_by=(LeadpageInboxItem.ts.asc(), LeadpageInboxItem.id.asc()),
+        )
+        .label("rn")
+    )
+    ranked = (
+        select(LeadpageInboxItem, targets.c.instrument, targets.c.max_notional_usdt, rn)
+        .join(
+            targets,
+            (LeadpageInboxItem.user_id == targets.c.user_id)
+            & (LeadpageInboxItem.provider == targets.c.provider),
+        )
+        .where(LeadpageInboxItem.kind == "ops", LeadpageInboxItem.read_ts.is_(None))
+        .subquery()
+    )
+    item = aliased(LeadpageInboxItem, ranked)
+    q = (
+        select(item, ranked.c.instrument, ranked.c.max_notional_usdt, LeadpageSignal)
+        .outerjoin(LeadpageSignal, LeadpageSignal.id == item.signal_id)
+        .where(ranked.c.rn <= int(per_target))
+        .order_by(item.ts.asc(), item.id.asc())
+    )
+    out: list[dict[str, Any]] = []
+    with Session(eng) as s:
+        for r, instrument, max_notional, sig in s.execute(q).all():
+            out.append(
+                {
+                    "id": int(r.id),
+                    "ts": int(r.ts),
+                    "user_id": int(r.user_id),
+                    "signal_id": int(r.signal_id),
+                    "provider": r.provider,
+                    "kind": r.kind,
+                    "ticker": r.ticker,
+                    "setting": {
+                        "provider": r.provider,
+                        "enabled": True,
+                        "auto_execute": True,
+                        "instrument": instrument,
+                        "max_notional_usdt": max_notional,
+                    },
+                    "signal": _signal_dict(sig) if sig is not None else None,
+                }
+            )
+    return out
+
+
+def commit_copy_executions(
+    *,
+    executions: list[dict[str, Any]],
+    read_inbox_ids: list[int],
+    trades: list[tuple[int, dict[str, Any]]],
+    accounts: dict[int, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Write one copy-execution batch in a single transaction.
+
+    ``executions`` take :func:`record_execution` keyword fields; ``trades`` are
+    ``(user_id, trade)`` pairs; ``accounts`` maps user id to a paper account snapshot.
+    Returns the recorded executions shaped like :func:`record_execution` output.
+    """
+    eng = engine()
+    if eng is None:
+        raise RuntimeError("DATABASE_URL is not set")
+    now = _now()
+    with Session(eng) as s:
+        if read_inbox_ids:
+            s.execute(
+                update(LeadpageInboxItem)
+                .where(LeadpageInboxItem.id.in_([int(i) for i in read_inbox_ids]))
+                .values(read_ts=now)
+            )
+        for uid, snapshot in accounts.items():
+            row = s.get(LeadpagePaperAccount, int(uid))
+            if row is None:
+                row = LeadpagePaperAccount(user_id=int(uid))
+                s.add(row)
+            row.cash_usdt = float(snapshot.get("cash_usdt") or 0.0)
+            row.realized_pnl_usdt = float(snapshot.get("realized_pnl_usdt") or 0.0)
+            row.state = snapshot
+            row.updated_ts = int(snapshot.get("updated_ts") or now)
+        s.add_all(
+            LeadpagePaperTrade(ts=int(trade.get("ts") or now), user_id=int(uid), trade=trade)
+            for uid, trade in trades
+        )
+        rows = [
+            LeadpageExecution(
+                ts=now,
+                user_id=int(e["user_id"]),
+                provider=e["provider"],
+                signal_id=int(e["signal_id"]),
+                inbox_id=int(e["inbox_id"]) if e.get("inbox_id") is not None else None,
+                status=str(e["status"]),
+                detail=str(e["detail"])[:2000],
+                trade=e.get("trade"),
+            )
+            for e in executions
+        ]
+        s.add_all(rows)
+        s.commit()
+        return [
+            {
+                "id": int(row.id),
+                "ts": int(row.ts),
+                "user_id": int(row.user_id),
+                "provider": row.provider,
+                "signal_id": int(row.signal_id),
+                "inbox_id": row.inbox_id,
+                "status": row.status,
+                "detail": row.detail,
+                "trade": row.trade,
+            }
+            for row in rows
+        ]
+
+
 def _get_cursor(session: Session, name: str) -> LeadpageFanoutCursor:
     c = session.get(LeadpageFanoutCursor, name)
     if c is None:
@@ -0,0 +1,213 @@
+"""Size-bounded SQLite blob store shared by the on-disk caches.
+
+One file per cache (stdlib ``sqlite3``, WAL journal). Each row holds a content key, a few
+indexed tag columns for targeted invalidation, the payload and ``last_used`` for LRU
+eviction; triggers keep entry/byte counters so :meth:`SqliteLruStore.stats` never scans
+the table. Used by :mod:`llm.decision_cache` and :mod:`backtest.invoke_cache`, which own
+the payload encoding.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+_PAYLOAD_TYPES = ("TEXT", "BLOB")
+
+
+def env_cache_dir(env: str, default: str) -> Path:
+    """Cache directory from ``env``, else ``default`` (relative to the working directory)."""
+    override = (os.getenv(env) or "").strip()
+    return Path(override) if override else Path(default)
+
+
+def env_max_entries(env: str, default: int) -> int:
+    """Entry cap from ``env`` (floored at 100); ``default`` when unset or invalid."""
+    raw = (os.getenv(env) or "").strip()
+    try:
+        n = int(raw) if raw else default
+    except ValueError:
+        n = default
+    return max(100, n)
+
+
+def _ddl(table: str, stats_table: str, tags: Sequence[str], payload_type: str) -> str:
+    tag_cols = "".join(f"    {c} TEXT NOT NULL DEFAULT '',\n" for c in tags)
+    indexes = "".join(
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{c} ON {table} ({c});\n"
+        for c in (*tags, "last_used")
+    )
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    key         TEXT PRIMARY KEY,
+{tag_cols}    payload     {payload_type} NOT NULL,
+    size_bytes  INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+{indexes}
+CREATE TABLE IF NOT EXISTS {stats_table} (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    entries     INTEGER NOT NULL,
+    size_bytes  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO {stats_table} (id, entries, size_bytes) VALUES (1, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON {table} BEGIN
+    UPDATE {stats_table}
+    SET entries = entries + 1, size_bytes = size_bytes + NEW.size_bytes
+    WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON {table} BEGIN
+    UPDATE {stats_table}
+    SET entries = entries - 1, size_bytes = size_bytes - OLD.size_bytes
+    WHERE id = 1;
+END;
+"""
+
+
+class SqliteLruStore:
+    """Key -> payload table with tag columns; one connection per process, serialized by a lock.
+
+    ``table`` / ``stats_table`` / ``tags`` are fixed identifiers chosen by the owning cache
+    (they are interpolated into SQL). Payloads are ``str`` for ``TEXT`` and ``bytes`` for
+    ``BLOB`` stores.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        table: str,
+        stats_table: str,
+        tags: Sequence[str] = (),
+        payload_type: str = "TEXT",
+        max_entries: int,
+    ) -> None:
+        names = (table, stats_table, *tags)
+        if not all(n.isidentifier() for n in names) or payload_type not in _PAYLOAD_TYPES:
+            raise ValueError(f"invalid store schema: {names} / {payload_type}")
+        self._table = table
+        self._stats_table = stats_table
+        self._tags = tuple(tags)
+        self._path = Path(db_path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_ddl(table, stats_table, self._tags, payload_type))
+        self._conn.commit()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get_payload(self, key: str) -> Any:
+        """Stored payload (and a ``last_used`` touch), or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT payload FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                f"UPDATE {self._table} SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self._hits += 1
+        return row[0]
+
+    def put_payload(self, key: str, payload: str | bytes, **tags: str) -> None:
+        cols = ("key", *self._tags, "payload", "size_bytes", "created_at", "last_used")
+        now = time.time()
+        values = (key, *(tags.get(t) or "" for t in self._tags), payload, len(payload), now, now)
+        with self._lock:
+            # DELETE + INSERT (not REPLACE) so the counter triggers see both sides.
+            self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+            self._conn.execute(
+                f"INSERT INTO {self._table} ({', '.join(cols)}) "
+                f"VALUES ({', '.join('?' for _ in cols)})",
+                values,
+            )
+            entries = self._conn.execute(
+                f"SELECT entries FROM {self._stats_table} WHERE id = 1"
+            ).fetchone()[0]
+            if entries > self._max_entries:
+                # Evict down to 90% so eviction runs once per batch of inserts, not per insert.
+                excess = entries - int(self._max_entries * 0.9)
+                self._conn.execute(
+                    f"DELETE FROM {self._table} WHERE key IN "
+                    f"(SELECT key FROM {self._table} ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+            self._conn.commit()
+
+    def invalidate(self, **tags: str | None) -> int:
+        """Delete rows matching every non-empty tag filter (all rows when none is given)."""
+        unknown = set(tags) - set(self._tags)
+        if unknown:
+            raise ValueError(f"unknown tag columns: {sorted(unknown)}")
+        filters = [(t, v) for t, v in tags.items() if v]
+        where = f" WHERE {' AND '.join(f'{t} = ?' for t, _ in filters)}" if filters else ""
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self._table}{where}", [v for _, v in filters])
+            self._conn.commit()
+            return int(cur.rowcount or 0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                f"SELECT entries, size_bytes FROM {self._stats_table} WHERE id = 1"
+            ).fetchone()
+            return {
+                "total_entries": int(entries),
+                "size_bytes": int(size),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "path": str(self._path),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+StoreT = TypeVar("StoreT", bound=SqliteLruStore)
+
+
+class SharedStore(Generic[StoreT]):
+    """Process-wide store for a path resolved on every call (reopened if it changes)."""
+
+    def __init__(self, resolve_path: Callable[[], Path], open_store: Callable[[Path], StoreT]):
+        self._resolve_path = resolve_path
+        self._open_store = open_store
+        self._store: StoreT | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> StoreT:
+        path = self._resolve_path()
+        with self._lock:
+            if self._store is None or self._store.path != path:
+                if self._store is not None:
+                    self._store.close()
+                self._store = self._open_store(path)
+            return self._store
+
+
+__all__ = [
+    "SharedStore",
+    "SqliteLruStore",
+    "env_cache_dir",
+    "env_max_entries",
+]
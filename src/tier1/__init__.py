@@ -7,6 +7,7 @@ import os
 from pathlib import Path
 
 from tier1.applier import apply_strategy, load_blueprint_path
+from tier1.compiler import CompiledBlueprint, compile_blueprint
 from tier1.metric_catalog import all_tier1_metrics, metric_ids_sorted
 from tier1.models import ExecutionPayload, PortfolioDeskBridge, StrategyBlueprint
 from tier1.presets import get_preset, list_presets
@@ -17,12 +18,14 @@ from tier1.validate import (
 )
 
 __all__ = [
+    "CompiledBlueprint",
     "ExecutionPayload",
     "PortfolioDeskBridge",
     "StrategyBlueprint",
     "effective_portfolio_desk_bridge",
     "all_tier1_metrics",
     "apply_strategy",
+    "compile_blueprint",
     "get_preset",
     "iter_blueprint_warnings",
     "list_presets",
@@ -0,0 +1,370 @@
+"""Compile a :class:`~tier1.models.StrategyBlueprint` into a one-pass evaluator.
+
+:func:`compile_blueprint` resolves every rule's ``metric_id`` to an accessor and binds its
+operator/threshold once. Evaluating a state then builds the Tier-0 index once, reads each
+distinct metric once, and scores all vetoes and alpha factors in a single pass.
+:meth:`CompiledBlueprint.evaluate_bars` does the same across a sequence of per-bar states
+with NumPy, for fast Tier-1 preset backtests.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from tier1.models import StrategyBlueprint, TacticalParameters
+from tier1.resolvers import (
+    RulePredicate,
+    Tier0Index,
+    compile_metric,
+    compile_operator,
+    tier0_by_agent_for_ticker,
+)
+from tier1.validate import log_blueprint_warnings, strict_validate_blueprint_weights
+
+logger = logging.getLogger(__name__)
+
+# ``evaluate_bars`` signal codes; vetoed bars are 0 with ``veto`` set.
+SIGNAL_CODES = {"HOLD": 0, "VETO": 0, "EXECUTE_LONG": 1, "EXECUTE_SHORT": -1}
+
+# Always read so the Applier's TWAP check shares the same index pass.
+_SLIPPAGE_METRIC = "liq_slippage"
+
+
+def effective_min_convergence(tactical: TacticalParameters) -> int:
+    base = int(tactical.min_convergence_score_required)
+    ease = float(tactical.entry_ease_fraction)
+    return max(1, int(round(base * (1.0 - ease))))
+
+
+def _persona_mix_terms(blueprint: StrategyBlueprint) -> tuple[int, float] | None:
+    """``(long_bias_add, scale)`` for the persona signal mix, or None when unset."""
+    mix = blueprint.persona_genetics.persona_signal_mix
+    if mix is None:
+        return None
+    bias = 0
+    if mix.long_bias is not None:
+        lb = max(0.0, min(1.0, float(mix.long_bias)))
+        bias = int(round((lb - 0.5) * 40))
+    style = (
+        mix.trend_weight
+        + mix.momentum_weight
+        - mix.mean_revert_weight
+        + 0.25 * mix.volume_weight
+        - 0.25 * mix.volatility_weight
+    )
+    scale = 1.0
+    if abs(style) > 1e-6:
+        scale = max(0.75, min(1.25, 1.0 + 0.15 * style))
+    return bias, scale
+
+
+def apply_persona_signal_mix(
+    long_s: int, short_s: int, blueprint: StrategyBlueprint
+) -> tuple[int, int]:
+    terms = _persona_mix_terms(blueprint)
+    if terms is None:
+        return long_s, short_s
+    bias, scale = terms
+    ls, ss = long_s + bias, short_s
+    if scale != 1.0:
+        ls = int(round(ls * scale))
+        ss = int(round(ss * (2.0 - scale)))
+    return max(0, ls), max(0, ss)
+
+
+def decide_signal(
+    long_s: int, short_s: int, min_req: int, *, can_long: bool, can_short: bool
+) -> tuple[str, int]:
+    """Pick ``EXECUTE_LONG`` / ``EXECUTE_SHORT`` / ``HOLD`` and the conviction score."""
+    if long_s >= min_req and long_s >= short_s and can_long:
+        return "EXECUTE_LONG", long_s
+    if short_s >= min_req and short_s > long_s and can_short:
+        return "EXECUTE_SHORT", short_s
+    if long_s >= min_req and long_s > short_s and not can_long and can_short and short_s >= min_req:
+        return "EXECUTE_SHORT", short_s
+    if short_s >= min_req and short_s > long_s and not can_short and can_long and long_s >= min_req:
+        return "EXECUTE_LONG", long_s
+    return "HOLD", max(long_s, short_s)
+
+
+@dataclass(frozen=True)
+class _Rule:
+    name: str
+    slot: int
+    predicate: RulePredicate
+    operator: str
+    bound: float | None
+    target: str = "ALL"
+    weight: int = 0
+
+
+@dataclass
+class Tier1Decision:
+    """Outcome of one blueprint evaluation (before sizing and TP/SL)."""
+
+    signal: str
+    conviction: int
+    long_score: int = 0
+    short_score: int = 0
+    veto_rule: str | None = None
+    block_long: bool = False
+    block_short: bool = False
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+
+def _numeric_bound(operator: str, threshold: Any) -> float | None:
+    if (operator or "").strip() not in _VEC_OPS:
+        return None
+    try:
+        return float(threshold)
+    except (TypeError, ValueError):
+        return None
+
+
+_VEC_OPS = {
+    ">": np.greater,
+    "GT": np.greater,
+    ">=": np.greater_equal,
+    "GTE": np.greater_equal,
+    "<": np.less,
+    "LT": np.less,
+    "<=": np.less_equal,
+    "LTE": np.less_equal,
+}
+
+
+def _as_float(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CompiledBlueprint:
+    """Precompiled veto/alpha rules for one blueprint. Build with :func:`compile_blueprint`."""
+
+    def __init__(self, blueprint: StrategyBlueprint) -> None:
+        self.blueprint = blueprint
+        tactical = blueprint.tactical_parameters
+        slots: dict[str, int] = {}
+
+        def slot(mid: str) -> int:
+            return slots.setdefault(mid.lower(), len(slots))
+
+        vetoes: list[_Rule] = []
+        for rule in tactical.veto_layer_constraints:
+            mid = (rule.metric_id or "").strip()
+            if not mid:
+                continue
+            vetoes.append(
+                _Rule(
+                    name=rule.rule_name,
+                    slot=slot(mid),
+                    predicate=compile_operator(rule.operator, rule.threshold, rule.threshold_array),
+                    operator=(rule.operator or "").strip(),
+                    bound=_numeric_bound(rule.operator, rule.threshold),
+                    target=(rule.veto_target or "ALL").upper(),
+                )
+            )
+        long_f: list[_Rule] = []
+        short_f: list[_Rule] = []
+        for fac in tactical.multi_factor_alpha_matrix:
+            mid = (fac.metric_id or "").strip()
+            if not mid:
+                continue
+            vd = (fac.vote_direction or "LONG").upper()
+            if vd not in ("LONG", "SHORT"):
+                continue
+            compiled = _Rule(
+                name=fac.factor_name,
+                slot=slot(mid),
+                predicate=compile_operator(fac.operator, fac.threshold, fac.threshold_array),
+                operator=(fac.operator or "").strip(),
+                bound=_numeric_bound(fac.operator, fac.threshold),
+                weight=int(fac.weight_pct),
+            )
+            (long_f if vd == "LONG" else short_f).append(compiled)
+        self._slippage_slot = slot(_SLIPPAGE_METRIC)
+
+        self.metric_ids: tuple[str, ...] = tuple(slots)
+        self._accessors = tuple(compile_metric(mid) for mid in self.metric_ids)
+        self._vetoes = tuple(vetoes)
+        self._long = tuple(long_f)
+        self._short = tuple(short_f)
+        self.min_convergence = effective_min_convergence(tactical)
+        permitted = {x.upper() for x in (blueprint.persona_genetics.permitted_directions or [])}
+        self._permit_long = "LONG" in permitted if permitted else True
+        self._permit_short = "SHORT" in permitted if permitted else True
+        self._mix = _persona_mix_terms(blueprint)
+
+    def metric_values(self, index: Tier0Index) -> list[Any]:
+        """Each distinct metric read once, in :attr:`metric_ids` order."""
+        return [fn(index) for fn in self._accessors]
+
+    def evaluate(self, state: dict[str, Any]) -> Tier1Decision:
+        """Vetoes, weighted alpha, persona mix and signal decision for one state."""
+        values = self.metric_values(tier0_by_agent_for_ticker(state))
+        metrics = dict(zip(self.metric_ids, values, strict=True))
+        block_long = block_short = False
+        for rule in self._vetoes:
+            if not rule.predicate(values[rule.slot]):
+                continue
+            if rule.target == "ALL":
+                return Tier1Decision(
+                    signal="VETO",
+                    conviction=0,
+                    veto_rule=rule.name,
+                    block_long=True,
+                    block_short=True,
+                    metrics=metrics,
+                )
+            if rule.target == "LONG_ONLY":
+                block_long = True
+            elif rule.target == "SHORT_ONLY":
+                block_short = True
+            logger.info("Tier-1 partial veto: %s target=%s", rule.name, rule.target)
+
+        long_s = sum(f.weight for f in self._long if f.predicate(values[f.slot]))
+        short_s = sum(f.weight for f in self._short if f.predicate(values[f.slot]))
+        long_s, short_s = apply_persona_signal_mix(long_s, short_s, self.blueprint)
+        signal, conviction = decide_signal(
+            long_s,
+            short_s,
+            self.min_convergence,
+            can_long=self._permit_long and not block_long,
+            can_short=self._permit_short and not block_short,
+        )
+        return Tier1Decision(
+            signal=signal,
+            conviction=int(conviction),
+            long_score=long_s,
+            short_score=short_s,
+            block_long=block_long,
+            block_short=block_short,
+            metrics=metrics,
+        )
+
+    def evaluate_bars(self, states: Iterable[dict[str, Any]]) -> dict[str, np.ndarray]:
+        """Evaluate one state per bar; returns equal-length arrays.
+
+        Keys: ``long_score``, ``short_score``, ``conviction`` (int64), ``veto`` (bool),
+        ``signal`` (int8 via :data:`SIGNAL_CODES`). Bar ``i`` matches ``evaluate(states[i])``.
+        """
+        rows = [self.metric_values(tier0_by_agent_for_ticker(s)) for s in states]
+        n = len(rows)
+        columns: list[Sequence[Any]] = [list(col) for col in zip(*rows, strict=True)] or [
+            [] for _ in self.metric_ids
+        ]
+        floats: dict[int, np.ndarray] = {}
+
+        def hits(rule: _Rule) -> np.ndarray:
+            col = columns[rule.slot]
+            if rule.bound is not None:
+                if rule.slot not in floats:
+                    floats[rule.slot] = np.fromiter(
+                        (_as_float(v) for v in col), dtype=np.float64, count=n
+                    )
+                return _VEC_OPS[rule.operator](floats[rule.slot], rule.bound)
+            return np.fromiter((bool(rule.predicate(v)) for v in col), dtype=bool, count=n)
+
+        veto = np.zeros(n, dtype=bool)
+        block_long = np.zeros(n, dtype=bool)
+        block_short = np.zeros(n, dtype=bool)
+        for rule in self._vetoes:
+            h = hits(rule)
+            if rule.target == "ALL":
+                veto |= h
+            elif rule.target == "LONG_ONLY":
+                block_long |= h
+            elif rule.target == "SHORT_ONLY":
+                block_short |= h
+
+        long_s = np.zeros(n, dtype=np.int64)
+        short_s = np.zeros(n, dtype=np.int64)
+        for f in self._long:
+            long_s += f.weight * hits(f)
+        for f in self._short:
+            short_s += f.weight * hits(f)
+        if self._mix is not None:
+            bias, scale = self._mix
+            long_s = long_s + bias
+            if scale != 1.0:
+                # np.rint rounds half to even, like the scalar path's round().
+                long_s = np.rint(long_s * scale).astype(np.int64)
+                short_s = np.rint(short_s * (2.0 - scale)).astype(np.int64)
+            long_s = np.maximum(0, long_s)
+            short_s = np.maximum(0, short_s)
+
+        m = self.min_convergence
+        can_long = self._permit_long & ~block_long
+        can_short = self._permit_short & ~block_short
+        long_ok = long_s >= m
+        short_ok = short_s >= m
+        # Same branch order as decide_signal.
+        branches = [
+            long_ok & (long_s >= short_s) & can_long,
+            short_ok & (short_s > long_s) & can_short,
+            long_ok & (long_s > short_s) & ~can_long & can_short & short_ok,
+            short_ok & (short_s > long_s) & ~can_short & can_long & long_ok,
+        ]
+        signal = np.select(branches, [1, -1, -1, 1], default=0).astype(np.int8)
+        conviction = np.where(
+            signal == 1, long_s, np.where(signal == -1, short_s, np.maximum(long_s, short_s))
+        )
+        signal[veto] = 0
+        conviction = np.where(veto, 0, conviction).astype(np.int64)
+        return {
+            "long_score": np.where(veto, 0, long_s).astype(np.int64),
+            "short_score": np.where(veto, 0, short_s).astype(np.int64),
+            "conviction": conviction,
+            "veto": veto,
+            "signal": signal,
+        }
+
+    def slippage_score(self, decision: Tier1Decision) -> Any:
+        return decision.metrics.get(self.metric_ids[self._slippage_slot])
+
+
+_COMPILED: dict[int, tuple[weakref.ref[StrategyBlueprint], CompiledBlueprint]] = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def compile_blueprint(blueprint: StrategyBlueprint) -> CompiledBlueprint:
+    """Compiled evaluator for ``blueprint``, cached per blueprint object.
+
+    Warnings are logged and weights strictly validated once, when the blueprint is first
+    compiled. Mutating a blueprint after compiling it is not supported.
+    """
+    key = id(blueprint)
+    with _COMPILED_LOCK:
+        hit = _COMPILED.get(key)
+        if hit is not None and hit[0]() is blueprint:
+            return hit[1]
+    log_blueprint_warnings(blueprint)
+    strict_validate_blueprint_weights(blueprint)
+    compiled = CompiledBlueprint(blueprint)
+    with _COMPILED_LOCK:
+        for k in [k for k, (ref, _) in _COMPILED.items() if ref() is None]:
+            del _COMPILED[k]
+        _COMPILED[key] = (weakref.ref(blueprint), compiled)
+    return compiled
+
+
+__all__ = [
+    "SIGNAL_CODES",
+    "CompiledBlueprint",
+    "Tier1Decision",
+    "apply_persona_signal_mix",
+    "compile_blueprint",
+    "decide_signal",
+    "effective_min_convergence",
+]
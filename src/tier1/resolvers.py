@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from typing import Any
 
 
@@ -57,151 +59,169 @@ def _circuit_breaker_status(c12: dict[str, Any]) -> str:
     return "NORMAL"
 
 
-def resolve_metric(metric_id: str, state: dict[str, Any]) -> Any:
-    """Return a scalar (or comparable) for ``metric_id`` from Tier-0 contracts."""
-    mid = (metric_id or "").strip().lower()
-    idx = tier0_by_agent_for_ticker(state)
-
-    c11 = idx.get("1.1") or {}
-    c12 = idx.get("1.2") or {}
-    c21 = idx.get("2.1") or {}
-    c22 = idx.get("2.2") or {}
-    c23 = idx.get("2.3") or {}
-    c31 = idx.get("3.1") or {}
-    c32 = idx.get("3.2") or {}
-    c41 = idx.get("4.1") or {}
-    c42 = idx.get("4.2") or {}
+Tier0Index = dict[str, dict[str, Any]]
+MetricAccessor = Callable[[Tier0Index], Any]
 
-    if mid in ("", "none"):
-        return None
 
-    if mid == "circuit_breaker_status":
-        return _circuit_breaker_status(c12)
-    if mid == "black_swan_news":
-        ni = _i(c12.get("News_Impact_Score"), 0)
-        et = str(c12.get("Event_Type") or "")
-        return bool(ni >= 80 or "Black Swan" in et)
-
-    if mid == "mon_liquidity_score":
-        return _i(c11.get("Liquidity_Score"), 0)
-    if mid == "mon_macro_regime_state":
-        return _i(c11.get("macro_regime_state"), 1)
-
-    if mid == "news_impact":
-        return _i(c12.get("News_Impact_Score"), 0)
-    if mid == "news_event_type":
-        return str(c12.get("Event_Type") or "")
-
-    if mid == "pattern_setup":
-        return _i(c21.get("Setup_Score"), 0)
-    if mid == "pattern_name":
-        return str(c21.get("pattern") or "")
-
-    if mid == "alpha_z":
-        z = c22.get("cross_sectional_z_score")
-        return None if z is None else _f(z, 0.0)
-    if mid == "alpha_signal_label":
-        return str(c22.get("alpha_signal") or "")
-    if mid == "alpha_strong_buy":
-        return "Strong Buy" in str(c22.get("alpha_signal") or "")
-    if mid == "alpha_strong_sell":
-        return "Strong Sell" in str(c22.get("alpha_signal") or "")
-    if mid == "factor_confluence":
-        return _i(c22.get("Factor_Confluence"), 0)
+def _c(idx: Tier0Index, agent: str) -> dict[str, Any]:
+    return idx.get(agent) or {}
 
-    if mid.startswith("ta_"):
-        sub = mid[3:]
-        ti = c23.get("ta_indicators") if isinstance(c23.get("ta_indicators"), dict) else {}
-        if not sub or sub not in ti:
-            return None
-        v = ti.get(sub)
-        if v is None:
-            return None
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, (int, float)):
-            return float(v)
+
+def _black_swan(c12: dict[str, Any]) -> bool:
+    ni = _i(c12.get("News_Impact_Score"), 0)
+    et = str(c12.get("Event_Type") or "")
+    return bool(ni >= 80 or "Black Swan" in et)
+
+
+def _opt_f(v: Any) -> float | None:
+    return None if v is None else _f(v, 0.0)
+
+
+def _ta_value(idx: Tier0Index, sub: str) -> Any:
+    c23 = _c(idx, "2.3")
+    ti = c23.get("ta_indicators") if isinstance(c23.get("ta_indicators"), dict) else {}
+    if not sub or sub not in ti:
+        return None
+    v = ti.get(sub)
+    if v is None:
+        return None
+    if isinstance(v, bool):
         return v
+    if isinstance(v, (int, float)):
+        return float(v)
+    return v
+
+
+def _abs_alpha_z(idx: Tier0Index) -> float | None:
+    z = _c(idx, "2.2").get("cross_sectional_z_score")
+    return None if z is None else abs(_f(z, 0.0))
+
+
+_ACCESSORS: dict[str, MetricAccessor] = {
+    "circuit_breaker_status": lambda idx: _circuit_breaker_status(_c(idx, "1.2")),
+    "black_swan_news": lambda idx: _black_swan(_c(idx, "1.2")),
+    "mon_liquidity_score": lambda idx: _i(_c(idx, "1.1").get("Liquidity_Score"), 0),
+    "mon_macro_regime_state": lambda idx: _i(_c(idx, "1.1").get("macro_regime_state"), 1),
+    "news_impact": lambda idx: _i(_c(idx, "1.2").get("News_Impact_Score"), 0),
+    "news_event_type": lambda idx: str(_c(idx, "1.2").get("Event_Type") or ""),
+    "pattern_setup": lambda idx: _i(_c(idx, "2.1").get("Setup_Score"), 0),
+    "pattern_name": lambda idx: str(_c(idx, "2.1").get("pattern") or ""),
+    "alpha_z": lambda idx: _opt_f(_c(idx, "2.2").get("cross_sectional_z_score")),
+    "alpha_signal_label": lambda idx: str(_c(idx, "2.2").get("alpha_signal") or ""),
+    "alpha_strong_buy": lambda idx: "Strong Buy" in str(_c(idx, "2.2").get("alpha_signal") or ""),
+    "alpha_strong_sell": lambda idx: "Strong Sell" in str(_c(idx, "2.2").get("alpha_signal") or ""),
+    "factor_confluence": lambda idx: _i(_c(idx, "2.2").get("Factor_Confluence"), 0),
+    "retail_fomo": lambda idx: _i(_c(idx, "3.1").get("FOMO_Level"), 0),
+    "retail_div": lambda idx: bool(_c(idx, "3.1").get("Divergence_Warning")),
+    "retail_sent_z": lambda idx: _f(_c(idx, "3.1").get("sentiment_z_score"), 0.0),
+    "pro_bias": lambda idx: _i(_c(idx, "3.2").get("Pro_Bias"), 0),
+    "pro_etf_trend": lambda idx: str(_c(idx, "3.2").get("ETF_Trend") or ""),
+    "whale_dump_prob": lambda idx: _f(_c(idx, "4.1").get("Dump_Probability"), 0.0),
+    "whale_sell_pressure": lambda idx: _i(_c(idx, "4.1").get("Sell_Pressure_Gauge"), 0),
+    "liq_slippage": lambda idx: _i(_c(idx, "4.2").get("Slippage_Risk_Score"), 50),
+    "liq_imbalance": lambda idx: _opt_f(_c(idx, "4.2").get("Order_Imbalance")),
+    "liq_poc_price": lambda idx: _opt_f(_c(idx, "4.2").get("POC_Price")),
+}
+
+
+def _none(_idx: Tier0Index) -> None:
+    return None
 
-    if mid == "retail_fomo":
-        return _i(c31.get("FOMO_Level"), 0)
-    if mid == "retail_div":
-        return bool(c31.get("Divergence_Warning"))
-    if mid == "retail_sent_z":
-        return _f(c31.get("sentiment_z_score"), 0.0)
-
-    if mid == "pro_bias":
-        return _i(c32.get("Pro_Bias"), 0)
-    if mid == "pro_etf_trend":
-        return str(c32.get("ETF_Trend") or "")
-
-    if mid == "whale_dump_prob":
-        return _f(c41.get("Dump_Probability"), 0.0)
-    if mid == "whale_sell_pressure":
-        return _i(c41.get("Sell_Pressure_Gauge"), 0)
-
-    if mid == "liq_slippage":
-        return _i(c42.get("Slippage_Risk_Score"), 50)
-    if mid == "liq_imbalance":
-        oi = c42.get("Order_Imbalance")
-        return None if oi is None else _f(oi, 0.0)
-    if mid == "liq_poc_price":
-        p = c42.get("POC_Price")
-        return None if p is None else _f(p, 0.0)
 
+@functools.lru_cache(maxsize=512)
+def compile_metric(metric_id: str) -> MetricAccessor:
+    """Resolve ``metric_id`` once to an accessor over a :func:`tier0_by_agent_for_ticker` index."""
+    mid = (metric_id or "").strip().lower()
+    if mid in ("", "none"):
+        return _none
+    fn = _ACCESSORS.get(mid)
+    if fn is not None:
+        return fn
+    if mid.startswith("ta_"):
+        sub = mid[3:]
+        return functools.partial(_ta_value, sub=sub)
     # Architect-style path string stored as metric_id: map common tokens
     if "amihud" in mid or "liquidity_z" in mid:
-        z = c22.get("cross_sectional_z_score")
-        return None if z is None else abs(_f(z, 0.0))
+        return _abs_alpha_z
+    return _none
 
-    return None
 
+def resolve_metric(metric_id: str, state: dict[str, Any]) -> Any:
+    """Return a scalar (or comparable) for ``metric_id`` from Tier-0 contracts."""
+    return compile_metric(metric_id)(tier0_by_agent_for_ticker(state))
 
-def eval_operator(
-    value: Any, operator: str, threshold: Any, threshold_array: list[Any] | None
-) -> bool:
-    """Return whether ``value`` satisfies the comparison (Tier-1 rule row)."""
+
+RulePredicate = Callable[[Any], bool]
+
+_NUMERIC_OPS: dict[str, Callable[[float, float], bool]] = {
+    ">": float.__gt__,
+    "GT": float.__gt__,
+    ">=": float.__ge__,
+    "GTE": float.__ge__,
+    "<": float.__lt__,
+    "LT": float.__lt__,
+    "<=": float.__le__,
+    "LTE": float.__le__,
+}
+
+
+def _never(_value: Any) -> bool:
+    return False
+
+
+def compile_operator(
+    operator: str, threshold: Any, threshold_array: list[Any] | None
+) -> RulePredicate:
+    """Bind a Tier-1 comparison to a one-argument predicate (same semantics as :func:`eval_operator`)."""
     op = (operator or "==").strip()
     arr = threshold_array if isinstance(threshold_array, list) else None
 
     if op.upper() == "IN":
         if arr is None:
-            return False
-        return value in arr
+            return _never
+        return lambda value: value in arr
     if op.upper() == "NOT_IN":
         if arr is None:
-            return False
-        return value not in arr
-
-    if value is None and op not in ("!=", "NE"):
-        return False
+            return _never
+        return lambda value: value not in arr
 
     if op in ("==", "EQ"):
-        return value == threshold
+        return lambda value: value is not None and value == threshold
     if op in ("!=", "NE"):
-        return value != threshold
-    if op in (">", "GT"):
-        try:
-            return value is not None and float(value) > float(threshold)  # type: ignore[arg-type]
-        except (TypeError, ValueError):
-            return False
-    if op in (">=", "GTE"):
-        try:
-            return value is not None and float(value) >= float(threshold)  # type: ignore[arg-type]
-        except (TypeError, ValueError):
-            return False
-    if op in ("<", "LT"):
-        try:
-            return value is not None and float(value) < float(threshold)  # type: ignore[arg-type]
-        except (TypeError, ValueError):
+        return lambda value: value != threshold
+    cmp = _NUMERIC_OPS.get(op)
+    if cmp is None:
+        return _never
+    try:
+        bound = float(threshold)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return _never
+
+    def numeric(value: Any) -> bool:
+        if value is None:
             return False
-    if op in ("<=", "LTE"):
         try:
-            return value is not None and float(value) <= float(threshold)  # type: ignore[arg-type]
+            return cmp(float(value), bound)
         except (TypeError, ValueError):
             return False
 
-    return False
+    return numeric
 
 
-__all__ = ["eval_operator", "resolve_metric", "tier0_by_agent_for_ticker"]
+def eval_operator(
+    value: Any, operator: str, threshold: Any, threshold_array: list[Any] | None
+) -> bool:
+    """Return whether ``value`` satisfies the comparison (Tier-1 rule row)."""
+    return compile_operator(operator, threshold, threshold_array)(value)
+
+
+__all__ = [
+    "MetricAccessor",
+    "RulePredicate",
+    "Tier0Index",
+    "compile_metric",
+    "compile_operator",
+    "eval_operator",
+    "resolve_metric",
+    "tier0_by_agent_for_ticker",
+]
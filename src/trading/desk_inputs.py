@@ -22,10 +22,10 @@ from __future__ import annotations
 
 import math
 import os
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping
 
-from tier1 import effective_portfolio_desk_bridge
-from tier1.models import PortfolioDeskBridge
+if TYPE_CHECKING:
+    from tier1.models import PortfolioDeskBridge
 
 _ALPHA_TO_SIGNAL = {"long_bias": "buy", "short_bias": "sell", "hold": "hold"}
 
@@ -333,7 +333,12 @@ def quant_analysis_for_portfolio(
         if isinstance(inner, dict) and isinstance(inner.get(ticker), dict):
             return explicit
 
-    bridge = desk_bridge if desk_bridge is not None else effective_portfolio_desk_bridge()
+    if desk_bridge is not None:
+        bridge = desk_bridge
+    else:
+        from tier1 import effective_portfolio_desk_bridge
+
+        bridge = effective_portfolio_desk_bridge()
 
     sig = "hold"
     sources: list[str] = []
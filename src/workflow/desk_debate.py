@@ -143,6 +143,7 @@ def llm_desk_debate_entries(state: HedgeFundState) -> list[dict[str, Any]]:
     ctx = _compact_context(state)
     out: list[dict[str, Any]] = []
     ps = prompt_settings_by_actor().get("desk_debate")
+    ticker = str(state.get("ticker") or "")
 
     depth_specs = nexus_tool_specs(include_write_tools=False)
     if ps is not None and isinstance(ps.tools, list) and ps.tools:
@@ -185,6 +186,8 @@ def llm_desk_debate_entries(state: HedgeFundState) -> list[dict[str, Any]]:
             temperature=(ps.temperature if ps is not None else None),
             max_tokens=(ps.max_tokens if ps is not None else None),
             max_tool_rounds=2,
+            cache_agent_id="desk_debate",
+            cache_ticker=ticker,
         )
         text_r = _normalize_debate_memo(text_r, max_chars=1400)
         if not text_r.lstrip().startswith("Decision:"):
@@ -200,6 +203,8 @@ def llm_desk_debate_entries(state: HedgeFundState) -> list[dict[str, Any]]:
                 temperature=0.2 if (ps is None or ps.temperature is None) else ps.temperature,
                 max_tokens=(ps.max_tokens if ps is not None else None),
                 max_tool_rounds=2,
+                cache_agent_id="desk_debate",
+                cache_ticker=ticker,
             )
             text_r2 = _normalize_debate_memo(text_r2, max_chars=1400)
             if text_r2.lstrip().startswith("Decision:"):
@@ -257,6 +262,8 @@ def llm_desk_debate_entries(state: HedgeFundState) -> list[dict[str, Any]]:
             temperature=(ps.temperature if ps is not None else None),
             max_tokens=(ps.max_tokens if ps is not None else None),
             max_tool_rounds=1,
+            cache_agent_id="desk_debate",
+            cache_ticker=ticker,
         )
         text_t = _normalize_debate_memo(text_t, max_chars=1200)
         if not text_t.lstrip().startswith("Decision:"):
@@ -272,6 +279,8 @@ def llm_desk_debate_entries(state: HedgeFundState) -> list[dict[str, Any]]:
                 temperature=0.2 if (ps is None or ps.temperature is None) else ps.temperature,
                 max_tokens=(ps.max_tokens if ps is not None else None),
                 max_tool_rounds=1,
+                cache_agent_id="desk_debate",
+                cache_ticker=ticker,
             )
             text_t2 = _normalize_debate_memo(text_t2, max_chars=1200)
             if text_t2.lstrip().startswith("Decision:"):
@@ -17,11 +17,11 @@ from __future__ import annotations
 
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from typing import Any
 
-from llm.agent_llm_client import check_api_key, infer_agent
+from llm.agent_llm_client import build_shared_market_context, check_api_key, infer_agent
+from llm.inference_scheduler import get_llm_scheduler
 from schemas.arbitration import ArbitrationResult
 from schemas.state import HedgeFundState
 from schemas.tier0_contract import tier0_contracts_by_agent
@@ -288,7 +288,7 @@ def _tier0_contracts_by_agent(state: HedgeFundState) -> dict[str, dict[str, Any]
 
 
 def _inject_llm_signals(state: HedgeFundState) -> tuple[HedgeFundState, list[dict[str, Any]]]:
-    """Parallel LLM inference for agent_llm mode.
+    """Concurrent LLM inference for agent_llm mode (shared :mod:`llm.inference_scheduler`).
 
     Returns local state for arbitration and append-only tier0 contract deltas.
     """
@@ -311,6 +311,9 @@ def _inject_llm_signals(state: HedgeFundState) -> tuple[HedgeFundState, list[dic
     )
     deterministic = _tier0_contracts_by_agent(state)
     primary_ticker = state.get("ticker", "")
+    # Built once per symbol/bar; only the deterministic baseline differs between agents.
+    # The universe / Nexus fragments are memoized across the symbols of the bar.
+    shared_context = build_shared_market_context(dict(state), primary_ticker)
 
     results: list[dict[str, Any] | None] = [None] * len(llm_agents)
     lock = Lock()
@@ -324,6 +327,7 @@ def _inject_llm_signals(state: HedgeFundState) -> tuple[HedgeFundState, list[dic
                 dict(state),
                 deterministic_contract=det_contract,
                 ticker=primary_ticker,
+                shared_context=shared_context,
             )
             with lock:
                 results[idx] = dict(llm_result)
@@ -343,13 +347,12 @@ def _inject_llm_signals(state: HedgeFundState) -> tuple[HedgeFundState, list[dic
             with lock:
                 results[idx] = error_signal
 
-    n_workers = min(len(llm_agents), 9)
-    with ThreadPoolExecutor(max_workers=n_workers) as pool:
-        futures = [pool.submit(_run_one, i, aid) for i, aid in enumerate(llm_agents)]
-        for future in as_completed(futures):
-            exc = future.exception()
-            if exc is not None and "API key" in str(exc):
-                raise exc
+    # Shared scheduler: one global concurrency / rate-limit budget across symbols and runs.
+    futures = get_llm_scheduler().map(lambda item: _run_one(*item), enumerate(llm_agents))
+    for future in futures:
+        exc = future.exception()
+        if exc is not None and "API key" in str(exc):
+            raise exc
 
     llm_deltas: list[dict[str, Any]] = []
     for i, agent_id in enumerate(llm_agents):
@@ -376,27 +379,14 @@ def _inject_llm_signals(state: HedgeFundState) -> tuple[HedgeFundState, list[dic
     return state, llm_deltas
 
 
-def weighted_arbitrator_node(state: HedgeFundState) -> dict[str, Any]:
-    """LangGraph node: weighted convergence arbitrator (supports agent_llm mode).
-
-    Reads:
-      - ``tier0_contracts`` from state
-      - ``profile_weights`` (optional) — personalised weights from Profile Agent
-      - ``run_mode`` for context
+def arbitrate_tier0(
+    state: HedgeFundState,
+) -> tuple[ArbitrationResult, dict[str, Any], dict[str, Any]]:
+    """Weighted arbitration over the Tier-0 contracts already in ``state`` (no LLM calls).
 
-    Writes:
-      - ``proposed_signal`` — same shape as ``signal_arbitrator_llm``
-      - ``trade_intent``   — derived via ``derive_trade_intent``
-      - ``reasoning_logs`` — per-agent scores + final decision
+    Returns ``(result, proposed_signal, trade_intent)``. This is the deterministic core of
+    :func:`weighted_arbitrator_node`; ``backtest.fast_deterministic`` checks parity against it.
     """
-    # agent_llm mode: inject LLM signals before arbitration
-    state, llm_deltas = _inject_llm_signals(state)
-
-    # Resolve weights (supports Profile Agent injection)
-    agent_weights = _resolve_agent_weights(state)
-    profile_id = state.get("profile_id") or ""
-
-    # Check if tier0 contracts exist
     idx = tier0_contracts_by_agent(state)
     if not idx:
         # Fallback: no Tier-0 data, return neutral
@@ -411,13 +401,32 @@ def weighted_arbitrator_node(state: HedgeFundState) -> dict[str, Any]:
     else:
         result = compute_weighted_arbitration(
             state,
-            agent_weights=agent_weights,
+            # Resolve weights (supports Profile Agent injection)
+            agent_weights=_resolve_agent_weights(state),
             disabled_agents=_V4_DISABLED_AGENTS,
             decision_threshold=_resolve_decision_threshold(state),
         )
-
     proposed_signal = _arbitration_to_proposed_signal(result, state)
-    intent = derive_trade_intent(state, proposed_signal)
+    return result, proposed_signal, derive_trade_intent(state, proposed_signal)
+
+
+def weighted_arbitrator_node(state: HedgeFundState) -> dict[str, Any]:
+    """LangGraph node: weighted convergence arbitrator (supports agent_llm mode).
+
+    Reads:
+      - ``tier0_contracts`` from state
+      - ``profile_weights`` (optional) — personalised weights from Profile Agent
+      - ``run_mode`` for context
+
+    Writes:
+      - ``proposed_signal`` — same shape as ``signal_arbitrator_llm``
+      - ``trade_intent``   — derived via ``derive_trade_intent``
+      - ``reasoning_logs`` — per-agent scores + final decision
+    """
+    # agent_llm mode: inject LLM signals before arbitration
+    state, llm_deltas = _inject_llm_signals(state)
+    profile_id = state.get("profile_id") or ""
+    result, proposed_signal, intent = arbitrate_tier0(state)
 
     compact = _compact_arbitration_for_reasoning(result)
     board = build_synthesis_board(state)
@@ -512,4 +521,4 @@ def weighted_arbitrator_node(state: HedgeFundState) -> dict[str, Any]:
     return out
 
 
-__all__ = ["weighted_arbitrator_node"]
+__all__ = ["arbitrate_tier0", "weighted_arbitrator_node"]
@@ -0,0 +1,111 @@
+"""agent_llm prompt assembly: memoized persona reads and byte-stable prefixes."""
+
+from __future__ import annotations
+
+import os
+
+from llm import agent_llm_client as alc
+
+
+def _state(ticker: str) -> dict:
+    bars = [[i, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(40)]
+    return {
+        "ticker": ticker,
+        "universe": ["BTC/USDT", "ETH/USDT"],
+        "market_data": {"BTC/USDT": {"ohlcv": bars}, "ETH/USDT": {"ohlcv": bars[:20]}},
+        "shared_memory": {
+            "nexus": {"funding": 0.0001, "news": [{"title": "CPI", "sentiment": "neg"}]}
+        },
+    }
+
+
+def test_persona_reads_are_memoized_by_mtime(monkeypatch, tmp_path):
+    agent_dir = tmp_path / alc._AGENT_INFO["2.1"]["dir"]
+    agent_dir.mkdir()
+    persona = agent_dir / "persona.md"
+    persona.write_text("v1", encoding="utf-8")
+    monkeypatch.setattr(alc, "_AGENTS_BASE", tmp_path)
+
+    reads = {"n": 0}
+    real_read = type(persona).read_text
+
+    def counting_read(self, *a, **kw):
+        reads["n"] += 1
+        return real_read(self, *a, **kw)
+
+    monkeypatch.setattr(type(persona), "read_text", counting_read)
+    assert alc._load_persona("2.1") == "v1"
+    assert alc._load_persona("2.1") == "v1"
+    assert reads["n"] == 1
+
+    persona.write_text("v2!", encoding="utf-8")
+    st = persona.stat()
+    os.utime(persona, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert alc._load_persona("2.1") == "v2!"
+    assert reads["n"] == 2
+    # Missing SKILL.md stays empty without raising.
+    assert alc._load_skill("2.1") == ""
+
+
+def test_prompts_share_prefix_across_symbols_and_agents():
+    btc = alc._build_market_context(_state("BTC/USDT"), "BTC/USDT", {"Setup_Score": 70}, "2.1")
+    eth = alc._build_market_context(_state("ETH/USDT"), "ETH/USDT", {"Setup_Score": 40}, "2.1")
+    shared_prefix = "## Universe\nUniverse (2 tickers): BTC/USDT, ETH/USDT\n\n## Nexus Data\n"
+    assert btc.startswith(shared_prefix) and eth.startswith(shared_prefix)
+    assert btc.endswith("Setup_Score: 70")
+
+    shared = alc.build_shared_market_context(_state("BTC/USDT"), "BTC/USDT")
+    assert btc == alc._build_market_context(
+        {}, "BTC/USDT", {"Setup_Score": 70}, "2.1", shared_context=shared
+    )
+
+    sys_a, _ = alc._build_agent_prompt("2.1", "p", "s", btc)
+    sys_b, _ = alc._build_agent_prompt("2.1", "p", "s", eth)
+    assert sys_a is sys_b
+
+
+def test_global_fragments_are_built_once_per_bar(monkeypatch):
+    monkeypatch.setattr(alc, "_GLOBAL_CONTEXT", type(alc._GLOBAL_CONTEXT)())
+    builds = {"n": 0}
+    real = alc._build_nexus_context
+
+    def counting(state):
+        builds["n"] += 1
+        return real(state)
+
+    monkeypatch.setattr(alc, "_build_nexus_context", counting)
+    btc = alc.build_shared_market_context(_state("BTC/USDT"), "BTC/USDT")
+    eth = alc.build_shared_market_context(_state("ETH/USDT"), "ETH/USDT")
+    assert builds["n"] == 1
+    assert "## OHLCV Data (BTC/USDT)" in btc and "## OHLCV Data (ETH/USDT)" in eth
+
+    # The next bar's Nexus bundle is a new digest and rebuilds the fragment.
+    nxt = _state("BTC/USDT")
+    nxt["shared_memory"]["nexus"]["funding"] = 0.0002
+    assert "Funding rate: 0.0002" in alc.build_shared_market_context(nxt, "BTC/USDT")
+    assert builds["n"] == 2
+
+
+def test_decision_cache_key_covers_sampling_settings(monkeypatch, tmp_path):
+    from types import SimpleNamespace
+
+    monkeypatch.setenv("AIMM_DECISION_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def completion(client, **kw):
+        calls.append((kw["temperature"], kw["max_tokens"]))
+        msg = SimpleNamespace(content='{"Setup_Score": 70, "pattern": "trend"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+    monkeypatch.setattr(alc, "_get_client", lambda: object())
+    monkeypatch.setattr(alc, "create_chat_completion", completion)
+    monkeypatch.setattr(
+        alc, "get_llm_scheduler", lambda: SimpleNamespace(call=lambda fn, est_tokens: fn())
+    )
+    state = _state("BTC/USDT")
+    first = alc.infer_agent("2.1", state, model="m")
+    assert alc.infer_agent("2.1", state, model="m")["cached"] is True
+    assert "cached" not in first and len(calls) == 1
+    alc.infer_agent("2.1", state, model="m", temperature=0.7)
+    alc.infer_agent("2.1", state, model="m", max_tokens=256)
+    assert calls == [(0.1, 1024), (0.7, 1024), (0.1, 256)]
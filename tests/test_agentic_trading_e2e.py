@@ -132,12 +132,12 @@ def agentic_stubs(monkeypatch):
             out["ta_indicators"] = {"rsi": 55, "macd_signal": "buy"}
         return out
 
-    monkeypatch.setattr(main_mod, "llm_portfolio_proposal", _stub_llm_proposal)
-    monkeypatch.setattr(main_mod, "llm_portfolio_execute", _stub_llm_execute)
+    monkeypatch.setattr("llm.portfolio_llm.llm_portfolio_proposal", _stub_llm_proposal)
+    monkeypatch.setattr("llm.portfolio_llm.llm_portfolio_execute", _stub_llm_execute)
     monkeypatch.setattr("workflow.weighted_arbitrator.infer_agent", _stub_infer_agent)
-    monkeypatch.setattr(main_mod, "MarketScanAgent", _StubMarketScanAgent)
-    monkeypatch.setattr(main_mod, "RiskManagementAgent", _StubRiskManagementAgent)
-    monkeypatch.setattr(main_mod, "RiskGuardAgent", _StubRiskGuardAgent)
+    monkeypatch.setattr("agents.market_scan.MarketScanAgent", _StubMarketScanAgent)
+    monkeypatch.setattr("agents.risk_management.RiskManagementAgent", _StubRiskManagementAgent)
+    monkeypatch.setattr("agents.governance.risk_guard.RiskGuardAgent", _StubRiskGuardAgent)
     monkeypatch.setattr(main_mod, "get_nexus_adapter", lambda: _StubNexusAdapter())
 
 
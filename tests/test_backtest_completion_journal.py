@@ -0,0 +1,133 @@
+"""Backtest completion journal and the platform worker's bulk local-result sync."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import pytest
+
+from backtest import completion_journal as cj
+from storage import leadpage_db
+
+
+def _finish(runs_dir, run_id: str, ret: float = 1.0) -> None:
+    out = runs_dir / "backtests" / run_id
+    out.mkdir(parents=True, exist_ok=True)
+    summary = {"run_id": run_id, "ticker": "BTC/USDT", "metrics": {"total_return_pct": ret}}
+    (out / "summary.json").write_text(json.dumps(summary), encoding="utf-8")
+    cj.record_backtest_completion(run_id, out / "summary.json", runs_dir=runs_dir)
+
+
+def test_reader_resumes_from_cursor_and_skips_partial_lines(tmp_path):
+    _finish(tmp_path, "bt-1")
+    _finish(tmp_path, "bt-2")
+    rows, cursor = cj.read_completions(None, runs_dir=tmp_path)
+    assert [r["run_id"] for r in rows] == ["bt-1", "bt-2"]
+    assert cursor == cj.journal_end(tmp_path)
+
+    with open(cj.journal_path(tmp_path), "ab") as f:
+        f.write(b'{"run_id": "bt-3"')  # append in flight
+    assert cj.read_completions(cursor, runs_dir=tmp_path) == ([], cursor)
+    with open(cj.journal_path(tmp_path), "ab") as f:
+        f.write(b', "summary": ""}\nnot json\n')
+    rows, cursor = cj.read_completions(cursor, runs_dir=tmp_path)
+    assert [r["run_id"] for r in rows] == ["bt-3"] and cursor == cj.journal_end(tmp_path)
+
+    # Truncated / compacted journal: a cursor past EOF starts over.
+    cj.journal_path(tmp_path).write_text('{"run_id": "bt-4"}\n', encoding="utf-8")
+    rows, _ = cj.read_completions(cursor, runs_dir=tmp_path)
+    assert [r["run_id"] for r in rows] == ["bt-4"]
+    assert cj.read_completions(None, runs_dir=tmp_path / "missing") == ([], (0, 0))
+
+
+def test_cursor_from_before_compaction_restarts_even_past_old_offset(tmp_path, monkeypatch):
+    for i in range(5):
+        _finish(tmp_path, f"bt-{i}")
+    _, cursor = cj.read_completions(None, runs_dir=tmp_path)
+    # Compaction replaces the file; the new one then grows past the old cursor.
+    monkeypatch.setattr(cj, "_MAX_BYTES", 400)
+    monkeypatch.setattr(cj, "_KEEP_LAST", 1)
+    _finish(tmp_path, "bt-5")
+    monkeypatch.setattr(cj, "_MAX_BYTES", 1024 * 1024)
+    for i in range(6, 12):
+        _finish(tmp_path, f"bt-{i}")
+    assert cj.journal_end(tmp_path).offset > cursor.offset
+    assert cj.journal_end(tmp_path).inode != cursor.inode
+    rows, _ = cj.read_completions(cursor, runs_dir=tmp_path)
+    assert [r["run_id"] for r in rows] == [f"bt-{i}" for i in range(5, 12)]
+
+
+@pytest.mark.skipif(cj.fcntl is None, reason="needs fcntl")
+def test_appends_wait_for_a_lock_held_by_another_process(tmp_path):
+    path = cj.journal_path(tmp_path)
+    # A second open file description stands in for another process holding the lock.
+    fd = os.open(path.with_name(path.name + ".lock"), os.O_WRONLY | os.O_CREAT, 0o644)
+    cj.fcntl.flock(fd, cj.fcntl.LOCK_EX)
+    writer = threading.Thread(target=_finish, args=(tmp_path, "bt-1"))
+    writer.start()
+    writer.join(0.3)
+    assert writer.is_alive() and cj.journal_end(tmp_path) == (0, 0)
+    os.close(fd)
+    writer.join(5)
+    rows, _ = cj.read_completions(None, runs_dir=tmp_path)
+    assert [r["run_id"] for r in rows] == ["bt-1"]
+
+
+def test_follower_backfills_once_then_polls_new_completions(tmp_path):
+    _finish(tmp_path, "bt-old")
+    follower = cj.CompletionFollower(tmp_path)
+    assert follower.poll() == []
+    assert [s["run_id"] for s in follower.backfill()] == ["bt-old"]
+
+    _finish(tmp_path, "bt-new")
+    assert [s["run_id"] for s in follower.poll()] == ["bt-new"]
+    # Not committed (e.g. the insert failed): the same rows come back.
+    assert [s["run_id"] for s in follower.poll()] == ["bt-new"]
+    follower.commit()
+    assert follower.poll() == []
+
+
+def test_follower_retries_rows_whose_summary_is_not_readable_yet(tmp_path):
+    follower = cj.CompletionFollower(tmp_path)
+    out = tmp_path / "backtests" / "bt-late"
+    out.mkdir(parents=True)
+    cj.record_backtest_completion("bt-late", out / "summary.json", runs_dir=tmp_path)
+    assert follower.poll() == []
+    follower.commit()
+    assert follower.poll() == []
+
+    (out / "summary.json").write_text(json.dumps({"run_id": "bt-late"}), encoding="utf-8")
+    assert [s["run_id"] for s in follower.poll()] == ["bt-late"]
+    follower.commit()
+    assert follower.poll() == []
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'lp.db'}")
+    monkeypatch.setenv("AIMM_DB_AUTOCREATE", "1")
+    monkeypatch.setattr(leadpage_db, "_ENGINE", None)
+    yield
+    eng = leadpage_db._ENGINE
+    if eng is not None:
+        eng.dispose()
+
+
+def test_bulk_insert_skips_existing_and_duplicate_run_ids(sqlite_db):
+    assert leadpage_db.insert_local_backtest_result_if_missing(
+        summary={"run_id": "bt-1", "metrics": {"total_return_pct": 2.0}}
+    )
+    batch = [
+        {"run_id": "bt-1", "metrics": {"total_return_pct": 9.0}},
+        {"run_id": "bt-2", "metrics": {"sharpe_ratio": 1.5, "max_drawdown": 0.1}},
+        {"run_id": "bt-2"},
+        {"run_id": ""},
+    ]
+    assert leadpage_db.insert_local_backtest_results_if_missing(batch) == 1
+    assert leadpage_db.insert_local_backtest_results_if_missing(batch) == 0
+
+    rows = {r["run_id"]: r for r in leadpage_db.provider_rows("local", limit=10)}
+    assert rows["bt-1"]["total_return_pct"] == 2.0
+    assert rows["bt-2"]["sharpe"] == 1.5 and rows["bt-2"]["max_drawdown_pct"] == 10.0
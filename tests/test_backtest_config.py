@@ -233,7 +233,7 @@ class TestLoopResolvedConfigStamp:
                     },
                 }
 
-        monkeypatch.setattr("backtest.loop.BacktestEngine", _FakeEngine)
+        monkeypatch.setattr("backtest.engine.BacktestEngine", _FakeEngine)
 
         from backtest.loop import run_multi_step_backtest
 
@@ -260,3 +260,8 @@ class TestLoopResolvedConfigStamp:
         assert res.resolved_config is not None
         assert res.resolved_config["take_profit_pct"] == 6.0
         assert res.resolved_config["stop_loss_pct"] == 2.5
+        # Journaled after the rewrite, so the index sees resolved_config too.
+        from backtest.completion_journal import read_completions
+
+        rows, _ = read_completions(None, runs_dir=tmp_path)
+        assert [r["run_id"] for r in rows] == ["bt_tp_sl_stamp"]
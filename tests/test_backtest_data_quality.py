@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from backtest.data_quality import validate_ohlcv_window
+import pytest
+
+from backtest.data_quality import OhlcvPrefixValidator, validate_ohlcv_window
 
 
 class TestValidateOhlcvWindow:
@@ -77,3 +79,44 @@ class TestValidateOhlcvWindow:
         )
         assert not r.passed
         assert not r.checks["ticker_match"]
+
+
+def _history(ts: list[float]) -> list[list[float]]:
+    return [[t, 100.0, 101.0, 99.0, 100.5, 1.0] for t in ts]
+
+
+class TestOhlcvPrefixValidator:
+    HISTORIES = {
+        "clean_ms": [1_700_000_000_000 + i * 300_000 for i in range(12)],
+        "gap_then_unordered": [0, 300_000, 600_000, 1_500_000, 1_800_000, 1_700_000, 2_100_000],
+        "unordered_then_gap": [0, 300_000, 200_000, 900_000, 5_000_000],
+        "seconds": [1_700_000_000 + i * 300 for i in range(5)] + [1_700_009_000],
+        "bad_ts": [0, 300_000, "x", 600_000],
+    }
+
+    def test_prefix_results_match_window_validation(self):
+        for name, ts in self.HISTORIES.items():
+            bars = _history(ts)
+            bulk = OhlcvPrefixValidator(bars, interval_sec=300)
+            streamed = OhlcvPrefixValidator(interval_sec=300)
+            for n in range(len(bars) + 1):
+                for sym, min_bars in (("BTC/USDT", 2), ("ETH/USDT", 1)):
+                    ref = validate_ohlcv_window(
+                        bars[:n],
+                        symbol=sym,
+                        expected_ticker="BTC/USDT",
+                        interval_sec=300,
+                        min_bars=min_bars,
+                    )
+                    for v in (bulk, streamed):
+                        got = v.result(n, symbol=sym, expected_ticker="BTC/USDT", min_bars=min_bars)
+                        assert got == ref, (name, n, sym)
+                        assert list(got.checks) == list(ref.checks)
+                if n < len(bars):
+                    streamed.append(bars[n])
+
+    def test_prefix_beyond_history_rejected(self):
+        v = OhlcvPrefixValidator(_history([0, 300_000]), interval_sec=300)
+        assert len(v) == 2
+        with pytest.raises(ValueError, match="exceeds"):
+            v.result(3, symbol="BTC/USDT", expected_ticker="BTC/USDT")
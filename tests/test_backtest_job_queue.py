@@ -0,0 +1,119 @@
+"""Tests for the bounded async backtest job queue and worker spool."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from api import backtest_jobs
+from api.backtest_jobs import (
+    BacktestJobQueue,
+    backtest_job_workers,
+    claim_spooled_jobs,
+    release_spooled_job,
+    requeue_stale_claims,
+    spool_dir,
+    spool_job,
+    spooled_position,
+)
+
+
+def test_queue_caps_concurrency_and_runs_by_priority_then_fifo():
+    gate = threading.Event()
+    started: list[str] = []
+    done = threading.Semaphore(0)
+
+    def job(name: str):
+        def fn() -> None:
+            started.append(name)
+            gate.wait(timeout=5)
+            done.release()
+
+        return fn
+
+    q = BacktestJobQueue(workers=1)
+    assert q.submit("a", job("a")) == 1
+    # Wait until "a" occupies the only worker.
+    for _ in range(500):
+        if q.is_running("a"):
+            break
+        threading.Event().wait(0.01)
+    assert q.is_running("a")
+
+    assert q.submit("b", job("b"), priority=5) == 1
+    assert q.submit("c", job("c"), priority=5) == 2
+    assert q.submit("urgent", job("urgent"), priority=0) == 1
+    assert q.position("b") == 2
+    assert q.position("c") == 3
+    assert q.stats() == {"workers": 1, "running": 1, "queued": 3}
+    assert q.idle_slots() == 0
+
+    gate.set()
+    for _ in range(4):
+        assert done.acquire(timeout=5)
+    assert started == ["a", "urgent", "b", "c"]
+    assert q.position("c") is None
+
+
+def test_backtest_job_workers_env_clamped(monkeypatch):
+    monkeypatch.setenv("BACKTEST_JOB_WORKERS", "0")
+    assert backtest_job_workers() == 1
+    monkeypatch.setenv("BACKTEST_JOB_WORKERS", "nope")
+    assert backtest_job_workers() == 2
+    monkeypatch.setenv("BACKTEST_JOB_WORKERS", "4")
+    assert backtest_job_workers() == 4
+
+
+def test_spool_claims_in_priority_order_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("AIMM_RUNS_DIR", str(tmp_path))
+    spool_job("bt-low", "quick", {"ticker": "BTC/USDT"}, priority=7)
+    spool_job("bt-first", "demo", {"symbols": "BTC/USDT,ETH/USDT"})
+    spool_job("bt-high", "preset", {"preset_id": "x"}, priority=1)
+
+    assert spooled_position("bt-high") == 1
+    assert spooled_position("bt-first") == 2
+    assert spooled_position("bt-low") == 3
+
+    claimed = claim_spooled_jobs(2)
+    assert [c["run_id"] for c in claimed] == ["bt-high", "bt-first"]
+    assert claimed[1]["request"] == {"symbols": "BTC/USDT,ETH/USDT"}
+    assert spooled_position("bt-high") is None
+    assert spooled_position("bt-low") == 1
+
+    assert [c["run_id"] for c in claim_spooled_jobs(5)] == ["bt-low"]
+    assert claim_spooled_jobs(5) == []
+
+
+def test_claims_survive_until_released_and_dead_workers_requeue(monkeypatch, tmp_path):
+    monkeypatch.setenv("AIMM_RUNS_DIR", str(tmp_path))
+    spool_job("bt-a", "quick", {"ticker": "BTC/USDT"})
+    spool_job("bt-b", "quick", {"ticker": "ETH/USDT"})
+    spec_a, _ = claim_spooled_jobs(2)
+    claims = sorted(p.name for p in spool_dir().glob("*.claimed"))
+    assert len(claims) == 2 and all(f"-{os.getpid()}.claimed" in n for n in claims)
+
+    release_spooled_job(spec_a)  # bt-a finished
+    # Our own (live) worker's claim is not touched.
+    assert requeue_stale_claims() == 0
+
+    # The worker holding bt-b died: its claim goes back to the queue on restart.
+    monkeypatch.setattr(backtest_jobs, "_pid_alive", lambda pid: False)
+    assert requeue_stale_claims() == 1
+    assert spooled_position("bt-b") == 1 and not list(spool_dir().glob("*.claimed"))
+    again = claim_spooled_jobs(5)
+    assert [s["run_id"] for s in again] == ["bt-b"] and again[0]["attempts"] == 1
+
+    # A job whose claims keep dying is parked as .failed rather than retried forever.
+    for _ in range(backtest_jobs.MAX_CLAIM_ATTEMPTS - 1):
+        requeue_stale_claims()
+        claim_spooled_jobs(5)
+    assert [p.suffix for p in spool_dir().iterdir()] == [".failed"]
+    assert claim_spooled_jobs(5) == []
+
+
+def test_unreadable_spool_file_is_kept_as_failed(monkeypatch, tmp_path):
+    monkeypatch.setenv("AIMM_RUNS_DIR", str(tmp_path))
+    spool_dir().mkdir(parents=True)
+    (spool_dir() / "5-00000000000000000001-bt-x.json").write_text("{", encoding="utf-8")
+    assert claim_spooled_jobs(1) == []
+    assert [p.name for p in spool_dir().iterdir()] == ["5-00000000000000000001-bt-x.failed"]
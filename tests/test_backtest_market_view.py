@@ -0,0 +1,35 @@
+"""Shared per-bar OHLCV windows for multi-symbol backtests."""
+
+from __future__ import annotations
+
+from backtest.market_view import UniverseWindows
+
+
+def _bars(n: int, base: float) -> list[list[float]]:
+    return [
+        [i * 60_000, base + i, base + i + 1, base + i - 1, base + i + 0.5, 1.0] for i in range(n)
+    ]
+
+
+def test_one_slice_per_symbol_per_bar_shared_by_invocations():
+    bars = {"BTC/USDT": _bars(50, 100.0), "ETH/USDT": _bars(50, 10.0), "XYZ/USDT": _bars(30, 1.0)}
+    view = UniverseWindows(bars)
+
+    a = view.market_data(20)
+    b = view.market_data(20)
+    assert a is not b and a["BTC/USDT"] is not b["BTC/USDT"]
+    for sym in bars:
+        assert a[sym]["ohlcv"] is b[sym]["ohlcv"]
+        assert a[sym]["ohlcv"] == bars[sym][:20]
+    assert view.window("BTC/USDT", 20) is a["BTC/USDT"]["ohlcv"]
+
+    # Next bar: fresh slices; earlier windows are untouched (no look-ahead leak).
+    c = view.market_data(21)
+    assert len(c["BTC/USDT"]["ohlcv"]) == 21 and len(a["BTC/USDT"]["ohlcv"]) == 20
+    assert view.market_data(40)["XYZ/USDT"]["ohlcv"] == bars["XYZ/USDT"]
+    assert view.window("MISSING", 5) == [] and view.market_data(0)["ETH/USDT"]["ohlcv"] == []
+
+
+def test_non_list_sequences_are_sliced():
+    view = UniverseWindows({"BTC/USDT": tuple(_bars(5, 1.0))})
+    assert view.window("BTC/USDT", 3) == _bars(5, 1.0)[:3]
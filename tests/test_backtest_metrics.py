@@ -1,8 +1,15 @@
+import math
+
+import numpy as np
+import pytest
+
+from backtest import metrics_kernel as mk
 from backtest.metrics import (
     compute_basic_metrics,
     max_drawdown,
     returns_from_equity,
     sharpe_ratio,
+    sortino_ratio,
     win_rate,
 )
 
@@ -44,3 +51,73 @@ def test_compute_basic_metrics_smoke():
     assert 0 <= m.win_rate <= 1
     assert m.periods_per_year >= 300
     assert m.profit_factor is not None
+
+
+def _reference_sharpe(r, ppy):
+    # Pre-vectorization loop implementation, kept as the parity oracle.
+    mean = sum(r) / len(r)
+    std = math.sqrt(sum((x - mean) ** 2 for x in r) / (len(r) - 1))
+    if std <= 0:
+        return 0.0
+    med_abs = sorted(abs(x) for x in r)[len(r) // 2]
+    raw = mean / max(std, max(1e-12, med_abs * 0.2)) * math.sqrt(ppy)
+    return max(-15.0, min(15.0, raw))
+
+
+def _reference_returns(eq):
+    return [0.0 if a == 0 else (b - a) / a for a, b in zip(eq, eq[1:], strict=False)]
+
+
+def _reference_max_drawdown(eq):
+    peak, mdd = eq[0], 0.0
+    for x in eq:
+        peak = max(peak, x)
+        if peak > 0:
+            mdd = max(mdd, (peak - x) / peak)
+    return mdd
+
+
+def _reference_sortino(r, ppy, mar=0.0):
+    mean = sum(r) / len(r)
+    dd = math.sqrt(sum(min(0.0, x - mar) ** 2 for x in r) / len(r))
+    if dd <= 1e-18:
+        return 0.0
+    return (mean - mar) / dd * math.sqrt(ppy)
+
+
+def test_kernel_batch_matches_scalar_functions():
+
+    rng = np.random.default_rng(7)
+    curves = 10_000 * np.cumprod(1 + rng.normal(0.0005, 0.01, size=(500, 300)), axis=1)
+    bundle = mk.metrics_bundle(curves, periods_per_year=8766)
+    for i in (0, 123, 499):
+        eq = curves[i].tolist()
+        rets = _reference_returns(eq)
+        assert returns_from_equity(eq) == pytest.approx(rets, rel=1e-12)
+        mdd, sortino = _reference_max_drawdown(eq), _reference_sortino(rets, 8766)
+        assert bundle["sharpe"][i] == pytest.approx(_reference_sharpe(rets, 8766), rel=1e-9)
+        assert bundle["max_drawdown_pct"][i] == pytest.approx(mdd * 100, rel=1e-12)
+        assert bundle["sortino"][i] == pytest.approx(sortino, rel=1e-9)
+        assert bundle["total_return_pct"][i] == pytest.approx((eq[-1] / eq[0] - 1) * 100)
+        # The scalar wrappers share the kernel, so check them against the oracles too.
+        assert max_drawdown(eq) == pytest.approx(mdd, rel=1e-12)
+        assert sortino_ratio(rets, periods_per_year=8766) == pytest.approx(sortino, rel=1e-9)
+        assert sharpe_ratio(rets, periods_per_year=8766) == pytest.approx(
+            _reference_sharpe(rets, 8766), rel=1e-9
+        )
+
+    ragged = mk.metrics_bundle_many([curves[0].tolist(), curves[1][:50].tolist()])
+    assert ragged[0]["sharpe"] == pytest.approx(mk.metrics_bundle(curves[0])["sharpe"])
+    assert ragged[1]["max_drawdown_pct"] == pytest.approx(
+        _reference_max_drawdown(curves[1][:50].tolist()) * 100
+    )
+
+
+def test_rolling_metrics_window_tail_matches_full_window():
+
+    eq = [100, 104, 101, 99, 107, 110, 95, 96, 120, 118]
+    roll = mk.rolling_metrics(eq, window=5)
+    assert all(math.isnan(x) for x in roll["sharpe"][:4])
+    tail = mk.metrics_bundle(eq[-5:])
+    assert roll["sharpe"][-1] == pytest.approx(tail["sharpe"])
+    assert roll["max_drawdown_pct"][-1] == pytest.approx(tail["max_drawdown_pct"])
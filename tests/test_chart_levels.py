@@ -0,0 +1,103 @@
+"""Multi-resolution chart levels: min/max-preserving buckets served by time range and width."""
+
+from __future__ import annotations
+
+import shutil
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from api import backtest_routes
+from api.flow_stream_server import app
+from backtest.chart_levels import pick_level, query_chart, write_chart_levels
+from backtest.engines.perp import PerpEngine
+
+H = 3_600_000
+T0 = 1_700_000_000_000
+
+
+def _walk(n: int, *, seed: int = 11) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    vals = 10_000 + np.cumsum(rng.normal(0.0, 20.0, n))
+    vals[n // 3] += 5_000  # one-bar spike that index striding would usually skip
+    return T0 + np.arange(n) * H, vals
+
+
+def test_downsampled_levels_keep_extremes_and_every_bar(tmp_path):
+    ts, vals = _walk(10_001)
+    meta = write_chart_levels(tmp_path, equity=(ts, vals))
+    assert meta["series"]["equity"]["levels"][:3] == [10_001, 5_001, 2_501]
+
+    out = query_chart(tmp_path, "equity", width=300)
+    assert out["downsampled"] and 300 <= out["points"] < 600
+    cols = out["columns"]
+    assert max(cols["high"]) == vals.max() and min(cols["low"]) == vals.min()
+    assert sum(cols["bars"]) == 10_001
+    assert cols["open"][0] == vals[0] and cols["close"][-1] == vals[-1]
+    assert cols["ts"] == sorted(cols["ts"]) and cols["ts"][0] == T0
+
+    full = query_chart(tmp_path, "equity", width=20_000)
+    assert full["level"] == 0 and full["columns"]["close"] == vals.tolist()
+    assert pick_level([100, 50, 25], 100, 10) == 2 and pick_level([100, 50], 100, 80) == 0
+
+
+def test_time_range_slices_the_chosen_level(tmp_path):
+    ts, vals = _walk(4_096)
+    write_chart_levels(tmp_path, equity=(ts, vals))
+    start, end = int(ts[1_000]), int(ts[1_999])
+    out = query_chart(tmp_path, "equity", start_ts=start, end_ts=end, width=100)
+    assert out["count"] == 1_000 and out["bucket_bars"] == 8
+    cols = out["columns"]
+    # Buckets are aligned to the run start, so edges may reach one bucket past the range.
+    assert cols["ts"][0] <= start < cols["ts"][0] + 8 * H and cols["ts"][-1] <= end
+    assert max(cols["high"]) >= vals[1_000:2_000].max()
+    assert query_chart(tmp_path, "equity", start_ts=int(ts[-1]) + H, width=100)["points"] == 0
+    assert query_chart(tmp_path, "ohlcv", width=100) is None
+
+
+def test_engine_writes_levels_and_route_serves_older_runs(tmp_path, monkeypatch):
+    rows = [
+        [T0 + i * H, 100 + i % 9, 102 + i % 9, 98 + i % 9, 101 + i % 9, 3.0] for i in range(300)
+    ]
+    engine = PerpEngine({"interval_sec": 3600, "eval_start_bar": 20})
+    engine.run({"BTC/USDT": rows}, lambda *a: 0.3, run_id="c", runs_dir=tmp_path)
+    run_dir = tmp_path / "backtests" / "c"
+    monkeypatch.setattr(backtest_routes, "BACKTESTS_DIR", tmp_path / "backtests")
+    client = TestClient(app)
+
+    first = client.get("/backtests/c/chart", params={"series": "ohlcv", "width": 100}).json()
+    assert first["count"] == 280 and first["columns"]["ts"][0] == T0 + 20 * H
+    assert max(first["columns"]["high"]) == 110 and sum(first["columns"]["volume"]) == 840.0
+    eq = client.get("/backtests/c/chart", params={"width": 1000}).json()
+    assert eq["columns"]["close"][-1] == pytest.approx(engine.snapshots[-1].equity)
+
+    shutil.rmtree(run_dir / "chart")  # a run finalized before chart levels existed
+    again = client.get("/backtests/c/chart", params={"series": "ohlcv", "width": 100}).json()
+    assert again["columns"] == first["columns"]
+    eq_again = client.get("/backtests/c/chart", params={"width": 1000}).json()
+    assert eq_again["columns"]["close"] == pytest.approx(eq["columns"]["close"])
+    assert not (run_dir / "chart").exists()  # GET never writes
+    bench = client.get("/backtests/c/chart", params={"series": "benchmark"})
+    assert bench.status_code == 200 and bench.json()["count"] == 280
+
+    assert client.get("/backtests/c/chart", params={"series": "fills"}).status_code == 400
+    assert client.get("/backtests/missing/chart").status_code == 404
+    (tmp_path / "backtests" / "partial").mkdir()  # no summary.json yet
+    assert client.get("/backtests/partial/chart").status_code == 404
+    for bad in ("..", ".", "c/..", ""):
+        with pytest.raises(HTTPException) as exc:
+            backtest_routes.get_backtest_chart(bad, "equity", None, None, 100)
+        assert exc.value.status_code == 404
+    assert not (tmp_path / "chart").exists()
+
+
+def test_rewrite_swaps_the_whole_level_set(tmp_path):
+    ts, vals = _walk(1_000)
+    write_chart_levels(tmp_path, equity=(ts, vals), ohlcv=[[t, 1, 2, 0, 1, 1] for t in ts])
+    write_chart_levels(tmp_path, equity=(ts[:100], vals[:100]))
+    names = sorted(p.name for p in (tmp_path / "chart").iterdir())
+    assert names == ["equity_L0.npy", "equity_L1.npy", "meta.json"]
+    assert [p.name for p in tmp_path.iterdir()] == ["chart"]  # no temp dirs left behind
+    assert query_chart(tmp_path, "equity", width=1_000)["count"] == 100
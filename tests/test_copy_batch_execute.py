@@ -0,0 +1,130 @@
+"""Batched auto-execute of follower ops inbox items (platform worker path)."""
+
+from __future__ import annotations
+
+import pytest
+
+from api import copy_routes
+from storage import leadpage_db
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'lp.db'}")
+    monkeypatch.setenv("AIMM_DB_AUTOCREATE", "1")
+    monkeypatch.setattr(leadpage_db, "_ENGINE", None)
+    monkeypatch.setattr(copy_routes, "RUNS_DIR", tmp_path / "runs")
+    yield
+    eng = leadpage_db._ENGINE
+    if eng is not None:
+        eng.dispose()
+
+
+def _ops(provider: str, intent: dict | None) -> int:
+    sig = leadpage_db.insert_signal(
+        provider=provider,
+        kind="ops",
+        title="t",
+        body="b",
+        ticker="BTC/USDT",
+        result_provider=None,
+        result_run_id=None,
+        meta={"intent": intent} if intent is not None else {},
+    )
+    return int(sig["id"])
+
+
+def _follow(uid: int, provider: str, *, auto: bool, max_notional: float | None = None) -> None:
+    leadpage_db.follow_provider(user_id=uid, provider=provider)
+    leadpage_db.upsert_copy_setting(
+        user_id=uid,
+        provider=provider,
+        enabled=True,
+        auto_execute=auto,
+        instrument="spot",
+        max_notional_usdt=max_notional,
+    )
+
+
+def test_batch_executes_each_follower_in_order_and_commits_once(sqlite_db, monkeypatch):
+    _follow(1, "alpha", auto=True)
+    _follow(2, "alpha", auto=True, max_notional=50.0)
+    _follow(3, "alpha", auto=False)
+    buy = {"symbol": "BTC/USDT", "side": "buy", "notional_usdt": 100.0, "price": 50_000.0}
+    _ops("alpha", buy)
+    _ops("alpha", {"symbol": "BTC/USDT", "side": "hold"})
+    _ops("alpha", {**buy, "side": "sell", "notional_usdt": 20.0})
+    leadpage_db.fanout_new_signals(limit=50)
+
+    loads = []
+    real_load = copy_routes._load_paper_account
+    monkeypatch.setattr(
+        copy_routes, "_load_paper_account", lambda uid: loads.append(uid) or real_load(uid)
+    )
+    pending = leadpage_db.pending_auto_execute_ops(per_target=3)
+    assert {it["user_id"] for it in pending} == {1, 2}
+    assert all(it["signal"]["kind"] == "ops" for it in pending)
+
+    done = copy_routes.execute_pending_ops(pending, max_workers=4)
+    assert sorted(loads) == [1, 2]  # one account load per follower, not per item
+    by_user = {}
+    for ex in done:
+        by_user.setdefault(ex["user_id"], []).append(ex["status"])
+    assert by_user == {u: ["executed", "rejected", "executed"] for u in (1, 2)}
+
+    # Executed items are read; the rejected one stays unread (as with execute_inbox_item).
+    left = leadpage_db.pending_auto_execute_ops()
+    assert sorted(it["user_id"] for it in left) == [1, 2]
+    acct = leadpage_db.get_or_init_paper_account(2, start_usdt=0.0)
+    assert acct["spot_positions"][0]["qty"] == pytest.approx(30.0 / 50_000.0)
+    assert len(leadpage_db.list_paper_trades(1)) == 2
+    assert len(leadpage_db.list_executions(3)) == 0
+
+
+def test_per_target_cap_and_single_item_path_agree(sqlite_db):
+    _follow(1, "alpha", auto=True)
+    for _ in range(4):
+        _ops("alpha", {"symbol": "ETH/USDT", "side": "buy", "notional_usdt": 10.0, "price": 2.0})
+    leadpage_db.fanout_new_signals(limit=50)
+    pending = leadpage_db.pending_auto_execute_ops(per_target=3)
+    assert len(pending) == 3
+
+    first = copy_routes.execute_inbox_item(user_id=1, inbox_id=pending[0]["id"])
+    assert first["ok"] is True
+    rest = copy_routes.execute_pending_ops(leadpage_db.pending_auto_execute_ops(), max_workers=2)
+    assert [ex["status"] for ex in rest] == ["executed"] * 3
+    assert first["execution"]["detail"] == rest[0]["detail"]
+    assert leadpage_db.pending_auto_execute_ops() == []
+
+
+def test_per_target_cap_is_applied_in_sql(sqlite_db, monkeypatch):
+    for uid in (1, 2):
+        _follow(uid, "alpha", auto=True)
+    for _ in range(7):
+        _ops("alpha", {"symbol": "ETH/USDT", "side": "buy", "notional_usdt": 10.0, "price": 2.0})
+    leadpage_db.fanout_new_signals(limit=50)
+
+    fetched: list[int] = []
+
+    class _Rows:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def all(self):
+            return self.rows
+
+    class CountingSession(leadpage_db.Session):
+        def execute(self, *a, **kw):
+            rows = super().execute(*a, **kw).all()
+            fetched.append(len(rows))
+            return _Rows(rows)
+
+    monkeypatch.setattr(leadpage_db, "Session", CountingSession)
+    pending = leadpage_db.pending_auto_execute_ops(per_target=2)
+    # 14 unread items, but only 2 per (user, provider) leave the database.
+    assert fetched == [4] and len(pending) == 4
+    by_user: dict[int, list[int]] = {}
+    for it in pending:
+        by_user.setdefault(it["user_id"], []).append(it["signal_id"])
+    assert by_user[1] == by_user[2] == sorted(by_user[1])
+    assert all(it["signal"]["kind"] == "ops" for it in pending)
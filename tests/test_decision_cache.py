@@ -0,0 +1,65 @@
+"""Tests for the SQLite-backed LLM decision cache."""
+
+from __future__ import annotations
+
+from llm.decision_cache import (
+    DecisionCache,
+    cache_stats,
+    invalidate_cache,
+    prompt_key,
+    read_cached_decision,
+    write_cached_decision,
+)
+
+
+def test_prompt_key_is_content_addressed():
+    k = prompt_key("m", "sys", "user")
+    assert k == prompt_key("m", "sys", "user")
+    assert k != prompt_key("m2", "sys", "user")
+    assert k != prompt_key("m", "sys", "user", extra="tools")
+    # Field boundaries matter: moving text between system and user changes the key.
+    assert prompt_key("m", "ab", "c") != prompt_key("m", "a", "bc")
+
+
+def test_round_trip_stats_and_invalidate(monkeypatch, tmp_path):
+    monkeypatch.setenv("AIMM_DECISION_CACHE_DIR", str(tmp_path))
+    k1 = prompt_key("m", "s", "btc")
+    k2 = prompt_key("m", "s", "eth")
+    assert read_cached_decision(k1) is None
+    assert write_cached_decision(k1, {"Setup_Score": 70}, agent_id="2.1", ticker="BTC/USDT")
+    assert write_cached_decision(k2, {"Setup_Score": 40}, agent_id="2.1", ticker="ETH/USDT")
+    # Overwrite keeps counters exact.
+    assert write_cached_decision(k1, {"Setup_Score": 71}, agent_id="2.1", ticker="BTC/USDT")
+
+    assert read_cached_decision(k1) == {"Setup_Score": 71}
+    stats = cache_stats()
+    assert stats["enabled"] is True
+    assert stats["total_entries"] == 2
+    assert stats["size_bytes"] > 0
+    assert stats["hits"] == 1
+
+    assert invalidate_cache(ticker="BTC/USDT") == 1
+    assert read_cached_decision(k1) is None
+    assert read_cached_decision(k2) == {"Setup_Score": 40}
+    assert cache_stats()["total_entries"] == 1
+
+
+def test_disabled_outside_backtest(monkeypatch):
+    monkeypatch.delenv("AIMM_DECISION_CACHE_DIR", raising=False)
+    monkeypatch.setenv("MODE", "paper")
+    assert write_cached_decision("k", {"x": 1}) is False
+    assert read_cached_decision("k") is None
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = DecisionCache(tmp_path / "d.sqlite3", max_entries=10)
+    for i in range(10):
+        cache.put(f"k{i}", {"i": i})
+    assert cache.get("k0") == {"i": 0}  # touch the oldest entry
+    cache.put("k10", {"i": 10})
+    stats = cache.stats()
+    assert stats["total_entries"] == 9
+    assert cache.get("k0") == {"i": 0}
+    assert cache.get("k1") is None
+    assert cache.get("k10") == {"i": 10}
+    cache.close()
@@ -0,0 +1,153 @@
+"""Fast deterministic desk: NumPy intents match the graph's Tier-0 nodes + arbitrator."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backtest import engine as engine_mod
+from backtest import fast_deterministic
+from backtest.engine import BacktestEngine
+from backtest.fast_deterministic import (
+    check_parity,
+    compile_desk_decisions,
+    reference_intent,
+)
+from backtest.loop import run_multi_step_backtest
+
+SYM = "BTC/USDT"
+# Full-series parity over these presets is what keeps the NumPy formulas in step with the
+# Tier-0 agents and weight_assigner: any formula change on either side fails here.
+PRESETS = [
+    pytest.param(None, None, id="defaults"),
+    pytest.param(
+        {"2.3": 0.5, "2.1": 0.3, "1.1": 0.15},
+        {
+            "buy": {"min_composite": 52, "min_confidence": 5},
+            "sell": {"max_composite": 48, "min_confidence": 5},
+            "ta_led": {"enabled": False},
+        },
+        id="loose_gates_no_ta_led",
+    ),
+    pytest.param(
+        {"1.1": 0.6, "2.1": 0.3, "2.3": 0.1},
+        {
+            "buy": {"min_composite": 51, "min_confidence": 2},
+            "sell": {"max_composite": 49, "min_confidence": 2},
+            "ta_led": {"buy_min_composite": 60, "sell_max_composite": 40, "min_confidence": 30},
+        },
+        id="macro_heavy_custom_ta_led",
+    ),
+    pytest.param(
+        {"2.3": 1.0},
+        {
+            "buy": {"min_composite": 50, "min_confidence": 0},
+            "sell": {"max_composite": 50, "min_confidence": 0},
+            "alignment_gating": {"min_factors_for_directional": 12},
+            "ta_led": {"enabled": False},
+        },
+        id="ta_only_factor_gated",
+    ),
+]
+
+
+def _bars(n: int, *, seed: int = 3) -> list[list[float]]:
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, n)))
+    out = []
+    for i, c in enumerate(closes):
+        o = closes[i - 1] if i else c
+        h = max(o, c) * (1 + abs(rng.normal(0.0, 0.01)))
+        lo = min(o, c) * (1 - abs(rng.normal(0.0, 0.01)))
+        out.append([1_700_000_000_000 + i * 86_400_000, o, h, lo, c, rng.uniform(100, 1000)])
+    return out
+
+
+@pytest.mark.parametrize("nexus", ["1", "0"])
+@pytest.mark.parametrize("weights,threshold", PRESETS)
+def test_every_bar_matches_the_graph_nodes(monkeypatch, nexus, weights, threshold):
+    monkeypatch.setenv("AIMM_BACKTEST_OHLCV_NEXUS", nexus)
+    bars = _bars(120)
+    desk = compile_desk_decisions(SYM, bars, profile_weights=weights, decision_threshold=threshold)
+    kw = {"profile_weights": weights, "decision_threshold": threshold}
+    fast = [desk.intent(n) for n in range(1, len(bars) + 1)]
+    graph = [reference_intent(SYM, bars, n, **kw) for n in range(1, len(bars) + 1)]
+    assert fast == graph
+    assert {"BUY", "SELL"} <= {a for a, _ in fast}
+    assert check_parity(desk, bars, sample=5, **kw) == []
+
+
+def test_long_only_book_holds_instead_of_opening_shorts():
+    bars = _bars(120)
+    desk = compile_desk_decisions(SYM, bars, allows_short=False)
+    n = next(n for n in range(1, len(bars) + 1) if desk.action[n] < 0)
+    assert desk.intent(n) == reference_intent(SYM, bars, n, allows_short=False)
+    assert desk.intent(n)[0] == "HOLD" and desk.target_weight(n, book_flat=True) == 0.0
+    conf = desk.intent(n, book_flat=False)[1]
+    assert desk.target_weight(n, book_flat=False) == -min(conf, 0.45)
+
+    with pytest.raises(ValueError):
+        compile_desk_decisions(SYM, [[0, 1, 1, 1, float("nan"), 1]])
+
+
+def test_engine_fast_run_trades_like_the_graph_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIMM_BACKTEST_TERMINAL_LOG", "0")
+    bars = _bars(90, seed=7)
+    cfg = {"initial_cash_usd": 10_000, "ta_warmup_bars": 20, "interval_sec": 86_400}
+
+    class _DeterministicGraph:
+        def invoke(self, state):
+            n = state["shared_memory"]["backtest"]["window_len"]
+            action, conf = reference_intent(SYM, bars, n)
+            return {"trade_intent": {"action": action, "confidence": conf}}
+
+    graph_engine = BacktestEngine(dict(cfg))
+    graph_engine.workflow = _DeterministicGraph()
+    graph = graph_engine.run(ticker=SYM, bars=bars, runs_dir=tmp_path, run_id="bt_graph")
+
+    fast_engine = BacktestEngine({**cfg, "fast_deterministic": True})
+    fast = fast_engine.run(ticker=SYM, bars=bars, runs_dir=tmp_path, run_id="bt_fast")
+
+    assert fast_engine.workflow is None
+    assert fast["fast_deterministic"]["parity_mismatches"] == []
+    assert fast["trade_count"] == graph["trade_count"] > 0
+    assert fast["final_equity"] == pytest.approx(graph["final_equity"])
+    summary = json.loads(Path(fast["paths"]["summary"]).read_text(encoding="utf-8"))
+    assert summary["fast_deterministic"] == fast["fast_deterministic"]
+
+
+def test_parity_mismatch_sends_the_symbol_through_the_graph(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIMM_BACKTEST_TERMINAL_LOG", "0")
+    bars = _bars(60, seed=5)
+    calls = []
+
+    class _Graph:
+        def invoke(self, state):
+            calls.append(state["shared_memory"]["backtest"]["window_len"])
+            return {"trade_intent": {"action": "HOLD", "confidence": 0.0}}
+
+    def drifted(desk, bars, **kw):
+        return [{"symbol": desk.symbol, "bars": 10, "fast": ["BUY", 0.5], "graph": ["HOLD", 0.0]}]
+
+    monkeypatch.setattr(fast_deterministic, "check_parity", drifted)
+    monkeypatch.setattr(engine_mod, "build_workflow", lambda: SimpleNamespace(compile=_Graph))
+    res = run_multi_step_backtest(
+        ticker=SYM,
+        bars=bars,
+        interval_sec=86_400,
+        runs_dir=tmp_path,
+        run_id="bt_drift",
+        export_bundle=False,
+        fast_deterministic=True,
+    )
+    report = res.fast_report
+    assert report["symbols"] == [] and report["graph_fallback_symbols"] == [SYM]
+    assert report["parity_mismatches"][0]["bars"] == 10
+    assert calls, "the drifted desk must not supply the intents"
+    assert res.trade_count == 0
+    summary = json.loads(res.summary_path.read_text(encoding="utf-8"))
+    assert summary["fast_deterministic"] == report
@@ -0,0 +1,65 @@
+"""Cold-import budget: CLIs and API workers must not pull the agent / exchange stack at import.
+
+The forbidden-module checks always run; the wall-clock budgets are ``slow`` (opt-in).
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+# module -> (modules that must stay unloaded, cumulative import budget in ms)
+_BUDGETS = {
+    "main": (("ccxt", "langgraph", "openai", "agents.market_scan"), 1500),
+    "api.flow_stream_server": (("ccxt", "langgraph", "openai", "eth_account"), 2500),
+}
+
+
+def _cold_import(module: str) -> tuple[set[str], int]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(_ROOT / "src") + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    loaded: set[str] = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            total_us = int(cumulative.strip())
+    return loaded, total_us // 1000
+
+
+@pytest.mark.parametrize("module", sorted(_BUDGETS))
+def test_cold_import_stays_light(module):
+    forbidden, _ = _BUDGETS[module]
+    loaded, _ = _cold_import(module)
+    assert module in loaded
+    heavy = sorted(m for m in forbidden if m in loaded)
+    assert not heavy, f"import {module} loads {heavy}"
+
+
+# Wall-clock limits depend on the machine and its load; opt in with ``-m slow``.
+@pytest.mark.slow
+@pytest.mark.parametrize("module", sorted(_BUDGETS))
+def test_cold_import_time_budget(module):
+    _, budget_ms = _BUDGETS[module]
+    _, took_ms = _cold_import(module)
+    assert took_ms < budget_ms, f"import {module} took {took_ms}ms (budget {budget_ms}ms)"
@@ -0,0 +1,107 @@
+"""Persistent invoke cache: identical bars/book across runs replay graph outputs from disk."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.invoke_cache import BarChain, InvokeCache, code_version, state_key
+
+SYM = "BTC/USDT"
+
+
+def _bars(n: int, *, seed: int = 5) -> list[list[float]]:
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, n)))
+    return [
+        [1_700_000_000_000 + i * 3_600_000, c, c * 1.01, c * 0.99, c, 10.0]
+        for i, c in enumerate(closes)
+    ]
+
+
+class _CountingGraph:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def invoke(self, state):
+        self.calls += 1
+        rows = state["market_data"][SYM]["ohlcv"]
+        up = rows[-1][4] > rows[-2][4]
+        return {
+            "trade_intent": {"action": "BUY" if up else "SELL", "confidence": 0.3},
+            "market_data": state["market_data"],  # not persisted
+        }
+
+
+def _run(tmp_path, bars, run_id: str) -> tuple[dict, int]:
+    engine = BacktestEngine(
+        {"initial_cash_usd": 10_000, "interval_sec": 3600, "invoke_cache": True}
+    )
+    engine.workflow = graph = _CountingGraph()
+    out = engine.run(ticker=SYM, bars=bars, runs_dir=tmp_path, run_id=run_id)
+    return out, graph.calls
+
+
+def test_rerun_replays_from_disk_and_edited_bars_miss(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIMM_INVOKE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("AIMM_BACKTEST_TERMINAL_LOG", "0")
+    bars = _bars(60)
+
+    first, cold = _run(tmp_path, bars, "bt_a")
+    second, warm = _run(tmp_path, bars, "bt_b")
+    assert cold > 0 and warm == 0
+    assert second["trade_count"] == first["trade_count"] > 0
+    assert second["final_equity"] == pytest.approx(first["final_equity"])
+    rows = (tmp_path / "backtests" / "bt_b" / "iterations.jsonl").read_text().splitlines()
+    agent = [json.loads(r) for r in rows if '"strategy": "agent"' in r]
+    assert agent and all(r.get("invoke_cache_persisted") for r in agent)
+
+    # Editing one bar invalidates every later prefix but keeps the earlier ones.
+    edited = [list(r) for r in bars]
+    edited[55][4] *= 1.05
+    _, partial = _run(tmp_path, edited, "bt_c")
+    assert 0 < partial < cold
+
+
+def test_key_covers_prefix_and_book_but_not_run_id(monkeypatch):
+    bars = _bars(30)
+    chain, longer = BarChain(bars), BarChain(bars + _bars(5, seed=9))
+    assert chain.digest(30) == longer.digest(30) != longer.digest(31)
+    tweaked = [list(r) for r in bars]
+    tweaked[3][4] += 1e-9
+    assert BarChain(tweaked).digest(30) != chain.digest(30)
+    assert BarChain(tweaked).digest(3) == chain.digest(3)
+
+    def state(run_id: str, qty: float) -> dict:
+        return {
+            "ticker": SYM,
+            "market_data": {SYM: {"ohlcv": bars[:20]}},
+            "shared_memory": {"backtest": {"run_id": run_id, "qty": qty}},
+        }
+
+    chains = {SYM: chain}
+    key = state_key(state("a", 0.0), chains=chains, version="v1")
+    assert key == state_key(state("b", 0.0), chains=chains, version="v1")
+    assert key != state_key(state("a", 1.0), chains=chains, version="v1")
+    assert key != state_key(state("a", 0.0), chains=chains, version="v2")
+
+    base = code_version()
+    monkeypatch.setenv("AIMM_BACKTEST_TERMINAL_LOG", "0")
+    assert code_version() == base
+    monkeypatch.setenv("AIMM_BACKTEST_HOLD_FALLBACK", "momentum")
+    assert code_version() != base
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = InvokeCache(tmp_path / "inv.sqlite3", max_entries=10)
+    for i in range(10):
+        store.put(f"k{i}", {"trade_intent": {"action": "HOLD"}, "market_data": {"x": i}})
+    assert store.get("k0") == {"trade_intent": {"action": "HOLD"}}
+    store.put("k10", {"trade_intent": {}})
+    stats = store.stats()
+    assert stats["total_entries"] == 9 and stats["size_bytes"] > 0
+    assert store.get("k0") is not None and store.get("k1") is None
+    store.close()
@@ -0,0 +1,61 @@
+"""Reverse-seeking JSONL tail reads and single-pass compaction."""
+
+from __future__ import annotations
+
+import json
+
+from backtest.trade_book import read_jsonl_dict_records
+from memory.policy_memory import PolicyMemoryStore
+from storage.jsonl_tail import compact_if_oversized, compact_jsonl, tail_jsonl, tail_lines
+
+
+def _write(path, n: int, *, pad: int = 0) -> list[dict]:
+    rows = [{"i": i, "pad": "x" * pad} for i in range(n)]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return rows
+
+
+def test_tail_matches_full_read_across_block_boundaries(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    rows = _write(path, 500, pad=37)
+    for n in (1, 7, 499, 500, 900):
+        assert tail_jsonl(path, n) == rows[-n:]
+    assert tail_lines(path, 3, block_size=16) == [json.dumps(r) for r in rows[-3:]]
+    # Blank lines, a torn line and no trailing newline.
+    path.write_bytes(b'{"i": 1}\n\n{"i": 2\n{"i": 3}\n\n{"i": 4}')
+    assert tail_jsonl(path, 5) == [{"i": 1}, {"i": 3}, {"i": 4}]
+    assert tail_jsonl(path, 2, where=lambda r: r["i"] != 4) == [{"i": 1}, {"i": 3}]
+    assert tail_jsonl(tmp_path / "missing.jsonl", 3) == []
+
+
+def test_read_jsonl_dict_records_tail_expands_legacy_arrays(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    path.write_text('{"a": 1}\n[{"a": 2}, {"a": 3}]\n{"a": 4}\n', encoding="utf-8")
+    assert read_jsonl_dict_records(path, tail=3) == [{"a": 2}, {"a": 3}, {"a": 4}]
+    assert read_jsonl_dict_records(path, limit=2) == [{"a": 1}, {"a": 2}]
+
+
+def test_compaction_keeps_newest_whole_lines(tmp_path):
+    path = tmp_path / "index.jsonl"
+    rows = _write(path, 300, pad=100)
+    assert not compact_if_oversized(path, max_bytes=10**9, keep_last=10)
+    assert compact_jsonl(path, keep_last=50, max_bytes=10**9)
+    assert [json.loads(x) for x in path.read_text().splitlines()] == rows[-50:]
+
+    # The byte cap wins when it is tighter than keep_last; cut at a line boundary.
+    line_len = len(json.dumps(rows[-1])) + 1
+    assert compact_if_oversized(path, max_bytes=line_len * 20 + 5, keep_last=50)
+    kept = [json.loads(x) for x in path.read_text().splitlines()]
+    assert kept == rows[-20:]
+
+
+def test_policy_memory_tail_and_size_triggered_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIMM_POLICY_MEMORY_MAX_MB", "1")
+    monkeypatch.setenv("AIMM_POLICY_MEMORY_KEEP_LAST", "100")
+    store = PolicyMemoryStore(tmp_path / "policy_memory.jsonl")
+    for i in range(120):
+        store.append_event({"kind": "run_end", "i": i, "blob": "y" * 10_000})
+    # 120 x ~10 KB crossed 1 MB once: compaction kept the newest 100, then appends resumed.
+    events = list(store.iter_events())
+    assert events[-1]["i"] == 119 and len(events) < 120
+    assert [e["i"] for e in store.iter_events(limit=3)] == [117, 118, 119]
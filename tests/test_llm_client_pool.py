@@ -0,0 +1,105 @@
+"""Pooled OpenAI clients and per-provider counters."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from llm import client_pool
+from llm.client_pool import (
+    aclose_async_clients,
+    acreate_chat_completion,
+    close_clients,
+    create_chat_completion,
+    get_async_openai_client,
+    get_openai_client,
+    provider_stats,
+    reset_provider_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    close_clients()
+    reset_provider_stats()
+    yield
+    close_clients()
+    reset_provider_stats()
+
+
+def test_clients_are_reused_per_endpoint_key():
+    a = get_openai_client(api_key="k", base_url="https://x.test/v1", timeout=30.0)
+    b = get_openai_client(api_key="k", base_url="https://x.test/v1", timeout=30.0)
+    assert a is b
+    assert get_openai_client(api_key="k", base_url="https://x.test/v1", timeout=60.0) is not a
+    assert get_openai_client(api_key="k2", base_url="https://x.test/v1", timeout=30.0) is not a
+    # Derived clients (e.g. max_retries=0) keep the pooled HTTP connection pool.
+    assert a.with_options(max_retries=0)._client is a._client
+
+
+def _fake_client(create):
+    return SimpleNamespace(
+        base_url="https://p.test/v1/",
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+    )
+
+
+def test_create_chat_completion_records_latency_and_tokens():
+    usage = SimpleNamespace(prompt_tokens=12, completion_tokens=5)
+    ok = _fake_client(lambda **kw: SimpleNamespace(usage=usage, kw=kw))
+    assert create_chat_completion(ok, model="m").kw == {"model": "m"}
+    create_chat_completion(ok, model="m")
+
+    def boom(**_kw):
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        create_chat_completion(_fake_client(boom), model="m")
+
+    row = provider_stats()["https://p.test/v1"]
+    assert row["calls"] == 3
+    assert row["errors"] == 1
+    assert row["prompt_tokens"] == 24
+    assert row["completion_tokens"] == 10
+    assert row["latency_s_avg"] >= 0.0
+
+
+def test_async_variant_pools_per_loop_and_counts():
+    usage = SimpleNamespace(prompt_tokens=1, completion_tokens=2)
+
+    async def create(**_kw):
+        return SimpleNamespace(usage=usage)
+
+    async def main():
+        c1 = get_async_openai_client(api_key="k", base_url="https://a.test/v1")
+        c2 = get_async_openai_client(api_key="k", base_url="https://a.test/v1")
+        await asyncio.gather(*(acreate_chat_completion(_fake_client(create)) for _ in range(4)))
+        return c1, c2
+
+    c1, c2 = asyncio.run(main())
+    assert c1 is c2
+    assert provider_stats()["https://p.test/v1"]["completion_tokens"] == 8
+
+
+def test_async_clients_never_outlive_their_loop():
+    async def pooled():
+        return get_async_openai_client(api_key="k", base_url="https://a.test/v1")
+
+    async def close_then_get():
+        first = await pooled()
+        await aclose_async_clients()
+        assert first.is_closed()
+        return first, await pooled()
+
+    first, second = asyncio.run(close_then_get())
+    assert second is not first
+    # A new loop (whose id may match the dead one) gets a fresh client.
+    assert asyncio.run(pooled()) is not second
+    gc.collect()
+    assert len(client_pool._ASYNC_CLIENTS) == 0
+
+    loopless = get_async_openai_client(api_key="k", base_url="https://a.test/v1")
+    assert loopless is not get_async_openai_client(api_key="k", base_url="https://a.test/v1")
@@ -0,0 +1,167 @@
+"""Shared LLM inference scheduler: rate limits, retries, concurrent per-symbol signals."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from backtest.engines.perp import PerpEngine
+from llm.inference_scheduler import (
+    LLMRateLimiter,
+    LLMRequestScheduler,
+    estimate_tokens,
+    is_retryable_llm_error,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+    def sleep(self, sec: float) -> None:
+        self.t += sec
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def test_rate_limiter_spaces_requests_by_rpm():
+    clock = _FakeClock()
+    lim = LLMRateLimiter(rpm=60, clock=clock, sleep=clock.sleep)
+    # Full bucket admits a burst of 60, then one request per second.
+    for _ in range(60):
+        assert lim.acquire() == 0.0
+    assert lim.acquire() == pytest.approx(1.0)
+    assert clock.t == pytest.approx(1.0)
+
+
+def test_rate_limiter_tpm_budget():
+    clock = _FakeClock()
+    lim = LLMRateLimiter(tpm=600, clock=clock, sleep=clock.sleep)
+    assert lim.acquire(600) == 0.0
+    # 300 tokens at 10 tok/s refill.
+    assert lim.acquire(300) == pytest.approx(30.0)
+
+
+def test_call_retries_transient_errors_then_succeeds():
+    sleeps: list[float] = []
+    sched = LLMRequestScheduler(max_retries=3, backoff_base_sec=0.5, sleep=sleeps.append)
+    attempts = {"n": 0}
+
+    def flaky() -> str:
+        attempts["n"] += 1
+        if attempts["n"] < 3:
+            raise _RateLimited("slow down")
+        return "ok"
+
+    assert sched.call(flaky) == "ok"
+    assert attempts["n"] == 3
+    assert len(sleeps) == 2
+    assert sched.stats()["retries"] == 2
+
+
+def test_call_does_not_retry_client_errors():
+    sched = LLMRequestScheduler(max_retries=3, sleep=lambda _s: None)
+    calls = {"n": 0}
+
+    def bad() -> None:
+        calls["n"] += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        sched.call(bad)
+    assert calls["n"] == 1
+    assert not is_retryable_llm_error(ValueError("x"))
+    assert is_retryable_llm_error(TimeoutError())
+
+
+def test_map_respects_global_concurrency():
+    sched = LLMRequestScheduler(max_concurrency=2)
+    lock = threading.Lock()
+    live = {"now": 0, "peak": 0}
+    gate = threading.Event()
+
+    def work(i: int) -> int:
+        with lock:
+            live["now"] += 1
+            live["peak"] = max(live["peak"], live["now"])
+        gate.wait(timeout=0.05)
+        with lock:
+            live["now"] -= 1
+        return i * i
+
+    futures = sched.map(work, range(6))
+    assert [f.result(timeout=5) for f in futures] == [0, 1, 4, 9, 16, 25]
+    assert live["peak"] <= 2
+    assert estimate_tokens("abcd" * 10, max_tokens=5) == 15
+
+
+def _bars(n: int, base: float) -> list[list[float]]:
+    t0 = 1_700_000_000_000
+    return [
+        [t0 + i * 3_600_000, base + i, base + i + 1, base + i - 1, base + i + 0.5, 10.0]
+        for i in range(n)
+    ]
+
+
+def test_perp_concurrent_signals_match_sequential(tmp_path):
+    bars = {"AAA/USDT": _bars(30, 100.0), "BBB/USDT": _bars(30, 50.0)}
+
+    def signal(symbol, window, positions, account):
+        # Position-independent signal so both schedules must agree exactly.
+        return 0.3 if len(window) % 4 < 2 else -0.2
+
+    seq = PerpEngine({"interval_sec": 3600}).run(
+        bars, signal, run_id="seq", runs_dir=tmp_path / "a"
+    )
+    conc = PerpEngine({"interval_sec": 3600, "concurrent_signals": True}).run(
+        bars, signal, run_id="conc", runs_dir=tmp_path / "b"
+    )
+    assert conc["final_equity"] == pytest.approx(seq["final_equity"])
+    assert conc["metrics"]["total_trades"] == seq["metrics"]["total_trades"]
+
+
+def test_perp_concurrent_signals_with_shared_run_state(tmp_path):
+    from flow_log import FlowEventRepo
+    from harness.run_memory import RunMemoryConfig, RunWorkingMemory
+    from schemas.flow_events import FlowEvent, FlowEventKind
+
+    symbols = [f"S{i}/USDT" for i in range(8)]
+    bars = {sym: _bars(60, 50.0 + 10 * i) for i, sym in enumerate(symbols)}
+    mem = RunWorkingMemory(cfg=RunMemoryConfig(recent_decisions_max=100))
+    repo = FlowEventRepo(run_id="conc", log_path=tmp_path / "flow.jsonl")
+
+    def signal(symbol, window, positions, account):
+        # Same shape as the backtest signal: record, snapshot and emit from every thread.
+        mem.record_decision({"symbol": symbol, "n": len(window)})
+        frag = mem.to_shared_memory_fragment()
+        repo.emit(FlowEvent(kind=FlowEventKind.REASONING, ts="t", payload={"n": len(frag)}))
+        return 0.3 if len(window) % 4 < 2 else -0.2
+
+    PerpEngine({"interval_sec": 3600, "concurrent_signals": True}).run(
+        bars, signal, run_id="conc", runs_dir=tmp_path
+    )
+    calls = len(symbols) * 59
+    assert len(repo.events()) == calls
+    assert len((tmp_path / "flow.jsonl").read_text().splitlines()) == calls
+    assert len(mem.to_shared_memory_fragment()["recent_decisions"]) == 100
+
+
+def test_perp_signal_pool_is_shut_down_when_a_bar_fails(tmp_path):
+    bars = {"AAA/USDT": _bars(30, 100.0), "BBB/USDT": _bars(30, 50.0)}
+
+    def signal(symbol, window, positions, account):
+        if len(window) == 10 and symbol == "BBB/USDT":
+            raise RuntimeError("boom")
+        return 0.1
+
+    with pytest.raises(RuntimeError, match="boom"):
+        PerpEngine({"interval_sec": 3600, "concurrent_signals": True}).run(
+            bars, signal, run_id="fail", runs_dir=tmp_path
+        )
+    assert not [t for t in threading.enumerate() if t.name.startswith("perp-signal")]
@@ -0,0 +1,147 @@
+"""Multi-ticker desk cycle: one market scan shared by every symbol's graph pass."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("ccxt")
+
+import main  # noqa: E402
+from schemas.state import initial_hedge_fund_state  # noqa: E402
+
+
+def _scan(state):
+    return {
+        "ticker": state["ticker"],
+        "universe": ["BTC/USDT", "SOL/USDT", "ETH/USDT"],
+        "universe_pairs": [["BTC/USDT", "SOL/USDT"]],
+        "market_data": {
+            "BTC/USDT": {"status": "success", "ohlcv": [[1, 1, 1, 1, 1, 1]]},
+            "SOL/USDT": {"status": "success", "ohlcv": [[1, 2, 2, 2, 2, 1]]},
+        },
+        "market_scan": [],
+        "shared_memory": {"nexus": {"endpoints": {"fear_greed": 40}}},
+        "reasoning_logs": [],
+    }
+
+
+class _Agent:
+    def fetch_data(self, sym):
+        return {"status": "success", "ohlcv": [[1, 3, 3, 3, 3, 1]], "ticker": sym}
+
+
+class _Nexus:
+    def fetch_market_depth(self, symbol, limit):
+        return {"status": "success", "symbol": symbol}
+
+
+class _App:
+    def __init__(self):
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def invoke(self, state):
+        with self.lock:
+            self.seen[state["ticker"]] = state
+        if state["ticker"] == "DOGE/USDT":
+            raise RuntimeError("boom")
+        return {**state, "execution_result": {"status": "skipped"}}
+
+
+@pytest.fixture
+def _offline(monkeypatch):
+    scans = []
+    monkeypatch.setattr(main, "market_scan", lambda s: scans.append(s["ticker"]) or _scan(s))
+    monkeypatch.setattr(main, "_market_scan_agent", lambda: _Agent())
+    monkeypatch.setattr(main, "get_nexus_adapter", lambda: _Nexus())
+    monkeypatch.setattr(main, "append_local_scan_result", lambda **kw: None)
+    monkeypatch.setattr(main, "schedule_runs_retention", lambda **kw: None)
+    return scans
+
+
+def test_one_scan_per_cycle_and_per_symbol_states(tmp_path, _offline):
+    app = _App()
+    tickers = ["ETH/USDT", "SOL/USDT", "DOGE/USDT", "ETH/USDT"]
+    run_id, results = main.run_multi_ticker_cycle(
+        app,
+        tickers,
+        run_mode="paper",
+        runs_dir=tmp_path,
+        max_workers=3,
+        state_overrides={"arbitrator_mode": "agent_llm"},
+    )
+
+    assert _offline == ["ETH/USDT"]  # scanned once, for the first ticker
+    assert list(results) == ["ETH/USDT", "SOL/USDT", "DOGE/USDT"]
+    assert results["DOGE/USDT"] is None and results["SOL/USDT"] is not None
+
+    eth, sol = app.seen["ETH/USDT"], app.seen["SOL/USDT"]
+    assert eth["universe"][0] == "ETH/USDT" and sol["universe"][0] == "SOL/USDT"
+    assert len(eth["universe"]) == 3
+    # Missing tickers were fetched once and shared; the per-symbol dicts are separate views.
+    assert eth["market_data"]["ETH/USDT"]["nexus_depth"]["symbol"] == "ETH/USDT"
+    assert eth["market_data"]["SOL/USDT"] is sol["market_data"]["SOL/USDT"]
+    assert eth["market_data"] is not sol["market_data"]
+    assert eth["shared_memory"]["nexus"] == {"endpoints": {"fear_greed": 40}}
+    assert eth["shared_memory"]["shared_scan"]["tickers"] == list(results)
+    assert eth["arbitrator_mode"] == "agent_llm"
+
+    rows = [json.loads(x) for x in (tmp_path / "index.jsonl").read_text().splitlines()]
+    assert {r["run_id"] for r in rows} == {run_id}
+    assert sorted(r["ticker"] for r in rows) == sorted(results)
+    assert (tmp_path / "latest_paper.txt").read_text() == run_id
+    assert main.get_flow_repo() is None
+
+
+def test_graph_market_scan_reuses_snapshot_and_tags_symbol():
+    scan = _scan(initial_hedge_fund_state(ticker="BTC/USDT"))
+    state = main._symbol_state(scan, "SOL/USDT", run_mode="paper", tickers=["BTC/USDT", "SOL/USDT"])
+    out = main.market_scan(state)  # shared snapshot: no exchange / Nexus I/O
+    assert out["ticker"] == "SOL/USDT"
+    assert out["market_context"][0]["symbols"][0] == "SOL/USDT"
+    assert "market_data" not in out
+    assert main._flow_extra(state)["symbol"] == "SOL/USDT"
+    assert "symbol" not in main._flow_extra(initial_hedge_fund_state(ticker="SOL/USDT"))
+
+
+def test_execute_llm_calls_overlap_but_paper_fills_do_not(monkeypatch):
+    import llm.portfolio_llm as pl
+
+    both_in_llm = threading.Barrier(2, timeout=5)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class _Book:
+        def get_portfolio_health(self, account_id):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.05)
+            with lock:
+                active[0] -= 1
+            return {"paper_account": {"cash_usdt": 1000.0, "positions": []}}
+
+    def execute(state, portfolio_result):
+        both_in_llm.wait()  # both symbols are inside their LLM call at once
+        return {"status": "ok", "smart_orders": []}
+
+    monkeypatch.setattr(pl, "llm_portfolio_execute", execute)
+    monkeypatch.setattr(main, "get_nexus_adapter", lambda: _Book())
+    outs = {}
+
+    def run(tk):
+        state = initial_hedge_fund_state(run_mode="paper", ticker=tk)
+        state["proposal"] = {}
+        outs[tk] = main.portfolio_execute(state)
+
+    threads = [threading.Thread(target=run, args=(tk,)) for tk in ("BTC/USDT", "ETH/USDT")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert sorted(outs) == ["BTC/USDT", "ETH/USDT"] and not both_in_llm.broken
+    assert peak[0] == 1
+    assert outs["BTC/USDT"]["shared_memory"]["paper"]["cash_usdt"] == 1000.0
@@ -0,0 +1,91 @@
+"""SQLite paper-account store: atomic fills, cursor pagination, legacy JSON import."""
+
+from __future__ import annotations
+
+import json
+
+from paper_account import (
+    apply_perp_fill,
+    apply_spot_fill,
+    list_trades,
+    load_or_init_account,
+    paper_store,
+    record_fill,
+    reset_account,
+)
+
+
+def test_fills_persist_incrementally_and_reload(tmp_path):
+    acct = load_or_init_account(runs_dir=tmp_path, account_id="u1", start_usdt=10_000.0)
+    t1 = apply_spot_fill(
+        account=acct, symbol="BTC/USDT", side="buy", qty=0.1, price=50_000, fee_bps=10
+    )
+    record_fill(runs_dir=tmp_path, account=acct, trade=t1)
+    t2 = apply_perp_fill(
+        account=acct, symbol="ETH/USDT", side="sell", qty=1.0, price=2_000, fee_bps=10, leverage=2
+    )
+    record_fill(runs_dir=tmp_path, account=acct, trade=t2)
+
+    again = paper_store(tmp_path).load("u1")
+    assert again is not None
+    assert again.snapshot(instrument="perp") == acct.snapshot(instrument="perp")
+    assert again.perp_positions["ETH/USDT"].qty_signed == -1.0
+
+    # Closing the spot position removes its row.
+    t3 = apply_spot_fill(
+        account=acct, symbol="BTC/USDT", side="sell", qty=0.1, price=51_000, fee_bps=10
+    )
+    record_fill(runs_dir=tmp_path, account=acct, trade=t3)
+    assert "BTC/USDT" not in paper_store(tmp_path).load("u1").spot_positions
+
+
+def test_cursor_pagination_and_filters(tmp_path):
+    acct = load_or_init_account(runs_dir=tmp_path, account_id="u2", start_usdt=1e9)
+    for i in range(7):
+        sym = "BTC/USDT" if i % 2 == 0 else "ETH/USDT"
+        trade = apply_spot_fill(
+            account=acct, symbol=sym, side="buy", qty=1.0, price=100 + i, fee_bps=0, ts=1000 + i
+        )
+        record_fill(runs_dir=tmp_path, account=acct, trade=trade)
+
+    page1, cur = list_trades(runs_dir=tmp_path, account_id="u2", limit=3)
+    assert [t["ts"] for t in page1] == [1004, 1005, 1006]
+    page2, cur2 = list_trades(runs_dir=tmp_path, account_id="u2", limit=3, before_id=cur)
+    assert [t["ts"] for t in page2] == [1001, 1002, 1003]
+    page3, cur3 = list_trades(runs_dir=tmp_path, account_id="u2", limit=3, before_id=cur2)
+    assert [t["ts"] for t in page3] == [1000] and cur3 is None
+
+    eth, _ = list_trades(
+        runs_dir=tmp_path, account_id="u2", limit=10, symbol="ETH/USDT", since_ts=1002
+    )
+    assert [t["ts"] for t in eth] == [1003, 1005]
+
+    reset_account(runs_dir=tmp_path, account=type(acct)(account_id="u2", cash_usdt=5.0))
+    assert list_trades(runs_dir=tmp_path, account_id="u2")[0] == []
+    assert paper_store(tmp_path).load("u2").cash_usdt == 5.0
+
+
+def test_legacy_json_account_is_imported_once(tmp_path):
+    paper = tmp_path / "paper"
+    paper.mkdir()
+    (paper / "old.account.json").write_text(
+        json.dumps(
+            {
+                "account_id": "old",
+                "cash_usdt": 123.0,
+                "spot_positions": [{"symbol": "BTC/USDT", "qty": 0.5, "avg_entry": 40_000}],
+                "updated_ts": 5,
+            }
+        ),
+        encoding="utf-8",
+    )
+    (paper / "old.trades.jsonl").write_text(
+        "\n".join(json.dumps({"ts": i, "symbol": "BTC/USDT", "side": "buy"}) for i in range(3)),
+        encoding="utf-8",
+    )
+    rows, _ = list_trades(runs_dir=tmp_path, account_id="old", limit=10)
+    assert [r["ts"] for r in rows] == [0, 1, 2]
+    acct = load_or_init_account(runs_dir=tmp_path, account_id="old", start_usdt=1.0)
+    assert acct.cash_usdt == 123.0 and acct.spot_positions["BTC/USDT"].qty == 0.5
+    assert len(list_trades(runs_dir=tmp_path, account_id="old", limit=10)[0]) == 3
+    assert list_trades(runs_dir=tmp_path, account_id="missing") == ([], None)
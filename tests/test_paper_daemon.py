@@ -0,0 +1,66 @@
+"""Resident paper engine: one compiled workflow, status patches per cycle."""
+
+from __future__ import annotations
+
+import json
+
+import main
+from paper_daemon import PaperDaemon
+
+
+def _status(daemon: PaperDaemon) -> dict:
+    return json.loads(daemon.status_path.read_text(encoding="utf-8"))
+
+
+def test_graph_compiled_once_across_cycles(tmp_path, monkeypatch):
+    compiled = []
+    runs = []
+
+    class _Graph:
+        def compile(self):
+            compiled.append(1)
+            return object()
+
+    monkeypatch.setattr(main, "validate_ticker", lambda t: True)
+    monkeypatch.setattr(main, "build_workflow", lambda: _Graph())
+    monkeypatch.setattr(
+        main,
+        "run_workflow_once",
+        lambda app, state, **kw: runs.append((app, state["ticker"], kw)) or ("run-x", {}),
+    )
+
+    daemon = PaperDaemon(ticker="ETH/USDT", interval_sec=0, runs_dir=tmp_path)
+    daemon.status_path.write_text(json.dumps({"pid": 123, "started_at": 1}), encoding="utf-8")
+    daemon.run_forever(max_cycles=3)
+
+    assert len(compiled) == 1 and len(runs) == 3
+    assert len({id(app) for app, _, _ in runs}) == 1
+    assert all(t == "ETH/USDT" and kw["run_mode"] == "paper" for _, t, kw in runs)
+    st = _status(daemon)
+    assert st["pid"] == 123 and st["started_at"] == 1  # API fields survive
+    assert st["phase"] == "waiting" and st["scan_iteration"] == 3
+    assert st["last_scan_exit_code"] == 0
+    assert st["next_scan_at"] == st["last_scan_finished_at"]
+
+
+def test_failed_cycle_is_recorded_and_loop_continues(tmp_path):
+    calls = []
+
+    def cycle() -> int:
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("exchange down")
+        return 0
+
+    daemon = PaperDaemon(ticker="BTC/USDT", interval_sec=0, runs_dir=tmp_path, cycle=cycle)
+    assert daemon.run_once() == 1
+    assert _status(daemon)["last_scan_exit_code"] == 1
+    daemon.run_forever(max_cycles=2)
+    assert len(calls) == 2 and _status(daemon)["last_scan_exit_code"] == 0
+
+
+def test_stop_ends_the_loop(tmp_path):
+    daemon = PaperDaemon(ticker="BTC/USDT", interval_sec=3600, runs_dir=tmp_path, cycle=lambda: 0)
+    daemon.stop()
+    daemon.run_forever()
+    assert daemon.iteration == 0
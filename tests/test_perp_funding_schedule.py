@@ -0,0 +1,93 @@
+"""PerpEngine funding schedule and maintenance tier lookup."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+
+from backtest.engines.perp import (
+    _TIER_TABLE,
+    FUNDING_HOURS,
+    PerpEngine,
+    Position,
+    funding_schedule,
+)
+
+
+def _reference_funding(timestamps_ms: list[int]) -> list[bool]:
+    """Datetime-based dedup the schedule replaces."""
+    seen: set = set()
+    out = []
+    for ts in timestamps_ms:
+        dt = datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
+        if dt.hour in FUNDING_HOURS:
+            key = ("slot", dt.year, dt.month, dt.day, dt.hour)
+        else:
+            key = ("day", dt.year, dt.month, dt.day)
+        out.append(key not in seen)
+        seen.add(key)
+    return out
+
+
+def test_schedule_matches_datetime_dedup():
+    start = 1_700_000_000_000
+    for step_ms in (300_000, 3_600_000, 4 * 3_600_000, 86_400_000, 7 * 60_000):
+        ts = [start + i * step_ms for i in range(600)]
+        assert funding_schedule(ts) == _reference_funding(ts), step_ms
+
+
+def test_run_schedule_and_direct_on_bar_charge_the_same_bars(tmp_path):
+    ts = [1_700_000_000_000 + i * 3_600_000 for i in range(72)]
+    bars = [[t, 100.0, 101.0, 99.0, 100.0, 1.0] for t in ts]
+    expected = funding_schedule(ts)
+
+    engine = PerpEngine()
+    seen = []
+    real_run_bars = engine._run_bars
+
+    def spy(*args, **kwargs):
+        seen.append(engine._funding_bars)
+        return real_run_bars(*args, **kwargs)
+
+    engine._run_bars = spy
+    engine.run({"BTC/USDT": bars}, lambda *a: 0.0, run_id="funding", runs_dir=tmp_path)
+    assert seen == [expected]
+    assert engine._funding_bars is None
+
+    # Without ``run`` (no schedule), time-ordered on_bar calls dedup to the same bars.
+    direct = PerpEngine({"funding_rate": 0.001})
+    direct.positions["BTC/USDT"] = Position("BTC/USDT", 1, 100.0, 1.0, 1.0, 100.0, 0)
+    hits = []
+    for t in ts:
+        before = direct.capital
+        direct.on_bar("BTC/USDT", 100.0, t)
+        hits.append(direct.capital != before)
+    assert hits == expected
+
+
+def test_on_bar_after_run_does_not_reuse_the_run_schedule(tmp_path):
+    ts = [1_700_000_000_000 + i * 3_600_000 for i in range(72)]
+    bars = [[t, 100.0, 101.0, 99.0, 100.0, 1.0] for t in ts]
+    engine = PerpEngine({"funding_rate": 0.001})
+    engine.run({"BTC/USDT": bars}, lambda *a: 0.0, run_id="stale", runs_dir=tmp_path)
+    # The run's last bar is not a funding bar; a later day's bar must still be charged.
+    assert not funding_schedule(ts)[-1]
+
+    engine.positions["BTC/USDT"] = Position("BTC/USDT", 1, 100.0, 1.0, 1.0, 100.0, 0)
+    before = engine.capital
+    engine.on_bar("BTC/USDT", 100.0, ts[-1] + 10 * 86_400_000)
+    assert engine.capital != before
+
+
+def test_maintenance_rate_tiers():
+    def reference(notional: float) -> float:
+        for cap, rate in _TIER_TABLE:
+            if notional <= cap:
+                return rate
+        return _TIER_TABLE[-1][1]
+
+    probes = [0.0, -5.0, 1.0, math.inf, math.nan]
+    for cap, _ in _TIER_TABLE[:-1]:
+        probes += [cap - 0.01, cap, cap + 0.01]
+    for x in probes:
+        assert PerpEngine.maintenance_rate(x) == reference(x), x
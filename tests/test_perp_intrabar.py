@@ -0,0 +1,106 @@
+"""PerpEngine ``intrabar="high_low"``: TP/SL/liquidation on the bar's high/low path."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backtest.engines.intrabar import first_exit, liquidation_price
+from backtest.engines.perp import _TIER_CAPS, _TIER_RATES, PerpEngine
+
+H = 3_600_000
+T0 = 1_700_000_000_000
+
+
+def _engine(**cfg) -> PerpEngine:
+    base = {
+        "slippage": 0.0,
+        "taker_rate": 0.0,
+        "maker_rate": 0.0,
+        "funding_rate": 0.0,
+        "interval_sec": 3600,
+        "take_profit_pct": 5.0,
+        "stop_loss_pct": 5.0,
+    }
+    return PerpEngine({**base, **cfg})
+
+
+def _bars(*ohlc) -> list[list[float]]:
+    return [[T0 + i * H, o, h, lo, c, 1.0] for i, (o, h, lo, c) in enumerate(ohlc)]
+
+
+def _first_trade(engine: PerpEngine, bars, tmp_path, weight: float = 1.0):
+    engine.run({"BTC/USDT": bars}, lambda *a: weight, run_id="ib", runs_dir=tmp_path)
+    return engine.trades[0]
+
+
+# Bar 1 opens the long at 100 and wicks to 94 (through the 95 stop) before closing at 101.
+WICK = _bars((100, 100, 100, 100), (100, 102, 94, 101), (101, 102, 100, 101))
+
+
+def test_close_mode_misses_the_wick_high_low_mode_stops_at_the_level(tmp_path):
+    assert _first_trade(_engine(), WICK, tmp_path).exit_reason == "end_of_backtest"
+
+    trade = _first_trade(_engine(intrabar="high_low"), WICK, tmp_path)
+    assert trade.exit_reason == "stop_loss"
+    assert trade.exit_price == pytest.approx(95.0)
+    assert trade.exit_ts_ms == T0 + H
+
+
+def test_gap_fills_at_open_and_short_side_mirrors(tmp_path):
+    gap = _bars((100, 100, 100, 100), (100, 101, 99, 100), (90, 92, 89, 91))
+    trade = _first_trade(_engine(intrabar="high_low"), gap, tmp_path)
+    assert (trade.exit_reason, trade.exit_price) == ("stop_loss", 90.0)
+
+    short = _bars((100, 100, 100, 100), (100, 101, 93, 99), (99, 99, 99, 99))
+    trade = _first_trade(_engine(intrabar="high_low"), short, tmp_path, weight=-1.0)
+    assert trade.direction == -1
+    assert (trade.exit_reason, trade.exit_price) == ("take_profit", pytest.approx(95.0))
+
+
+def test_ambiguous_bar_stops_out_unless_lower_timeframe_says_otherwise(tmp_path):
+    both = _bars((100, 100, 100, 100), (100, 106, 94, 100), (100, 100, 100, 100))
+    assert _first_trade(_engine(intrabar="high_low"), both, tmp_path).exit_reason == "stop_loss"
+
+    minutes = [
+        [T0 + H + 0 * 60_000, 100, 101, 99, 100, 1.0],
+        [T0 + H + 1 * 60_000, 100, 106, 100, 105, 1.0],  # target first
+        [T0 + H + 2 * 60_000, 105, 105, 94, 95, 1.0],
+    ]
+    engine = _engine(intrabar="high_low", intrabar_bars={"BTC/USDT": minutes})
+    trade = _first_trade(engine, both, tmp_path)
+    assert (trade.exit_reason, trade.exit_price) == ("take_profit", pytest.approx(105.0))
+    assert trade.exit_ts_ms == T0 + H + 60_000
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+@pytest.mark.parametrize("notional", [5_000.0, 80_000.0, 3_000_000.0])
+def test_liquidation_price_matches_the_close_check(direction, notional):
+    entry, lev = 100.0, 10.0
+    size, margin = notional / entry, notional / lev
+    liq = liquidation_price(
+        direction=direction,
+        entry=entry,
+        size=size,
+        margin=margin,
+        tier_caps=_TIER_CAPS,
+        tier_rates=_TIER_RATES,
+    )
+
+    def liquidated(px: float) -> bool:
+        unrealized = direction * size * (px - entry)
+        return margin + unrealized <= size * px * PerpEngine.maintenance_rate(size * px)
+
+    assert liquidated(liq * (1 - direction * 1e-6))
+    assert not liquidated(liq * (1 + direction * 1e-6))
+
+
+def test_stop_nearer_than_liquidation_wins_on_the_same_bar():
+    path = np.asarray([[T0, 100.0, 100.5, 80.0, 85.0]])
+    hit = first_exit(path, direction=1, take_profit=None, stop_loss=95.0, liquidation=91.0)
+    assert hit == ("stop_loss", 95.0, 0)
+    hit = first_exit(path, direction=1, take_profit=None, stop_loss=88.0, liquidation=91.0)
+    assert hit == ("liquidation", 91.0, 0)
+    assert (
+        first_exit(path, direction=1, take_profit=120.0, stop_loss=None, liquidation=None) is None
+    )
@@ -0,0 +1,111 @@
+"""Runs retention sized from the persistent manifest instead of a recursive scan per call."""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import runs_retention as rr
+
+_KB = 1024
+
+
+def _sized(path, nbytes: int, *, age_sec: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.truncate(nbytes)
+    ts = time.time() - age_sec
+    os.utime(path, (ts, ts))
+    os.utime(path.parent, (ts, ts))
+
+
+@pytest.fixture()
+def policy(monkeypatch):
+    pol = rr.RunsRetention(
+        max_total_mb=1, keep_last=2, backtests_max_total_mb=1, backtests_keep_last=2
+    )
+    monkeypatch.setattr(rr, "load_runs_retention", lambda: pol)
+    monkeypatch.setattr(
+        rr,
+        "load_app_settings",
+        lambda: SimpleNamespace(runs=SimpleNamespace(backtests_retention_enabled=True)),
+    )
+    return pol
+
+
+def test_settled_dirs_are_not_rewalked(tmp_path, monkeypatch):
+    for i in range(4):
+        _sized(tmp_path / "backtests" / f"bt-{i}" / "equity.jsonl", 10 * _KB, age_sec=3600 + i)
+    walks: list[str] = []
+    real = rr._tree_size_bytes
+    monkeypatch.setattr(rr, "_tree_size_bytes", lambda p: walks.append(p.name) or real(p))
+
+    manifest = rr.retention_manifest(tmp_path)
+    first = manifest.reconcile("backtests")
+    assert sorted(e.size for e in first) == [10 * _KB] * 4 and len(walks) == 4
+
+    walks.clear()
+    assert {e.name: e.size for e in manifest.reconcile("backtests")} == {
+        e.name: e.size for e in first
+    }
+    assert walks == []
+
+    # A writer marks one run dirty: only that dir is re-walked.
+    _sized(tmp_path / "backtests" / "bt-1" / "trades.jsonl", 5 * _KB, age_sec=3600)
+    rr.note_runs_artifact(tmp_path / "backtests" / "bt-1", runs_dir=tmp_path)
+    sizes = {e.name: e.size for e in manifest.reconcile("backtests")}
+    assert walks == ["bt-1"] and sizes["bt-1"] == 15 * _KB
+
+
+def test_enforcement_deletes_oldest_beyond_caps(tmp_path, policy):
+    for i in range(5):
+        _sized(tmp_path / "backtests" / f"bt-{i}" / "equity.jsonl", 400 * _KB, age_sec=5000 - i)
+    stats = rr.enforce_backtests_retention(runs_dir=tmp_path)
+    # 2000 KB > 1 MB: drop the oldest until under the cap, never the newest two.
+    assert stats["deleted_dirs"] == 3
+    assert sorted(p.name for p in (tmp_path / "backtests").iterdir()) == ["bt-3", "bt-4"]
+    names = {e.name for e in rr.retention_manifest(tmp_path).reconcile("backtests")}
+    assert names == {"bt-3", "bt-4"}
+
+    for i in range(4):
+        _sized(tmp_path / f"run-{i}.events.jsonl", 300 * _KB, age_sec=4000 - i)
+    _sized(tmp_path / "policy_memory.jsonl", 10 * _KB, age_sec=9000)
+    # Live state that looks like old runs: paper accounts, engine pid/status, job spool.
+    _sized(tmp_path / "paper" / "paper.sqlite3", 10 * _KB, age_sec=9000)
+    _sized(tmp_path / "paper_engine.pid", 1, age_sec=9000)
+    _sized(tmp_path / "paper_engine.status.json", 1, age_sec=9000)
+    _sized(tmp_path / "backtest_queue" / "job.json", 1, age_sec=9000)
+    rr.schedule_runs_retention(runs_dir=tmp_path, keep_run_id="run-0").join(timeout=10)
+    left = sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(rr.MANIFEST_NAME))
+    # Backtests (800 KB) count toward usage; kept run, preserved files and newest 2 survive.
+    assert left == [
+        "backtest_queue",
+        "backtests",
+        "paper",
+        "paper_engine.pid",
+        "paper_engine.status.json",
+        "policy_memory.jsonl",
+        "run-0.events.jsonl",
+        "run-2.events.jsonl",
+        "run-3.events.jsonl",
+    ]
+
+
+def test_failed_deletes_are_not_counted_as_freed(tmp_path, policy, monkeypatch):
+    for i in range(5):
+        _sized(tmp_path / "backtests" / f"bt-{i}" / "equity.jsonl", 400 * _KB, age_sec=5000 - i)
+    real = rr.shutil.rmtree
+
+    def stubborn(path, ignore_errors=False):
+        if path.name == "bt-0":
+            return  # e.g. a file held open elsewhere: ignore_errors hides the failure
+        real(path, ignore_errors=ignore_errors)
+
+    monkeypatch.setattr(rr.shutil, "rmtree", stubborn)
+    stats = rr.enforce_backtests_retention(runs_dir=tmp_path)
+    # bt-0 survived, so bt-1..bt-2 still go and bt-0's bytes are not reported as freed.
+    assert stats == {"deleted_dirs": 2, "bytes_freed": 800 * _KB}
+    assert "bt-0" in {e.name for e in rr.retention_manifest(tmp_path).reconcile("backtests")}
@@ -0,0 +1,108 @@
+"""Nexus payload validation cached by structural signature, with sampling and counters."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from api import schema_validation as sv
+
+
+def _payload(n_msgs: int = 3, *, kind: str = "status") -> dict:
+    return {
+        "metadata": {"run_id": "r1", "ticker": "BTC/USDT", "status": "running", "kpis": {}},
+        "topology": {
+            "nodes": [{"id": "n0", "actor": "a", "label": "A", "status": "ACTIVE"}],
+            "edges": [{"from": "n0", "to": "n1"}],
+        },
+        "traces": [],
+        "message_log": [
+            {
+                "seq": i,
+                "ts": f"2026-01-01T00:00:0{i % 10}Z",
+                "node_id": "n0",
+                "actor_id": "a",
+                "kind": kind,
+                "message": f"tick {i}",
+            }
+            for i in range(n_msgs)
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def _fresh(monkeypatch):
+    monkeypatch.delenv("AIMM_SCHEMA_VALIDATION", raising=False)
+    sv.reset_schema_validation_cache()
+    yield
+    sv.reset_schema_validation_cache()
+
+
+def test_same_shape_validates_once(monkeypatch):
+    calls = {"n": 0}
+    real = sv._full_validate
+
+    def counting(payload):
+        calls["n"] += 1
+        return real(payload)
+
+    monkeypatch.setattr(sv, "_full_validate", counting)
+    for i in range(50):
+        sv.validate_nexus_payload(_payload(3 + i % 5))
+    assert calls["n"] == 1
+    stats = sv.schema_validation_stats()
+    assert stats["checks"] == 50 and stats["cache_hits"] == 49 and stats["failures"] == 0
+
+
+def test_enum_values_are_part_of_the_signature():
+    good = _payload(kind="thought")
+    bad = copy.deepcopy(good)
+    bad["message_log"][0]["kind"] = "gossip"
+    assert sv.payload_signature(good) != sv.payload_signature(bad)
+    # Plain string values are not: different text, same shape.
+    other = copy.deepcopy(good)
+    other["message_log"][0]["message"] = "something else"
+    assert sv.payload_signature(good) == sv.payload_signature(other)
+
+    sv.validate_nexus_payload(good)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="message_log.0.kind"):
+            sv.validate_nexus_payload(bad)
+    stats = sv.schema_validation_stats()
+    assert stats["failures"] == 2 and stats["validations"] == 2
+    assert "gossip" in stats["last_failure"]
+
+
+def test_type_change_misses_cache():
+    sv.validate_nexus_payload(_payload())
+    bad = _payload()
+    bad["message_log"][1]["seq"] = "1"
+    with pytest.raises(ValueError, match="message_log.1.seq"):
+        sv.validate_nexus_payload(bad)
+
+
+def test_sample_and_off_modes(monkeypatch):
+    bad = _payload()
+    del bad["metadata"]
+    monkeypatch.setenv("AIMM_SCHEMA_VALIDATION", "off")
+    sv.validate_nexus_payload(bad)
+    monkeypatch.setenv("AIMM_SCHEMA_VALIDATION", "sample")
+    monkeypatch.setenv("AIMM_SCHEMA_VALIDATION_SAMPLE_RATE", "0")
+    for _ in range(10):
+        sv.validate_nexus_payload(bad)
+    assert sv.schema_validation_stats()["sampled_out"] == 10
+    monkeypatch.setenv("AIMM_SCHEMA_VALIDATION", "full")
+    with pytest.raises(ValueError, match="<root>"):
+        sv.validate_nexus_payload(bad)
+
+
+def test_integral_and_fractional_floats_do_not_share_a_signature():
+    ok = _payload()
+    ok["message_log"][0]["seq"] = 1.0  # Draft-7 ``integer`` accepts an integral float
+    sv.validate_nexus_payload(ok)
+    bad = copy.deepcopy(ok)
+    bad["message_log"][0]["seq"] = 1.5
+    assert sv.payload_signature(ok) != sv.payload_signature(bad)
+    with pytest.raises(ValueError, match="message_log.0.seq"):
+        sv.validate_nexus_payload(bad)
@@ -0,0 +1,127 @@
+"""Shared /signals/stream broadcaster on the SQLite poller fallback."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from api import signal_broadcaster as sb
+from storage import leadpage_db
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'lp.db'}")
+    monkeypatch.setenv("AIMM_DB_AUTOCREATE", "1")
+    monkeypatch.setattr(leadpage_db, "_ENGINE", None)
+    yield
+    eng = leadpage_db._ENGINE
+    if eng is not None:
+        eng.dispose()
+
+
+def _publish(provider: str, title: str) -> dict:
+    return leadpage_db.insert_signal(
+        provider=provider,
+        kind="strategy",
+        title=title,
+        body="b",
+        ticker=None,
+        result_provider=None,
+        result_run_id=None,
+        meta=None,
+    )
+
+
+def test_one_query_per_tick_fans_out_filtered(sqlite_db, monkeypatch):
+    old = _publish("alpha", "before subscribe")
+    bc = sb.SignalBroadcaster(poll_sec=0.02)
+    calls = {"n": 0}
+    real = sb.signals_after
+
+    def counting(last_id, **kw):
+        calls["n"] += 1
+        return real(last_id, **kw)
+
+    monkeypatch.setattr(sb, "signals_after", counting)
+    everyone = [bc.subscribe() for _ in range(20)]
+    only_beta = bc.subscribe("beta")
+    assert bc.mode in {"poll", "idle"}
+
+    a = _publish("alpha", "a1")
+    b = _publish("beta", "b1")
+    bc.notify()
+    got = [everyone[0].inbox.get(timeout=5), everyone[0].inbox.get(timeout=5)]
+    assert [r["id"] for r in got] == [a["id"], b["id"]]
+    assert everyone[-1].inbox.get(timeout=5)["id"] == a["id"]
+    assert only_beta.inbox.get(timeout=5)["id"] == b["id"]
+    assert only_beta.inbox.empty()
+    assert old["id"] < a["id"]
+    # Queries scale with poll ticks, not with the 21 subscribers.
+    assert calls["n"] < 21 * 2
+
+    for sub in [*everyone, only_beta]:
+        bc.unsubscribe(sub)
+    bc.stop()
+    assert bc.subscriber_count() == 0
+
+
+class _FakeListen:
+    """LISTEN connection stand-in; the first one blocks in ``close()`` until released."""
+
+    def __init__(self, closing: threading.Event | None, release: threading.Event) -> None:
+        self.closing = closing
+        self.release = release
+
+    def notifies(self, timeout, stop_after):
+        time.sleep(0.02)
+        return iter(())
+
+    def close(self):
+        if self.closing is not None:
+            self.closing.set()
+            self.release.wait(5)
+
+
+def test_resubscribe_while_last_reader_winds_down(sqlite_db):
+    closing, release = threading.Event(), threading.Event()
+    conns = [_FakeListen(closing, release)]
+    bc = sb.SignalBroadcaster(poll_sec=0.02)
+    bc._listen_connection = lambda: conns.pop(0) if conns else _FakeListen(None, release)
+
+    first = bc.subscribe()
+    old = bc._thread
+    bc.unsubscribe(first)
+    # The old reader has left its loop and is stuck closing its connection.
+    assert closing.wait(5)
+    second = bc.subscribe()
+    assert bc._thread is not None and bc._thread is not old
+    release.set()
+    old.join(5)
+
+    row = _publish("alpha", "after resubscribe")
+    assert second.inbox.get(timeout=5)["id"] == row["id"]
+    bc.unsubscribe(second)
+    bc.stop()
+
+
+def test_slow_consumer_is_dropped_with_sentinel(monkeypatch):
+    monkeypatch.setattr(sb, "_QUEUE_MAX", 3)
+    bc = sb.SignalBroadcaster()
+    sub = sb.SignalSubscription(provider=None)
+    bc._subs.add(sub)
+    bc.publish([{"id": i, "provider": "p"} for i in range(1, 6)])
+    assert sub.overflowed and bc.subscriber_count() == 0
+    drained = [sub.inbox.get_nowait() for _ in range(sub.inbox.qsize())]
+    assert drained[-1] is None
+
+
+def test_signals_after_supports_last_event_id_resume(sqlite_db):
+    rows = [_publish("alpha" if i % 2 else "beta", f"s{i}") for i in range(5)]
+    assert leadpage_db.latest_signal_id() == rows[-1]["id"]
+    after = leadpage_db.signals_after(rows[1]["id"])
+    assert [r["id"] for r in after] == [r["id"] for r in rows[2:]]
+    alpha = leadpage_db.signals_after(0, provider="alpha")
+    assert all(r["provider"] == "alpha" for r in alpha) and len(alpha) == 2
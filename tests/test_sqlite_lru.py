@@ -0,0 +1,53 @@
+"""Shared SQLite LRU store behind the decision and invoke caches."""
+
+from __future__ import annotations
+
+import pytest
+
+from backtest.invoke_cache import InvokeCache
+from llm.decision_cache import DecisionCache
+from storage.sqlite_lru import SharedStore, SqliteLruStore
+
+
+def test_tags_filter_invalidation_and_counters(tmp_path):
+    store = SqliteLruStore(
+        tmp_path / "s.sqlite3",
+        table="rows",
+        stats_table="row_stats",
+        tags=("a", "b"),
+        max_entries=100,
+    )
+    store.put_payload("k1", "x" * 10, a="1", b="x")
+    store.put_payload("k2", "y" * 5, a="1", b="y")
+    store.put_payload("k1", "z" * 3, a="2")  # overwrite keeps the counters exact
+    assert store.stats()["total_entries"] == 2 and store.stats()["size_bytes"] == 8
+    assert store.invalidate(a="1", b="") == 1
+    assert store.get_payload("k2") is None and store.get_payload("k1") == "zzz"
+    with pytest.raises(ValueError):
+        store.invalidate(c="1")
+    store.close()
+    with pytest.raises(ValueError):
+        SqliteLruStore(tmp_path / "bad.sqlite3", table="x; DROP", stats_table="s", max_entries=1)
+
+
+def test_both_caches_share_one_file_layout(tmp_path):
+    dec = DecisionCache(tmp_path / "d.sqlite3", max_entries=10)
+    dec.put("k", {"Setup_Score": 70}, agent_id="2.1", ticker="BTC/USDT")
+    inv = InvokeCache(tmp_path / "i.sqlite3", max_entries=10)
+    inv.put("k", {"trade_intent": {"action": "BUY"}}, symbol="BTC/USDT")
+    assert dec.get("k") == {"Setup_Score": 70}
+    assert inv.get("k") == {"trade_intent": {"action": "BUY"}}
+    assert dec.invalidate(ticker="BTC/USDT") == 1 and inv.invalidate(symbol="BTC/USDT") == 1
+    dec.close()
+    inv.close()
+
+
+def test_shared_store_reopens_when_the_path_changes(tmp_path):
+    target = {"p": tmp_path / "a.sqlite3"}
+    shared = SharedStore(lambda: target["p"], lambda p: DecisionCache(p, max_entries=10))
+    first = shared.get()
+    assert shared.get() is first
+    target["p"] = tmp_path / "b.sqlite3"
+    second = shared.get()
+    assert second is not first and second.path == tmp_path / "b.sqlite3"
+    second.close()
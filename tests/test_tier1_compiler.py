@@ -0,0 +1,179 @@
+"""Compiled Tier-1 evaluator vs the per-rule resolve/eval path, single state and bar vectors."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from tier1 import apply_strategy, compile_blueprint, get_preset, list_presets
+from tier1.compiler import SIGNAL_CODES, decide_signal
+from tier1.models import AlphaFactor, PersonaSignalMix, VetoRule
+from tier1.resolvers import eval_operator, resolve_metric
+
+
+def _state(rng: random.Random) -> dict:
+    signals = ["Strong Buy", "Buy", "Neutral", "Sell", "Strong Sell"]
+    return {
+        "ticker": "BTC/USDT",
+        "tier0_contracts": [
+            {"agent": "1.1", "ticker": "BTC/USDT", "Liquidity_Score": rng.randint(0, 100)},
+            {
+                "agent": "1.2",
+                "ticker": "BTC/USDT",
+                "News_Impact_Score": rng.choice([10, 50, 85]),
+                "Event_Type": rng.choice(["Macro", "Black Swan", ""]),
+            },
+            {"agent": "2.1", "ticker": "BTC/USDT", "Setup_Score": rng.randint(0, 100)},
+            {
+                "agent": "2.2",
+                "ticker": "BTC/USDT",
+                "cross_sectional_z_score": rng.choice([None, rng.uniform(-3, 3)]),
+                "alpha_signal": rng.choice(signals),
+                "Factor_Confluence": rng.randint(0, 5),
+            },
+            {
+                "agent": "2.3",
+                "ticker": "BTC/USDT",
+                "ta_indicators": {"rsi": rng.uniform(0, 100), "macd_cross": rng.random() < 0.5},
+            },
+            {"agent": "3.1", "ticker": "BTC/USDT", "FOMO_Level": rng.randint(0, 100)},
+            {"agent": "3.2", "ticker": "BTC/USDT", "Pro_Bias": rng.randint(-100, 100)},
+            {"agent": "4.1", "ticker": "BTC/USDT", "Dump_Probability": rng.random()},
+            {"agent": "4.2", "ticker": "BTC/USDT", "Slippage_Risk_Score": rng.randint(0, 100)},
+        ],
+    }
+
+
+def _reference(bp, state) -> tuple[str, int]:
+    """The Applier's original per-rule loop, one resolve_metric call per rule."""
+    tactical = bp.tactical_parameters
+    block_long = block_short = False
+    for rule in tactical.veto_layer_constraints:
+        if not rule.metric_id:
+            continue
+        val = resolve_metric(rule.metric_id, state)
+        if not eval_operator(val, rule.operator, rule.threshold, rule.threshold_array):
+            continue
+        if rule.veto_target == "ALL":
+            return "VETO", 0
+        block_long |= rule.veto_target == "LONG_ONLY"
+        block_short |= rule.veto_target == "SHORT_ONLY"
+    long_s = short_s = 0
+    for fac in tactical.multi_factor_alpha_matrix:
+        val = resolve_metric(fac.metric_id, state)
+        if eval_operator(val, fac.operator, fac.threshold, fac.threshold_array):
+            if fac.vote_direction == "LONG":
+                long_s += fac.weight_pct
+            elif fac.vote_direction == "SHORT":
+                short_s += fac.weight_pct
+    mix = bp.persona_genetics.persona_signal_mix
+    if mix is not None:
+        if mix.long_bias is not None:
+            long_s += int(round((mix.long_bias - 0.5) * 40))
+        style = mix.trend_weight + mix.momentum_weight - mix.mean_revert_weight
+        style += 0.25 * mix.volume_weight - 0.25 * mix.volatility_weight
+        if abs(style) > 1e-6:
+            scale = max(0.75, min(1.25, 1.0 + 0.15 * style))
+            long_s = int(round(long_s * scale))
+            short_s = int(round(short_s * (2.0 - scale)))
+        long_s, short_s = max(0, long_s), max(0, short_s)
+    min_req = max(
+        1,
+        int(round(tactical.min_convergence_score_required * (1.0 - tactical.entry_ease_fraction))),
+    )
+    permitted = set(bp.persona_genetics.permitted_directions or ["LONG", "SHORT"])
+    return decide_signal(
+        long_s,
+        short_s,
+        min_req,
+        can_long="LONG" in permitted and not block_long,
+        can_short="SHORT" in permitted and not block_short,
+    )
+
+
+def _custom_blueprint():
+    bp = get_preset(list_presets()[0]).model_copy(deep=True)
+    tactical = bp.tactical_parameters
+    tactical.veto_layer_constraints.append(
+        VetoRule(
+            rule_name="fomo long block",
+            metric_id="retail_fomo",
+            operator=">",
+            threshold=70,
+            veto_target="LONG_ONLY",
+        )
+    )
+    tactical.multi_factor_alpha_matrix = [
+        AlphaFactor(
+            factor_name="setup",
+            metric_id="pattern_setup",
+            operator=">",
+            threshold=40,
+            weight_pct=40,
+        ),
+        AlphaFactor(
+            factor_name="rsi", metric_id="TA_RSI", operator="<", threshold=30, weight_pct=30
+        ),
+        AlphaFactor(
+            factor_name="sig",
+            metric_id="alpha_signal_label",
+            operator="IN",
+            threshold_array=["Sell", "Strong Sell"],
+            weight_pct=60,
+            vote_direction="SHORT",
+        ),
+        AlphaFactor(
+            factor_name="z",
+            metric_id="alpha_z",
+            operator="<=",
+            threshold=-1,
+            weight_pct=30,
+            vote_direction="SHORT",
+        ),
+    ]
+    tactical.min_convergence_score_required = 50
+    bp.persona_genetics.persona_signal_mix = PersonaSignalMix(
+        trend_weight=0.8, mean_revert_weight=0.1, long_bias=0.7
+    )
+    return bp
+
+
+@pytest.mark.parametrize("name", [*list_presets(), "custom"])
+def test_compiled_matches_per_rule_path(name):
+    bp = _custom_blueprint() if name == "custom" else get_preset(name)
+    compiled = compile_blueprint(bp)
+    assert compile_blueprint(bp) is compiled
+    rng = random.Random(7)
+    states = [_state(rng) for _ in range(300)]
+    expected = [_reference(bp, s) for s in states]
+
+    got = [compiled.evaluate(s) for s in states]
+    assert [(d.signal, d.conviction) for d in got] == expected
+
+    bars = compiled.evaluate_bars(states)
+    assert bars["signal"].tolist() == [SIGNAL_CODES[sig] for sig, _ in expected]
+    assert bars["conviction"].tolist() == [conv for _, conv in expected]
+    assert bars["veto"].tolist() == [sig == "VETO" for sig, _ in expected]
+    assert len({sig for sig, _ in expected}) >= 2
+
+
+def test_apply_strategy_uses_compiled_decision():
+    bp = _custom_blueprint()
+    state = _state(random.Random(3))
+    payload = apply_strategy(state, bp, ticker="BTC/USDT")
+    sig, conv = _reference(bp, state)
+    assert payload.signal == sig and payload.conviction_score == conv
+    assert compile_blueprint(bp).evaluate_bars([])["signal"].shape == (0,)
+
+
+def test_compiled_operators_match_eval_semantics():
+    assert eval_operator(None, "!=", 1, None) is True
+    assert eval_operator(None, "==", None, None) is False
+    assert eval_operator(None, ">", 1, None) is False
+    assert eval_operator("abc", ">", 1, None) is False
+    assert eval_operator(5, ">=", "5", None) is True
+    assert eval_operator(5, ">", "nope", None) is False
+    assert eval_operator("x", "IN", None, None) is False
+    assert eval_operator("x", "not_in", None, ["y"]) is True
+    assert eval_operator(1, "~", 1, None) is False
@@ -0,0 +1,129 @@
+"""Streaming equity/trades journals (JSONL or Parquet) written by PerpEngine during the run."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backtest.engines.perp import PerpEngine
+from backtest.trade_book import (
+    ParquetJournal,
+    journal_path,
+    journal_row_count,
+    open_journal,
+    read_journal_rows,
+    read_jsonl_dict_records,
+)
+
+H = 3_600_000
+T0 = 1_700_000_000_000
+
+
+def _bars(n: int, *, drift: float = 0.0) -> list[list[float]]:
+    out = []
+    for i in range(n):
+        c = 100.0 + drift * i + (3.0 if i % 7 < 3 else -2.0)
+        out.append([T0 + i * H, c, c + 1.0, c - 1.0, c, 5.0])
+    return out
+
+
+def _run(tmp_path, fmt: str, run_id: str, seen: list[int] | None = None) -> PerpEngine:
+    engine = PerpEngine(
+        {"interval_sec": 3600, "eval_start_bar": 5, "artifact_format": fmt, "slippage": 0.0}
+    )
+
+    def signal(sym, window, positions, account):
+        if seen is not None and sym == "BTC/USDT":
+            seen.append(engine._equity_journal.rows)
+        return 0.5 if len(window) % 6 < 3 else -0.5
+
+    bars = {"BTC/USDT": _bars(40), "ETH/USDT": _bars(40, drift=0.5)}
+    engine.run(bars, signal, run_id=run_id, runs_dir=tmp_path)
+    return engine
+
+
+def test_jsonl_journal_grows_during_the_run_and_feeds_the_bundle(tmp_path):
+    seen: list[int] = []
+    engine = _run(tmp_path, "jsonl", "j", seen)
+    run_dir = tmp_path / "backtests" / "j"
+
+    # Rows were journaled while the run was still going (scored bars only).
+    assert seen[4] == 0 and seen[-1] == 34
+    equity = read_journal_rows(run_dir, "equity")
+    assert len(equity) == journal_row_count(run_dir, "equity") == 35
+    assert equity[0]["ts"] == T0 + 5 * H
+    assert equity[-1]["equity"] == pytest.approx(engine.snapshots[-1].equity)
+
+    trades = read_journal_rows(run_dir, "trades")
+    assert len(trades) == len(engine.trades) > 2
+    assert trades[-1]["exit_reason"] == "end_of_backtest"
+    csv_rows = (run_dir / "trades_record.csv").read_text().splitlines()
+    assert len(csv_rows) == len(trades) + 1
+    assert len((run_dir / "equity_curve.csv").read_text().splitlines()) == 36
+
+    bars = json.loads((run_dir / "bars.json").read_text())
+    assert len(bars["bars"]) == 35 and bars["bars"][0]["ts"] == T0 + 5 * H
+    assert set(bars["ohlcv_by_symbol"]) == {"BTC/USDT", "ETH/USDT"}
+    assert len(bars["benchmark_equity"]) == len(bars["benchmark_equity_points"]) == 35
+
+    cols = read_journal_rows(run_dir, "equity", columns=("ts", "equity"), start=30, stop=32)
+    assert cols == [{"ts": r["ts"], "equity": r["equity"]} for r in equity[30:32]]
+    assert read_journal_rows(run_dir, "trades", tail=2) == trades[-2:]
+
+
+def test_parquet_journals_read_back_like_jsonl(tmp_path):
+    pytest.importorskip("pyarrow")
+    _run(tmp_path, "jsonl", "same")
+    jsonl_dir = tmp_path / "backtests" / "same"
+    ref = {name: read_journal_rows(jsonl_dir, name) for name in ("equity", "trades")}
+    ref_csv = (jsonl_dir / "equity_curve.csv").read_text()
+
+    _run(tmp_path, "parquet", "same")  # same run_id: the JSONL journals are replaced
+    assert journal_path(jsonl_dir, "equity").suffix == ".parquet"
+    assert not (jsonl_dir / "equity.jsonl").exists()
+    for name, rows in ref.items():
+        assert read_journal_rows(jsonl_dir, name) == rows
+        assert journal_row_count(jsonl_dir, name) == len(rows)
+    assert read_journal_rows(jsonl_dir, "trades", tail=3) == ref["trades"][-3:]
+    assert read_jsonl_dict_records(jsonl_dir / "trades.parquet", limit=2) == ref["trades"][:2]
+    assert (jsonl_dir / "equity_curve.csv").read_text() == ref_csv
+
+
+def test_parquet_slices_decode_only_overlapping_row_groups(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    journal = ParquetJournal(tmp_path / "equity.parquet", "equity", batch_rows=10)
+    rows = [
+        {"ts": T0 + i * H, "capital": i, "unrealized_pnl": 0.0, "equity": 2.0 * i, "positions": 1}
+        for i in range(95)
+    ]
+    for row in rows:
+        journal.append(row)
+    journal.close()
+
+    decoded: list[list[int]] = []
+    real = pq.ParquetFile.read_row_groups
+
+    def spy(self, row_groups, *args, **kwargs):
+        decoded.append(list(row_groups))
+        return real(self, row_groups, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", spy)
+    cols = ("ts", "equity")
+    assert read_journal_rows(tmp_path, "equity", columns=cols, start=38, stop=52) == [
+        {"ts": r["ts"], "equity": r["equity"]} for r in rows[38:52]
+    ]
+    assert read_journal_rows(tmp_path, "equity", tail=7) == rows[-7:]
+    assert read_journal_rows(tmp_path, "equity", start=-3) == rows[-3:]
+    assert read_journal_rows(tmp_path, "equity", start=50, stop=50) == []
+    assert read_journal_rows(tmp_path, "equity") == rows
+    assert decoded == [[3, 4, 5], [8, 9], [9], list(range(10))]
+
+
+def test_open_journal_rejects_unknown_names_and_formats(tmp_path):
+    with pytest.raises(ValueError):
+        open_journal(tmp_path, "fills")
+    with pytest.raises(ValueError):
+        open_journal(tmp_path, "equity", fmt="csv")
+    assert journal_path(tmp_path, "equity") is None
+    assert read_journal_rows(tmp_path, "equity") == []